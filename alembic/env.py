@@ -12,7 +12,10 @@ from alembic import context
 from src.app.models.base import Base
 from src.app.models.etl_pipeline import EtlPipeline  # noqa: F401
 from src.app.models.etl_pipeline_task import EtlPipelineTask  # noqa: F401
+from src.app.models.etl_row_fingerprint import EtlRowFingerprint  # noqa: F401
 from src.app.models.etl_run import EtlRun  # noqa: F401
+from src.app.models.etl_run_daily import EtlRunDaily  # noqa: F401
+from src.app.models.etl_run_profile import EtlRunProfile  # noqa: F401
 from src.app.models.etl_state import EtlState  # noqa: F401
 from src.config import get_settings
 
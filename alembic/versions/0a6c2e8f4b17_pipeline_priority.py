@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0a6c2e8f4b17"
+down_revision: str | Sequence[str] | None = "f1b3d5e7a902"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "etl_pipelines",
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="10"),
+        schema="etl",
+    )
+    op.create_check_constraint(
+        "etl_pipelines_priority_check",
+        "etl_pipelines",
+        "priority BETWEEN 1 AND 100",
+        schema="etl",
+    )
+    # candidates are fetched by status and ordered by priority on every runner tick
+    op.create_index(
+        "ix_etl_pipelines_status_priority",
+        "etl_pipelines",
+        ["status", sa.text("priority DESC"), "name"],
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_etl_pipelines_status_priority", "etl_pipelines", schema="etl")
+    op.drop_constraint("etl_pipelines_priority_check", "etl_pipelines", schema="etl", type_="check")
+    op.drop_column("etl_pipelines", "priority", schema="etl")
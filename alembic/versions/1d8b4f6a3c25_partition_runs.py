@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1d8b4f6a3c25"
+down_revision: str | Sequence[str] | None = "0a6c2e8f4b17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_COLUMNS = (
+    "id, pipeline_id, started_at, finished_at, rows_read, rows_written, rows_skipped,"
+    " status, error_message, plan_summary"
+)
+
+# etl_runs becomes a table range-partitioned by started_at, one partition per
+# month (etl_runs_pYYYYMM, bounds in UTC). The runner creates partitions ahead
+# of time and drops expired ones (src/runner/orchestration/retention.py).
+# Partitions for the existing history are created here and the rows copied.
+_CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    m timestamptz;
+    last_month timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        + interval '2 months';
+BEGIN
+    m := coalesce(
+        (SELECT date_trunc('month', min(started_at) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+           FROM etl.etl_runs_unpartitioned),
+        date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+    );
+    WHILE m <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE etl.%I PARTITION OF etl.etl_runs FOR VALUES FROM (%L) TO (%L)',
+            'etl_runs_p' || to_char(m AT TIME ZONE 'UTC', 'YYYYMM'),
+            m,
+            m + interval '1 month'
+        );
+        m := m + interval '1 month';
+    END LOOP;
+END $$;
+"""
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE etl.etl_runs RENAME TO etl_runs_unpartitioned")
+    op.execute(
+        "ALTER INDEX etl.ix_etl_runs_pipeline_id_started_at"
+        " RENAME TO ix_etl_runs_unpartitioned_pipeline_id_started_at"
+    )
+    op.execute(
+        "ALTER TABLE etl.etl_runs_unpartitioned"
+        " RENAME CONSTRAINT etl_runs_status_check TO etl_runs_unpartitioned_status_check"
+    )
+    op.execute(
+        "ALTER TABLE etl.etl_runs_unpartitioned"
+        " RENAME CONSTRAINT etl_runs_pkey TO etl_runs_unpartitioned_pkey"
+    )
+
+    # the partition key must be part of the primary key
+    op.create_table(
+        "etl_runs",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=False),
+            nullable=False,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column(
+            "pipeline_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "started_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("finished_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("rows_read", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("rows_written", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("rows_skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("status", sa.Text(), nullable=False, server_default=sa.text("'RUNNING'")),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("plan_summary", postgresql.JSONB(), nullable=True),
+        sa.PrimaryKeyConstraint("id", "started_at", name="etl_runs_pkey"),
+        sa.CheckConstraint(
+            "status IN ('RUNNING', 'SUCCESS', 'FAILED')", name="etl_runs_status_check"
+        ),
+        schema="etl",
+        postgresql_partition_by="RANGE (started_at)",
+    )
+    op.execute("CREATE TABLE etl.etl_runs_default PARTITION OF etl.etl_runs DEFAULT")
+    op.execute(_CREATE_MONTHLY_PARTITIONS)
+
+    op.execute(
+        f"INSERT INTO etl.etl_runs ({_COLUMNS}) SELECT {_COLUMNS} FROM etl.etl_runs_unpartitioned"
+    )
+    op.drop_table("etl_runs_unpartitioned", schema="etl")
+
+    op.create_index(
+        "ix_etl_runs_pipeline_id_started_at",
+        "etl_runs",
+        ["pipeline_id", sa.text("started_at DESC")],
+        schema="etl",
+    )
+    # recovery and the rollup look for RUNNING runs only; keeps that lookup tiny
+    op.create_index(
+        "ix_etl_runs_running",
+        "etl_runs",
+        ["pipeline_id"],
+        schema="etl",
+        postgresql_where=sa.text("status = 'RUNNING'"),
+    )
+
+    op.create_table(
+        "etl_run_daily",
+        sa.Column(
+            "pipeline_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("runs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("succeeded", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_read", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("rows_written", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("rows_skipped", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("duration_total_s", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("duration_max_s", sa.Float(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        schema="etl",
+    )
+    op.create_index("ix_etl_run_daily_day", "etl_run_daily", ["day"], schema="etl")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_etl_run_daily_day", "etl_run_daily", schema="etl")
+    op.drop_table("etl_run_daily", schema="etl")
+
+    op.execute("ALTER TABLE etl.etl_runs RENAME TO etl_runs_partitioned")
+    op.execute("ALTER INDEX etl.ix_etl_runs_pipeline_id_started_at RENAME TO ix_etl_runs_p_started")
+    op.execute(
+        "ALTER TABLE etl.etl_runs_partitioned"
+        " RENAME CONSTRAINT etl_runs_status_check TO etl_runs_partitioned_status_check"
+    )
+    op.execute(
+        "ALTER TABLE etl.etl_runs_partitioned RENAME CONSTRAINT etl_runs_pkey TO etl_runs_p_pkey"
+    )
+
+    op.create_table(
+        "etl_runs",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=False),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column(
+            "pipeline_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "started_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("finished_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("rows_read", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("rows_written", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("rows_skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("status", sa.Text(), nullable=False, server_default=sa.text("'RUNNING'")),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("plan_summary", postgresql.JSONB(), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('RUNNING', 'SUCCESS', 'FAILED')", name="etl_runs_status_check"
+        ),
+        schema="etl",
+    )
+    op.execute(
+        f"INSERT INTO etl.etl_runs ({_COLUMNS}) SELECT {_COLUMNS} FROM etl.etl_runs_partitioned"
+    )
+    # drops every partition with it
+    op.drop_table("etl_runs_partitioned", schema="etl")
+    op.create_index(
+        "ix_etl_runs_pipeline_id_started_at",
+        "etl_runs",
+        ["pipeline_id", sa.text("started_at DESC")],
+        schema="etl",
+    )
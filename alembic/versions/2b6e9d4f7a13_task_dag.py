@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b6e9d4f7a13"
+down_revision: str | Sequence[str] | None = "9a3d6f2c8e41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "etl_pipeline_tasks",
+        sa.Column("depends_on", postgresql.ARRAY(sa.Integer()), nullable=True),
+        schema="etl",
+    )
+    op.add_column(
+        "etl_state",
+        sa.Column("reader_checkpoints", postgresql.JSONB(), nullable=True),
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("etl_state", "reader_checkpoints", schema="etl")
+    op.drop_column("etl_pipeline_tasks", "depends_on", schema="etl")
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a7d9b10"
+down_revision: str | Sequence[str] | None = "88c13e0965d5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "etl_pipelines",
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+        schema="etl",
+    )
+
+    # Tasks have no API; they are edited directly in SQL. Bump the owning
+    # pipeline's version on any change so runner caches are invalidated.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION etl.bump_pipeline_version_on_task_change()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE etl.etl_pipelines SET version = version + 1 WHERE id = OLD.pipeline_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE etl.etl_pipelines SET version = version + 1 WHERE id = NEW.pipeline_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER etl_pipeline_tasks_bump_version
+        AFTER INSERT OR UPDATE OR DELETE ON etl.etl_pipeline_tasks
+        FOR EACH ROW EXECUTE FUNCTION etl.bump_pipeline_version_on_task_change();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS etl_pipeline_tasks_bump_version ON etl.etl_pipeline_tasks;")
+    op.execute("DROP FUNCTION IF EXISTS etl.bump_pipeline_version_on_task_change();")
+    op.drop_column("etl_pipelines", "version", schema="etl")
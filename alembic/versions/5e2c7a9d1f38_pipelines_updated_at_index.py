@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2c7a9d1f38"
+down_revision: str | Sequence[str] | None = "1d8b4f6a3c25"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # max(updated_at) drives the ETag of the pipeline listing, checked on every poll
+    op.create_index(
+        "ix_etl_pipelines_updated_at",
+        "etl_pipelines",
+        ["updated_at"],
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_etl_pipelines_updated_at", "etl_pipelines", schema="etl")
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6d1f8a3c9e25"
+down_revision: str | Sequence[str] | None = "2b6e9d4f7a13"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.drop_constraint(
+        "etl_pipeline_tasks_type_check", "etl_pipeline_tasks", schema="etl", type_="check"
+    )
+    op.create_check_constraint(
+        "etl_pipeline_tasks_type_check",
+        "etl_pipeline_tasks",
+        "task_type IN ('SQL', 'PYTHON', 'JOIN')",
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "etl_pipeline_tasks_type_check", "etl_pipeline_tasks", schema="etl", type_="check"
+    )
+    op.create_check_constraint(
+        "etl_pipeline_tasks_type_check",
+        "etl_pipeline_tasks",
+        "task_type IN ('SQL', 'PYTHON')",
+        schema="etl",
+    )
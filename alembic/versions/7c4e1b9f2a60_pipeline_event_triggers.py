@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e1b9f2a60"
+down_revision: str | Sequence[str] | None = "5e2c7a9d1f38"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# channel name: src.app.core.constants.PIPELINE_EVENTS_CHANNEL
+# NOTIFY is delivered at commit, so listeners never see rolled back transitions.
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION etl.notify_pipeline_status() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('etl_pipeline_events', json_build_object(
+                'type', 'status',
+                'pipeline_id', NEW.id,
+                'status', NEW.status,
+                'previous', OLD.status,
+                'at', now()
+            )::text);
+            RETURN NULL;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER etl_pipelines_status_notify
+        AFTER UPDATE OF status ON etl.etl_pipelines
+        FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+        EXECUTE FUNCTION etl.notify_pipeline_status()
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION etl.notify_run_status() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_notify('etl_pipeline_events', json_build_object(
+                'type', 'run',
+                'pipeline_id', NEW.pipeline_id,
+                'run_id', NEW.id,
+                'status', NEW.status,
+                'rows_read', NEW.rows_read,
+                'rows_written', NEW.rows_written,
+                'error_message', left(NEW.error_message, 300),
+                'at', now()
+            )::text);
+            RETURN NULL;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER etl_runs_status_notify
+        AFTER INSERT OR UPDATE OF status ON etl.etl_runs
+        FOR EACH ROW EXECUTE FUNCTION etl.notify_run_status()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS etl_runs_status_notify ON etl.etl_runs")
+    op.execute("DROP FUNCTION IF EXISTS etl.notify_run_status()")
+    op.execute("DROP TRIGGER IF EXISTS etl_pipelines_status_notify ON etl.etl_pipelines")
+    op.execute("DROP FUNCTION IF EXISTS etl.notify_pipeline_status()")
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a3d6f2c8e41"
+down_revision: str | Sequence[str] | None = "7c4e1b9f2a60"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "etl_pipelines",
+        sa.Column("profile_runs", sa.Integer(), nullable=False, server_default="0"),
+        schema="etl",
+    )
+    op.add_column(
+        "etl_pipelines",
+        sa.Column("profile_mode", sa.Text(), nullable=False, server_default="sample"),
+        schema="etl",
+    )
+    op.create_check_constraint(
+        "etl_pipelines_profile_check",
+        "etl_pipelines",
+        "profile_mode IN ('sample', 'cprofile') AND profile_runs >= 0",
+        schema="etl",
+    )
+
+    # no FK to etl_runs: it is partitioned (PK id, started_at)
+    op.create_table(
+        "etl_run_profiles",
+        sa.Column("run_id", postgresql.UUID(as_uuid=False), primary_key=True),
+        sa.Column(
+            "pipeline_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("mode", sa.Text(), nullable=False),
+        sa.Column("format", sa.Text(), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("duration_s", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        schema="etl",
+    )
+    op.create_index(
+        "ix_etl_run_profiles_pipeline_id",
+        "etl_run_profiles",
+        ["pipeline_id"],
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_etl_run_profiles_pipeline_id", "etl_run_profiles", schema="etl")
+    op.drop_table("etl_run_profiles", schema="etl")
+    op.drop_constraint("etl_pipelines_profile_check", "etl_pipelines", schema="etl", type_="check")
+    op.drop_column("etl_pipelines", "profile_mode", schema="etl")
+    op.drop_column("etl_pipelines", "profile_runs", schema="etl")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4d2a91c3f"
+down_revision: str | Sequence[str] | None = "3f1c2a7d9b10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "etl_runs",
+        sa.Column("plan_summary", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("etl_runs", "plan_summary", schema="etl")
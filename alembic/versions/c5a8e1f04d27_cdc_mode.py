@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a8e1f04d27"
+down_revision: str | Sequence[str] | None = "b7e4d2a91c3f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("etl_pipelines", sa.Column("cdc_slot", sa.Text(), nullable=True), schema="etl")
+    op.add_column(
+        "etl_pipelines", sa.Column("cdc_source_table", sa.Text(), nullable=True), schema="etl"
+    )
+    op.add_column(
+        "etl_pipelines", sa.Column("cdc_key_column", sa.Text(), nullable=True), schema="etl"
+    )
+
+    op.drop_constraint("etl_pipelines_mode_check", "etl_pipelines", schema="etl", type_="check")
+    op.create_check_constraint(
+        "etl_pipelines_mode_check",
+        "etl_pipelines",
+        "mode IN ('full', 'incremental', 'cdc')",
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("etl_pipelines_mode_check", "etl_pipelines", schema="etl", type_="check")
+    op.create_check_constraint(
+        "etl_pipelines_mode_check",
+        "etl_pipelines",
+        "mode IN ('full', 'incremental')",
+        schema="etl",
+    )
+
+    op.drop_column("etl_pipelines", "cdc_key_column", schema="etl")
+    op.drop_column("etl_pipelines", "cdc_source_table", schema="etl")
+    op.drop_column("etl_pipelines", "cdc_slot", schema="etl")
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d92f6b3e7a14"
+down_revision: str | Sequence[str] | None = "c5a8e1f04d27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "etl_pipelines",
+        sa.Column(
+            "extra_targets",
+            postgresql.ARRAY(sa.Text()),
+            nullable=False,
+            server_default="{}",
+        ),
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("etl_pipelines", "extra_targets", schema="etl")
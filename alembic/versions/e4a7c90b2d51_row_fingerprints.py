@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c90b2d51"
+down_revision: str | Sequence[str] | None = "d92f6b3e7a14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "etl_pipelines",
+        sa.Column("skip_unchanged", sa.Boolean(), nullable=False, server_default="false"),
+        schema="etl",
+    )
+    op.add_column(
+        "etl_runs",
+        sa.Column("rows_skipped", sa.Integer(), nullable=False, server_default="0"),
+        schema="etl",
+    )
+
+    op.create_table(
+        "etl_row_fingerprints",
+        sa.Column(
+            "pipeline_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("target", sa.Text(), primary_key=True),
+        sa.Column("row_key", sa.Text(), primary_key=True),
+        sa.Column("fingerprint", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("etl_row_fingerprints", schema="etl")
+    op.drop_column("etl_runs", "rows_skipped", schema="etl")
+    op.drop_column("etl_pipelines", "skip_unchanged", schema="etl")
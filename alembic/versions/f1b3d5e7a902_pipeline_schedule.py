@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b3d5e7a902"
+down_revision: str | Sequence[str] | None = "e4a7c90b2d51"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("etl_pipelines", sa.Column("schedule", sa.Text(), nullable=True), schema="etl")
+    op.add_column(
+        "etl_pipelines",
+        sa.Column("schedule_misfire", sa.Text(), nullable=False, server_default="coalesce"),
+        schema="etl",
+    )
+    op.add_column(
+        "etl_pipelines",
+        sa.Column("last_scheduled_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        schema="etl",
+    )
+    op.create_check_constraint(
+        "etl_pipelines_schedule_misfire_check",
+        "etl_pipelines",
+        "schedule_misfire IN ('coalesce', 'skip')",
+        schema="etl",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "etl_pipelines_schedule_misfire_check", "etl_pipelines", schema="etl", type_="check"
+    )
+    op.drop_column("etl_pipelines", "last_scheduled_at", schema="etl")
+    op.drop_column("etl_pipelines", "schedule_misfire", schema="etl")
+    op.drop_column("etl_pipelines", "schedule", schema="etl")
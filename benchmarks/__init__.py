@@ -0,0 +1,6 @@
+"""Offline benchmarks for the runner hot paths.
+
+Run with ``python -m benchmarks`` (see ``python -m benchmarks --help``).
+No Postgres or Elasticsearch is required: the source/sink DB is emulated
+in-process and Elasticsearch is a local fake bulk endpoint.
+"""
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks.scenarios import SCENARIOS, BenchParams
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _params(args: argparse.Namespace, rows: int) -> BenchParams:
+    return BenchParams(
+        rows=rows,
+        batch_size=args.batch_size,
+        rtt_ms=args.rtt_ms,
+        es_latency_ms=args.es_latency_ms,
+    )
+
+
+def _run_child(args: argparse.Namespace) -> int:
+    logging.basicConfig(level=args.log_level)
+    result = asyncio.run(SCENARIOS[args.child](_params(args, args.rows[0])))
+    print(json.dumps(result.to_dict()))
+    return 0
+
+
+def _run_isolated(args: argparse.Namespace, scenario: str, rows: int) -> dict[str, Any]:
+    """Run one scenario in a fresh interpreter so peak RSS is per scenario."""
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks",
+        "run",
+        "--child",
+        scenario,
+        "--rows",
+        str(rows),
+        "--batch-size",
+        str(args.batch_size),
+        "--rtt-ms",
+        str(args.rtt_ms),
+        "--es-latency-ms",
+        str(args.es_latency_ms),
+        "--log-level",
+        args.log_level,
+    ]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    if args.child:
+        return _run_child(args)
+
+    results: list[dict[str, Any]] = []
+    for scenario in args.scenarios:
+        for rows in args.rows:
+            if args.in_process:
+                res = asyncio.run(SCENARIOS[scenario](_params(args, rows))).to_dict()
+            else:
+                res = _run_isolated(args, scenario, rows)
+            results.append(res)
+            print(
+                f"{scenario:<12} rows={rows:<9} {res['rows_per_sec']:>12.1f} rows/s"
+                f"  p50={res['batch_latency_ms']['p50']:.3f}ms"
+                f"  p99={res['batch_latency_ms']['p99']:.3f}ms"
+                f"  rss={res['peak_rss_mb']}MB",
+                file=sys.stderr,
+            )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "batch_size": args.batch_size,
+            "rtt_ms": args.rtt_ms,
+            "es_latency_ms": args.es_latency_ms,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    base = json.loads(Path(args.base).read_text())
+    new = json.loads(Path(args.new).read_text())
+
+    def key(r: dict[str, Any]) -> tuple[str, int]:
+        return r["scenario"], r["rows"]
+
+    base_by_key = {key(r): r for r in base["results"]}
+    print(f"{'scenario':<12} {'rows':>9} {'rows/s':>10} {'p50':>8} {'p99':>8} {'rss':>8}")
+    for r in new["results"]:
+        b = base_by_key.get(key(r))
+        if b is None:
+            continue
+
+        def delta(new_v: float, old_v: float) -> str:
+            return f"{(new_v - old_v) / old_v * 100:+.1f}%" if old_v else "n/a"
+
+        print(
+            f"{r['scenario']:<12} {r['rows']:>9} "
+            f"{delta(r['rows_per_sec'], b['rows_per_sec']):>10} "
+            f"{delta(r['batch_latency_ms']['p50'], b['batch_latency_ms']['p50']):>8} "
+            f"{delta(r['batch_latency_ms']['p99'], b['batch_latency_ms']['p99']):>8} "
+            f"{delta(r['peak_rss_mb'], b['peak_rss_mb']):>8}"
+        )
+    return 0
+
+
+def cmd_plan_time(args: argparse.Namespace) -> int:
+    from benchmarks.plan_time import measure
+    from src.config import get_settings
+
+    dsn = args.dsn or get_settings().database_url.replace("postgresql+asyncpg", "postgresql")
+    report = asyncio.run(
+        measure(dsn, args.pipeline_id, samples=args.samples, batches_per_day=args.batches_per_day)
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+    return 0
+
+
+def _rows(value: str) -> list[int]:
+    return [int(float(v)) for v in value.split(",") if v.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run scenarios and emit a JSON report")
+    run.add_argument(
+        "--scenarios",
+        type=lambda v: [s.strip() for s in v.split(",") if s.strip()],
+        default=list(SCENARIOS),
+        help=f"comma-separated subset of: {','.join(SCENARIOS)}",
+    )
+    run.add_argument("--rows", type=_rows, default=[10_000], help="e.g. 10000,1e6,1e7")
+    run.add_argument("--batch-size", type=int, default=1000)
+    run.add_argument("--rtt-ms", type=float, default=0.0, help="simulated DB round trip")
+    run.add_argument("--es-latency-ms", type=float, default=0.0, help="simulated ES bulk latency")
+    run.add_argument("--out", help="write the JSON report here instead of stdout")
+    run.add_argument("--in-process", action="store_true", help="do not isolate scenarios")
+    run.add_argument("--log-level", default="WARNING")
+    run.add_argument("--child", choices=list(SCENARIOS), help=argparse.SUPPRESS)
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="compare two JSON reports")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.set_defaults(func=cmd_compare)
+
+    plan = sub.add_parser(
+        "plan-time", help="measure seek query planning time, ad-hoc vs prepared (needs a DB)"
+    )
+    plan.add_argument("pipeline_id")
+    plan.add_argument("--dsn", help="postgresql://... (default: from settings)")
+    plan.add_argument("--samples", type=int, default=50)
+    plan.add_argument("--batches-per-day", type=int, default=200_000)
+    plan.set_defaults(func=cmd_plan_time)
+
+    args = parser.parse_args(argv)
+    unknown = [s for s in getattr(args, "scenarios", []) if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {unknown}")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+Row = dict[str, Any]
+
+EPOCH = datetime(2020, 1, 1)
+
+# several rows share the same updated_at, so the (ts, id) tie-break is exercised
+ROWS_PER_TICK = 4
+
+
+def row_id(i: int) -> str:
+    # fixed-width hex: lexical order of ids == numeric order of i
+    return str(UUID(int=i + 1))
+
+
+def row_index(rid: str) -> int:
+    return UUID(rid).int - 1
+
+
+def film_work_row(i: int) -> Row:
+    """Row shaped like `content.film_work` (+ `film_id` alias used by sinks)."""
+    rid = row_id(i)
+    return {
+        "id": rid,
+        "film_id": rid,
+        "title": f"Synthetic film #{i}",
+        "rating": round((i * 37 % 100) / 10, 1),
+        "updated_at": EPOCH + timedelta(seconds=i // ROWS_PER_TICK),
+    }
+
+
+def rating_row(i: int) -> Row:
+    """Row shaped like `ugc.ratings`."""
+    return {
+        "id": row_id(i),
+        "film_id": row_id(i % 50_000),
+        "user_id": row_id(1_000_000 + i % 200_000),
+        "rating": i * 7 % 10 + 1,
+        "created_at": EPOCH + timedelta(seconds=i // ROWS_PER_TICK),
+    }
+
+
+def rating_agg_row(i: int) -> Row:
+    """Row shaped like `ugc.ratings` grouped by film (analytics.film_rating_agg input)."""
+    count = i % 500 + 1
+    return {
+        "film_id": row_id(i),
+        "avg_rating": round(1 + (i * 13 % 90) / 10, 2),
+        "rating_count": count,
+        "updated_at": EPOCH + timedelta(seconds=i // ROWS_PER_TICK),
+    }
+
+
+DATASETS: dict[str, Callable[[int], Row]] = {
+    "film_work": film_work_row,
+    "ratings": rating_row,
+    "film_rating_agg": rating_agg_row,
+}
+
+
+class SyntheticTable:
+    """A lazily generated table of `size` rows, ordered by (updated_at, id).
+
+    Rows are produced on demand from their index, so memory stays bounded
+    regardless of the table size (10k .. 10M rows).
+    """
+
+    def __init__(self, dataset: str, size: int) -> None:
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset {dataset!r}. Known: {sorted(DATASETS)}")
+        self.dataset = dataset
+        self.size = size
+        self._make = DATASETS[dataset]
+
+    def slice(self, start: int, limit: int) -> list[Row]:
+        stop = min(self.size, start + limit)
+        return [self._make(i) for i in range(max(start, 0), stop)]
+
+    def seek(self, last_id: str | None, limit: int) -> list[Row]:
+        """Rows strictly after `last_id` in (updated_at, id) order."""
+        start = 0 if last_id is None else row_index(str(last_id)) + 1
+        return self.slice(start, limit)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+from aiohttp import web
+
+_HEADERS = {"X-Elastic-Product": "Elasticsearch"}
+
+
+class FakeElasticsearch:
+    """In-process Elasticsearch stand-in: index exists/create and `_bulk`.
+
+    Bulk requests are fully parsed (NDJSON), so serialization and transport
+    costs on the client side are real; only indexing is skipped.
+    """
+
+    def __init__(self, *, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.indices: set[str] = set()
+        self.bulk_requests = 0
+        self.docs = 0
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self) -> str:
+        app = web.Application(client_max_size=512 * 1024 * 1024)
+        app.router.add_get("/", self._info)
+        app.router.add_post("/_bulk", self._bulk)
+        app.router.add_put("/_bulk", self._bulk)
+        app.router.add_route("HEAD", "/{index}", self._index_exists)
+        app.router.add_put("/{index}", self._index_create)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self) -> None:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    def _json(self, body: Any, status: int = 200) -> web.Response:
+        return web.json_response(body, status=status, headers=_HEADERS)
+
+    async def _info(self, request: web.Request) -> web.Response:
+        return self._json({"name": "fake", "version": {"number": "8.13.4"}})
+
+    async def _index_exists(self, request: web.Request) -> web.Response:
+        status = 200 if request.match_info["index"] in self.indices else 404
+        return web.Response(status=status, headers=_HEADERS)
+
+    async def _index_create(self, request: web.Request) -> web.Response:
+        index = request.match_info["index"]
+        self.indices.add(index)
+        return self._json({"acknowledged": True, "shards_acknowledged": True, "index": index})
+
+    async def _bulk(self, request: web.Request) -> web.Response:
+        await self._delay()
+        body = await request.read()
+        lines = [ln for ln in body.split(b"\n") if ln]
+
+        items: list[dict[str, Any]] = []
+        it = iter(lines)
+        for action_line in it:
+            action = json.loads(action_line)
+            op, meta = next(iter(action.items()))
+            if op != "delete":
+                json.loads(next(it))
+            items.append(
+                {op: {"_index": meta.get("_index"), "_id": meta.get("_id"), "status": 200}}
+            )
+
+        self.bulk_requests += 1
+        self.docs += len(items)
+        return self._json({"took": 1, "errors": False, "items": items})
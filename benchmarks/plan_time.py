@@ -0,0 +1,139 @@
+"""Planning time of the incremental seek query: ad-hoc vs prepared.
+
+Needs a real database. For a given pipeline the seek-page statement built by
+`src.app.core.seek_query` is executed under
+`EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON)` in two ways:
+
+- `adhoc`: sent as a fresh statement every time (what the runner did when the
+  SQL text was rebuilt per batch and the statement cache missed);
+- `prepared`: `PREPARE` once, then `EXPLAIN ... EXECUTE` per batch (what a
+  warm asyncpg statement cache does).
+
+The difference in reported "Planning Time" is the server-side cost saved per
+batch; multiplied by `--batches-per-day` it gives the daily saving.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import asyncpg as pg_asyncpg
+
+from src.app.core.seek_query import build_seek_query
+
+_PIPELINE_SQL = """
+SELECT p.source_query, p.incremental_key, p.incremental_id_key, p.batch_size,
+       s.last_processed_value, s.last_processed_id
+FROM etl.etl_pipelines p
+LEFT JOIN etl.etl_state s ON s.pipeline_id = p.id
+WHERE p.id = $1
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class PlanTimeReport:
+    samples: int
+    adhoc_planning_ms: float
+    prepared_planning_ms: float
+    saved_per_batch_ms: float
+    batches_per_day: int
+    saved_per_day_s: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def planning_ms(explain_json: Any) -> float:
+    """Extract "Planning Time" from EXPLAIN (FORMAT JSON) output."""
+    doc = json.loads(explain_json) if isinstance(explain_json, str) else explain_json
+    return float(doc[0].get("Planning Time", 0.0))
+
+
+def summarize(adhoc: list[float], prepared: list[float], *, batches_per_day: int) -> PlanTimeReport:
+    adhoc_ms = statistics.fmean(adhoc) if adhoc else 0.0
+    prepared_ms = statistics.fmean(prepared) if prepared else 0.0
+    saved = max(0.0, adhoc_ms - prepared_ms)
+    return PlanTimeReport(
+        samples=min(len(adhoc), len(prepared)),
+        adhoc_planning_ms=round(adhoc_ms, 4),
+        prepared_planning_ms=round(prepared_ms, 4),
+        saved_per_batch_ms=round(saved, 4),
+        batches_per_day=batches_per_day,
+        saved_per_day_s=round(saved * batches_per_day / 1000, 2),
+    )
+
+
+def _literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+async def measure(
+    dsn: str,
+    pipeline_id: str,
+    *,
+    samples: int = 50,
+    batches_per_day: int = 200_000,
+) -> PlanTimeReport:
+    import asyncpg
+
+    # no client-side statement cache: every ad-hoc EXPLAIN is parsed and planned anew
+    conn = await asyncpg.connect(dsn, statement_cache_size=0)
+    try:
+        row = await conn.fetchrow(_PIPELINE_SQL, pipeline_id)
+        if row is None:
+            raise SystemExit(f"pipeline {pipeline_id} not found")
+        if not row["incremental_key"]:
+            raise SystemExit("pipeline is not incremental (no incremental_key)")
+
+        query = build_seek_query(
+            row["source_query"],
+            inc_key=row["incremental_key"],
+            id_key=row["incremental_id_key"] or "film_id",
+        )
+        limit = int(row["batch_size"] or 1000)
+
+        # seek from the current checkpoint, or from the first row if there is none
+        last_ts_raw, last_id = row["last_processed_value"], row["last_processed_id"]
+        if last_ts_raw:
+            last_ts = datetime.fromisoformat(last_ts_raw)
+        else:
+            first = await conn.fetchrow(_compile(query.first_page)[0], 1)
+            if first is None:
+                raise SystemExit("source query returned no rows")
+            last_ts, last_id = first[query.inc_key], str(first[query.id_key])
+
+        sql, names = _compile(query.seek_page)
+        bound = {"last_ts": last_ts, "last_id": last_id, "limit": limit}
+        args = [bound[n] for n in names]
+
+        explain = "EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) "
+        adhoc: list[float] = []
+        for _ in range(samples):
+            adhoc.append(planning_ms(await conn.fetchval(explain + sql, *args)))
+
+        await conn.execute(f"PREPARE etl_seek_bench AS {sql}")
+        try:
+            execute = "EXECUTE etl_seek_bench(" + ", ".join(_literal(a) for a in args) + ")"
+            prepared: list[float] = []
+            for _ in range(samples):
+                prepared.append(planning_ms(await conn.fetchval(explain + execute)))
+        finally:
+            await conn.execute("DEALLOCATE etl_seek_bench")
+    finally:
+        await conn.close()
+
+    return summarize(adhoc, prepared, batches_per_day=batches_per_day)
+
+
+def _compile(stmt: Any) -> tuple[str, list[str]]:
+    """Render a text() statement with $n placeholders, as asyncpg receives it."""
+    compiled = stmt.compile(dialect=pg_asyncpg.dialect())
+    return str(compiled), list(compiled.positiontup or [])
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import resource
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from benchmarks.datagen import SyntheticTable
+from benchmarks.fake_db import FakeSession
+from benchmarks.fake_es import FakeElasticsearch
+from src.runner.adapters.sql_full import run_sql_full_pipeline
+from src.runner.adapters.sql_incremental import run_sql_incremental_pipeline
+from src.runner.adapters.tasks_full import run_tasks_full
+from src.runner.adapters.writers import ElasticsearchWriter, ESConfig, PostgresWriter
+from src.runner.orchestration.context import ExecutionContext
+from src.runner.repos.pipelines import PipelinesRepo
+from src.runner.repos.runs import RunsRepo
+from src.runner.repos.state import StateRepo
+from src.runner.services.pause_signals import PauseWatcher
+from src.runner.services.pipeline_snapshot import PipelineSnapshot, TaskSnapshot
+
+
+@dataclass(frozen=True, slots=True)
+class BenchParams:
+    rows: int
+    batch_size: int = 1000
+    rtt_ms: float = 0.0
+    es_latency_ms: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioResult:
+    scenario: str
+    rows: int
+    batch_size: int
+    batches: int
+    seconds: float
+    rows_per_sec: float
+    batch_latency_ms: dict[str, float]
+    peak_rss_mb: float
+    statements: int
+    commits: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _snapshot(**overrides: Any) -> PipelineSnapshot:
+    base: dict[str, Any] = dict(
+        id="00000000-0000-0000-0000-00000000be0c",
+        name="bench",
+        type="SQL",
+        mode="full",
+        enabled=True,
+        batch_size=1000,
+        source_query="SELECT id, id AS film_id, title, rating, updated_at FROM content.film_work",
+        python_module=None,
+        target_table="analytics.film_dim",
+        incremental_key=None,
+        incremental_id_key=None,
+    )
+    base.update(overrides)
+    return PipelineSnapshot(**base)
+
+
+def _ctx(session: FakeSession) -> ExecutionContext:
+    return ExecutionContext(
+        session=session,  # type: ignore[arg-type]
+        run_id="bench",
+        runs=RunsRepo(),
+        pipelines=PipelinesRepo(),
+        state=StateRepo(),
+        # never refreshed: pause checks stay in-memory and always negative
+        pause=PauseWatcher(session_factory=None),
+    )
+
+
+def _result(
+    name: str,
+    params: BenchParams,
+    *,
+    rows: int,
+    seconds: float,
+    latencies: list[float],
+    session: FakeSession,
+) -> ScenarioResult:
+    lat_ms = [v * 1000 for v in latencies]
+    return ScenarioResult(
+        scenario=name,
+        rows=rows,
+        batch_size=params.batch_size,
+        batches=len(latencies),
+        seconds=round(seconds, 6),
+        rows_per_sec=round(rows / seconds, 1) if seconds > 0 else 0.0,
+        batch_latency_ms={
+            "p50": round(percentile(lat_ms, 50), 3),
+            "p99": round(percentile(lat_ms, 99), 3),
+            "max": round(max(lat_ms, default=0.0), 3),
+        },
+        peak_rss_mb=round(peak_rss_mb(), 1),
+        statements=session.statements,
+        commits=session.commits,
+    )
+
+
+async def _run_adapter(
+    name: str,
+    params: BenchParams,
+    dataset: str,
+    body: Callable[[ExecutionContext], Awaitable[tuple[int, int]]],
+) -> ScenarioResult:
+    session = FakeSession(SyntheticTable(dataset, params.rows), rtt=params.rtt_ms / 1000)
+
+    started = time.perf_counter()
+    rows_read, _ = await body(_ctx(session))
+    seconds = time.perf_counter() - started
+
+    # batch latency = time between consecutive source fetches
+    marks = session.fetch_started
+    latencies = [b - a for a, b in zip(marks, marks[1:], strict=False)]
+    return _result(
+        name, params, rows=rows_read, seconds=seconds, latencies=latencies, session=session
+    )
+
+
+async def full_offset(params: BenchParams) -> ScenarioResult:
+    snap = _snapshot(batch_size=params.batch_size)
+    return await _run_adapter(
+        "full_offset", params, "film_work", lambda ctx: run_sql_full_pipeline(ctx, snap)
+    )
+
+
+async def incremental(params: BenchParams) -> ScenarioResult:
+    snap = _snapshot(
+        mode="incremental",
+        batch_size=params.batch_size,
+        incremental_key="updated_at",
+        incremental_id_key="id",
+    )
+    return await _run_adapter(
+        "incremental", params, "film_work", lambda ctx: run_sql_incremental_pipeline(ctx, snap)
+    )
+
+
+async def tasks_chain(params: BenchParams) -> ScenarioResult:
+    snap = _snapshot(
+        batch_size=params.batch_size,
+        tasks=(
+            TaskSnapshot(
+                id="t1",
+                order_index=1,
+                task_type="SQL",
+                body="SELECT id AS film_id, title, rating FROM content.film_work",
+                target_table=None,
+            ),
+            TaskSnapshot(
+                id="t2",
+                order_index=2,
+                task_type="PYTHON",
+                body="src.pipelines.python_tasks.normalize_title",
+                target_table=None,
+            ),
+        ),
+    )
+    return await _run_adapter(
+        "tasks_chain", params, "film_work", lambda ctx: run_tasks_full(ctx, snap)
+    )
+
+
+async def _run_writer(
+    name: str,
+    params: BenchParams,
+    dataset: str,
+    write: Callable[[FakeSession, list[dict]], Awaitable[int]],
+) -> ScenarioResult:
+    table = SyntheticTable(dataset, params.rows)
+    session = FakeSession(table, rtt=params.rtt_ms / 1000)
+
+    latencies: list[float] = []
+    written = 0
+    for start in range(0, params.rows, params.batch_size):
+        batch = table.slice(start, params.batch_size)  # generation is not timed
+        t0 = time.perf_counter()
+        written += await write(session, batch)
+        latencies.append(time.perf_counter() - t0)
+
+    return _result(
+        name, params, rows=written, seconds=sum(latencies), latencies=latencies, session=session
+    )
+
+
+async def pg_upsert(params: BenchParams) -> ScenarioResult:
+    writer = PostgresWriter()
+    snap = _snapshot(target_table="analytics.film_rating_agg")
+
+    async def write(session: FakeSession, rows: list[dict]) -> int:
+        return await writer.write(session, snap, rows)  # type: ignore[arg-type]
+
+    return await _run_writer("pg_upsert", params, "film_rating_agg", write)
+
+
+async def es_bulk(params: BenchParams) -> ScenarioResult:
+    fake = FakeElasticsearch(latency=params.es_latency_ms / 1000)
+    url = await fake.start()
+    writer = ElasticsearchWriter(ESConfig(url=url, user=None, password=None))
+    snap = _snapshot(target_table="es:film_dim")
+
+    async def write(session: FakeSession, rows: list[dict]) -> int:
+        return await writer.write(session, snap, rows)  # type: ignore[arg-type]
+
+    try:
+        return await _run_writer("es_bulk", params, "film_work", write)
+    finally:
+        await writer.close()
+        await fake.stop()
+
+
+SCENARIOS: dict[str, Callable[[BenchParams], Awaitable[ScenarioResult]]] = {
+    "full_offset": full_offset,
+    "incremental": incremental,
+    "tasks_chain": tasks_chain,
+    "pg_upsert": pg_upsert,
+    "es_bulk": es_bulk,
+}
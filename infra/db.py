@@ -1,30 +1,154 @@
+from __future__ import annotations
+
+import time
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config import get_settings
 
 settings = get_settings()
 
-# Async engine SQLAlchemy
-engine: AsyncEngine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    future=True,
-    pool_pre_ping=True,
-    pool_recycle=1800,
+
+@dataclass(slots=True)
+class PoolStats:
+    """Checkout wait statistics of one connection pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+
+    def observe(self, waited: float) -> None:
+        self.checkouts += 1
+        self.wait_total_s += waited
+        self.wait_max_s = max(self.wait_max_s, waited)
+
+    def as_dict(self) -> dict[str, float | int]:
+        avg = self.wait_total_s / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(avg * 1000, 3),
+            "wait_max_ms": round(self.wait_max_s * 1000, 3),
+        }
+
+
+def _timed_pool_class(stats: PoolStats) -> type[AsyncAdaptedQueuePool]:
+    class _TimedQueuePool(AsyncAdaptedQueuePool):
+        # measures how long a checkout waits for a free (or new) connection
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                stats.timeouts += 1
+                raise
+            finally:
+                stats.observe(time.perf_counter() - started)
+
+    return _TimedQueuePool
+
+
+def _create_engine(
+    role: str,
+    *,
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: float,
+    statement_cache_size: int,
+    stats: PoolStats,
+    use_lifo: bool = False,
+    lock_timeout_ms: int = 0,
+) -> AsyncEngine:
+    server_settings = {"application_name": f"{settings.db_application_name}-{role}"}
+    if lock_timeout_ms > 0:
+        server_settings["lock_timeout"] = str(lock_timeout_ms)
+    return create_async_engine(
+        settings.database_url,
+        echo=False,
+        future=True,
+        poolclass=_timed_pool_class(stats),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_use_lifo=use_lifo,
+        pool_pre_ping=True,
+        pool_recycle=settings.db_pool_recycle,
+        connect_args={
+            "prepared_statement_cache_size": statement_cache_size,
+            "server_settings": server_settings,
+        },
+    )
+
+
+control_pool_stats = PoolStats()
+data_pool_stats = PoolStats()
+
+# Control-plane engine: API, status polling, claims, run bookkeeping.
+engine: AsyncEngine = _create_engine(
+    "control",
+    pool_size=settings.db_control_pool_size,
+    max_overflow=settings.db_control_max_overflow,
+    pool_timeout=settings.db_control_pool_timeout,
+    statement_cache_size=settings.db_control_statement_cache_size,
+    stats=control_pool_stats,
 )
 
-# Session factory
+# Data-plane engine: batch reads/writes and checkpoints (runner only).
+# Connections are opened lazily, so the API never touches this pool.
+# LIFO checkout hands each batch the most recently used connection, whose
+# prepared statement cache already holds the run's seek query.
+data_engine: AsyncEngine = _create_engine(
+    "data",
+    pool_size=settings.db_data_pool_size,
+    max_overflow=settings.db_data_max_overflow,
+    pool_timeout=settings.db_data_pool_timeout,
+    statement_cache_size=settings.db_data_statement_cache_size,
+    stats=data_pool_stats,
+    use_lifo=True,
+    lock_timeout_ms=settings.db_data_lock_timeout_ms,
+)
+
+# Session factories
 async_session_factory = async_sessionmaker(
     engine,
     expire_on_commit=False,
 )
+data_session_factory = async_sessionmaker(
+    data_engine,
+    expire_on_commit=False,
+)
+
+
+def pool_metrics() -> dict[str, dict[str, float | int]]:
+    """Checkout wait and occupancy per pool."""
+    out: dict[str, dict[str, float | int]] = {}
+    for name, eng, stats in (
+        ("control", engine, control_pool_stats),
+        ("data", data_engine, data_pool_stats),
+    ):
+        pool = eng.sync_engine.pool
+        out[name] = {
+            **stats.as_dict(),
+            "size": pool.size(),  # type: ignore[attr-defined]
+            "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+            "overflow": pool.overflow(),  # type: ignore[attr-defined]
+        }
+    return out
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    await data_engine.dispose()
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
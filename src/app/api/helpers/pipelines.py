@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, Response, status
 
 from src.app.core.exceptions import PipelineNotFoundError
+from src.app.models import EtlRunProfile
 from src.app.schemas.pipelines import PipelineOut
 from src.app.services.pipelines import PipelinesService
 
@@ -25,6 +35,96 @@ async def get_pipeline_or_404(
     return PipelineOut.model_validate(pipeline)
 
 
+def encode_cursor(after: tuple[str, str]) -> str:
+    """Opaque keyset cursor: the (name, id) of the last row of a page."""
+    raw = json.dumps(list(after), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of `encode_cursor`; raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name, pid = json.loads(raw)
+        UUID(str(pid))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    return str(name), str(pid)
+
+
+def listing_etag(count: int, updated_at: datetime | None, query: str) -> str:
+    """Weak ETag of a listing page: the filtered set's change marker plus the
+    request's query string (page, filters, projection)."""
+    marker = f"{count}|{updated_at.isoformat() if updated_at else '-'}|{query}"
+    return 'W/"' + hashlib.sha1(marker.encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+SSE_HEARTBEAT_SECONDS = 15.0
+
+
+def sse_event(event: dict[str, Any]) -> str:
+    """One Server-Sent Events frame; the event type becomes the SSE `event:`."""
+    data = json.dumps(event, separators=(",", ":"), default=str)
+    return f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
+
+
+async def sse_stream(
+    request: Request,
+    queue: asyncio.Queue[dict[str, Any]],
+    first: dict[str, Any],
+    subscription: AsyncExitStack,
+    *,
+    heartbeat: float = SSE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """Stream `first`, then queued events, until the client goes away.
+
+    A comment line is sent every `heartbeat` seconds without events, which
+    keeps proxies from closing the idle connection and detects disconnects.
+    """
+    try:
+        yield "retry: 2000\n\n"
+        yield sse_event(first)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": ping\n\n"
+                continue
+            yield sse_event(event)
+    finally:
+        await subscription.aclose()
+
+
+_PROFILE_MEDIA = {
+    "collapsed": ("text/plain; charset=utf-8", "collapsed.txt"),
+    "pstats": ("application/octet-stream", "pstats"),
+}
+
+
+def profile_response(profile: EtlRunProfile) -> Response:
+    """Stored (gzip) run profile as a download."""
+    media_type, suffix = _PROFILE_MEDIA.get(profile.format, ("application/octet-stream", "bin"))
+    return Response(
+        content=gzip.decompress(profile.data),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="run-{profile.run_id}.{suffix}"',
+            "X-Profile-Mode": profile.mode,
+            "X-Profile-Samples": str(profile.samples),
+            "X-Profile-Duration": f"{profile.duration_s:.3f}",
+        },
+    )
+
+
 def http_400(detail: str) -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -44,3 +144,10 @@ def http_409(detail: str) -> HTTPException:
         status_code=status.HTTP_409_CONFLICT,
         detail=detail,
     )
+
+
+def http_503(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+    )
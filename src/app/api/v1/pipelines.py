@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+from contextlib import AsyncExitStack
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from pydantic_core import to_jsonable_python
 
 from src.app.api.helpers.pipelines import (
+    decode_cursor,
+    encode_cursor,
+    etag_matches,
     get_pipeline_or_404,
     http_400,
     http_404,
     http_409,
+    http_503,
+    listing_etag,
+    profile_response,
+    sse_stream,
 )
 from src.app.core.exceptions import (
     PipelineIsRunningError,
@@ -17,12 +28,25 @@ from src.app.core.exceptions import (
 )
 from src.app.dependencies import get_pipelines_service
 from src.app.schemas.pipelines import (
+    MAX_PAGE_SIZE,
+    BulkActionOut,
+    BulkActionRequest,
     PipelineCreate,
+    PipelineExplainOut,
+    PipelineListFilter,
+    PipelineMode,
     PipelineOut,
+    PipelineRunDailyOut,
     PipelineRunOut,
+    PipelineType,
     PipelineUpdate,
+    ProfileRequest,
+    ProfileRequestOut,
+    SeekPlanOut,
+    parse_fields,
 )
 from src.app.services.pipelines import PipelinesService
+from src.app.services.status_events import StatusEventHub, get_status_event_hub
 
 router = APIRouter(prefix="/api/v1/pipelines", tags=["pipelines"])
 
@@ -53,10 +77,71 @@ async def create_pipeline_endpoint(
 
 @router.get("/", response_model=list[PipelineOut])
 async def list_pipelines_endpoint(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="`X-Next-Cursor` of the previous page"),
+    status_: list[str] = Query([], alias="status"),
+    mode: PipelineMode | None = Query(None),
+    type_: PipelineType | None = Query(None, alias="type"),
+    enabled: bool | None = Query(None),
+    fields: str | None = Query(None, description="Comma-separated PipelineOut fields"),
+    if_none_match: str | None = Header(None),
     service: PipelinesService = Depends(get_pipelines_service),
-) -> list[PipelineOut]:
-    pipelines = await service.list_pipelines()
-    return [PipelineOut.model_validate(p) for p in pipelines]
+) -> Response:
+    """Pipelines ordered by name, one keyset page at a time.
+
+    The next page's cursor is returned in `X-Next-Cursor` (absent on the last
+    page). Responses carry an ETag derived from the filtered set's count and
+    max(updated_at); a matching `If-None-Match` gets 304 after that single query.
+    """
+    try:
+        filters = PipelineListFilter(
+            status=tuple(s for v in status_ for s in v.split(",")),
+            mode=mode,
+            type=type_,
+            enabled=enabled,
+        )
+        projection = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValidationError as exc:
+        raise http_400(str(exc.errors()[0]["msg"])) from exc
+    except ValueError as exc:
+        raise http_400(str(exc)) from exc
+
+    count, updated_at = await service.pipelines_watermark(filters)
+    etag = listing_etag(count, updated_at, str(sorted(request.query_params.multi_items())))
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    rows, next_after = await service.list_pipelines_page(
+        filters, fields=projection, after=after, limit=limit
+    )
+    if projection is None:
+        body = [PipelineOut.model_validate(dict(r)).model_dump(mode="json") for r in rows]
+    else:
+        body = [to_jsonable_python({f: r[f] for f in projection}) for r in rows]
+    if next_after is not None:
+        headers["X-Next-Cursor"] = encode_cursor(next_after)
+    return JSONResponse(body, headers=headers)
+
+
+@router.post(":run", response_model=BulkActionOut)
+async def bulk_run_endpoint(
+    payload: BulkActionRequest,
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> BulkActionOut:
+    """Bulk run request: every eligible selected pipeline -> RUN_REQUESTED."""
+    return await service.bulk_transition("run", payload)
+
+
+@router.post(":pause", response_model=BulkActionOut)
+async def bulk_pause_endpoint(
+    payload: BulkActionRequest,
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> BulkActionOut:
+    """Bulk pause request: every eligible selected pipeline -> PAUSE_REQUESTED."""
+    return await service.bulk_transition("pause", payload)
 
 
 @router.post("/{pipeline_id}/run", response_model=PipelineOut)
@@ -137,3 +222,144 @@ async def get_pipeline_runs_endpoint(
         limit=limit,
     )
     return [PipelineRunOut.model_validate(r) for r in runs]
+
+
+@router.get(
+    "/{pipeline_id}/runs/daily",
+    response_model=list[PipelineRunDailyOut],
+    summary="Get per-day run totals of a pipeline",
+)
+async def get_pipeline_runs_daily_endpoint(
+    pipeline_id: UUID,
+    days: int = Query(30, ge=1, le=366),
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> list[PipelineRunDailyOut]:
+    """Daily totals, newest first; they outlive the retention of individual runs."""
+    try:
+        rows = await service.list_pipeline_daily(pipeline_id=str(pipeline_id), days=days)
+    except PipelineNotFoundError as exc:
+        raise http_404("Pipeline not found") from exc
+    return [PipelineRunDailyOut.model_validate(r) for r in rows]
+
+
+@router.post("/{pipeline_id}/profile", response_model=ProfileRequestOut)
+async def request_profile_endpoint(
+    pipeline_id: UUID,
+    payload: ProfileRequest,
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> ProfileRequestOut:
+    """Profile the next runs in place; no runner restart or redeploy needed."""
+    try:
+        pipeline = await service.request_profile(
+            str(pipeline_id), runs=payload.runs, mode=payload.mode
+        )
+    except PipelineNotFoundError as exc:
+        raise http_404("Pipeline not found") from exc
+    return ProfileRequestOut.model_validate(pipeline)
+
+
+@router.get(
+    "/{pipeline_id}/runs/{run_id}/profile",
+    response_class=Response,
+    summary="Download the profile captured for a run",
+)
+async def get_run_profile_endpoint(
+    pipeline_id: UUID,
+    run_id: UUID,
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> Response:
+    """Collapsed stacks (`text/plain`, flamegraph input) for sampled runs,
+    a pstats file (`pstats.Stats(path)`) for cProfile runs."""
+    try:
+        profile = await service.get_run_profile(str(pipeline_id), str(run_id))
+    except PipelineNotFoundError as exc:
+        raise http_404("Pipeline not found") from exc
+    if profile is None:
+        raise http_404("No profile for this run")
+    return profile_response(profile)
+
+
+@router.get(
+    "/{pipeline_id}/events",
+    response_class=StreamingResponse,
+    summary="Stream status changes and run progress (Server-Sent Events)",
+)
+async def pipeline_events_endpoint(
+    pipeline_id: UUID,
+    request: Request,
+    service: PipelinesService = Depends(get_pipelines_service),
+    hub: StatusEventHub = Depends(get_status_event_hub),
+) -> StreamingResponse:
+    """`text/event-stream` of `status`, `run` and `progress` events of one pipeline.
+
+    Starts with the current status; `resync` means events may have been lost
+    and the client should re-read the pipeline.
+    """
+    pid = str(pipeline_id)
+    subscription = AsyncExitStack()
+    try:
+        # subscribe before reading the state, so no transition falls in between
+        queue = await subscription.enter_async_context(hub.subscribe(pid))
+    except Exception as exc:
+        await subscription.aclose()
+        raise http_503("Event stream unavailable") from exc
+
+    try:
+        pipeline = await service.get_pipeline(pid)
+    except PipelineNotFoundError as exc:
+        await subscription.aclose()
+        raise http_404("Pipeline not found") from exc
+
+    first = {"type": "status", "pipeline_id": pid, "status": pipeline.status, "previous": None}
+    return StreamingResponse(
+        sse_stream(request, queue, first, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{pipeline_id}/seek-plan", response_model=SeekPlanOut)
+async def get_seek_plan_endpoint(
+    pipeline_id: UUID,
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> SeekPlanOut:
+    """EXPLAIN the incremental seek query and suggest a composite index."""
+    return await _seek_plan(service, pipeline_id, create_index=False)
+
+
+@router.post("/{pipeline_id}/seek-plan/index", response_model=SeekPlanOut)
+async def create_seek_index_endpoint(
+    pipeline_id: UUID,
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> SeekPlanOut:
+    """Create the suggested index (CREATE INDEX CONCURRENTLY) if the seek query sorts."""
+    return await _seek_plan(service, pipeline_id, create_index=True)
+
+
+@router.post("/{pipeline_id}/explain", response_model=PipelineExplainOut)
+async def explain_pipeline_endpoint(
+    pipeline_id: UUID,
+    service: PipelinesService = Depends(get_pipelines_service),
+) -> PipelineExplainOut:
+    """Dry run: EXPLAIN the batch queries the next run would issue and estimate its cost."""
+    try:
+        estimate = await service.explain_pipeline(str(pipeline_id))
+    except PipelineNotFoundError as exc:
+        raise http_404("Pipeline not found") from exc
+    except ValueError as exc:
+        raise http_400(str(exc)) from exc
+
+    return PipelineExplainOut.model_validate(estimate.as_dict())
+
+
+async def _seek_plan(
+    service: PipelinesService, pipeline_id: UUID, *, create_index: bool
+) -> SeekPlanOut:
+    try:
+        summary = await service.explain_seek(str(pipeline_id), create_index=create_index)
+    except PipelineNotFoundError as exc:
+        raise http_404("Pipeline not found") from exc
+    except ValueError as exc:
+        raise http_400(str(exc)) from exc
+
+    return SeekPlanOut.model_validate(summary.as_dict())
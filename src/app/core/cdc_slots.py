@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Logical replication slots of cdc pipelines (test_decoding). A slot keeps WAL
+# on the source until it is consumed or dropped, so one no pipeline reads any
+# more fills the disk.
+
+_SLOT_ACTIVE_SQL = text(
+    """
+    SELECT
+        s.active,
+        EXISTS (
+            SELECT 1 FROM etl.etl_pipelines p WHERE p.mode = 'cdc' AND p.cdc_slot = s.slot_name
+        )
+    FROM pg_replication_slots s
+    WHERE s.slot_name = :slot
+    """
+)
+_DROP_SLOT_SQL = text("SELECT pg_drop_replication_slot(:slot)")
+_ORPHAN_SLOTS_SQL = text(
+    """
+    SELECT s.slot_name::text
+    FROM pg_replication_slots s
+    WHERE s.plugin = 'test_decoding'
+      AND s.database = current_database()
+      AND NOT EXISTS (
+          SELECT 1 FROM etl.etl_pipelines p
+          WHERE p.mode = 'cdc' AND p.cdc_slot = s.slot_name
+      )
+    ORDER BY 1
+    """
+)
+
+
+def released_slot(
+    old_mode: str | None, old_slot: str | None, new_mode: str | None, new_slot: str | None
+) -> str | None:
+    """Slot a pipeline stops using after an update (mode change or rename), if any."""
+    if old_mode != "cdc" or not old_slot:
+        return None
+    if new_mode == "cdc" and new_slot == old_slot:
+        return None
+    return old_slot
+
+
+def checkpoint_incompatible(old_mode: str | None, new_mode: str | None) -> bool:
+    """Whether a mode change invalidates the etl_state checkpoint.
+
+    cdc stores an LSN, incremental a timestamp plus an id; neither can
+    resume from the other's checkpoint.
+    """
+    return old_mode != new_mode and "cdc" in (old_mode, new_mode)
+
+
+SlotDrop = Literal["dropped", "missing", "active", "in_use"]
+
+
+async def drop_replication_slot(session: AsyncSession, slot: str) -> SlotDrop:
+    """Drop `slot` unless it is missing, being consumed ("active") or still the
+    slot of a cdc pipeline ("in_use"); it is left in place then.
+
+    Dropping is not transactional; the caller commits afterwards.
+    """
+    res = await session.execute(_SLOT_ACTIVE_SQL, {"slot": slot})
+    row = res.one_or_none()
+    if row is None:
+        return "missing"
+    active, in_use = row
+    if in_use:
+        return "in_use"
+    if active:
+        return "active"
+    await session.execute(_DROP_SLOT_SQL, {"slot": slot})
+    return "dropped"
+
+
+async def orphaned_slots(session: AsyncSession) -> list[str]:
+    """test_decoding slots of this database that no cdc pipeline uses."""
+    res = await session.execute(_ORPHAN_SLOTS_SQL)
+    return [str(r[0]) for r in res.all()]
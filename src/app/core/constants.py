@@ -7,6 +7,10 @@ ALLOWED_TARGET_TABLES: set[str] = {
 
 ES_TARGET_PREFIX = "es:"
 
+# LISTEN/NOTIFY channel of pipeline status, run status and run progress events
+# (status triggers on etl_pipelines/etl_runs, progress notifications from the runner)
+PIPELINE_EVENTS_CHANNEL = "etl_pipeline_events"
+
 # MVP: only allowing these indexes - for security
 ALLOWED_ES_INDEXES: set[str] = {
     "film_dim",
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# Five-field cron expressions ("minute hour day-of-month month day-of-week"),
+# evaluated in UTC. Supports `*`, lists, ranges, steps, JAN-DEC / SUN-SAT names
+# and the @hourly/@daily/@weekly/@monthly/@yearly macros. Like Vixie cron, when
+# both day fields are restricted a day matches if either does.
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_MONTHS = {m: i for i, m in enumerate("JAN FEB MAR APR MAY JUN JUL AUG SEP OCT NOV DEC".split(), 1)}
+_DAYS = {d: i for i, d in enumerate("SUN MON TUE WED THU FRI SAT".split())}
+
+# an expression that never matches (e.g. "0 0 30 2 *") must not loop forever
+_MAX_YEARS = 5
+
+
+@dataclass(frozen=True, slots=True)
+class CronSchedule:
+    expr: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]  # 0 = Sunday
+    days_any: bool  # day-of-month was "*"
+    weekdays_any: bool  # day-of-week was "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.days_any or self.weekdays_any:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, after: datetime) -> datetime:
+        """First fire time strictly after `after` (naive UTC, minute precision)."""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after.year + _MAX_YEARS
+
+        while dt.year <= limit:
+            if dt.month not in self.months:
+                year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+                dt = dt.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+
+        raise ValueError(f"cron expression {self.expr!r} never fires")
+
+
+def _parse_value(token: str, names: dict[str, int]) -> int:
+    upper = token.upper()
+    if upper in names:
+        return names[upper]
+    if not token.isdigit():
+        raise ValueError(f"invalid cron value {token!r}")
+    return int(token)
+
+
+def _parse_field(
+    field: str, lo: int, hi: int, names: dict[str, int] | None = None
+) -> tuple[frozenset[int], bool]:
+    names = names or {}
+    values: set[int] = set()
+    for part in field.split(","):
+        base, _, step_s = part.partition("/")
+        step = int(step_s) if step_s.isdigit() else 0 if step_s else 1
+        if step < 1:
+            raise ValueError(f"invalid cron step in {part!r}")
+
+        if base == "*":
+            start, end = lo, hi
+        elif "-" in base:
+            a, b = base.split("-", 1)
+            start, end = _parse_value(a, names), _parse_value(b, names)
+        else:
+            start = _parse_value(base, names)
+            end = hi if step_s else start
+
+        if not (lo <= start <= hi and lo <= end <= hi) or start > end:
+            raise ValueError(f"cron field {part!r} is outside {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+
+    return frozenset(values), field == "*"
+
+
+def parse_cron(expr: str) -> CronSchedule:
+    """Parse a cron expression; raises ValueError with a readable message."""
+    raw = " ".join((expr or "").split())
+    fields = _MACROS.get(raw.lower(), raw).split(" ")
+    if len(fields) != 5:
+        raise ValueError("schedule must have 5 fields: minute hour day month weekday")
+
+    minutes, _ = _parse_field(fields[0], 0, 59)
+    hours, _ = _parse_field(fields[1], 0, 23)
+    days, days_any = _parse_field(fields[2], 1, 31)
+    months, _ = _parse_field(fields[3], 1, 12, _MONTHS)
+    weekdays, weekdays_any = _parse_field(fields[4], 0, 7, _DAYS)
+    if 7 in weekdays:  # 7 is Sunday too
+        weekdays = (weekdays - {7}) | {0}
+
+    return CronSchedule(
+        expr=raw,
+        minutes=minutes,
+        hours=hours,
+        days=days,
+        months=months,
+        weekdays=weekdays,
+        days_any=days_any,
+        weekdays_any=weekdays_any,
+    )
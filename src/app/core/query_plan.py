@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.seek_query import SeekQuery, build_seek_query, wrap_query_with_limit_offset
+
+# Shared by the API (plan endpoints) and the runner (seek pre-flight): both
+# build the batch queries of a pipeline and EXPLAIN them the same way.
+
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_QUALIFIED_COL_RE = re.compile(r"^\(?([A-Za-z_][A-Za-z0-9_]*)\.([A-Za-z_][A-Za-z0-9_]*)\)?$")
+
+# last OFFSET batch costing this many times the first one is flagged: every
+# batch re-reads all the rows it skips
+OFFSET_GROWTH_RATIO = 10.0
+
+# (last_ts, last_id) an incremental run resumes from
+Checkpoint = tuple[datetime | None, str | None]
+
+
+@dataclass(frozen=True, slots=True)
+class BatchSource:
+    """What the batch queries of a pipeline are built from.
+
+    `reader_sql` is the first task's SQL for task pipelines, the
+    `source_query` otherwise.
+    """
+
+    id: str
+    mode: str
+    reader_sql: str | None
+    batch_size: int = 1000
+    incremental_key: str | None = None
+    incremental_id_key: str | None = None
+
+
+def parse_checkpoint(last_value: str | None, last_id: str | None) -> Checkpoint:
+    """Checkpoint from the etl_state columns (`last_value` is an ISO timestamp)."""
+    return (datetime.fromisoformat(last_value) if last_value else None, last_id)
+
+
+@dataclass(frozen=True, slots=True)
+class SeekPlanSummary:
+    """What EXPLAIN says about the incremental seek query of a pipeline.
+
+    `needs_sort` means every batch sorts the candidate rows on the incremental
+    keys; `seq_scans` lists relations read without an index. `suggested_index`
+    is a CREATE INDEX statement when the sort keys map to plain columns of a
+    single scanned relation.
+    """
+
+    total_cost: float
+    plan_rows: int
+    node_types: tuple[str, ...]
+    sort_keys: tuple[str, ...]
+    seq_scans: tuple[str, ...]
+    needs_sort: bool
+    suggested_index: str | None = None
+    index_created: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.needs_sort
+
+    def as_dict(self) -> dict[str, Any]:
+        out = asdict(self)
+        out["ok"] = self.ok
+        return out
+
+
+@dataclass(frozen=True, slots=True)
+class PlanIssue:
+    code: str
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineExplain:
+    """EXPLAIN-based estimate of the next run of a pipeline (nothing is executed).
+
+    `form` is the batch query the runner issues: "offset" (full mode),
+    "seek" (incremental, wrapped keyset page) or "pushdown" (incremental
+    query with its own seek placeholders). `estimated_rows` counts the rows
+    the run would read (incremental: after the checkpoint), `last_batch` is
+    planned for the offset form only.
+    """
+
+    form: str
+    batch_size: int
+    estimated_rows: int
+    projected_batches: int
+    estimated_total_cost: float
+    first_batch: SeekPlanSummary
+    last_batch: SeekPlanSummary | None = None
+    issues: tuple[PlanIssue, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "form": self.form,
+            "batch_size": self.batch_size,
+            "estimated_rows": self.estimated_rows,
+            "projected_batches": self.projected_batches,
+            "estimated_total_cost": self.estimated_total_cost,
+            "first_batch": self.first_batch.as_dict(),
+            "last_batch": self.last_batch.as_dict() if self.last_batch else None,
+            "issues": [asdict(i) for i in self.issues],
+        }
+
+
+def reader_sql_for(source: BatchSource) -> str:
+    if not source.reader_sql:
+        raise ValueError("Pipeline has empty source_query")
+    return source.reader_sql
+
+
+def seek_query_for(source: BatchSource) -> SeekQuery:
+    """Seek query the incremental adapter will run for `source`."""
+    if source.mode != "incremental" or not source.incremental_key:
+        raise ValueError("seek plan applies to incremental pipelines only")
+
+    return build_seek_query(
+        reader_sql_for(source),
+        inc_key=source.incremental_key,
+        id_key=source.incremental_id_key or "film_id",
+    )
+
+
+def _walk(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def summarize_plan(
+    plan_json: Any, *, inc_key: str | None = None, id_key: str | None = None
+) -> SeekPlanSummary:
+    """Summarize `EXPLAIN (VERBOSE, FORMAT JSON)` output of a batch query.
+
+    With `inc_key`/`id_key` (seek queries) only sorts on those keys count;
+    without them every sort does (offset batches re-sort on each page).
+    """
+    doc = json.loads(plan_json) if isinstance(plan_json, str) else plan_json
+    root = doc[0]["Plan"]
+
+    keys = {k.lower() for k in (inc_key, id_key) if k}
+    node_types: list[str] = []
+    sort_keys: list[str] = []
+    seq_scans: list[str] = []
+    aliases: dict[str, str] = {}
+
+    for node in _walk(root):
+        ntype = str(node.get("Node Type", ""))
+        node_types.append(ntype)
+
+        if ntype in ("Sort", "Incremental Sort"):
+            node_keys = [str(k) for k in node.get("Sort Key", ())]
+            if not keys or any(_column_of(k).lower() in keys for k in node_keys):
+                sort_keys.extend(node_keys)
+
+        if ntype == "Seq Scan":
+            rel = str(node.get("Relation Name", ""))
+            schema = node.get("Schema")
+            qualified = f"{schema}.{rel}" if schema else rel
+            seq_scans.append(qualified)
+            aliases[str(node.get("Alias", rel))] = qualified
+
+    return SeekPlanSummary(
+        total_cost=float(root.get("Total Cost", 0.0)),
+        plan_rows=int(root.get("Plan Rows", 0)),
+        node_types=tuple(node_types),
+        sort_keys=tuple(sort_keys),
+        seq_scans=tuple(seq_scans),
+        needs_sort=bool(sort_keys),
+        suggested_index=_suggest_index(sort_keys, aliases),
+    )
+
+
+def _column_of(sort_key: str) -> str:
+    m = _QUALIFIED_COL_RE.match(sort_key.strip())
+    return m.group(2) if m else sort_key.strip()
+
+
+def _suggest_index(sort_keys: list[str], aliases: dict[str, str]) -> str | None:
+    """Composite index matching the sort, if it is over one scanned relation."""
+    if not sort_keys:
+        return None
+
+    relation: str | None = None
+    columns: list[str] = []
+    for key in sort_keys:
+        m = _QUALIFIED_COL_RE.match(key.strip())
+        if m is None:
+            return None  # expression sort key: no plain index can serve it
+        alias, column = m.groups()
+        rel = aliases.get(alias)
+        if rel is None or (relation is not None and rel != relation):
+            return None
+        relation = rel
+        if column not in columns:
+            columns.append(column)
+
+    if relation is None or not all(_IDENT_RE.fullmatch(part) for part in relation.split(".")):
+        return None  # would need quoting; leave it to a human
+    table = relation.rsplit(".", 1)[-1]
+    name = f"ix_{table}_{'_'.join(columns)}"[:63]
+    return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {relation} ({', '.join(columns)})"
+
+
+async def explain_seek(
+    session: AsyncSession,
+    query: SeekQuery,
+    *,
+    last_ts: datetime | None,
+    last_id: str | None,
+    limit: int | None,
+) -> SeekPlanSummary:
+    """EXPLAIN (no ANALYZE) the page the next batch would run.
+
+    `limit=None` binds `LIMIT NULL` (no limit): the plan then estimates all
+    rows left after the checkpoint.
+    """
+    stmt, params = query.bind(last_ts, last_id, limit)
+    res = await session.execute(text("EXPLAIN (VERBOSE, FORMAT JSON) " + stmt.text), params)
+    return summarize_plan(res.scalar_one(), inc_key=query.inc_key, id_key=query.id_key)
+
+
+async def explain_next_page(
+    session: AsyncSession, source: BatchSource, checkpoint: Checkpoint
+) -> SeekPlanSummary:
+    """EXPLAIN the seek page the next batch of `source` would run (from `checkpoint`)."""
+    last_ts, last_id = checkpoint
+    return await explain_seek(
+        session,
+        seek_query_for(source),
+        last_ts=last_ts,
+        last_id=last_id,
+        limit=int(source.batch_size or 1000),
+    )
+
+
+async def create_suggested_index(session: AsyncSession, summary: SeekPlanSummary) -> bool:
+    """Run the suggested CREATE INDEX CONCURRENTLY outside a transaction.
+
+    The statement is built only from relation/column names reported by
+    EXPLAIN, never from user input.
+    """
+    if summary.suggested_index is None:
+        return False
+
+    # CONCURRENTLY cannot run inside a transaction block
+    await session.commit()
+    conn = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    await conn.execute(text(summary.suggested_index))
+    await session.commit()
+    return True
+
+
+def _projected_batches(rows: int, batch_size: int) -> int:
+    return math.ceil(rows / batch_size) if rows > 0 else 0
+
+
+def _sort_issue(plan: SeekPlanSummary) -> PlanIssue:
+    hint = plan.suggested_index or "no single-relation index applies"
+    return PlanIssue(
+        "sort_per_batch",
+        f"every batch sorts the candidate rows on {', '.join(plan.sort_keys)}. Suggested: {hint}",
+    )
+
+
+async def _explain(session: AsyncSession, sql: str, params: dict[str, Any] | None = None) -> Any:
+    res = await session.execute(text("EXPLAIN (VERBOSE, FORMAT JSON) " + sql), params or {})
+    return res.scalar_one()
+
+
+async def explain_offset_run(
+    session: AsyncSession, reader_sql: str, *, batch_size: int
+) -> PipelineExplain:
+    """Plan the first and the last `LIMIT/OFFSET` batch of a full run."""
+    base = reader_sql.strip().rstrip(";")
+    rows = summarize_plan(await _explain(session, base)).plan_rows
+    batches = _projected_batches(rows, batch_size)
+
+    first = summarize_plan(
+        await _explain(session, wrap_query_with_limit_offset(base, batch_size, 0))
+    )
+    last: SeekPlanSummary | None = None
+    if batches > 1:
+        last_offset = (batches - 1) * batch_size
+        last = summarize_plan(
+            await _explain(session, wrap_query_with_limit_offset(base, batch_size, last_offset))
+        )
+
+    issues: list[PlanIssue] = []
+    if first.needs_sort:
+        issues.append(_sort_issue(first))
+    if last is not None and last.total_cost > OFFSET_GROWTH_RATIO * max(first.total_cost, 1.0):
+        issues.append(
+            PlanIssue(
+                "offset_rescan",
+                f"the last batch costs {last.total_cost / max(first.total_cost, 1.0):.0f}x"
+                f" the first: OFFSET re-reads up to {(batches - 1) * batch_size} skipped rows"
+                " on every batch",
+            )
+        )
+
+    # batch cost grows about linearly with the offset
+    total_cost = batches * (first.total_cost + (last or first).total_cost) / 2
+    return PipelineExplain(
+        form="offset",
+        batch_size=batch_size,
+        estimated_rows=rows,
+        projected_batches=batches,
+        estimated_total_cost=total_cost,
+        first_batch=first,
+        last_batch=last,
+        issues=tuple(issues),
+    )
+
+
+async def explain_seek_run(
+    session: AsyncSession, source: BatchSource, checkpoint: Checkpoint, *, batch_size: int
+) -> PipelineExplain:
+    """Plan the next keyset page of an incremental run, from its checkpoint."""
+    query = seek_query_for(source)
+    last_ts, last_id = checkpoint
+
+    first = await explain_seek(session, query, last_ts=last_ts, last_id=last_id, limit=batch_size)
+    remaining = await explain_seek(session, query, last_ts=last_ts, last_id=last_id, limit=None)
+    rows = remaining.plan_rows
+    batches = _projected_batches(rows, batch_size)
+
+    issues: list[PlanIssue] = []
+    if first.needs_sort:
+        issues.append(_sort_issue(first))
+    if first.seq_scans:
+        issues.append(
+            PlanIssue(
+                "seq_scan_per_batch",
+                f"every batch scans {', '.join(first.seq_scans)} in full"
+                " instead of seeking an index from the checkpoint",
+            )
+        )
+
+    return PipelineExplain(
+        form="pushdown" if query.pushdown else "seek",
+        batch_size=batch_size,
+        estimated_rows=rows,
+        projected_batches=batches,
+        estimated_total_cost=batches * first.total_cost,
+        first_batch=first,
+        issues=tuple(issues),
+    )
+
+
+async def explain_pipeline_run(
+    session: AsyncSession, source: BatchSource, checkpoint: Checkpoint
+) -> PipelineExplain:
+    """EXPLAIN (no ANALYZE) the batch queries the next run of `source` would issue."""
+    batch_size = int(source.batch_size or 1000)
+    if source.mode == "full":
+        return await explain_offset_run(session, reader_sql_for(source), batch_size=batch_size)
+    if source.mode == "incremental":
+        return await explain_seek_run(session, source, checkpoint, batch_size=batch_size)
+    raise ValueError("dry-run applies to full and incremental pipelines only")
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from src.app.core.source_query import uses_seek_placeholders, validate_source_placeholders
+from src.app.core.sql_ident import validate_sql_ident
+
+
+def wrap_query_with_limit_offset(base_query: str, limit: int, offset: int) -> str:
+    """Batch query of full-mode runs (OFFSET pagination over `base_query`)."""
+    q = base_query.strip().rstrip(";")
+    return f"SELECT * FROM ({q}) AS src LIMIT {limit} OFFSET {offset}"
+
+
+@dataclass(frozen=True, slots=True)
+class SeekQuery:
+    """Keyset-paginated reader over `source_sql`, built once per run.
+
+    Both pages are constructed a single time, so every batch executes the same
+    statement object: SQLAlchemy reuses its compiled form and asyncpg finds the
+    server-side prepared statement in its per-connection cache (see
+    `DB_DATA_STATEMENT_CACHE_SIZE`) instead of parsing and planning again.
+
+    With `pushdown`, the source query carries its own `:last_ts`/`:last_id`/
+    `:limit` placeholders and is executed as-is for every page; the first page
+    binds NULL for both keys.
+    """
+
+    inc_key: str
+    id_key: str
+    first_page: TextClause
+    seek_page: TextClause
+    pushdown: bool = False
+
+    def bind(
+        self, last_ts: datetime | None, last_id: str | None, limit: int | None
+    ) -> tuple[TextClause, dict[str, Any]]:
+        if last_ts is None and not self.pushdown:
+            return self.first_page, {"limit": limit}
+        return self.seek_page, {"last_ts": last_ts, "last_id": last_id, "limit": limit}
+
+
+def build_seek_query(source_sql: str, *, inc_key: str, id_key: str) -> SeekQuery:
+    # defense-in-depth: identifiers are interpolated into the statement text
+    inc_key = validate_sql_ident(inc_key, what="incremental_key")
+    id_key = validate_sql_ident(id_key, what="incremental_id_key")
+
+    base = str(source_sql).strip().rstrip(";")
+
+    if uses_seek_placeholders(base):
+        validate_source_placeholders(base, mode="incremental")
+        # the query filters below its joins/aggregates itself; wrapping it would
+        # only repeat the filter above them
+        stmt = text(base)
+        return SeekQuery(
+            inc_key=inc_key, id_key=id_key, first_page=stmt, seek_page=stmt, pushdown=True
+        )
+
+    order = f"ORDER BY src.{inc_key}, src.{id_key}"
+
+    first_page = text(f"SELECT * FROM ({base}) AS src {order} LIMIT :limit")
+    seek_page = text(
+        f"SELECT * FROM ({base}) AS src"
+        f" WHERE (src.{inc_key} > :last_ts)"
+        f" OR (src.{inc_key} = :last_ts AND src.{id_key} > :last_id)"
+        f" {order} LIMIT :limit"
+    )
+
+    return SeekQuery(
+        inc_key=inc_key,
+        id_key=id_key,
+        first_page=first_page,
+        seek_page=seek_page,
+    )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import re
+
+# Same pattern SQLAlchemy's text() uses to find bind parameters, so what is
+# detected here is exactly what the runner will have to bind. `::type` casts
+# are not placeholders.
+_BIND_RE = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+
+SEEK_PLACEHOLDERS: frozenset[str] = frozenset({"last_ts", "last_id", "limit"})
+
+
+def placeholders(source_query: str) -> set[str]:
+    """Named `:param` placeholders in `source_query`."""
+    return set(_BIND_RE.findall(source_query or ""))
+
+
+def uses_seek_placeholders(source_query: str) -> bool:
+    """True when the query filters/limits itself (`:last_ts`/`:last_id`/`:limit`)."""
+    return bool(placeholders(source_query) & SEEK_PLACEHOLDERS)
+
+
+def validate_source_placeholders(source_query: str, *, mode: str | None) -> None:
+    """Check the placeholders of `source_query` against what the runner binds.
+
+    Only incremental pipelines get parameters, and then either none of the seek
+    placeholders or all of them: a query with `:last_ts` but no `:limit` would
+    read the whole remainder of the source in one batch.
+    """
+    found = placeholders(source_query)
+    if not found:
+        return
+
+    if mode != "incremental":
+        names = ", ".join(f":{p}" for p in sorted(found))
+        raise ValueError(f"source_query placeholders ({names}) are only bound in incremental mode")
+
+    unknown = found - SEEK_PLACEHOLDERS
+    if unknown:
+        names = ", ".join(f":{p}" for p in sorted(unknown))
+        raise ValueError(
+            f"source_query has unknown placeholders ({names}); "
+            "only :last_ts, :last_id and :limit are bound"
+        )
+
+    missing = SEEK_PLACEHOLDERS - found
+    if missing:
+        names = ", ".join(f":{p}" for p in sorted(missing))
+        raise ValueError(f"source_query uses seek placeholders but is missing {names}")
+
+    if "order by" not in " ".join(source_query.lower().split()):
+        raise ValueError(
+            "source_query with seek placeholders must ORDER BY incremental_key, "
+            "incremental_id_key"
+        )
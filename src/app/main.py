@@ -7,8 +7,9 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from sqlalchemy import text
 
-from infra.db import engine
+from infra.db import dispose_engines, engine, pool_metrics
 from src.app.api.v1.pipelines import router as pipelines_router
+from src.app.services.status_events import close_status_event_hub
 from src.config import get_settings
 
 logger = logging.getLogger("etl_api")
@@ -48,8 +49,9 @@ async def lifespan(app: FastAPI):
     yield
 
     # shutdown
-    await engine.dispose()
-    logger.info("DB engine disposed")
+    await close_status_event_hub()
+    await dispose_engines()
+    logger.info("DB engines disposed")
 
 
 app = FastAPI(title="ETL Platform API", version="0.1.0", lifespan=lifespan)
@@ -59,3 +61,9 @@ app.include_router(pipelines_router)
 @app.get("/api/v1/health", tags=["system"])
 async def healthcheck() -> dict:
     return {"status": "ok", "db": "ok", "env": settings.app_env}
+
+
+@app.get("/api/v1/metrics/pools", tags=["system"])
+async def pool_stats() -> dict:
+    """Connection pool occupancy and checkout wait times of this process."""
+    return pool_metrics()
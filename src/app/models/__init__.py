@@ -1,11 +1,17 @@
 from .etl_pipeline import EtlPipeline
 from .etl_pipeline_task import EtlPipelineTask
+from .etl_row_fingerprint import EtlRowFingerprint
 from .etl_run import EtlRun
+from .etl_run_daily import EtlRunDaily
+from .etl_run_profile import EtlRunProfile
 from .etl_state import EtlState
 
 __all__ = [
     "EtlPipeline",
     "EtlPipelineTask",
+    "EtlRowFingerprint",
     "EtlState",
     "EtlRun",
+    "EtlRunDaily",
+    "EtlRunProfile",
 ]
@@ -9,7 +9,7 @@ from sqlalchemy import (
     Integer,
     Text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -33,7 +33,7 @@ class EtlPipeline(Base):
             name="etl_pipelines_type_check",
         ),
         CheckConstraint(
-            "mode IN ('full', 'incremental')",
+            "mode IN ('full', 'incremental', 'cdc')",
             name="etl_pipelines_mode_check",
         ),
         CheckConstraint(
@@ -41,6 +41,18 @@ class EtlPipeline(Base):
             " 'RUNNING', 'PAUSE_REQUESTED', 'PAUSED', 'FAILED')",
             name="etl_pipelines_status_check",
         ),
+        CheckConstraint(
+            "priority BETWEEN 1 AND 100",
+            name="etl_pipelines_priority_check",
+        ),
+        CheckConstraint(
+            "schedule_misfire IN ('coalesce', 'skip')",
+            name="etl_pipelines_schedule_misfire_check",
+        ),
+        CheckConstraint(
+            "profile_mode IN ('sample', 'cprofile') AND profile_runs >= 0",
+            name="etl_pipelines_profile_check",
+        ),
         {"schema": "etl"},
     )
 
@@ -67,6 +79,15 @@ class EtlPipeline(Base):
 
     target_table: Mapped[str] = mapped_column(Text, nullable=False)
 
+    # Additional sinks written from the same read/transform (fan-out); the
+    # checkpoint advances only after target_table and all of these succeed
+    extra_targets: Mapped[list[str]] = mapped_column(
+        ARRAY(Text),
+        nullable=False,
+        default=list,
+        server_default="{}",
+    )
+
     # Execution mode: "full" / "incremental"
     mode: Mapped[str] = mapped_column(
         Text,
@@ -78,6 +99,42 @@ class EtlPipeline(Base):
 
     incremental_id_key: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # CDC mode: logical replication slot (test_decoding) and the watched source
+    # table; changed rows are re-read via source_query by incremental_id_key
+    cdc_slot: Mapped[str | None] = mapped_column(Text, nullable=True)
+    cdc_source_table: Mapped[str | None] = mapped_column(Text, nullable=True)
+    cdc_key_column: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Fair-share weight (1..100): dispatch order and share of runner time
+    priority: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=10,
+        server_default="10",
+    )
+
+    # Cron schedule (5 fields, UTC) evaluated by the runner's scheduler;
+    # NULL = run only on request
+    schedule: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # What to do with fire times missed by more than the grace period (runner
+    # down, long run): "coalesce" = one catch-up run, "skip" = wait for the next
+    schedule_misfire: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        default="coalesce",
+        server_default="coalesce",
+    )
+    # Fire times up to this instant have been handled (fired, absorbed or skipped)
+    last_scheduled_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    # Skip rows whose content hash equals the last one written (etl_row_fingerprints)
+    skip_unchanged: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="false",
+    )
+
     batch_size: Mapped[int] = mapped_column(
         Integer,
         nullable=False,
@@ -95,6 +152,30 @@ class EtlPipeline(Base):
         default=PipelineStatus.IDLE.value,
     )
 
+    # Profile the next `profile_runs` runs ("sample" or "cprofile"); the runner
+    # counts down when it claims a run (not a definition change: no version bump)
+    profile_runs: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    profile_mode: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        default="sample",
+        server_default="sample",
+    )
+
+    # Definition version: bumped on every definition change (API update or
+    # task edits via trigger). Runner caches are keyed by (id, version).
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         nullable=False,
         server_default=func.now(),
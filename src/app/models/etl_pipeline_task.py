@@ -10,7 +10,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -32,7 +32,7 @@ class EtlPipelineTask(Base):
             name="etl_pipeline_tasks_order_uq",
         ),
         CheckConstraint(
-            "task_type IN ('SQL', 'PYTHON')",
+            "task_type IN ('SQL', 'PYTHON', 'JOIN')",
             name="etl_pipeline_tasks_type_check",
         ),
         {"schema": "etl"},
@@ -52,15 +52,21 @@ class EtlPipelineTask(Base):
 
     order_index: Mapped[int] = mapped_column(Integer, nullable=False)
 
-    # "SQL" / "PYTHON"
+    # "SQL" / "PYTHON" / "JOIN" (task DAGs only)
     task_type: Mapped[str] = mapped_column(Text, nullable=False)
 
-    # For SQL: raw SQL text; for PYTHON: dotted path / registered task name
+    # For SQL: raw SQL text; for PYTHON: dotted path / registered task name;
+    # for JOIN: JSON join spec (src.runner.services.hash_join.JoinSpec)
     body: Mapped[str] = mapped_column(Text, nullable=False)
 
     source_table: Mapped[str | None] = mapped_column(Text, nullable=True)
     target_table: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Tasks v2 (DAG): order_index of the upstream task ([] for SQL readers;
+    # [upstream, dimension reader] for JOIN).
+    # NULL on every task of a pipeline keeps the v1 linear chain.
+    depends_on: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(
         nullable=False,
         server_default=func.now(),
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, LargeBinary, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class EtlRowFingerprint(Base):
+    """Content hash of the last row written per target key — etl.etl_row_fingerprints.
+
+    Used by pipelines with `skip_unchanged` to avoid rewriting identical rows.
+    `target` is the sink (or the comma-joined sink set of a fan-out pipeline).
+    """
+
+    __tablename__ = "etl_row_fingerprints"
+    __table_args__ = ({"schema": "etl"},)
+
+    pipeline_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    target: Mapped[str] = mapped_column(Text, primary_key=True)
+    row_key: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    # 16-byte BLAKE2b digest of the row as handed to the writer
+    fingerprint: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+        server_default=func.now(),
+    )
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import CheckConstraint, ForeignKey, Integer, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -17,7 +17,12 @@ if TYPE_CHECKING:
 
 
 class EtlRun(Base):
-    """Pipeline execution runs (etl.etl_runs)."""
+    """Pipeline execution runs (etl.etl_runs).
+
+    Range-partitioned by `started_at` (one partition per month), so the
+    partition key is part of the primary key. Old partitions are dropped by
+    the runner's retention job; per-day totals survive in etl.etl_run_daily.
+    """
 
     __tablename__ = "etl_runs"
     __table_args__ = (
@@ -41,6 +46,7 @@ class EtlRun(Base):
     )
 
     started_at: Mapped[datetime] = mapped_column(
+        primary_key=True,
         nullable=False,
         server_default=func.now(),
     )
@@ -58,6 +64,13 @@ class EtlRun(Base):
         nullable=False,
         default=0,
     )
+    # rows not written because their fingerprint was unchanged (skip_unchanged)
+    rows_skipped: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
 
     # "RUNNING" / "SUCCESS" / "FAILED"
     status: Mapped[str] = mapped_column(
@@ -68,6 +81,9 @@ class EtlRun(Base):
 
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # EXPLAIN summary of the incremental seek query, recorded by the runner pre-flight
+    plan_summary: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
     pipeline: Mapped[EtlPipeline] = relationship(
         "EtlPipeline",
         back_populates="runs",
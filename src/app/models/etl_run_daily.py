@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, Float, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class EtlRunDaily(Base):
+    """Per-pipeline, per-day (UTC) run totals — etl.etl_run_daily.
+
+    Maintained by the runner from etl.etl_runs and kept after the run
+    partitions of that day were dropped by retention.
+    """
+
+    __tablename__ = "etl_run_daily"
+    __table_args__ = ({"schema": "etl"},)
+
+    pipeline_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    runs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    succeeded: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    rows_read: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rows_written: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rows_skipped: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    # wall time of finished runs
+    duration_total_s: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    duration_max_s: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+        server_default=func.now(),
+    )
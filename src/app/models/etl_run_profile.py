@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Float, ForeignKey, Integer, LargeBinary, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class EtlRunProfile(Base):
+    """Profile captured for one run on request — etl.etl_run_profiles.
+
+    Keyed by the run id only: etl.etl_runs is partitioned, so there is no
+    foreign key to it; profiles expire with the run history retention.
+    """
+
+    __tablename__ = "etl_run_profiles"
+    __table_args__ = ({"schema": "etl"},)
+
+    run_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True)
+    pipeline_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("etl.etl_pipelines.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # "sample" (collapsed stacks, text) or "cprofile" (marshalled pstats)
+    mode: Mapped[str] = mapped_column(Text, nullable=False)
+    format: Mapped[str] = mapped_column(Text, nullable=False)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duration_s: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # gzip-compressed artifact
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+        server_default=func.now(),
+    )
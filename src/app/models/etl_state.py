@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -29,6 +29,11 @@ class EtlState(Base):
     last_processed_id: Mapped[str | None] = mapped_column(Text, nullable=True)
     last_processed_value: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # checkpoints of the other readers of a DAG task pipeline, keyed by the
+    # reader's order_index: {"3": {"value": ..., "id": ...}}; the first reader
+    # uses the columns above
+    reader_checkpoints: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
     updated_at: Mapped[datetime] = mapped_column(
         nullable=False,
         server_default=func.now(),
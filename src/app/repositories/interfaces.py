@@ -5,7 +5,8 @@ from typing import Protocol
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.models import EtlPipeline, EtlRun
+from src.app.models import EtlPipeline, EtlRun, EtlRunDaily, EtlRunProfile
+from src.app.schemas.pipelines import PipelineListFilter
 
 
 class PipelinesRepository(Protocol):
@@ -20,9 +21,37 @@ class PipelinesRepository(Protocol):
     ) -> EtlPipeline: ...
 
     async def update_pipeline(
-        self, session: AsyncSession, pipeline_id: str, data: dict
+        self, session: AsyncSession, pipeline_id: str, data: dict, *, reset_checkpoint: bool = False
     ) -> EtlPipeline: ...
 
     async def list_pipeline_runs(
         self, session: AsyncSession, pipeline_id: str, limit: int
     ) -> Sequence[EtlRun]: ...
+
+    async def list_pipeline_daily(
+        self, session: AsyncSession, pipeline_id: str, days: int
+    ) -> Sequence[EtlRunDaily]: ...
+
+    async def request_profile(
+        self, session: AsyncSession, pipeline_id: str, *, runs: int, mode: str
+    ) -> EtlPipeline | None: ...
+
+    async def get_run_profile(
+        self, session: AsyncSession, pipeline_id: str, run_id: str
+    ) -> EtlRunProfile | None: ...
+
+    async def get_reader_sql(self, session: AsyncSession, pipeline_id: str) -> str | None: ...
+
+    async def get_checkpoint(
+        self, session: AsyncSession, pipeline_id: str
+    ) -> tuple[str | None, str | None]: ...
+
+    async def bulk_set_status(
+        self,
+        session: AsyncSession,
+        *,
+        new_status: str,
+        allowed_from: Sequence[str],
+        ids: Sequence[str] | None = None,
+        filters: PipelineListFilter | None = None,
+    ) -> list[tuple[str, str, bool]]: ...
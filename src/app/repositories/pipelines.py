@@ -1,14 +1,36 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import select, update
+from sqlalchemy import Select, delete, func, literal, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.core.enums import PipelineStatus
 from src.app.core.exceptions import PipelineNotFoundError
-from src.app.models import EtlPipeline, EtlRun
+from src.app.models import (
+    EtlPipeline,
+    EtlPipelineTask,
+    EtlRun,
+    EtlRunDaily,
+    EtlRunProfile,
+    EtlState,
+)
+from src.app.schemas.pipelines import PipelineListFilter
+
+
+def _filtered(stmt: Select, filters: PipelineListFilter) -> Select:
+    if filters.status:
+        stmt = stmt.where(EtlPipeline.status.in_(filters.status))
+    if filters.mode is not None:
+        stmt = stmt.where(EtlPipeline.mode == filters.mode)
+    if filters.type is not None:
+        stmt = stmt.where(EtlPipeline.type == filters.type)
+    if filters.enabled is not None:
+        stmt = stmt.where(EtlPipeline.enabled.is_(filters.enabled))
+    return stmt
 
 
 class SQLPipelinesRepository:
@@ -25,6 +47,42 @@ class SQLPipelinesRepository:
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def list_pipelines_page(
+        self,
+        session: AsyncSession,
+        filters: PipelineListFilter,
+        *,
+        columns: Sequence[str],
+        after: tuple[str, str] | None,
+        limit: int,
+    ) -> Sequence[Any]:
+        """One keyset page ordered by (name, id), as row mappings of `columns`.
+
+        `after` is the (name, id) of the last row of the previous page.
+        """
+        table = EtlPipeline.__table__
+        cols = dict.fromkeys(["id", "name", *columns])
+        stmt = _filtered(select(*(table.c[c] for c in cols)), filters)
+        if after is not None:
+            name, pid = after
+            stmt = stmt.where(
+                tuple_(EtlPipeline.name, EtlPipeline.id)
+                > tuple_(literal(name), literal(pid, EtlPipeline.id.type))
+            )
+        stmt = stmt.order_by(EtlPipeline.name, EtlPipeline.id).limit(limit)
+        result = await session.execute(stmt)
+        return result.mappings().all()
+
+    async def pipelines_watermark(
+        self, session: AsyncSession, filters: PipelineListFilter
+    ) -> tuple[int, datetime | None]:
+        """(count, max(updated_at)) of the filtered pipelines; changes with every
+        insert, update or delete, so it can drive conditional GETs."""
+        stmt = _filtered(select(func.count(), func.max(EtlPipeline.updated_at)), filters)
+        result = await session.execute(stmt)
+        count, updated_at = result.one()
+        return int(count), updated_at
+
     async def get_pipeline(self, session: AsyncSession, pipeline_id: str) -> EtlPipeline:
         stmt = select(EtlPipeline).where(EtlPipeline.id == pipeline_id)
         result = await session.execute(stmt)
@@ -50,11 +108,19 @@ class SQLPipelinesRepository:
             mode=payload.mode,
             enabled=payload.enabled,
             batch_size=payload.batch_size,
+            priority=payload.priority,
             target_table=payload.target_table,
+            extra_targets=list(payload.extra_targets),
+            skip_unchanged=payload.skip_unchanged,
+            schedule=payload.schedule,
+            schedule_misfire=payload.schedule_misfire,
             source_query=payload.source_query,
             python_module=payload.python_module,
             incremental_key=payload.incremental_key,
             incremental_id_key=payload.incremental_id_key,
+            cdc_slot=payload.cdc_slot,
+            cdc_source_table=payload.cdc_source_table,
+            cdc_key_column=payload.cdc_key_column,
         )
 
         session.add(pipeline)
@@ -80,12 +146,21 @@ class SQLPipelinesRepository:
         session: AsyncSession,
         pipeline_id: str,
         data: dict,
+        *,
+        reset_checkpoint: bool = False,
     ) -> EtlPipeline:
+        """Apply `data`; with `reset_checkpoint` the etl_state row is deleted in
+        the same transaction (the next run starts from scratch)."""
         pipeline = await self.get_pipeline(session, pipeline_id)
 
         for field, value in data.items():
             setattr(pipeline, field, value)
 
+        # invalidates runner-side snapshot/plan caches keyed by (id, version)
+        pipeline.version = EtlPipeline.version + 1
+        if reset_checkpoint:
+            await session.execute(delete(EtlState).where(EtlState.pipeline_id == pipeline_id))
+
         await session.commit()
         await session.refresh(pipeline)
         return pipeline
@@ -108,6 +183,106 @@ class SQLPipelinesRepository:
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def list_pipeline_daily(
+        self,
+        session: AsyncSession,
+        pipeline_id: str,
+        days: int = 30,
+    ) -> Sequence[EtlRunDaily]:
+        stmt = (
+            select(EtlRunDaily)
+            .where(EtlRunDaily.pipeline_id == pipeline_id)
+            .order_by(EtlRunDaily.day.desc())
+            .limit(days)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+    async def request_profile(
+        self, session: AsyncSession, pipeline_id: str, *, runs: int, mode: str
+    ) -> EtlPipeline | None:
+        stmt = (
+            update(EtlPipeline)
+            .where(EtlPipeline.id == pipeline_id)
+            .values(profile_runs=runs, profile_mode=mode)
+            .returning(EtlPipeline)
+        )
+        result = await session.execute(stmt)
+        updated = result.scalar_one_or_none()
+        await session.commit()
+        return updated
+
+    async def get_run_profile(
+        self, session: AsyncSession, pipeline_id: str, run_id: str
+    ) -> EtlRunProfile | None:
+        stmt = select(EtlRunProfile).where(
+            EtlRunProfile.run_id == run_id,
+            EtlRunProfile.pipeline_id == pipeline_id,
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_reader_sql(self, session: AsyncSession, pipeline_id: str) -> str | None:
+        """SQL of the first task (the reader), None for pipelines without tasks."""
+        stmt = (
+            select(EtlPipelineTask.body)
+            .where(EtlPipelineTask.pipeline_id == pipeline_id)
+            .order_by(EtlPipelineTask.order_index)
+            .limit(1)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_checkpoint(
+        self, session: AsyncSession, pipeline_id: str
+    ) -> tuple[str | None, str | None]:
+        """(last_processed_value, last_processed_id); both None before the first run."""
+        stmt = select(EtlState.last_processed_value, EtlState.last_processed_id).where(
+            EtlState.pipeline_id == pipeline_id
+        )
+        row = (await session.execute(stmt)).one_or_none()
+        return (row[0], row[1]) if row is not None else (None, None)
+
+    async def bulk_set_status(
+        self,
+        session: AsyncSession,
+        *,
+        new_status: str,
+        allowed_from: Sequence[str],
+        ids: Sequence[str] | None = None,
+        filters: PipelineListFilter | None = None,
+    ) -> list[tuple[str, str, bool]]:
+        """Move every selected pipeline in `allowed_from` to `new_status` in one statement.
+
+        Selects by `ids` or by `filters`, locks the rows, updates the eligible
+        ones and returns (id, status before, applied) for every selected row.
+        Ids that do not exist are simply absent from the result.
+        """
+        target = select(EtlPipeline.id, EtlPipeline.status)
+        if ids is not None:
+            target = target.where(EtlPipeline.id.in_(list(ids)))
+        if filters is not None:
+            target = _filtered(target, filters)
+        target_cte = target.with_for_update().cte("target")
+
+        changed = (
+            update(EtlPipeline)
+            .where(EtlPipeline.id == target_cte.c.id)
+            .where(target_cte.c.status.in_(list(allowed_from)))
+            .values(status=new_status, updated_at=func.now())
+            .returning(EtlPipeline.id)
+            .cte("changed")
+        )
+        stmt = (
+            select(target_cte.c.id, target_cte.c.status, changed.c.id.is_not(None))
+            .select_from(target_cte.outerjoin(changed, changed.c.id == target_cte.c.id))
+            .order_by(target_cte.c.id)
+        )
+        result = await session.execute(stmt)
+        rows = [(str(pid), str(status), bool(applied)) for pid, status, applied in result.all()]
+        await session.commit()
+        return rows
+
     async def request_run(self, session: AsyncSession, pipeline_id: str) -> EtlPipeline | None:
         """Atomically move a pipeline to RUN_REQUESTED if allowed.
 
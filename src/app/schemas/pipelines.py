@@ -1,17 +1,66 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime
+from datetime import date, datetime
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from src.app.core.cron import parse_cron
+from src.app.core.enums import PipelineStatus
+from src.app.core.source_query import validate_source_placeholders
 
 IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+QUALIFIED_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*\.[A-Za-z_][A-Za-z0-9_]*$")
+SLOT_RE = re.compile(r"^[a-z0-9_]{1,63}$")
 NAME_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+MAX_EXTRA_TARGETS = 4
 
 PipelineType = Literal["SQL", "PYTHON", "ES"]
-PipelineMode = Literal["full", "incremental"]
+PipelineMode = Literal["full", "incremental", "cdc"]
+MisfirePolicy = Literal["coalesce", "skip"]
+BulkAction = Literal["run", "pause"]
+BulkOutcome = Literal["applied", "unchanged", "rejected", "not_found"]
+ProfileMode = Literal["sample", "cprofile"]
+MAX_PROFILE_RUNS = 10
+
+
+def _validate_cdc_slot(v: str | None) -> str | None:
+    if v is None:
+        return v
+    v = v.strip()
+    if not SLOT_RE.fullmatch(v):
+        raise ValueError("cdc_slot must match [a-z0-9_] (max 63 characters)")
+    return v
+
+
+def _validate_extra_targets(v: list[str] | None) -> list[str] | None:
+    if v is None:
+        return v
+    out = list(dict.fromkeys(t.strip() for t in v))
+    if any(not t for t in out):
+        raise ValueError("extra_targets must not contain empty values")
+    if len(out) > MAX_EXTRA_TARGETS:
+        raise ValueError(f"at most {MAX_EXTRA_TARGETS} extra_targets are allowed")
+    return out
+
+
+def _validate_schedule(v: str | None) -> str | None:
+    if v is None or not v.strip():
+        return None
+    cron = parse_cron(v)
+    cron.next_after(datetime(2000, 1, 1))  # rejects dates that never occur (e.g. Feb 30)
+    return cron.expr
+
+
+def _validate_cdc_source_table(v: str | None) -> str | None:
+    if v is None:
+        return v
+    v = v.strip()
+    if not QUALIFIED_IDENT_RE.fullmatch(v):
+        raise ValueError("cdc_source_table must be schema.table")
+    return v
 
 
 class PipelineBase(BaseModel):
@@ -24,6 +73,7 @@ class PipelineBase(BaseModel):
     enabled: bool = True
     target_table: str
     batch_size: int = 1000
+    priority: int = 10
 
     @field_validator("name")
     @classmethod
@@ -42,15 +92,34 @@ class PipelineBase(BaseModel):
             raise ValueError("batch_size must be 1..50000")
         return v
 
+    @field_validator("priority")
+    @classmethod
+    def validate_priority(cls, v: int) -> int:
+        if not (1 <= v <= 100):
+            raise ValueError("priority must be 1..100")
+        return v
+
 
 class PipelineCreate(PipelineBase):
     source_query: str
     python_module: str | None = None
 
+    # fan-out: more sinks fed from the same read
+    extra_targets: list[str] = []
+    skip_unchanged: bool = False
+
+    # cron (5 fields, UTC); the runner requests runs when it fires
+    schedule: str | None = None
+    schedule_misfire: MisfirePolicy = "coalesce"
+
     incremental_key: str | None = None
     incremental_id_key: str | None = None
 
-    @field_validator("incremental_key", "incremental_id_key")
+    cdc_slot: str | None = None
+    cdc_source_table: str | None = None
+    cdc_key_column: str | None = None
+
+    @field_validator("incremental_key", "incremental_id_key", "cdc_key_column")
     @classmethod
     def validate_sql_identifiers(cls, v: str | None) -> str | None:
         if v is None:
@@ -60,6 +129,26 @@ class PipelineCreate(PipelineBase):
             raise ValueError("must be a valid SQL identifier")
         return v
 
+    @field_validator("cdc_slot")
+    @classmethod
+    def validate_cdc_slot(cls, v: str | None) -> str | None:
+        return _validate_cdc_slot(v)
+
+    @field_validator("cdc_source_table")
+    @classmethod
+    def validate_cdc_source_table(cls, v: str | None) -> str | None:
+        return _validate_cdc_source_table(v)
+
+    @field_validator("extra_targets")
+    @classmethod
+    def validate_extra_targets(cls, v: list[str] | None) -> list[str] | None:
+        return _validate_extra_targets(v)
+
+    @field_validator("schedule")
+    @classmethod
+    def validate_schedule(cls, v: str | None) -> str | None:
+        return _validate_schedule(v)
+
     @field_validator("python_module")
     @classmethod
     def validate_python_module(cls, v: str | None) -> str | None:
@@ -76,6 +165,12 @@ class PipelineCreate(PipelineBase):
 
     @model_validator(mode="after")
     def validate_business_rules(self):
+        if self.target_table.strip() in self.extra_targets:
+            raise ValueError("extra_targets must not repeat target_table")
+
+        # `:last_ts`/`:last_id`/`:limit` in the query replace the runner's subquery wrap
+        validate_source_placeholders(self.source_query, mode=self.mode)
+
         if self.mode == "incremental":
             q = self.source_query.lower()
 
@@ -88,6 +183,13 @@ class PipelineCreate(PipelineBase):
 
             if not self.incremental_key or not self.incremental_id_key:
                 raise ValueError("incremental mode requires incremental_key and incremental_id_key")
+        if self.mode == "cdc":
+            if not self.cdc_slot or not self.cdc_source_table or not self.incremental_id_key:
+                raise ValueError(
+                    "cdc mode requires cdc_slot, cdc_source_table and incremental_id_key"
+                )
+            if self.incremental_id_key.lower() not in self.source_query.lower():
+                raise ValueError("source_query must include incremental_id_key in SELECT output")
         if self.type == "PYTHON":
             if not self.python_module:
                 raise ValueError("PYTHON pipelines require python_module")
@@ -103,7 +205,12 @@ class PipelineUpdate(BaseModel):
     mode: PipelineMode | None = None
     enabled: bool | None = None
     target_table: str | None = None
+    extra_targets: list[str] | None = None
+    skip_unchanged: bool | None = None
+    schedule: str | None = None
+    schedule_misfire: MisfirePolicy | None = None
     batch_size: int | None = None
+    priority: int | None = None
     source_query: str | None = None
 
     python_module: str | None = None
@@ -111,6 +218,10 @@ class PipelineUpdate(BaseModel):
     incremental_key: str | None = None
     incremental_id_key: str | None = None
 
+    cdc_slot: str | None = None
+    cdc_source_table: str | None = None
+    cdc_key_column: str | None = None
+
     @field_validator("name")
     @classmethod
     def validate_name(cls, v: str | None) -> str | None:
@@ -134,7 +245,16 @@ class PipelineUpdate(BaseModel):
             raise ValueError("batch_size must be 1..50000")
         return v
 
-    @field_validator("incremental_key", "incremental_id_key")
+    @field_validator("priority")
+    @classmethod
+    def validate_priority(cls, v: int | None) -> int | None:
+        if v is None:
+            return v
+        if not (1 <= v <= 100):
+            raise ValueError("priority must be 1..100")
+        return v
+
+    @field_validator("incremental_key", "incremental_id_key", "cdc_key_column")
     @classmethod
     def validate_sql_identifiers(cls, v: str | None) -> str | None:
         if v is None:
@@ -144,6 +264,26 @@ class PipelineUpdate(BaseModel):
             raise ValueError("must be a valid SQL identifier")
         return v
 
+    @field_validator("cdc_slot")
+    @classmethod
+    def validate_cdc_slot(cls, v: str | None) -> str | None:
+        return _validate_cdc_slot(v)
+
+    @field_validator("cdc_source_table")
+    @classmethod
+    def validate_cdc_source_table(cls, v: str | None) -> str | None:
+        return _validate_cdc_source_table(v)
+
+    @field_validator("extra_targets")
+    @classmethod
+    def validate_extra_targets(cls, v: list[str] | None) -> list[str] | None:
+        return _validate_extra_targets(v)
+
+    @field_validator("schedule")
+    @classmethod
+    def validate_schedule(cls, v: str | None) -> str | None:
+        return _validate_schedule(v)
+
     @field_validator("python_module")
     @classmethod
     def validate_python_module(cls, v: str | None) -> str | None:
@@ -169,13 +309,112 @@ class PipelineOut(PipelineBase):
 
     id: UUID
     status: str
+    version: int = 1
     python_module: str | None = None
     source_query: str | None = None
+    extra_targets: list[str] = []
+    skip_unchanged: bool = False
+
+    # scheduling
+    schedule: str | None = None
+    schedule_misfire: str = "coalesce"
+    last_scheduled_at: datetime | None = None
 
     # incremental
     incremental_key: str | None = None
     incremental_id_key: str | None = None  # NEW
 
+    # cdc
+    cdc_slot: str | None = None
+    cdc_source_table: str | None = None
+    cdc_key_column: str | None = None
+
+
+PIPELINE_OUT_FIELDS = tuple(PipelineOut.model_fields)
+MAX_PAGE_SIZE = 1000
+
+
+class PipelineListFilter(BaseModel):
+    """Server-side filters of the pipeline listing (all optional, ANDed)."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    status: tuple[str, ...] = ()
+    mode: PipelineMode | None = None
+    type: PipelineType | None = None
+    enabled: bool | None = None
+
+    @field_validator("status")
+    @classmethod
+    def validate_status(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        allowed = {s.value for s in PipelineStatus}
+        out = tuple(dict.fromkeys(s.strip().upper() for s in v if s.strip()))
+        unknown = [s for s in out if s not in allowed]
+        if unknown:
+            raise ValueError(f"unknown status: {', '.join(unknown)}")
+        return out
+
+
+MAX_BULK_IDS = 1000
+
+
+class BulkActionRequest(BaseModel):
+    """Pipelines to run or pause: an explicit id list or a listing filter."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    ids: list[UUID] | None = None
+    filter: PipelineListFilter | None = None
+
+    @field_validator("ids")
+    @classmethod
+    def validate_ids(cls, v: list[UUID] | None) -> list[UUID] | None:
+        if v is None:
+            return v
+        if not v:
+            raise ValueError("ids must not be empty")
+        if len(v) > MAX_BULK_IDS:
+            raise ValueError(f"at most {MAX_BULK_IDS} ids per request")
+        return list(dict.fromkeys(v))
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> BulkActionRequest:
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("pass exactly one of ids or filter")
+        if self.filter is not None and self.filter == PipelineListFilter():
+            # an empty filter would silently select every pipeline
+            raise ValueError("filter needs at least one condition")
+        return self
+
+
+class BulkActionItem(BaseModel):
+    id: UUID
+    outcome: BulkOutcome
+    previous_status: str | None = None
+    status: str | None = None
+
+
+class BulkActionOut(BaseModel):
+    """Per-pipeline result of a bulk run/pause request."""
+
+    action: BulkAction
+    applied: int
+    results: list[BulkActionItem]
+
+
+def parse_fields(raw: str | None) -> tuple[str, ...] | None:
+    """`fields=name,status` -> the projected PipelineOut fields (`id` is always kept).
+
+    None means the full representation.
+    """
+    if raw is None or not raw.strip():
+        return None
+    names = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in names if f not in PIPELINE_OUT_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *names]))
+
 
 class PipelineRunOut(BaseModel):
     """Model used for pipeline run history responses."""
@@ -188,4 +427,74 @@ class PipelineRunOut(BaseModel):
     finished_at: datetime | None = None
     rows_read: int
     rows_written: int
+    rows_skipped: int = 0
     error_message: str | None = None
+    plan_summary: dict | None = None
+
+
+class PipelineRunDailyOut(BaseModel):
+    """Per-day (UTC) run totals of a pipeline."""
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+    day: date
+    runs: int
+    succeeded: int
+    failed: int
+    rows_read: int
+    rows_written: int
+    rows_skipped: int
+    duration_total_s: float
+    duration_max_s: float
+
+
+class ProfileRequest(BaseModel):
+    """Profile the next `runs` runs of a pipeline (0 cancels pending ones)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    runs: int = Field(1, ge=0, le=MAX_PROFILE_RUNS)
+    # "sample": low overhead, collapsed stacks of this run only;
+    # "cprofile": exact pstats of everything the runner executes meanwhile
+    mode: ProfileMode = "sample"
+
+
+class ProfileRequestOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    profile_runs: int
+    profile_mode: ProfileMode
+
+
+class SeekPlanOut(BaseModel):
+    """EXPLAIN summary of the incremental seek query."""
+
+    ok: bool
+    needs_sort: bool
+    total_cost: float
+    plan_rows: int
+    node_types: list[str]
+    sort_keys: list[str]
+    seq_scans: list[str]
+    suggested_index: str | None = None
+    index_created: bool = False
+
+
+class PlanIssueOut(BaseModel):
+    code: str
+    message: str
+
+
+class PipelineExplainOut(BaseModel):
+    """Dry-run cost estimate of the next run (EXPLAIN without ANALYZE)."""
+
+    ok: bool
+    form: Literal["offset", "seek", "pushdown"]
+    batch_size: int
+    estimated_rows: int
+    projected_batches: int
+    estimated_total_cost: float
+    first_batch: SeekPlanOut
+    last_batch: SeekPlanOut | None = None
+    issues: list[PlanIssueOut]
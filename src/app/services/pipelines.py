@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import logging
 from collections.abc import Sequence
+from dataclasses import replace
+from datetime import datetime
+from typing import Any
+from uuid import UUID
 
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.core.cdc_slots import (
+    checkpoint_incompatible,
+    drop_replication_slot,
+    released_slot,
+)
 from src.app.core.constants import is_allowed_target
 from src.app.core.enums import PipelineStatus
 from src.app.core.exceptions import (
@@ -12,9 +22,61 @@ from src.app.core.exceptions import (
     PipelineNameAlreadyExistsError,
     PipelineNotFoundError,
 )
-from src.app.models import EtlPipeline, EtlRun
+from src.app.core.query_plan import (
+    BatchSource,
+    Checkpoint,
+    PipelineExplain,
+    SeekPlanSummary,
+    create_suggested_index,
+    explain_next_page,
+    explain_pipeline_run,
+    parse_checkpoint,
+)
+from src.app.core.source_query import validate_source_placeholders
+from src.app.models import EtlPipeline, EtlRun, EtlRunDaily, EtlRunProfile
 from src.app.repositories.pipelines import SQLPipelinesRepository
-from src.app.schemas.pipelines import PipelineCreate
+from src.app.schemas.pipelines import (
+    PIPELINE_OUT_FIELDS,
+    BulkAction,
+    BulkActionItem,
+    BulkActionOut,
+    BulkActionRequest,
+    BulkOutcome,
+    PipelineCreate,
+    PipelineListFilter,
+)
+
+logger = logging.getLogger("etl_api")
+
+# action -> (target status, statuses it may be entered from, statuses already there)
+_BULK_TRANSITIONS: dict[str, tuple[str, tuple[str, ...], tuple[str, ...]]] = {
+    "run": (
+        PipelineStatus.RUN_REQUESTED.value,
+        (
+            PipelineStatus.IDLE.value,
+            PipelineStatus.PAUSED.value,
+            PipelineStatus.PAUSE_REQUESTED.value,
+        ),
+        (PipelineStatus.RUNNING.value, PipelineStatus.RUN_REQUESTED.value),
+    ),
+    "pause": (
+        PipelineStatus.PAUSE_REQUESTED.value,
+        (
+            PipelineStatus.RUNNING.value,
+            PipelineStatus.RUN_REQUESTED.value,
+            PipelineStatus.IDLE.value,
+        ),
+        (PipelineStatus.PAUSED.value, PipelineStatus.PAUSE_REQUESTED.value),
+    ),
+}
+
+
+def _validate_targets(target_table: str, extra_targets: list[str] | None) -> None:
+    for target in (target_table, *(extra_targets or ())):
+        if not is_allowed_target(target):
+            raise ValueError(f"target_table '{target}' is not allowed")
+    if target_table in (extra_targets or ()):
+        raise ValueError("extra_targets must not repeat target_table")
 
 
 def _validate_pipeline_config(final: dict) -> None:
@@ -25,6 +87,15 @@ def _validate_pipeline_config(final: dict) -> None:
         if not final.get("incremental_key") or not final.get("incremental_id_key"):
             raise ValueError("incremental mode requires incremental_key and incremental_id_key")
 
+    if mode == "cdc":
+        if not final.get("cdc_slot") or not final.get("cdc_source_table"):
+            raise ValueError("cdc mode requires cdc_slot and cdc_source_table")
+        if not final.get("incremental_id_key"):
+            raise ValueError("cdc mode requires incremental_id_key")
+
+    if final.get("source_query"):
+        validate_source_placeholders(final["source_query"], mode=mode)
+
     if ptype == "PYTHON":
         if not final.get("python_module"):
             raise ValueError("PYTHON pipelines require python_module")
@@ -47,6 +118,32 @@ class PipelinesService:
         """Return all pipelines."""
         return await self.repo.list_pipelines(self.session)
 
+    async def list_pipelines_page(
+        self,
+        filters: PipelineListFilter,
+        *,
+        fields: Sequence[str] | None,
+        after: tuple[str, str] | None,
+        limit: int,
+    ) -> tuple[Sequence[Any], tuple[str, str] | None]:
+        """Return one page of pipeline rows (only `fields`, or every PipelineOut
+        field) and the keyset position after it, None on the last page."""
+        rows = await self.repo.list_pipelines_page(
+            self.session,
+            filters,
+            columns=fields or PIPELINE_OUT_FIELDS,
+            after=after,
+            limit=limit + 1,
+        )
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, (rows[-1]["name"], str(rows[-1]["id"]))
+
+    async def pipelines_watermark(self, filters: PipelineListFilter) -> tuple[int, datetime | None]:
+        """Cheap change marker of the filtered listing: (count, max updated_at)."""
+        return await self.repo.pipelines_watermark(self.session, filters)
+
     async def get_pipeline(self, pipeline_id: str) -> EtlPipeline:
         """Return a pipeline by id or raise PipelineNotFoundError."""
         try:
@@ -61,8 +158,7 @@ class PipelinesService:
         Business rule validation (target_table, etc.) lives here.
         The repository is responsible only for persistence.
         """
-        if not is_allowed_target(payload.target_table):
-            raise ValueError(f"target_table '{payload.target_table}' is not allowed")
+        _validate_targets(payload.target_table, payload.extra_targets)
 
         try:
             return await self.repo.create_pipeline(self.session, payload)
@@ -114,6 +210,48 @@ class PipelinesService:
 
         return await self.get_pipeline(pipeline_id)
 
+    async def bulk_transition(
+        self, action: BulkAction, request: BulkActionRequest
+    ) -> BulkActionOut:
+        """Run or pause many pipelines with one conditional UPDATE.
+
+        Same transition rules as run_pipeline / pause_pipeline; every selected
+        (or requested) pipeline gets an outcome: applied, unchanged (already
+        there), rejected (e.g. FAILED) or not_found.
+        """
+        new_status, allowed_from, already = _BULK_TRANSITIONS[action]
+        rows = await self.repo.bulk_set_status(
+            self.session,
+            new_status=new_status,
+            allowed_from=allowed_from,
+            ids=[str(i) for i in request.ids] if request.ids is not None else None,
+            filters=request.filter,
+        )
+
+        found: dict[str, BulkActionItem] = {}
+        for pid, previous, applied in rows:
+            outcome: BulkOutcome = "applied"
+            if not applied:
+                outcome = "unchanged" if previous in already else "rejected"
+            found[pid] = BulkActionItem(
+                id=UUID(pid),
+                outcome=outcome,
+                previous_status=previous,
+                status=new_status if applied else previous,
+            )
+
+        if request.ids is None:
+            results = list(found.values())
+        else:
+            results = [
+                found.get(str(i)) or BulkActionItem(id=i, outcome="not_found") for i in request.ids
+            ]
+        return BulkActionOut(
+            action=action,
+            applied=sum(r.outcome == "applied" for r in results),
+            results=results,
+        )
+
     async def update_pipeline(
         self,
         pipeline_id: str,
@@ -123,26 +261,45 @@ class PipelinesService:
 
         Rule:
         - if the pipeline is RUNNING, updates are not allowed.
+        - switching to or from cdc mode resets the checkpoint (etl_state).
         """
         pipeline = await self.get_pipeline(pipeline_id)
 
         if pipeline.status == PipelineStatus.RUNNING.value:
             raise PipelineIsRunningError("Cannot update pipeline while it is RUNNING")
 
+        pipeline_before = {"mode": pipeline.mode, "cdc_slot": pipeline.cdc_slot}
         final = {
             "type": pipeline.type,
             "mode": pipeline.mode,
             "incremental_key": pipeline.incremental_key,
             "incremental_id_key": pipeline.incremental_id_key,
             "python_module": pipeline.python_module,
+            "cdc_slot": pipeline.cdc_slot,
+            "cdc_source_table": pipeline.cdc_source_table,
+            "source_query": pipeline.source_query,
             **update_data,
         }
         _validate_pipeline_config(final)
+        if "schedule" in update_data:
+            # a new schedule counts from when the runner picks it up, no catch-up runs
+            update_data = {**update_data, "last_scheduled_at": None}
+        for not_null in ("schedule_misfire", "priority"):
+            if not_null in update_data and update_data[not_null] is None:
+                update_data = {k: v for k, v in update_data.items() if k != not_null}
+        if "extra_targets" in update_data and update_data["extra_targets"] is None:
+            update_data = {**update_data, "extra_targets": []}  # column is NOT NULL
+        if "target_table" in update_data or "extra_targets" in update_data:
+            _validate_targets(
+                update_data.get("target_table") or pipeline.target_table,
+                update_data.get("extra_targets", pipeline.extra_targets),
+            )
 
         updated = await self.repo.update_pipeline(
             session=self.session,
             pipeline_id=pipeline_id,
             data=update_data,
+            reset_checkpoint=checkpoint_incompatible(pipeline_before["mode"], final["mode"]),
         )
         # repo.update_pipeline either returns an object,
         # or raises its own error if something goes wrong.
@@ -150,8 +307,96 @@ class PipelinesService:
             # Defensive: if repo returned None (race conditions, etc.).
             raise PipelineNotFoundError(f"Pipeline {pipeline_id} not found")
 
+        released = released_slot(
+            pipeline_before["mode"], pipeline_before["cdc_slot"], final["mode"], final["cdc_slot"]
+        )
+        if released is not None:
+            await self._drop_released_slot(pipeline_id, released)
         return updated
 
+    async def _drop_released_slot(self, pipeline_id: str, slot: str) -> None:
+        """Drop the replication slot a pipeline no longer reads (it would keep WAL).
+
+        Best effort: the update is already committed; a slot that cannot be
+        dropped now is logged and reported by the runner as orphaned.
+        """
+        try:
+            outcome = await drop_replication_slot(self.session, slot)
+            await self.session.commit()
+        except DBAPIError as exc:
+            await self.session.rollback()
+            logger.warning(
+                "Pipeline %s: cannot drop replication slot %s: %s", pipeline_id, slot, exc.orig
+            )
+            return
+        if outcome == "dropped":
+            logger.info("Pipeline %s: dropped replication slot %s", pipeline_id, slot)
+        elif outcome in ("active", "in_use"):
+            logger.warning(
+                "Pipeline %s: replication slot %s is %s; not dropped",
+                pipeline_id,
+                slot,
+                "being consumed" if outcome == "active" else "used by another pipeline",
+            )
+
+    # ---------- Query plan ----------
+
+    async def explain_seek(
+        self, pipeline_id: str, *, create_index: bool = False
+    ) -> SeekPlanSummary:
+        """EXPLAIN the incremental seek query from the current checkpoint.
+
+        Raises ValueError for non-incremental pipelines or an unplannable query.
+        """
+        source, checkpoint = await self._batch_source(pipeline_id)
+
+        try:
+            summary = await explain_next_page(self.session, source, checkpoint)
+        except DBAPIError as exc:
+            await self.session.rollback()
+            raise ValueError(f"EXPLAIN failed: {exc.orig}") from exc
+        await self.session.rollback()
+
+        if create_index and summary.needs_sort:
+            try:
+                created = await create_suggested_index(self.session, summary)
+            except DBAPIError as exc:
+                await self.session.rollback()
+                raise ValueError(f"CREATE INDEX failed: {exc.orig}") from exc
+            if created:
+                logger.warning("Created seek index: %s", summary.suggested_index)
+            summary = replace(summary, index_created=created)
+        return summary
+
+    async def _batch_source(self, pipeline_id: str) -> tuple[BatchSource, Checkpoint]:
+        """Batch query source and checkpoint of a pipeline, as its next run sees them."""
+        pipeline = await self.get_pipeline(pipeline_id)
+        task_sql = await self.repo.get_reader_sql(self.session, pipeline_id)
+        source = BatchSource(
+            id=str(pipeline.id),
+            mode=pipeline.mode,
+            reader_sql=task_sql or pipeline.source_query,
+            batch_size=int(pipeline.batch_size or 1000),
+            incremental_key=pipeline.incremental_key,
+            incremental_id_key=pipeline.incremental_id_key,
+        )
+        last_value, last_id = await self.repo.get_checkpoint(self.session, pipeline_id)
+        return source, parse_checkpoint(last_value, last_id)
+
+    async def explain_pipeline(self, pipeline_id: str) -> PipelineExplain:
+        """Dry-run cost estimate of the batch queries the next run would issue.
+
+        Raises ValueError for CDC pipelines or an unplannable query.
+        """
+        source, checkpoint = await self._batch_source(pipeline_id)
+
+        try:
+            return await explain_pipeline_run(self.session, source, checkpoint)
+        except DBAPIError as exc:
+            raise ValueError(f"EXPLAIN failed: {exc.orig}") from exc
+        finally:
+            await self.session.rollback()
+
     # ---------- Run history ----------
 
     async def list_pipeline_runs(
@@ -171,3 +416,29 @@ class PipelinesService:
             pipeline_id=pipeline_id,
             limit=limit,
         )
+
+    async def request_profile(self, pipeline_id: str, *, runs: int, mode: str) -> EtlPipeline:
+        """Profile the next `runs` runs; picked up by the runner at its next claim."""
+        updated = await self.repo.request_profile(self.session, pipeline_id, runs=runs, mode=mode)
+        if updated is None:
+            raise PipelineNotFoundError(f"Pipeline {pipeline_id} not found")
+        return updated
+
+    async def get_run_profile(self, pipeline_id: str, run_id: str) -> EtlRunProfile | None:
+        """The stored profile of a run, None if that run was not profiled."""
+        await self.get_pipeline(pipeline_id)
+        return await self.repo.get_run_profile(self.session, pipeline_id, run_id)
+
+    async def list_pipeline_daily(
+        self,
+        pipeline_id: str,
+        days: int,
+    ) -> Sequence[EtlRunDaily]:
+        """Return per-day run totals, newest first (kept beyond run retention)."""
+        await self.get_pipeline(pipeline_id)
+
+        return await self.repo.list_pipeline_daily(
+            session=self.session,
+            pipeline_id=pipeline_id,
+            days=days,
+        )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import asyncpg
+
+from src.app.core.constants import PIPELINE_EVENTS_CHANNEL
+from src.config import get_settings
+
+logger = logging.getLogger("etl_api")
+
+# sent to subscribers whose queue overflowed or whose stream may have gaps
+# (LISTEN connection lost): they should re-read the current state
+RESYNC_EVENT: dict[str, Any] = {"type": "resync"}
+
+
+class StatusEventHub:
+    """Fans out pipeline events from one LISTEN connection to many subscribers.
+
+    The connection is opened on the first subscription and kept for the life
+    of the process; if it drops, it is re-established with backoff and every
+    subscriber gets a `resync` event. Each subscriber has a bounded queue; a
+    slow reader loses its oldest events and gets `resync` instead of holding
+    memory or blocking the others.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]] | None = None,
+        *,
+        queue_size: int = 100,
+        reconnect_delays: tuple[float, ...] = (0.5, 1, 2, 5, 10),
+    ) -> None:
+        self._connect = connect or (lambda: asyncpg.connect(get_settings().database_dsn))
+        self._queue_size = queue_size
+        self._reconnect_delays = reconnect_delays
+        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+        self._conn: Any = None
+        self._lost = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._ready: asyncio.Future[None] | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(qs) for qs in self._subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self, pipeline_id: str) -> AsyncIterator[asyncio.Queue[dict[str, Any]]]:
+        """Queue receiving the events of `pipeline_id` while the context is open.
+
+        Returns once LISTEN is active, so nothing committed afterwards is missed.
+        """
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(self._queue_size)
+        self._subscribers.setdefault(pipeline_id, set()).add(queue)
+        try:
+            await self._ensure_listening()
+            yield queue
+        finally:
+            subs = self._subscribers.get(pipeline_id)
+            if subs is not None:
+                subs.discard(queue)
+                if not subs:
+                    del self._subscribers[pipeline_id]
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._disconnect()
+
+    # ---------- delivery ----------
+
+    def publish(self, event: dict[str, Any]) -> None:
+        pid = str(event.get("pipeline_id") or "")
+        for queue in self._subscribers.get(pid, ()):
+            _offer(queue, event)
+
+    def _broadcast(self, event: dict[str, Any]) -> None:
+        for subs in self._subscribers.values():
+            for queue in subs:
+                _offer(queue, event)
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed pipeline event: %.200s", payload)
+            return
+        if isinstance(event, dict):
+            self.publish(event)
+
+    # ---------- connection ----------
+
+    async def _ensure_listening(self) -> None:
+        if self._task is None or self._task.done():
+            self._ready = _new_ready_future()
+            self._task = asyncio.create_task(self._listen_forever(), name="status-event-hub")
+        assert self._ready is not None
+        await asyncio.shield(self._ready)
+
+    async def _listen_forever(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                await self._listen_once()
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                delay = self._reconnect_delays[min(attempt, len(self._reconnect_delays) - 1)]
+                attempt += 1
+                logger.warning("Pipeline event LISTEN failed: %r; retrying in %ss", exc, delay)
+                if self._ready is not None and not self._ready.done():
+                    # waiting subscribers fail fast; later ones wait for the retry
+                    self._ready.set_exception(exc)
+                    self._ready = _new_ready_future()
+                await asyncio.sleep(delay)
+            finally:
+                await self._disconnect()
+            self._broadcast(RESYNC_EVENT)
+
+    async def _listen_once(self) -> None:
+        self._lost.clear()
+        self._conn = await self._connect()
+        self._conn.add_termination_listener(lambda _conn: self._lost.set())
+        await self._conn.add_listener(PIPELINE_EVENTS_CHANNEL, self._on_notify)
+        logger.info("Listening for pipeline events on %s", PIPELINE_EVENTS_CHANNEL)
+        if self._ready is not None and not self._ready.done():
+            self._ready.set_result(None)
+        await self._lost.wait()
+        logger.warning("Pipeline event LISTEN connection lost; reconnecting")
+
+    async def _disconnect(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close(timeout=2)
+            except Exception:  # noqa: BLE001
+                conn.terminate()
+
+
+def _new_ready_future() -> asyncio.Future[None]:
+    fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    # nobody may be waiting when a connect attempt fails
+    fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+    return fut
+
+
+def _offer(queue: asyncio.Queue[dict[str, Any]], event: dict[str, Any]) -> None:
+    if queue.full():
+        # drop the backlog of a slow reader and tell it to re-read the state
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC_EVENT)
+    queue.put_nowait(event)
+
+
+_hub: StatusEventHub | None = None
+
+
+def get_status_event_hub() -> StatusEventHub:
+    """Process-wide hub (one LISTEN connection per API worker)."""
+    global _hub
+    if _hub is None:
+        _hub = StatusEventHub()
+    return _hub
+
+
+async def close_status_event_hub() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.aclose()
+        _hub = None
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,6 +13,83 @@ class Settings(BaseSettings):
     db_user: str = "etl_user"
     db_password: str = "etl_password"
 
+    # connection pools: control-plane (status polling, claims, run bookkeeping)
+    # and data-plane (bulk reads/writes, checkpoints) are configured separately
+    db_application_name: str = "etl"
+    db_pool_recycle: int = 1800
+
+    db_control_pool_size: int = 5
+    db_control_max_overflow: int = 5
+    db_control_pool_timeout: float = 10.0
+    db_control_statement_cache_size: int = 100
+
+    db_data_pool_size: int = 5
+    db_data_max_overflow: int = 5
+    db_data_pool_timeout: float = 60.0
+    db_data_statement_cache_size: int = 500
+    # data-plane lock waits give up after this many ms (0 = wait forever); sink
+    # writes that lose a lock wait are retried with backoff instead of failing
+    db_data_lock_timeout_ms: int = 5000
+
+    # runner: how often the shared PAUSE_REQUESTED view is refreshed (seconds)
+    runner_pause_poll_interval: float = 0.5
+    # runner: how often pool checkout metrics are logged (seconds, 0 disables)
+    runner_pool_metrics_interval: float = 60.0
+    # runner: EXPLAIN the incremental seek query before each run; optionally create
+    # the suggested composite index (CREATE INDEX CONCURRENTLY, needs table ownership)
+    runner_seek_preflight: bool = True
+    runner_seek_index_autocreate: bool = False
+    # runner: built-in cron scheduler for pipelines with a `schedule`; definitions
+    # are re-read every refresh interval, fires later than the grace period are
+    # misfires (handled per pipeline `schedule_misfire`)
+    runner_scheduler_enabled: bool = True
+    runner_schedule_refresh_interval: float = 30.0
+    runner_schedule_misfire_grace: float = 60.0
+    # runner: concurrent pipeline runs per process, and slots kept free of "heavy"
+    # pipelines (decayed runtime above the threshold); usage decays with the half-life
+    runner_max_concurrency: int = 4
+    runner_reserved_light_slots: int = 1
+    runner_fair_share_half_life: float = 900.0
+    runner_heavy_usage_seconds: float = 300.0
+    # runner: transforms of one task DAG batch (independent branches) run at once
+    runner_task_branch_concurrency: int = 4
+    # runner: JOIN task dimensions are indexed in memory up to this estimated size, then
+    # spilled to a temporary SQLite file in the spill dir ("" = system temp; MB, 0 = no limit)
+    runner_join_memory_mb: int = 64
+    runner_join_spill_dir: str = ""
+    # runner: per-sink throughput limits shared by all pipelines of the process, as
+    # JSON keyed by target pattern, e.g. {"es:*": {"rows_per_sec": 5000, "max_in_flight": 2}}
+    runner_sink_limits: str = ""
+    # runner: at most one run progress NOTIFY per run per interval, streamed to SSE
+    # watchers of GET /pipelines/{id}/events (seconds, 0 disables)
+    runner_progress_notify_interval: float = 1.0
+    # runner: run history maintenance (monthly etl_runs partitions created ahead,
+    # daily rollup into etl_run_daily, partitions older than retention dropped;
+    # retention 0 keeps all history)
+    runner_run_retention_days: int = 90
+    runner_run_partitions_ahead: int = 2
+    runner_history_maintenance_interval: float = 3600.0
+    # runner: log lines go through a queue to a writer thread, as "text" or "json"
+    # (one object per line with pipeline_id/pipeline/run_id fields); per-batch
+    # lines are limited to one per run and message per interval (seconds, 0 = all)
+    runner_log_format: Literal["text", "json"] = "text"
+    runner_log_batch_interval: float = 5.0
+    # runner: tracing spans (dispatch, execute, per-batch fetch/transform/write/commit,
+    # sink requests, pause checks); "console"/"file" write JSON lines from a
+    # background thread, "otlp" needs the opentelemetry SDK + OTLP exporter installed
+    runner_trace_exporter: Literal["none", "console", "file", "otlp"] = "none"
+    runner_trace_file: str = "runner-traces.jsonl"
+    # runner: before the first tick, open min(pool size, max concurrency) connections
+    # per pool and resolve the plans (transforms, sinks, adapters) of up to
+    # `max_plans` enabled pipelines; startup phase timings are logged either way
+    runner_warmup_enabled: bool = True
+    runner_warmup_max_plans: int = 100
+
+    @property
+    def database_dsn(self) -> str:
+        # plain libpq-style DSN for direct asyncpg connections (LISTEN)
+        return self.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
     @property
     def database_url(self) -> str:
         # asyncpg + SQLAlchemy 2.x
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.sql_ident import validate_sql_ident
+from src.runner.adapters.transformers import Transformer, resolve_transformer
+from src.runner.adapters.writers import Writer, resolve_writer
+from src.runner.orchestration.context import ExecutionContext
+from src.runner.ports.pipeline import PipelineLike
+from src.runner.services.cdc_decoding import parse_change, touched_keys
+from src.runner.services.logctx import ctx_prefix
+from src.runner.services.pause import _pause_if_requested
+from src.runner.services.progress import report_progress
+from src.runner.services.structured_log import PER_BATCH
+from src.runner.services.tracing import span
+
+logger = logging.getLogger("etl_runner")
+
+# key types come from the server (test_decoding output), e.g. "uuid",
+# "character varying(20)"; still validated before being interpolated
+_SQL_TYPE_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_ ]*(\(\d+(,\s*\d+)?\))?$")
+
+_SLOT_EXISTS_SQL = text(
+    "SELECT confirmed_flush_lsn::text FROM pg_replication_slots WHERE slot_name = :slot"
+)
+_CREATE_SLOT_SQL = text("SELECT pg_create_logical_replication_slot(:slot, 'test_decoding')")
+_CURRENT_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+_PEEK_SQL = text(
+    "SELECT lsn::text AS lsn, data"
+    " FROM pg_logical_slot_peek_changes("
+    "CAST(:slot AS name), CAST(:upto AS pg_lsn), :limit,"
+    " 'include-xids', '0', 'skip-empty-xacts', '1')"
+)
+# Checkpoints store the `lsn` peek reports for a batch's last COMMIT row, which is
+# already the end of that commit record. The slot is advanced to exactly that
+# position: the commit record of another, interleaved transaction can start
+# right there, and one byte further would skip it.
+_ADVANCE_SQL = text("SELECT pg_replication_slot_advance(CAST(:slot AS name), CAST(:lsn AS pg_lsn))")
+_BEHIND_SQL = text("SELECT CAST(:checkpoint AS pg_lsn) > CAST(:confirmed AS pg_lsn)")
+
+
+async def _ensure_slot(session: AsyncSession, slot: str, ctx_str: str) -> str | None:
+    """Return the slot's confirmed LSN, creating the slot on first use."""
+    res = await session.execute(_SLOT_EXISTS_SQL, {"slot": slot})
+    row = res.one_or_none()
+    if row is not None:
+        return row[0]
+
+    await session.commit()  # slot creation needs a transaction without writes
+    await session.execute(_CREATE_SLOT_SQL, {"slot": slot})
+    await session.commit()
+    logger.warning(
+        "%s CDC created replication slot %s; changes before this point are not captured"
+        " (run a full load once to seed the target)",
+        ctx_str,
+        slot,
+    )
+    return None
+
+
+async def _slot_behind(session: AsyncSession, checkpoint: str, confirmed: str) -> bool:
+    res = await session.execute(_BEHIND_SQL, {"checkpoint": checkpoint, "confirmed": confirmed})
+    return bool(res.scalar_one())
+
+
+async def run_cdc_pipeline(
+    ctx: ExecutionContext,
+    pipeline: PipelineLike,
+    *,
+    transformer: Transformer | None = None,
+    writer: Writer | None = None,
+) -> tuple[int, int]:
+    """Apply changes from a logical replication slot (test_decoding) in batches.
+
+    Each batch peeks up to `batch_size` changes, re-reads the touched keys via
+    `source_query` (keys that yield no row are deleted from the target), then
+    commits the sink writes together with the LSN checkpoint in etl_state.
+    Only after that commit is the slot advanced, so a crash in between replays
+    the batch (writes are idempotent upserts/deletes).
+    """
+    session = ctx.session
+    state_repo = ctx.state
+
+    if pipeline.mode != "cdc":
+        raise ValueError(f"Unsupported pipeline.mode: {pipeline.mode}")
+
+    source_query = pipeline.source_query
+    if not source_query:
+        raise ValueError("Pipeline has empty source_query")
+
+    slot = (pipeline.cdc_slot or "").strip()
+    if not slot:
+        raise ValueError("CDC pipeline requires cdc_slot")
+
+    source_table = (pipeline.cdc_source_table or "").strip()
+    schema, _, table = source_table.partition(".")
+    validate_sql_ident(schema, what="cdc_source_table schema")
+    validate_sql_ident(table, what="cdc_source_table table")
+
+    key_col = validate_sql_ident(pipeline.cdc_key_column or "id", what="cdc_key_column")
+    id_key = validate_sql_ident(pipeline.incremental_id_key or "", what="incremental_id_key")
+
+    batch_size = int(pipeline.batch_size or 1000)
+    pid = str(pipeline.id)
+    pname = str(pipeline.name or pid)
+    ctx_str = ctx_prefix(pid=pid, pname=pname, rid=str(ctx.run_id))
+
+    if transformer is None:
+        transformer = resolve_transformer(pipeline)
+    if writer is None:
+        writer = resolve_writer(pipeline)
+
+    base = str(source_query).strip().rstrip(";")
+    reread_sql: dict[str, Any] = {}  # key type -> compiled statement, built once per run
+
+    total_read = 0
+    total_written = 0
+    batch_no = 0
+    last_lsn: str | None = None
+
+    try:
+        state = await state_repo.get(session, pid)
+        checkpoint = state.last_processed_value if state else None
+
+        confirmed = await _ensure_slot(session, slot, ctx_str)
+
+        # the previous run may have committed its checkpoint but died before advancing
+        if checkpoint and confirmed and await _slot_behind(session, checkpoint, confirmed):
+            await session.execute(_ADVANCE_SQL, {"slot": slot, "lsn": checkpoint})
+            logger.info("%s CDC slot %s caught up to checkpoint %s", ctx_str, slot, checkpoint)
+
+        # drain what exists now; later changes belong to the next run
+        upto = (await session.execute(_CURRENT_LSN_SQL)).scalar_one()
+        await session.commit()
+
+        logger.info(
+            "%s CDC start slot=%s table=%s key=%s checkpoint=%s upto=%s",
+            ctx_str,
+            slot,
+            source_table,
+            key_col,
+            checkpoint,
+            upto,
+        )
+
+        while True:
+            with span("peek_changes", batch_no=batch_no + 1) as s:
+                res = await session.execute(
+                    _PEEK_SQL, {"slot": slot, "upto": upto, "limit": batch_size}
+                )
+                raw = res.all()
+                s.set(changes=len(raw))
+            if not raw:
+                logger.info("%s CDC done (slot drained) batches=%d", ctx_str, batch_no)
+                break
+
+            batch_no += 1
+            prev_lsn, last_lsn = last_lsn, str(raw[-1][0])
+            if last_lsn == prev_lsn:
+                raise RuntimeError(f"CDC slot {slot} did not advance past {last_lsn}")
+            changes = [c for c in (parse_change(str(r[1])) for r in raw) if c is not None]
+            keys, key_type = touched_keys(changes, table=source_table, key=key_col)
+
+            written = 0
+            if keys:
+                if not _SQL_TYPE_RE.fullmatch(key_type or ""):
+                    raise ValueError(f"Unsupported CDC key type: {key_type!r}")
+                stmt = reread_sql.get(key_type)
+                if stmt is None:
+                    stmt = text(
+                        f"SELECT * FROM ({base}) AS src"
+                        # keys arrive as text; bind text[] and let Postgres cast
+                        f" WHERE src.{id_key} = ANY(CAST(CAST(:keys AS text[]) AS {key_type}[]))"
+                    )
+                    reread_sql[key_type] = stmt
+
+                with span("fetch", batch_no=batch_no, keys=len(keys)) as s:
+                    src_rows = [
+                        dict(r) for r in (await session.execute(stmt, {"keys": keys})).mappings()
+                    ]
+                    s.set(rows=len(src_rows))
+                total_read += len(src_rows)
+
+                found = {str(r[id_key]) for r in src_rows}
+                gone = [k for k in keys if k not in found]
+
+                with span("transform", batch_no=batch_no, rows_in=len(src_rows)) as s:
+                    rows = await transformer.transform(pipeline, src_rows)
+                    s.set(rows=len(rows))
+                with span("write", batch_no=batch_no, rows=len(rows), deletes=len(gone)) as s:
+                    if rows:
+                        written += int(await writer.write(session, pipeline, rows) or 0)
+                    if gone:
+                        written += int(await writer.delete(session, pipeline, gone) or 0)
+                    s.set(written=written)
+                total_written += written
+
+                logger.info(
+                    "%s CDC batch=%d changes=%d keys=%d upserted=%d deleted_keys=%d",
+                    ctx_str,
+                    batch_no,
+                    len(changes),
+                    len(keys),
+                    len(rows),
+                    len(gone),
+                    extra=PER_BATCH,
+                )
+
+            with span("commit", batch_no=batch_no):
+                await state_repo.upsert(session, pid, last_value=last_lsn, last_id=None)
+                await session.commit()
+
+                await session.execute(_ADVANCE_SQL, {"slot": slot, "lsn": last_lsn})
+                await session.commit()
+
+            logger.info(
+                "%s CDC checkpoint committed batch=%d -> lsn=%s",
+                ctx_str,
+                batch_no,
+                last_lsn,
+                extra=PER_BATCH,
+            )
+
+            await report_progress(
+                ctx.progress, batch=batch_no, rows_read=total_read, rows_written=total_written
+            )
+            if await _pause_if_requested(ctx, pid):
+                return total_read, total_written
+
+        return total_read, total_written
+
+    except Exception:
+        logger.exception("CDC pipeline failed id=%s name=%s", pid, pname)
+        raise
+    finally:
+        await writer.close()
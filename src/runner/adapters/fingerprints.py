@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.runner.adapters.writers import Writer, normalize_row
+from src.runner.ports.pipeline import PipelineLike
+
+# every whitelisted target (PG tables and ES indexes) is keyed by film_id
+TARGET_KEY_FIELD = "film_id"
+
+_LOAD_SQL = text(
+    "SELECT row_key, fingerprint FROM etl.etl_row_fingerprints"
+    " WHERE pipeline_id = CAST(:pid AS uuid) AND target = :target"
+    " AND row_key = ANY(CAST(:keys AS text[]))"
+)
+_STORE_SQL = text(
+    "INSERT INTO etl.etl_row_fingerprints (pipeline_id, target, row_key, fingerprint)"
+    " SELECT CAST(:pid AS uuid), :target, k, f"
+    " FROM unnest(CAST(:keys AS text[]), CAST(:fps AS bytea[])) AS t(k, f)"
+    " ON CONFLICT (pipeline_id, target, row_key) DO UPDATE"
+    " SET fingerprint = EXCLUDED.fingerprint, updated_at = now()"
+)
+_FORGET_SQL = text(
+    "DELETE FROM etl.etl_row_fingerprints"
+    " WHERE pipeline_id = CAST(:pid AS uuid) AND target = :target"
+    " AND row_key = ANY(CAST(:keys AS text[]))"
+)
+
+
+def row_fingerprint(row: dict) -> bytes:
+    """Stable 16-byte digest of a row's content (key order does not matter)."""
+    payload = json.dumps(
+        normalize_row(row), sort_keys=True, separators=(",", ":"), default=str
+    ).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def fingerprint_scope(pipeline: PipelineLike) -> str:
+    """Name fingerprints are stored under: the sink, or all sinks of a fan-out.
+
+    Fan-out batches succeed or fail for all sinks together, so one fingerprint
+    per key covers the whole set; changing the set starts from scratch.
+    """
+    target = (pipeline.target_table or "").strip()
+    extra = [t.strip() for t in (getattr(pipeline, "extra_targets", None) or ())]
+    return ",".join(dict.fromkeys([target, *extra]))
+
+
+class FingerprintWriter:
+    """Writer wrapper that drops rows whose content hash has not changed.
+
+    Fingerprints are upserted on the run's session after the inner writer
+    accepted the batch, so they commit together with the checkpoint: a batch
+    that is replayed after a failure is written again, never skipped.
+    Built per run; `skipped` is the run's total.
+    """
+
+    def __init__(self, inner: Writer, *, pipeline_id: str, scope: str) -> None:
+        self._inner = inner
+        self._pid = pipeline_id
+        self._scope = scope
+        self.skipped = 0
+
+    async def _load(self, session: AsyncSession, keys: list[str]) -> dict[str, bytes]:
+        res = await session.execute(
+            _LOAD_SQL, {"pid": self._pid, "target": self._scope, "keys": keys}
+        )
+        return {str(k): bytes(f) for k, f in res.all()}
+
+    async def write(self, session: AsyncSession, pipeline: PipelineLike, rows: list[dict]) -> int:
+        if not rows:
+            return 0
+
+        # the last row wins when a key repeats inside a batch
+        fps: dict[str, bytes] = {}
+        for r in rows:
+            if TARGET_KEY_FIELD not in r:
+                raise ValueError(f"skip_unchanged needs {TARGET_KEY_FIELD!r} in every row")
+            fps[str(r[TARGET_KEY_FIELD])] = row_fingerprint(r)
+
+        stored = await self._load(session, list(fps))
+        changed = {k: fp for k, fp in fps.items() if stored.get(k) != fp}
+
+        todo = [r for r in rows if str(r[TARGET_KEY_FIELD]) in changed]
+        self.skipped += len(rows) - len(todo)
+        if not todo:
+            return 0
+
+        written = await self._inner.write(session, pipeline, todo)
+        await session.execute(
+            _STORE_SQL,
+            {
+                "pid": self._pid,
+                "target": self._scope,
+                "keys": list(changed),
+                "fps": list(changed.values()),
+            },
+        )
+        return written
+
+    async def delete(self, session: AsyncSession, pipeline: PipelineLike, keys: list[str]) -> int:
+        if not keys:
+            return 0
+        deleted = await self._inner.delete(session, pipeline, keys)
+        await session.execute(
+            _FORGET_SQL, {"pid": self._pid, "target": self._scope, "keys": list(keys)}
+        )
+        return deleted
+
+    async def close(self) -> None:
+        await self._inner.close()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import importlib
+from collections.abc import Awaitable, Callable
+from functools import cache
+
+RunnerFn = Callable[..., Awaitable[tuple[int, int]]]
+
+# (kind, mode) -> "module:function"; kind is "sql" (source_query), "tasks"
+# (v1 linear chain) or "dag" (v2 task DAG). Adapters are imported on first
+# use, so a runner only loads the code paths of the pipelines it actually runs.
+ADAPTERS: dict[tuple[str, str], str] = {
+    ("sql", "full"): "src.runner.adapters.sql_full:run_sql_full_pipeline",
+    ("sql", "incremental"): "src.runner.adapters.sql_incremental:run_sql_incremental_pipeline",
+    ("sql", "cdc"): "src.runner.adapters.cdc:run_cdc_pipeline",
+    ("tasks", "full"): "src.runner.adapters.tasks_full:run_tasks_full",
+    ("tasks", "incremental"): "src.runner.adapters.tasks_incremental:run_tasks_incremental",
+    ("dag", "full"): "src.runner.adapters.tasks_dag:run_tasks_dag",
+    ("dag", "incremental"): "src.runner.adapters.tasks_dag:run_tasks_dag",
+}
+
+
+@cache
+def load_adapter(mode: str, *, kind: str = "sql") -> RunnerFn:
+    """Adapter running pipelines of `mode` and `kind`."""
+    ref = ADAPTERS.get((kind, mode))
+    if ref is None:
+        raise ValueError(f"Unsupported pipeline.mode: {mode!r}")
+    module, name = ref.split(":")
+    fn: RunnerFn = getattr(importlib.import_module(module), name)
+    return fn
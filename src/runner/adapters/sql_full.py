@@ -4,24 +4,26 @@ import logging
 
 from sqlalchemy import text
 
-from src.runner.adapters.transformers import resolve_transformer
-from src.runner.adapters.writers import resolve_writer
+from src.app.core.seek_query import wrap_query_with_limit_offset
+from src.runner.adapters.transformers import Transformer, resolve_transformer
+from src.runner.adapters.writers import Writer, resolve_writer
 from src.runner.orchestration.context import ExecutionContext
 from src.runner.ports.pipeline import PipelineLike
 from src.runner.services.logctx import ctx_prefix
 from src.runner.services.pause import _pause_if_requested
+from src.runner.services.progress import report_progress
+from src.runner.services.structured_log import PER_BATCH
+from src.runner.services.tracing import span
 
 logger = logging.getLogger("etl_runner")
 
 
-def _wrap_query_with_limit_offset(base_query: str, limit: int, offset: int) -> str:
-    q = base_query.strip().rstrip(";")
-    return f"SELECT * FROM ({q}) AS src LIMIT {limit} OFFSET {offset}"
-
-
 async def run_sql_full_pipeline(
     ctx: ExecutionContext,
     pipeline: PipelineLike,
+    *,
+    transformer: Transformer | None = None,
+    writer: Writer | None = None,
 ) -> tuple[int, int]:
     session = ctx.session
 
@@ -53,22 +55,28 @@ async def run_sql_full_pipeline(
     total_written = 0
     non_empty_batches = 0
 
-    transformer = resolve_transformer(pipeline)
-    writer = resolve_writer(pipeline)
+    if transformer is None:
+        transformer = resolve_transformer(pipeline)
+    if writer is None:
+        writer = resolve_writer(pipeline)
 
     try:
         while True:
             batch_no += 1
             current_offset = offset
 
-            logger.info("%s FULL batch=%d offset=%d", ctx_str, batch_no, current_offset)
+            logger.info(
+                "%s FULL batch=%d offset=%d", ctx_str, batch_no, current_offset, extra=PER_BATCH
+            )
 
-            batch_query = _wrap_query_with_limit_offset(
+            batch_query = wrap_query_with_limit_offset(
                 pipeline.source_query, batch_size, current_offset
             )
-            src_result = await session.execute(text(batch_query))
-            src_rows_rm = src_result.mappings().all()
-            src_rows: list[dict[str, object]] = [dict(r) for r in src_rows_rm]
+            with span("fetch", batch_no=batch_no) as s:
+                src_result = await session.execute(text(batch_query))
+                src_rows_rm = src_result.mappings().all()
+                src_rows: list[dict[str, object]] = [dict(r) for r in src_rows_rm]
+                s.set(rows=len(src_rows))
 
             fetched = len(src_rows)
 
@@ -77,6 +85,7 @@ async def run_sql_full_pipeline(
                 ctx_str,
                 batch_no,
                 fetched,
+                extra=PER_BATCH,
             )
 
             if fetched == 0:
@@ -103,10 +112,14 @@ async def run_sql_full_pipeline(
 
             total_read += fetched
 
-            rows = await transformer.transform(pipeline, src_rows)
+            with span("transform", batch_no=batch_no, rows_in=fetched) as s:
+                rows = await transformer.transform(pipeline, src_rows)
+                s.set(rows=len(rows))
 
             if rows:
-                written = await writer.write(session, pipeline, rows)
+                with span("write", batch_no=batch_no, rows=len(rows)) as s:
+                    written = await writer.write(session, pipeline, rows)
+                    s.set(written=int(written or 0))
                 written_i = int(written or 0)
                 total_written += written_i
                 logger.info(
@@ -115,9 +128,11 @@ async def run_sql_full_pipeline(
                     batch_no,
                     written_i,
                     total_written,
+                    extra=PER_BATCH,
                 )
 
-            await session.commit()
+            with span("commit", batch_no=batch_no):
+                await session.commit()
 
             # next offset: continue after the rows we actually fetched
             offset = current_offset + fetched
@@ -129,8 +144,12 @@ async def run_sql_full_pipeline(
                 offset,
                 total_read,
                 total_written,
+                extra=PER_BATCH,
             )
 
+            await report_progress(
+                ctx.progress, batch=batch_no, rows_read=total_read, rows_written=total_written
+            )
             if await _pause_if_requested(ctx, pipeline.id):
                 return total_read, total_written
 
@@ -4,15 +4,17 @@ import logging
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import text
-
-from src.runner.adapters.transformers import resolve_transformer
-from src.runner.adapters.writers import resolve_writer
+from src.app.core.seek_query import build_seek_query
+from src.app.core.sql_ident import validate_sql_ident
+from src.runner.adapters.transformers import Transformer, resolve_transformer
+from src.runner.adapters.writers import Writer, resolve_writer
 from src.runner.orchestration.context import ExecutionContext
 from src.runner.ports.pipeline import PipelineLike
 from src.runner.services.logctx import ctx_prefix
 from src.runner.services.pause import _pause_if_requested
-from src.runner.services.sql_ident import validate_sql_ident
+from src.runner.services.progress import report_progress
+from src.runner.services.structured_log import PER_BATCH
+from src.runner.services.tracing import span
 
 logger = logging.getLogger("etl_runner")
 
@@ -20,6 +22,9 @@ logger = logging.getLogger("etl_runner")
 async def run_sql_incremental_pipeline(
     ctx: ExecutionContext,
     pipeline: PipelineLike,
+    *,
+    transformer: Transformer | None = None,
+    writer: Writer | None = None,
 ) -> tuple[int, int]:
     session = ctx.session
     state_repo = ctx.state
@@ -56,8 +61,10 @@ async def run_sql_incremental_pipeline(
     total_read = 0
     total_written = 0
 
-    transformer = resolve_transformer(pipeline)
-    writer = resolve_writer(pipeline)
+    if transformer is None:
+        transformer = resolve_transformer(pipeline)
+    if writer is None:
+        writer = resolve_writer(pipeline)
 
     try:
         try:
@@ -83,33 +90,17 @@ async def run_sql_incremental_pipeline(
                 last_id,
             )
 
-            base = str(source_query).strip().rstrip(";")
+            query = build_seek_query(source_query, inc_key=inc_key, id_key=id_key)
 
             while True:
                 batch_no += 1
 
-                params: dict[str, Any] = {"limit": batch_size}
-
-                if last_ts is None:
-                    batch_sql = f"""
-                    SELECT * FROM ({base}) AS src
-                    ORDER BY src.{inc_key}, src.{id_key}
-                    LIMIT :limit
-                    """
-                else:
-                    batch_sql = f"""
-                    SELECT * FROM ({base}) AS src
-                    WHERE (src.{inc_key} > :last_ts)
-                       OR (src.{inc_key} = :last_ts AND src.{id_key} > :last_id)
-                    ORDER BY src.{inc_key}, src.{id_key}
-                    LIMIT :limit
-                    """
-                    params["last_ts"] = last_ts
-                    params["last_id"] = last_id
-
-                res = await session.execute(text(batch_sql), params)
-                src_rows_rm = res.mappings().all()
-                src_rows: list[dict[str, object]] = [dict(r) for r in src_rows_rm]
+                stmt, params = query.bind(last_ts, last_id, batch_size)
+                with span("fetch", batch_no=batch_no) as s:
+                    res = await session.execute(stmt, params)
+                    src_rows_rm = res.mappings().all()
+                    src_rows: list[dict[str, object]] = [dict(r) for r in src_rows_rm]
+                    s.set(rows=len(src_rows))
                 fetched = len(src_rows)
 
                 if fetched == 0:
@@ -117,18 +108,24 @@ async def run_sql_incremental_pipeline(
                     logger.info("%s INC done (no more rows) batches=%d", ctx_str, processed_batches)
                     break
 
-                logger.info("%s INC batch=%d fetched rows=%d", ctx_str, batch_no, fetched)
+                logger.info(
+                    "%s INC batch=%d fetched rows=%d", ctx_str, batch_no, fetched, extra=PER_BATCH
+                )
                 total_read += fetched
 
                 # normalize SQLAlchemy RowMapping -> dict for mypy + stable downstream types
                 src_rows_d: list[dict[str, Any]] = [dict(r) for r in src_rows]
 
-                rows = await transformer.transform(pipeline, src_rows_d)
+                with span("transform", batch_no=batch_no, rows_in=fetched) as s:
+                    rows = await transformer.transform(pipeline, src_rows_d)
+                    s.set(rows=len(rows))
 
                 written_i = 0
                 if rows:
-                    written = await writer.write(session, pipeline, rows)
-                    written_i = int(written or 0)
+                    with span("write", batch_no=batch_no, rows=len(rows)) as s:
+                        written = await writer.write(session, pipeline, rows)
+                        written_i = int(written or 0)
+                        s.set(written=written_i)
                     total_written += written_i
 
                 logger.info(
@@ -137,6 +134,7 @@ async def run_sql_incremental_pipeline(
                     batch_no,
                     written_i,
                     total_written,
+                    extra=PER_BATCH,
                 )
 
                 head = src_rows_d[0]
@@ -171,15 +169,17 @@ async def run_sql_incremental_pipeline(
                     first_id,
                     next_last_ts,
                     next_last_id,
+                    extra=PER_BATCH,
                 )
 
                 last_ts = next_last_ts
                 last_id = next_last_id
 
-                await state_repo.upsert(
-                    session, pid, last_value=last_ts.isoformat(), last_id=last_id
-                )
-                await session.commit()
+                with span("commit", batch_no=batch_no):
+                    await state_repo.upsert(
+                        session, pid, last_value=last_ts.isoformat(), last_id=last_id
+                    )
+                    await session.commit()
 
                 logger.info(
                     "%s INC checkpoint committed batch=%d -> last_ts=%s last_id=%s",
@@ -187,8 +187,12 @@ async def run_sql_incremental_pipeline(
                     batch_no,
                     last_ts,
                     last_id,
+                    extra=PER_BATCH,
                 )
 
+                await report_progress(
+                    ctx.progress, batch=batch_no, rows_read=total_read, rows_written=total_written
+                )
                 if await _pause_if_requested(ctx, pid):
                     return total_read, total_written
 
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from sqlalchemy import text
+
+from src.app.core.seek_query import build_seek_query, wrap_query_with_limit_offset
+from src.app.core.sql_ident import validate_sql_ident
+from src.runner.adapters.tasks_python import TransformFn, apply_transform
+from src.runner.adapters.writers import _all_or_cancel
+from src.runner.orchestration.context import ExecutionContext
+from src.runner.services.hash_join import DimensionIndex, hash_join, join_limits
+from src.runner.services.pause import _pause_if_requested
+from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from src.runner.services.plan_cache import DagPlan
+from src.runner.services.progress import report_progress
+from src.runner.services.tracing import span
+
+logger = logging.getLogger("etl_runner")
+
+Rows = list[dict[str, Any]]
+
+# rows fetched per round trip while a join dimension is read
+DIMENSION_FETCH_ROWS = 5000
+
+
+@dataclass(slots=True)
+class _Totals:
+    read: int = 0
+    written: int = 0
+    batches: int = 0
+
+
+async def run_tasks_dag(
+    ctx: ExecutionContext, p: PipelineSnapshot, *, dag: DagPlan, concurrency: int = 4
+) -> tuple[int, int]:
+    """Run a task DAG (Tasks v2): every batch of a reader fans out to its branches.
+
+    Readers run one after another. Within a batch the transforms of
+    independent branches run concurrently, at most `concurrency` at a time;
+    the batch is then written to every sink under the reader, and the
+    reader's checkpoint commits in the same transaction. JOIN dimensions
+    are read once, before the first batch.
+    """
+    limit = asyncio.Semaphore(max(1, concurrency))
+    totals = _Totals()
+    indexes: list[DimensionIndex] = []
+
+    logger.info(
+        "TASKS DAG start: pipeline=%s mode=%s readers=%d sinks=%s",
+        p.name,
+        p.mode,
+        len(dag.graph.readers),
+        ", ".join(dag.sinks.targets),
+    )
+    try:
+        if dag.graph.joins:
+            dag = replace(dag, fns={**dag.fns, **await _join_fns(ctx, dag, indexes)})
+        for reader in dag.graph.readers:
+            if p.mode == "incremental":
+                paused = await _run_seek_reader(ctx, p, dag, reader, limit, totals)
+            else:
+                paused = await _run_offset_reader(ctx, p, dag, reader, limit, totals)
+            if paused:
+                break
+        logger.info(
+            "TASKS DAG done: pipeline=%s batches=%d read=%d written=%d",
+            p.name,
+            totals.batches,
+            totals.read,
+            totals.written,
+        )
+        return totals.read, totals.written
+    finally:
+        for index in indexes:
+            index.close()
+        await dag.sinks.close()
+
+
+async def _join_fns(
+    ctx: ExecutionContext, dag: DagPlan, indexes: list[DimensionIndex]
+) -> dict[int, TransformFn]:
+    """Read every JOIN dimension into an index; the JOIN tasks as transforms.
+
+    JOINs on the same dimension, keys and columns share one index. Created
+    indexes are appended to `indexes` (the caller closes them).
+    """
+    limits = join_limits()
+    built: dict[tuple[Any, ...], DimensionIndex] = {}
+    fns: dict[int, TransformFn] = {}
+    for idx, spec in dag.graph.joins.items():
+        dim = dag.graph.nodes[idx].dimension
+        assert dim is not None
+        key = (dim, spec.dim_on, spec.columns)
+        index = built.get(key)
+        if index is None:
+            index = DimensionIndex(
+                spec.dim_on,
+                spec.columns,
+                memory_limit=limits.memory_bytes,
+                spill_dir=limits.spill_dir,
+            )
+            indexes.append(index)
+            with span("join_build", task=idx, dimension=dim) as s:
+                result = await ctx.session.stream(text(dag.graph.nodes[dim].task.body))
+                async for part in result.mappings().partitions(DIMENSION_FETCH_ROWS):
+                    await index.add(part)
+                s.set(rows=index.size, spilled=index.spilled)
+            logger.info(
+                "JOIN dimension %d ready: rows=%d spilled=%s", dim, index.size, index.spilled
+            )
+            built[key] = index
+        fns[idx] = partial(hash_join, index=index, spec=spec)
+    return fns
+
+
+async def run_branches(
+    dag: DagPlan, reader: int, rows: Rows, limit: asyncio.Semaphore
+) -> dict[int, Rows]:
+    """Output of every task under `reader` for one batch, by order_index.
+
+    Sibling branches run concurrently, sync transforms in worker threads.
+    Each gets its own copy of the rows, so a transform that edits rows in
+    place cannot leak into another branch or into the rows its parent writes.
+    """
+    graph = dag.graph
+    outputs: dict[int, Rows] = {}
+
+    async def visit(idx: int, rows_in: Rows) -> None:
+        outputs[idx] = rows_in
+        node = graph.nodes[idx]
+        shared = len(node.children) > 1 or node.target is not None
+        await _all_or_cancel(
+            [
+                branch(child, [dict(r) for r in rows_in] if shared else rows_in)
+                for child in node.children
+            ]
+        )
+
+    async def branch(idx: int, rows_in: Rows) -> None:
+        rows_out: Rows = []
+        if rows_in:
+            async with limit:
+                rows_out = await apply_transform(dag.fns[idx], rows_in, in_thread=True)
+        await visit(idx, rows_out)
+
+    await visit(reader, rows)
+    return outputs
+
+
+async def _write_batch(
+    ctx: ExecutionContext,
+    p: PipelineSnapshot,
+    dag: DagPlan,
+    reader: int,
+    rows: Rows,
+    limit: asyncio.Semaphore,
+    totals: _Totals,
+) -> None:
+    totals.batches += 1
+    totals.read += len(rows)
+
+    with span("transform", batch_no=totals.batches, reader=reader, rows_in=len(rows)) as s:
+        outputs = await run_branches(dag, reader, rows, limit)
+        s.set(tasks=len(outputs))
+
+    with span("write", batch_no=totals.batches, reader=reader) as s:
+        written = await dag.sinks.write(ctx.session, p, outputs)
+        s.set(written=written)
+    totals.written += written
+
+
+async def _after_commit(ctx: ExecutionContext, p: PipelineSnapshot, totals: _Totals) -> bool:
+    await report_progress(
+        ctx.progress, batch=totals.batches, rows_read=totals.read, rows_written=totals.written
+    )
+    return await _pause_if_requested(ctx, p.id)
+
+
+async def _run_offset_reader(
+    ctx: ExecutionContext,
+    p: PipelineSnapshot,
+    dag: DagPlan,
+    reader: int,
+    limit: asyncio.Semaphore,
+    totals: _Totals,
+) -> bool:
+    """Full mode: LIMIT/OFFSET batches of one reader. Returns True when paused."""
+    session = ctx.session
+    reader_sql = dag.graph.nodes[reader].task.body
+    batch_size = int(p.batch_size or 1000)
+    offset = 0
+
+    while True:
+        batch_query = wrap_query_with_limit_offset(reader_sql, batch_size, offset)
+        with span("fetch", batch_no=totals.batches + 1, reader=reader) as s:
+            res = await session.execute(text(batch_query))
+            rows = [dict(r) for r in res.mappings().all()]
+            s.set(rows=len(rows))
+
+        if not rows:
+            return False
+
+        await _write_batch(ctx, p, dag, reader, rows, limit, totals)
+
+        with span("commit", batch_no=totals.batches):
+            await session.commit()
+
+        if await _after_commit(ctx, p, totals):
+            return True
+        offset += batch_size
+
+
+async def _run_seek_reader(
+    ctx: ExecutionContext,
+    p: PipelineSnapshot,
+    dag: DagPlan,
+    reader: int,
+    limit: asyncio.Semaphore,
+    totals: _Totals,
+) -> bool:
+    """Incremental mode: keyset batches of one reader from its own checkpoint.
+
+    The first reader keeps the pipeline checkpoint (etl_state columns), the
+    others are stored under their order_index. Returns True when paused.
+    """
+    if not p.incremental_key:
+        raise ValueError("Incremental pipeline requires incremental_key")
+    inc_key = validate_sql_ident(p.incremental_key, what="incremental_key")
+    id_key = validate_sql_ident(p.incremental_id_key or "film_id", what="incremental_id_key")
+
+    session = ctx.session
+    pid = str(p.id)
+    primary = reader == dag.graph.readers[0]
+    batch_size = int(p.batch_size or 1000)
+
+    if primary:
+        state = await ctx.state.get(session, pid)
+    else:
+        state = await ctx.state.get_reader(session, pid, reader)
+    last_ts_raw = state.last_processed_value if state else None
+    last_ts = datetime.fromisoformat(last_ts_raw) if last_ts_raw else None
+    last_id = state.last_processed_id if state else None
+    if last_ts is not None and last_id is None:
+        raise ValueError(f"Incremental state of reader {reader} is missing last_processed_id")
+
+    query = build_seek_query(dag.graph.nodes[reader].task.body, inc_key=inc_key, id_key=id_key)
+
+    while True:
+        stmt, params = query.bind(last_ts, last_id, batch_size)
+        with span("fetch", batch_no=totals.batches + 1, reader=reader) as s:
+            res = await session.execute(stmt, params)
+            rows = [dict(r) for r in res.mappings().all()]
+            s.set(rows=len(rows))
+
+        if not rows:
+            return False
+
+        await _write_batch(ctx, p, dag, reader, rows, limit, totals)
+
+        tail = rows[-1]
+        if inc_key not in tail or id_key not in tail:
+            raise ValueError(f"Reader {reader} rows must contain {inc_key!r} and {id_key!r}")
+        next_ts = tail[inc_key]
+        if not isinstance(next_ts, datetime):
+            raise ValueError(
+                f"Invariant broken: incremental_key must be datetime, got {type(next_ts)!r}"
+            )
+        last_ts, last_id = next_ts, str(tail[id_key])
+        checkpoint = {"last_value": next_ts.isoformat(), "last_id": last_id}
+
+        with span("commit", batch_no=totals.batches):
+            if primary:
+                await ctx.state.upsert(session, pid, **checkpoint)
+            else:
+                await ctx.state.upsert_reader(session, pid, reader, **checkpoint)
+            await session.commit()
+
+        if await _after_commit(ctx, p, totals):
+            return True
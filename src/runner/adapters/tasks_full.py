@@ -1,36 +1,32 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from dataclasses import replace
 from typing import Any
 
 from sqlalchemy import text
 
 from src.app.core.constants import is_allowed_target
-from src.app.core.enums import PipelineStatus
-from src.runner.adapters.tasks_python import apply_transform, load_python_transform
-from src.runner.adapters.writers import resolve_writer
+from src.app.core.seek_query import wrap_query_with_limit_offset
+from src.runner.adapters.tasks_python import TransformFn, apply_transform, load_python_transform
+from src.runner.adapters.writers import Writer, resolve_writer
 from src.runner.orchestration.context import ExecutionContext
+from src.runner.services.pause import _pause_if_requested
 from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from src.runner.services.progress import report_progress
+from src.runner.services.tracing import span
 
 logger = logging.getLogger("etl_runner")
 
 
-def _wrap_query_with_limit_offset(base_query: str, limit: int, offset: int) -> str:
-    q = base_query.strip().rstrip(";")
-    return f"SELECT * FROM ({q}) AS src LIMIT {limit} OFFSET {offset}"
-
-
-async def _pause_if_requested(ctx: ExecutionContext, pipeline_id: str) -> bool:
-    status = await ctx.pipelines.get_status(ctx.session, pipeline_id)
-    if status == PipelineStatus.PAUSE_REQUESTED.value:
-        await ctx.pipelines.apply_pause_requested(ctx.session, pipeline_id)  # commit inside
-        logger.info("Pause requested: " "pipeline id=%s -> PAUSED (after batch)", pipeline_id)
-        return True
-    return False
-
-
-async def run_tasks_full(ctx: ExecutionContext, p: PipelineSnapshot) -> tuple[int, int]:
+async def run_tasks_full(
+    ctx: ExecutionContext,
+    p: PipelineSnapshot,
+    *,
+    writer: Writer | None = None,
+    py_fns: Sequence[TransformFn] | None = None,
+) -> tuple[int, int]:
     if not p.tasks:
         raise ValueError("Tasks runner requires non-empty tasks")
 
@@ -47,9 +43,11 @@ async def run_tasks_full(ctx: ExecutionContext, p: PipelineSnapshot) -> tuple[in
 
     p_view = replace(p, source_query=reader_sql, target_table=final_target)
 
-    writer = resolve_writer(p_view)
+    if writer is None:
+        writer = resolve_writer(p_view)
 
-    py_fns = [load_python_transform(t.body) for t in p.tasks[1:]]
+    if py_fns is None:
+        py_fns = [load_python_transform(t.body) for t in p.tasks[1:]]
 
     total_read = 0
     total_written = 0
@@ -63,28 +61,40 @@ async def run_tasks_full(ctx: ExecutionContext, p: PipelineSnapshot) -> tuple[in
             final_target,
         )
 
+        batch_no = 0
         while True:
-            batch_query = _wrap_query_with_limit_offset(reader_sql, batch_size, offset)
-            res = await session.execute(text(batch_query))
-            rows_rm = res.mappings().all()
-            rows: list[dict[str, Any]] = [dict(r) for r in rows_rm]
+            batch_query = wrap_query_with_limit_offset(reader_sql, batch_size, offset)
+            with span("fetch", batch_no=batch_no + 1) as s:
+                res = await session.execute(text(batch_query))
+                rows_rm = res.mappings().all()
+                rows: list[dict[str, Any]] = [dict(r) for r in rows_rm]
+                s.set(rows=len(rows))
 
             if not rows:
                 break
 
+            batch_no += 1
             total_read += len(rows)
 
-            for fn in py_fns:
-                rows = await apply_transform(fn, rows)
-                if not rows:
-                    break
+            with span("transform", batch_no=batch_no, rows_in=len(rows), steps=len(py_fns)) as s:
+                for fn in py_fns:
+                    rows = await apply_transform(fn, rows)
+                    if not rows:
+                        break
+                s.set(rows=len(rows))
 
             if rows:
-                written = await writer.write(session, p_view, rows)
+                with span("write", batch_no=batch_no, rows=len(rows)) as s:
+                    written = await writer.write(session, p_view, rows)
+                    s.set(written=int(written or 0))
                 total_written += int(written or 0)
 
-            await session.commit()
+            with span("commit", batch_no=batch_no):
+                await session.commit()
 
+            await report_progress(
+                ctx.progress, batch=batch_no, rows_read=total_read, rows_written=total_written
+            )
             if await _pause_if_requested(ctx, p.id):
                 return total_read, total_written
 
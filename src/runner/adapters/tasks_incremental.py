@@ -1,33 +1,32 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from dataclasses import replace
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import text
-
 from src.app.core.constants import is_allowed_target
-from src.app.core.enums import PipelineStatus
-from src.runner.adapters.tasks_python import apply_transform, load_python_transform
-from src.runner.adapters.writers import resolve_writer
+from src.app.core.seek_query import build_seek_query
+from src.app.core.sql_ident import validate_sql_ident
+from src.runner.adapters.tasks_python import TransformFn, apply_transform, load_python_transform
+from src.runner.adapters.writers import Writer, resolve_writer
 from src.runner.orchestration.context import ExecutionContext
+from src.runner.services.pause import _pause_if_requested
 from src.runner.services.pipeline_snapshot import PipelineSnapshot
-from src.runner.services.sql_ident import validate_sql_ident
+from src.runner.services.progress import report_progress
+from src.runner.services.tracing import span
 
 logger = logging.getLogger("etl_runner")
 
 
-async def _pause_if_requested(ctx: ExecutionContext, pipeline_id: str) -> bool:
-    status = await ctx.pipelines.get_status(ctx.session, pipeline_id)
-    if status == PipelineStatus.PAUSE_REQUESTED.value:
-        await ctx.pipelines.apply_pause_requested(ctx.session, pipeline_id)  # commit inside
-        logger.info("Pause requested:" " pipeline id=%s -> PAUSED (after batch)", pipeline_id)
-        return True
-    return False
-
-
-async def run_tasks_incremental(ctx: ExecutionContext, p: PipelineSnapshot) -> tuple[int, int]:
+async def run_tasks_incremental(
+    ctx: ExecutionContext,
+    p: PipelineSnapshot,
+    *,
+    writer: Writer | None = None,
+    py_fns: Sequence[TransformFn] | None = None,
+) -> tuple[int, int]:
     if not p.tasks:
         raise ValueError("Tasks runner requires non-empty tasks")
     if p.mode != "incremental":
@@ -61,8 +60,10 @@ async def run_tasks_incremental(ctx: ExecutionContext, p: PipelineSnapshot) -> t
 
     p_view = replace(p, source_query=reader_sql, target_table=final_target)
 
-    writer = resolve_writer(p_view)
-    py_fns = [load_python_transform(t.body) for t in p.tasks[1:]]
+    if writer is None:
+        writer = resolve_writer(p_view)
+    if py_fns is None:
+        py_fns = [load_python_transform(t.body) for t in p.tasks[1:]]
 
     total_read = 0
     total_written = 0
@@ -89,43 +90,37 @@ async def run_tasks_incremental(ctx: ExecutionContext, p: PipelineSnapshot) -> t
             final_target,
         )
 
+        query = build_seek_query(reader_sql, inc_key=inc_key, id_key=id_key)
+
+        batch_no = 0
         while True:
-            params: dict[str, Any] = {"limit": batch_size}
-
-            if last_ts is None:
-                batch_sql = f"""
-                    SELECT * FROM ({reader_sql}) AS src
-                    ORDER BY src.{inc_key}, src.{id_key}
-                    LIMIT :limit
-                    """
-            else:
-                batch_sql = f"""
-                    SELECT * FROM ({reader_sql}) AS src
-                    WHERE (src.{inc_key} > :last_ts)
-                       OR (src.{inc_key} = :last_ts AND src.{id_key} > :last_id)
-                    ORDER BY src.{inc_key}, src.{id_key}
-                    LIMIT :limit
-                    """
-                params["last_ts"] = last_ts
-                params["last_id"] = last_id
-
-            res = await session.execute(text(batch_sql), params)
-            src_rows = [dict(r) for r in res.mappings().all()]
+            stmt, params = query.bind(last_ts, last_id, batch_size)
+
+            with span("fetch", batch_no=batch_no + 1) as s:
+                res = await session.execute(stmt, params)
+                src_rows = [dict(r) for r in res.mappings().all()]
+                s.set(rows=len(src_rows))
 
             if not src_rows:
                 logger.info("TASKS INC done: pipeline=%s (no more rows)", pname)
                 break
 
+            batch_no += 1
             total_read += len(src_rows)
 
             rows: list[dict[str, Any]] = src_rows
-            for fn in py_fns:
-                rows = await apply_transform(fn, rows)
-                if not rows:
-                    break
+            with span("transform", batch_no=batch_no, rows_in=len(rows), steps=len(py_fns)) as s:
+                for fn in py_fns:
+                    rows = await apply_transform(fn, rows)
+                    if not rows:
+                        break
+                s.set(rows=len(rows))
 
             if rows:
-                total_written += int(await writer.write(session, p_view, rows) or 0)
+                with span("write", batch_no=batch_no, rows=len(rows)) as s:
+                    written = int(await writer.write(session, p_view, rows) or 0)
+                    s.set(written=written)
+                total_written += written
 
             tail = src_rows[-1]
             if inc_key not in tail:
@@ -147,9 +142,15 @@ async def run_tasks_incremental(ctx: ExecutionContext, p: PipelineSnapshot) -> t
             last_ts = next_last_ts_any
             last_id = next_last_id
 
-            await state_repo.upsert(session, pid, last_value=last_ts.isoformat(), last_id=last_id)
-            await session.commit()
+            with span("commit", batch_no=batch_no):
+                await state_repo.upsert(
+                    session, pid, last_value=last_ts.isoformat(), last_id=last_id
+                )
+                await session.commit()
 
+            await report_progress(
+                ctx.progress, batch=batch_no, rows_read=total_read, rows_written=total_written
+            )
             if await _pause_if_requested(ctx, pid):
                 return total_read, total_written
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import importlib
 import inspect
 from collections.abc import Callable, Mapping, Sequence
@@ -23,9 +24,26 @@ def load_python_transform(dotted_path: str) -> TransformFn:
     return fn
 
 
-async def apply_transform(fn: TransformFn, rows: Sequence[RowIn]) -> list[RowOut]:
-    res = fn(rows)
+async def apply_transform(
+    fn: TransformFn, rows: Sequence[RowIn], *, in_thread: bool = False
+) -> list[RowOut]:
+    """Run `fn` on one batch.
+
+    With `in_thread` a sync transform (and the copy of its output) runs in a
+    worker thread, so it neither blocks the event loop nor serializes with
+    other transforms; coroutine functions are awaited directly either way.
+    """
+    if in_thread and not inspect.iscoroutinefunction(fn):
+        res = await asyncio.to_thread(_call_sync, fn, rows)
+    else:
+        res = fn(rows)
     if inspect.isawaitable(res):
         res = await res
 
     return [dict(r) for r in res]
+
+
+def _call_sync(fn: TransformFn, rows: Sequence[RowIn]) -> Any:
+    res = fn(rows)
+    # a generator would otherwise be consumed back on the event loop
+    return res if inspect.isawaitable(res) else list(res)
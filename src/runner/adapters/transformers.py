@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import importlib
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Protocol
 
 from src.runner.ports.pipeline import PipelineLike
@@ -21,15 +22,19 @@ class PythonCallableTransformer:
     dotted_path: str
     fn_name: str = "transform"
 
-    async def transform(self, pipeline: PipelineLike, rows: list[dict]) -> list[dict]:
+    @cached_property
+    def fn(self):
+        # resolved once per transformer instance (plans are cached per pipeline version)
         module = importlib.import_module(self.dotted_path)
         fn = getattr(module, self.fn_name, None)
         if fn is None:
             raise ValueError(
                 f"Python transformer not found:" f" {self.dotted_path}.{self.fn_name}()"
             )
+        return fn
 
-        result = fn(rows, pipeline=pipeline)
+    async def transform(self, pipeline: PipelineLike, rows: list[dict]) -> list[dict]:
+        result = self.fn(rows, pipeline=pipeline)
         # Allow a sync function, but if it returns an awaitable — await it.
         if hasattr(result, "__await__"):
             result = await result
@@ -1,18 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
 import os
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Protocol
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar, cast
 from uuid import UUID
 
-from elasticsearch import AsyncElasticsearch
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.core.constants import ES_TARGET_PREFIX, is_allowed_target
 from src.runner.ports.pipeline import PipelineLike
+from src.runner.services.db_errors import is_lock_contention
+from src.runner.services.rate_limit import SinkLimiter, sink_limiter
+from src.runner.services.tracing import span
+
+if TYPE_CHECKING:
+    from elasticsearch import AsyncElasticsearch
+
+logger = logging.getLogger("etl_runner")
+
+# retries of one request the sink pushed back on (ES 429, PG lock timeout)
+# before the batch fails
+MAX_PUSHBACK_RETRIES = 6
+
+T = TypeVar("T")
 
 
 class Writer(Protocol):
@@ -23,14 +41,58 @@ class Writer(Protocol):
         rows: list[dict],
     ) -> int: ...
 
+    async def delete(self, session: AsyncSession, pipeline: PipelineLike, keys: list[str]) -> int:
+        """Remove target rows/documents by their id key (used by CDC)."""
+        ...
+
     async def close(self) -> None: ...
 
 
+def _payload_bytes(limiter: SinkLimiter, rows: list[dict], *, traced: bool = False) -> int:
+    """Approximate request size; only computed when a bytes/sec limit applies
+    or the request is traced."""
+    if not (limiter.counts_bytes or traced):
+        return 0
+    return sum(len(json.dumps(r, default=str)) for r in rows)
+
+
 # ----------------------------
 # Postgres
 # ----------------------------
 
 
+async def _pg_execute(
+    session: AsyncSession, stmt: Any, params: Any, *, target: str, rows: list[dict] | None = None
+) -> Any:
+    """Execute a sink statement under the sink's limits.
+
+    The statement runs in a SAVEPOINT, so losing a lock wait (the data-plane
+    pool sets `lock_timeout`) or a deadlock rolls back only this statement:
+    the limiter backs off and the statement is retried in the same batch
+    transaction instead of failing the run.
+    """
+    limiter = sink_limiter(target)
+    n = len(rows) if rows is not None else 1
+    with span("sink", target=target, rows=n) as s:
+        nbytes = _payload_bytes(limiter, rows or [], traced=s.recording)
+        s.set(bytes=nbytes)
+        for attempt in range(1, MAX_PUSHBACK_RETRIES + 1):
+            async with limiter.slot(rows=n, nbytes=nbytes):
+                try:
+                    async with session.begin_nested():
+                        res = await session.execute(stmt, params)
+                except DBAPIError as exc:
+                    if not is_lock_contention(exc) or attempt == MAX_PUSHBACK_RETRIES:
+                        raise
+                    limiter.on_pushback()
+                else:
+                    limiter.on_success()
+                    s.set(attempts=attempt)
+                    return res
+            await asyncio.sleep(limiter.backoff(attempt))
+    raise AssertionError("unreachable")
+
+
 class PostgresWriter:
     async def write(
         self,
@@ -62,7 +124,7 @@ class PostgresWriter:
                 {"film_id": r["film_id"], "title": r["title"], "rating": r.get("rating")}
                 for r in rows
             ]
-            await session.execute(insert_sql, payload)
+            await _pg_execute(session, insert_sql, payload, target=target, rows=payload)
             return len(payload)
 
         if target == "analytics.film_rating_agg":
@@ -86,11 +148,35 @@ class PostgresWriter:
                 }
                 for r in rows
             ]
-            await session.execute(insert_sql, payload)
+            await _pg_execute(session, insert_sql, payload, target=target, rows=payload)
             return len(payload)
 
         raise ValueError(f"Unsupported target_table" f" for PostgresWriter: {target}")
 
+    async def delete(self, session: AsyncSession, pipeline: PipelineLike, keys: list[str]) -> int:
+        if not keys:
+            return 0
+
+        target = (pipeline.target_table or "").strip()
+
+        if not is_allowed_target(target):
+            raise ValueError(f"target_table '{target}' is not allowed")
+
+        # both analytics targets are keyed by film_id UUID
+        if target == "analytics.film_dim":
+            delete_sql = text(
+                "DELETE FROM analytics.film_dim WHERE film_id = ANY(CAST(:ids AS uuid[]))"
+            )
+        elif target == "analytics.film_rating_agg":
+            delete_sql = text(
+                "DELETE FROM analytics.film_rating_agg WHERE film_id = ANY(CAST(:ids AS uuid[]))"
+            )
+        else:
+            raise ValueError(f"Unsupported target_table" f" for PostgresWriter: {target}")
+
+        res = await _pg_execute(session, delete_sql, {"ids": list(keys)}, target=target)
+        return int(getattr(res, "rowcount", 0) or 0)
+
     async def close(self) -> None:
         pass
 
@@ -129,7 +215,8 @@ def _jsonify(v):
     return v
 
 
-def _normalize_row(row: dict) -> dict:
+def normalize_row(row: dict) -> dict:
+    """JSON-ready copy of a row (UUIDs and datetimes as strings, Decimals as floats)."""
     d = dict(row)  # RowMapping -> dict
     return {k: _jsonify(val) for k, val in d.items()}
 
@@ -149,6 +236,9 @@ class ElasticsearchWriter:
 
     async def _get_client(self) -> AsyncElasticsearch:
         if self._client is None:
+            # imported on first use: runners with Postgres sinks only never load it
+            from elasticsearch import AsyncElasticsearch
+
             self._client = AsyncElasticsearch(
                 hosts=[self._cfg.url],
                 basic_auth=self._auth(),
@@ -228,9 +318,9 @@ class ElasticsearchWriter:
             await self._ensure_index(client, index)
             self._ensured.add(index)
 
-        ops: list[dict] = []
+        actions: list[list[dict]] = []
         for raw in rows:
-            r = _normalize_row(raw)
+            r = normalize_row(raw)
 
             if id_field not in r:
                 raise ValueError(
@@ -239,33 +329,270 @@ class ElasticsearchWriter:
 
             _id = str(r[id_field])
 
-            ops.append({"update": {"_index": index, "_id": _id}})
-            ops.append({"doc": r, "doc_as_upsert": True})
+            actions.append(
+                [{"update": {"_index": index, "_id": _id}}, {"doc": r, "doc_as_upsert": True}]
+            )
 
-        resp = await client.bulk(operations=ops, refresh=False)
+        items = await self._bulk(client, target, actions)
 
-        if resp.get("errors"):
-            items = resp.get("items") or []
-            first_err = None
-            for it in items:
-                v = it.get("update") or it.get("index") or it.get("create") or it.get("delete")
-                if v and v.get("error"):
-                    first_err = v
-                    break
+        first_err = next((v for v in items if v.get("error")), None)
+        if first_err is not None:
             raise RuntimeError(f"Elasticsearch bulk errors=True." f" first_error={first_err!r}")
 
         return len(rows)
 
+    async def _bulk(
+        self, client: AsyncElasticsearch, target: str, actions: list[list[dict]]
+    ) -> list[dict]:
+        """Send bulk actions under the sink's limits; one result item per action.
+
+        Requests rejected as a whole with 429, and single items rejected with
+        429 (full write queues), are retried after the limiter backed off.
+        Other item errors are returned to the caller.
+        """
+        from elasticsearch import ApiError
+
+        limiter = sink_limiter(target)
+        results: list[dict | None] = [None] * len(actions)
+        pending = list(range(len(actions)))
+
+        with span("sink", target=target, rows=len(actions)) as s:
+            for attempt in range(1, MAX_PUSHBACK_RETRIES + 1):
+                ops = [op for i in pending for op in actions[i]]
+                nbytes = _payload_bytes(limiter, ops, traced=s.recording)
+                s.set(bytes=nbytes, attempts=attempt)
+                async with limiter.slot(rows=len(pending), nbytes=nbytes):
+                    try:
+                        resp = await client.bulk(operations=ops, refresh=False)
+                    except ApiError as exc:
+                        if exc.status_code != 429 or attempt == MAX_PUSHBACK_RETRIES:
+                            raise
+                        resp = None
+
+                rejected: list[int] = []
+                if resp is not None:
+                    for i, it in zip(pending, resp.get("items") or [], strict=False):
+                        v: dict = next(iter(it.values()), {}) if it else {}
+                        if v.get("status") == 429 and attempt < MAX_PUSHBACK_RETRIES:
+                            rejected.append(i)
+                        else:
+                            results[i] = v
+                else:
+                    rejected = pending
+
+                if not rejected:
+                    limiter.on_success()
+                    return [r or {} for r in results]
+
+                limiter.on_pushback()
+                logger.warning(
+                    "Elasticsearch %s rejected %d/%d actions (429), retry %d/%d",
+                    target,
+                    len(rejected),
+                    len(pending),
+                    attempt,
+                    MAX_PUSHBACK_RETRIES - 1,
+                )
+                pending = rejected
+                await asyncio.sleep(limiter.backoff(attempt))
+
+        raise AssertionError("unreachable")
+
+    async def delete(self, session: AsyncSession, pipeline: PipelineLike, keys: list[str]) -> int:
+        if not keys:
+            return 0
+
+        target = (pipeline.target_table or "").strip()
+
+        if not is_allowed_target(target):
+            raise ValueError(f"target_table '{target}' is not allowed")
+
+        index = self._index_from_target(target)
+        client = await self._get_client()
+
+        actions = [[{"delete": {"_index": index, "_id": str(k)}}] for k in keys]
+        items = await self._bulk(client, target, actions)
+
+        deleted = 0
+        for v in items:
+            if v.get("result") == "deleted":
+                deleted += 1
+            elif v.get("error") and v.get("status") != 404:
+                raise RuntimeError(f"Elasticsearch bulk delete failed. first_error={v!r}")
+        return deleted
+
 
 # ----------------------------
-# Resolver
+# Fan-out
 # ----------------------------
 
 
-def resolve_writer(pipeline: PipelineLike) -> Writer:
-    target = (pipeline.target_table or "").strip()
+class _TargetView:
+    """The pipeline as seen by one sink: same definition, different target_table."""
+
+    __slots__ = ("_pipeline", "target_table")
+
+    def __init__(self, pipeline: PipelineLike, target: str) -> None:
+        self._pipeline = pipeline
+        self.target_table = target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pipeline, name)
 
+
+async def _all_or_cancel(aws: list[Awaitable[T]]) -> list[T]:
+    """gather() that cancels the remaining sinks as soon as one fails."""
+    tasks = [asyncio.ensure_future(a) for a in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class FanOutWriter:
+    """Write each batch to several sinks; succeeds only when every sink did.
+
+    Postgres sinks share the run's session (an AsyncSession is not safe for
+    concurrent use), so they run one after another inside the batch
+    transaction, while Elasticsearch sinks run concurrently with them and with
+    each other. Callers commit the checkpoint after `write` returns, i.e. after
+    every sink acknowledged the batch.
+    """
+
+    def __init__(self, sinks: list[tuple[str, Writer]]) -> None:
+        if not sinks:
+            raise ValueError("FanOutWriter needs at least one sink")
+        self._sinks = sinks
+
+    @property
+    def targets(self) -> list[str]:
+        return [t for t, _ in self._sinks]
+
+    async def _each(
+        self, call: Callable[[Writer, PipelineLike], Awaitable[int]], pipeline: PipelineLike
+    ) -> list[int]:
+        pg = [(w, t) for t, w in self._sinks if not t.startswith(ES_TARGET_PREFIX)]
+        es = [(w, t) for t, w in self._sinks if t.startswith(ES_TARGET_PREFIX)]
+
+        def view(target: str) -> PipelineLike:
+            return cast(PipelineLike, _TargetView(pipeline, target))
+
+        async def pg_chain() -> list[int]:
+            return [int(await call(w, view(t)) or 0) for w, t in pg]
+
+        async def es_one(w: Writer, t: str) -> list[int]:
+            return [int(await call(w, view(t)) or 0)]
+
+        results = await _all_or_cancel([pg_chain(), *[es_one(w, t) for w, t in es]])
+        return [n for part in results for n in part]
+
+    async def write(self, session: AsyncSession, pipeline: PipelineLike, rows: list[dict]) -> int:
+        if not rows:
+            return 0
+        counts = await self._each(lambda w, p: w.write(session, p, rows), pipeline)
+        # rows acknowledged by every sink
+        return min(counts)
+
+    async def delete(self, session: AsyncSession, pipeline: PipelineLike, keys: list[str]) -> int:
+        if not keys:
+            return 0
+        counts = await self._each(lambda w, p: w.delete(session, p, keys), pipeline)
+        # sinks may disagree on what existed; report the most that was removed anywhere
+        return max(counts)
+
+    async def close(self) -> None:
+        results = await asyncio.gather(*(w.close() for _, w in self._sinks), return_exceptions=True)
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+
+
+class BranchWriter:
+    """Write the outputs of a task DAG batch, each task's rows to its own sink.
+
+    As with FanOutWriter, a batch succeeds only when every sink did: sinks
+    that write to Postgres share the run's session and run one after another
+    inside the batch transaction, Elasticsearch-only sinks run concurrently.
+    """
+
+    def __init__(self, sinks: list[tuple[int, str, Writer, bool]]) -> None:
+        # (task order_index, target, writer, uses the session)
+        self._sinks = sinks
+
+    @property
+    def targets(self) -> list[str]:
+        return list(dict.fromkeys(t for _, t, _, _ in self._sinks))
+
+    async def write(
+        self, session: AsyncSession, pipeline: PipelineLike, outputs: Mapping[int, list[dict]]
+    ) -> int:
+        pending = [s for s in self._sinks if outputs.get(s[0])]
+
+        def view(target: str) -> PipelineLike:
+            return cast(PipelineLike, _TargetView(pipeline, target))
+
+        async def pg_chain() -> int:
+            written = 0
+            for i, t, w, uses_session in pending:
+                if uses_session:
+                    written += int(await w.write(session, view(t), outputs[i]) or 0)
+            return written
+
+        async def es_one(i: int, t: str, w: Writer) -> int:
+            return int(await w.write(session, view(t), outputs[i]) or 0)
+
+        results = await _all_or_cancel(
+            [pg_chain(), *[es_one(i, t, w) for i, t, w, pg in pending if not pg]]
+        )
+        return sum(results)
+
+    async def close(self) -> None:
+        results = await asyncio.gather(
+            *(w.close() for _, _, w, _ in self._sinks), return_exceptions=True
+        )
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+
+
+# ----------------------------
+# Resolver
+# ----------------------------
+
+
+def _writer_for(target: str) -> Writer:
     if target.startswith(ES_TARGET_PREFIX):
         return ElasticsearchWriter(_load_es_config())
 
     return PostgresWriter()
+
+
+def resolve_writer(pipeline: PipelineLike) -> Writer:
+    target = (pipeline.target_table or "").strip()
+    extra = [t.strip() for t in (getattr(pipeline, "extra_targets", None) or ())]
+    if not extra:
+        return _writer_for(target)
+
+    targets = list(dict.fromkeys([target, *extra]))
+    for t in targets:
+        if not is_allowed_target(t):
+            raise ValueError(f"target_table '{t}' is not allowed")
+
+    # one writer per sink: each ES writer owns its client
+    return FanOutWriter([(t, _writer_for(t)) for t in targets])
+
+
+def resolve_branch_writer(pipeline: PipelineLike, sinks: list[tuple[int, str]]) -> BranchWriter:
+    """One writer per (task, target); the pipeline's own target keeps its extra_targets."""
+    default = (pipeline.target_table or "").strip()
+    extra = [t.strip() for t in (getattr(pipeline, "extra_targets", None) or ())]
+    resolved: list[tuple[int, str, Writer, bool]] = []
+    for idx, target in sinks:
+        targets = [target, *extra] if target == default else [target]
+        writer = resolve_writer(pipeline) if target == default else _writer_for(target)
+        uses_session = any(not t.startswith(ES_TARGET_PREFIX) for t in targets)
+        resolved.append((idx, target, writer, uses_session))
+    return BranchWriter(resolved)
@@ -2,23 +2,48 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from logging.handlers import QueueListener
 from typing import NoReturn
 
 from sqlalchemy import text
 
-from infra.db import async_session_factory, engine
+from infra.db import (
+    async_session_factory,
+    data_engine,
+    data_session_factory,
+    dispose_engines,
+    engine,
+    pool_metrics,
+)
+from src.app.core.cdc_slots import orphaned_slots
+from src.config import get_settings
+from src.runner.orchestration.fair_share import FairShare
 from src.runner.orchestration.manager import PipelineManager
+from src.runner.orchestration.retention import RunHistoryMaintenance
+from src.runner.orchestration.scheduler import CronScheduler
 from src.runner.repos.pipelines import PipelinesRepo
 from src.runner.repos.runs import RunsRepo
 from src.runner.services.db_errors import is_db_disconnect
+from src.runner.services.hash_join import JoinLimits, configure_join_limits
+from src.runner.services.pause_signals import PauseWatcher
+from src.runner.services.rate_limit import configure_sink_limits, parse_sink_limits
+from src.runner.services.structured_log import configure_logging
+from src.runner.services.tracing import build_tracer, configure_tracing, shutdown_tracing
+from src.runner.services.warmup import StartupTimer
 
 logger = logging.getLogger("etl_runner")
 
 
-def setup_logging() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] [runner] %(message)s",
+def loop_time() -> float:
+    return asyncio.get_running_loop().time()
+
+
+def setup_logging() -> QueueListener:
+    settings = get_settings()
+    return configure_logging(
+        fmt=settings.runner_log_format,
+        batch_interval=settings.runner_log_batch_interval,
     )
 
 
@@ -34,6 +59,23 @@ async def _check_db_connection() -> None:
         _ = result.scalar_one()
 
 
+async def check_cdc_slots() -> list[str]:
+    """Warn about replication slots no cdc pipeline uses (deleted pipelines).
+
+    They keep WAL on the source until dropped; they are never dropped here,
+    as they may belong to something else.
+    """
+    async with async_session_factory() as session:
+        slots = await orphaned_slots(session)
+    if slots:
+        logger.warning(
+            "Replication slots not used by any cdc pipeline keep WAL on the source: %s."
+            " Drop them with pg_drop_replication_slot() if they are not needed",
+            ", ".join(slots),
+        )
+    return slots
+
+
 async def wait_for_db(
     *,
     attempts: int = 10,
@@ -59,12 +101,14 @@ async def wait_for_db(
     raise last_exc  # type: ignore[misc]
 
 
-async def main_loop(poll_interval: float = 5.0) -> NoReturn:
+async def main_loop(poll_interval: float = 5.0, *, timer: StartupTimer | None = None) -> NoReturn:
     logger.info("ETL Runner starting up...")
+    timer = timer or StartupTimer()
 
     # --- startup ---
     await wait_for_db()
     logger.info("Startup checks passed")
+    timer.mark("db")
 
     pipelines_repo = PipelinesRepo()
     runs_repo = RunsRepo()
@@ -90,33 +134,136 @@ async def main_loop(poll_interval: float = 5.0) -> NoReturn:
             )
         else:
             logger.info("No stuck RUNNING pipelines found (recovery not needed)")
+    try:
+        await check_cdc_slots()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Cannot check replication slots: %r", exc)
+    timer.mark("recovery")
 
     logger.info("Entering main loop with" " poll_interval=%s seconds", poll_interval)
 
-    manager = PipelineManager(async_session_factory)
+    pause_watcher = PauseWatcher(
+        async_session_factory,
+        pipelines=pipelines_repo,
+        interval=get_settings().runner_pause_poll_interval,
+    )
+    await pause_watcher.start()
+
+    settings = get_settings()
+    configure_sink_limits(parse_sink_limits(settings.runner_sink_limits))
+    configure_join_limits(
+        JoinLimits(
+            memory_bytes=settings.runner_join_memory_mb * 1024 * 1024,
+            spill_dir=settings.runner_join_spill_dir or None,
+        )
+    )
+    manager = PipelineManager(
+        async_session_factory,
+        data_session_factory=data_session_factory,
+        pause_watcher=pause_watcher,
+        seek_preflight=settings.runner_seek_preflight,
+        seek_index_autocreate=settings.runner_seek_index_autocreate,
+        progress_interval=settings.runner_progress_notify_interval,
+        branch_concurrency=settings.runner_task_branch_concurrency,
+        fair_share=FairShare(
+            max_slots=settings.runner_max_concurrency,
+            reserved_slots=settings.runner_reserved_light_slots,
+            half_life=settings.runner_fair_share_half_life,
+            heavy_seconds=settings.runner_heavy_usage_seconds,
+        ),
+    )
+    scheduler = (
+        CronScheduler(
+            async_session_factory,
+            pipelines=pipelines_repo,
+            refresh_interval=settings.runner_schedule_refresh_interval,
+            misfire_grace=settings.runner_schedule_misfire_grace,
+        )
+        if settings.runner_scheduler_enabled
+        else None
+    )
+    history = RunHistoryMaintenance(
+        async_session_factory,
+        retention_days=settings.runner_run_retention_days,
+        months_ahead=settings.runner_run_partitions_ahead,
+        interval=settings.runner_history_maintenance_interval,
+    )
+    timer.mark("setup")
+
+    if settings.runner_warmup_enabled:
+        report = await manager.warm_up(
+            engines=[
+                (engine, min(settings.db_control_pool_size, settings.runner_max_concurrency)),
+                (data_engine, min(settings.db_data_pool_size, settings.runner_max_concurrency)),
+            ],
+            max_plans=settings.runner_warmup_max_plans,
+        )
+        logger.info(
+            "Warm-up: connections=%d plans=%d failed=%d",
+            report.connections,
+            report.plans,
+            report.failed,
+        )
+        timer.mark("warmup")
+
+    logger.info("Runner ready in %.3fs (%s)", timer.total, timer.summary())
+
+    metrics_every = settings.runner_pool_metrics_interval
+    last_metrics = loop_time()
 
     # --- main loop ---
-    while True:
-        try:
-            await manager.tick()
-        except Exception as exc:
-            if is_db_disconnect(exc):
-                logger.warning("DB disconnected during tick." " Will retry next tick. err=%r", exc)
+    try:
+        while True:
+            if scheduler is not None:
+                try:
+                    await scheduler.tick()
+                except Exception as exc:
+                    # dispatch of already requested runs goes on regardless
+                    if is_db_disconnect(exc):
+                        logger.warning("DB disconnected during schedule tick. err=%r", exc)
+                    else:
+                        logger.exception("Error during schedule tick")
+            try:
+                await manager.tick()
+                if await history.tick():
+                    await check_cdc_slots()
+            except Exception as exc:
+                if is_db_disconnect(exc):
+                    logger.warning(
+                        "DB disconnected during tick." " Will retry next tick. err=%r", exc
+                    )
+
+                    await asyncio.sleep(1.0)
+                else:
+                    logger.exception("Error during runner tick")
 
-                await asyncio.sleep(1.0)
-            else:
-                logger.exception("Error during runner tick")
-        await asyncio.sleep(poll_interval)
+            if metrics_every > 0 and loop_time() - last_metrics >= metrics_every:
+                last_metrics = loop_time()
+                logger.info("DB pool metrics: %s", pool_metrics())
+
+            await asyncio.sleep(poll_interval)
+    finally:
+        await manager.aclose()
+        await pause_watcher.stop()
 
 
 async def main() -> None:
-    setup_logging()
+    timer = StartupTimer()
+    # CPU time of interpreter start and module imports (before any timer could run)
+    imports_cpu = time.process_time()
+    log_listener = setup_logging()
+    settings = get_settings()
+    configure_tracing(build_tracer(settings.runner_trace_exporter, path=settings.runner_trace_file))
+    logger.info("Runner imports took %.3fs CPU", imports_cpu)
+    timer.mark("init")
     try:
-        await main_loop()
+        await main_loop(timer=timer)
     finally:
         # important: always dispose the connection pool
-        logger.info("Disposing DB engine...")
-        await engine.dispose()
+        logger.info("Disposing DB engines...")
+        await dispose_engines()
+        shutdown_tracing()
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.runner.repos.pipelines import PipelinesRepo
 from src.runner.repos.runs import RunsRepo
 from src.runner.repos.state import StateRepo
+from src.runner.services.pause_signals import PauseWatcher
+from src.runner.services.progress import ProgressReporter
 
 
 @dataclass(frozen=True, slots=True)
@@ -16,3 +18,5 @@ class ExecutionContext:
     runs: RunsRepo
     pipelines: PipelinesRepo
     state: StateRepo
+    pause: PauseWatcher | None = None
+    progress: ProgressReporter | None = None
@@ -11,6 +11,8 @@ from src.runner.orchestration.executor import PipelineExecutor, short_db_error
 from src.runner.repos.pipelines import PipelinesRepo
 from src.runner.services.db_errors import is_db_disconnect
 from src.runner.services.pipeline_snapshot import PipelineSnapshot, snapshot_pipeline_with_tasks
+from src.runner.services.plan_cache import PlanCache
+from src.runner.services.tracing import span
 
 logger = logging.getLogger("etl_runner")
 
@@ -26,13 +28,32 @@ class PipelineDispatcher:
         pipelines: PipelinesRepo,
         max_attempts: int = 3,
         backoff_seconds: tuple[float, ...] = (1, 2, 4),
+        plans: PlanCache | None = None,
     ) -> None:
         self._executor = executor
         self._pipelines = pipelines
         self._max_attempts = max_attempts
         self._backoff_seconds = backoff_seconds
+        self._plans = plans
+
+    async def _load_snapshot(self, session: AsyncSession, claimed: EtlPipeline) -> PipelineSnapshot:
+        """Return the pipeline snapshot, skipping the tasks query on a cache hit."""
+        version = int(getattr(claimed, "version", 0) or 0)
+        if self._plans is not None and version:
+            cached = self._plans.get_snapshot(str(claimed.id), version)
+            if cached is not None:
+                return cached
+
+        snap = await snapshot_pipeline_with_tasks(session, claimed)
+        if self._plans is not None:
+            self._plans.put_snapshot(snap)
+        return snap
 
     async def dispatch(self, session: AsyncSession, pipeline: EtlPipeline) -> None:
+        with span("dispatch", pipeline_id=str(pipeline.id), status=pipeline.status):
+            await self._dispatch(session, pipeline)
+
+    async def _dispatch(self, session: AsyncSession, pipeline: EtlPipeline) -> None:
         # 1) PAUSE_REQUESTED -> PAUSED
         if pipeline.status == PipelineStatus.PAUSE_REQUESTED.value:
             await self._pipelines.apply_pause_requested(session, pipeline.id)
@@ -40,18 +61,30 @@ class PipelineDispatcher:
 
         # 2) RUN_REQUESTED -> RUNNING (claim)
         if pipeline.status == PipelineStatus.RUN_REQUESTED.value:
-            claimed = await self._pipelines.claim_run_requested(session, pipeline.id)
+            with span("claim") as s:
+                claimed = await self._pipelines.claim_run_requested(session, pipeline.id)
+                s.set(claimed=claimed is not None)
             if claimed is None:
                 return  # claimed by another runner
 
-            snap: PipelineSnapshot = await snapshot_pipeline_with_tasks(session, claimed)
+            with span("snapshot") as s:
+                snap: PipelineSnapshot = await self._load_snapshot(session, claimed)
+                s.set(tasks=len(snap.tasks))
             logger.info("Pipeline snapshot: id=%s tasks=%d", snap.id, len(snap.tasks))
             pid = snap.id
             pname = snap.name
 
+            # profiled runs are requested through the API (profile_runs countdown);
+            # one request profiles the first attempt only, retries run unprofiled
+            profile = None
+            if int(getattr(claimed, "profile_runs", 0) or 0) > 0:
+                profile = await self._pipelines.take_profile_request(session, pid)
+
             for attempt in range(1, self._max_attempts + 1):
                 try:
-                    await self._executor.execute(session, snap, attempt=attempt)
+                    await self._executor.execute(
+                        session, snap, attempt=attempt, profile=profile if attempt == 1 else None
+                    )
 
                     status = await self._pipelines.get_status(session, pid)
 
@@ -2,23 +2,26 @@ from __future__ import annotations
 
 import logging
 import os
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.runner.adapters.sql_full import run_sql_full_pipeline
-from src.runner.adapters.sql_incremental import run_sql_incremental_pipeline
-from src.runner.adapters.tasks_full import run_tasks_full
-from src.runner.adapters.tasks_incremental import run_tasks_incremental
+from src.runner.adapters.fingerprints import FingerprintWriter, fingerprint_scope
+from src.runner.adapters.registry import load_adapter
 from src.runner.orchestration.context import ExecutionContext
 from src.runner.ports.pipeline import PipelineLike
 from src.runner.repos.pipelines import PipelinesRepo
 from src.runner.repos.runs import RunsRepo
 from src.runner.repos.state import StateRepo
 from src.runner.services.db_errors import is_db_disconnect
-from src.runner.services.logctx import ctx_prefix
-from src.runner.services.task_plan import validate_tasks_v1
+from src.runner.services.logctx import bind_log_context, ctx_fields, ctx_prefix
+from src.runner.services.pause_signals import PauseWatcher
+from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from src.runner.services.plan_cache import PipelinePlan, PlanCache, build_plan
+from src.runner.services.profiling import ProfileArtifact, ProfileCapture, profile_run
+from src.runner.services.progress import ProgressReporter
+from src.runner.services.seek_explain import seek_preflight
+from src.runner.services.tracing import span
 
 LOG_TRACEBACKS = os.getenv("ETL_LOG_TRACEBACKS", "0") == "1"
 logger = logging.getLogger("etl_runner")
@@ -42,20 +45,38 @@ def short_db_error(exc: Exception) -> str:
 class ExecutionResult:
     rows_read: int
     rows_written: int
-
-
-RunnerFn = Callable[[ExecutionContext, PipelineLike], Awaitable[tuple[int, int]]]
+    rows_skipped: int = 0
 
 
 class PipelineExecutor:
-    def __init__(self, *, runs: RunsRepo, pipelines: PipelinesRepo, state: StateRepo) -> None:
+    def __init__(
+        self,
+        *,
+        runs: RunsRepo,
+        pipelines: PipelinesRepo,
+        state: StateRepo,
+        pause: PauseWatcher | None = None,
+        plans: PlanCache | None = None,
+        data_session_factory=None,
+        seek_preflight: bool = False,
+        seek_index_autocreate: bool = False,
+        progress_interval: float = 0.0,
+        branch_concurrency: int = 4,
+    ) -> None:
         self._runs = runs
         self._pipelines = pipelines
         self._state = state
-        self._strategies: dict[str, RunnerFn] = {
-            "full": run_sql_full_pipeline,
-            "incremental": run_sql_incremental_pipeline,
-        }
+        self._pause = pause
+        self._plans = plans
+        # batch reads/writes/checkpoints go to the data-plane pool when provided;
+        # run bookkeeping always stays on the caller's (control-plane) session
+        self._data_session_factory = data_session_factory
+        self._seek_preflight = seek_preflight
+        self._seek_index_autocreate = seek_index_autocreate
+        # seconds between progress NOTIFYs of a run (0 disables them)
+        self._progress_interval = progress_interval
+        # transforms of one task DAG batch running at the same time
+        self._branch_concurrency = branch_concurrency
 
     async def execute(
         self,
@@ -63,76 +84,184 @@ class PipelineExecutor:
         pipeline: PipelineLike,
         *,
         attempt: int | None = None,
+        profile: str | None = None,
     ) -> ExecutionResult:
         pid = str(pipeline.id)
         pname = str(getattr(pipeline, "name", pid))
 
         run_id = await self._runs.start_run(session, pipeline_id=pid)
         ctx_str = ctx_prefix(pid=pid, pname=pname, rid=str(run_id), attempt=attempt)
+        # structured logs of this run (and its adapters) carry the same fields
+        log_fields = ctx_fields(pid=pid, pname=pname, rid=str(run_id), attempt=attempt)
 
-        logger.info("%s run started", ctx_str)
+        with (
+            bind_log_context(**log_fields),
+            span("execute", pipeline_id=pid, run_id=str(run_id), attempt=attempt) as run_span,
+        ):
+            logger.info("%s run started", ctx_str)
 
-        ctx = ExecutionContext(
-            session=session,
-            run_id=run_id,
-            runs=self._runs,
-            pipelines=self._pipelines,
-            state=self._state,
-        )
+            capture: ProfileCapture | None = None
+            try:
+                async with profile_run(profile) as capture:
+                    result = await self._run_on_data_session(session, run_id, pipeline)
 
-        try:
-            rows_read, rows_written = await self._run_body(ctx, pipeline)
+                await self._runs.finish_success(
+                    session,
+                    run_id=run_id,
+                    rows_read=result.rows_read,
+                    rows_written=result.rows_written,
+                    rows_skipped=result.rows_skipped,
+                )
 
-            await self._runs.finish_success(
-                session,
-                run_id=run_id,
-                rows_read=int(rows_read),
-                rows_written=int(rows_written),
-            )
+                logger.info(
+                    "%s run finished SUCCESS read=%d written=%d skipped=%d",
+                    ctx_str,
+                    result.rows_read,
+                    result.rows_written,
+                    result.rows_skipped,
+                )
+                run_span.set(
+                    rows_read=result.rows_read,
+                    rows_written=result.rows_written,
+                    rows_skipped=result.rows_skipped,
+                )
+                return result
 
-            logger.info(
-                "%s run finished SUCCESS read=%d written=%d",
-                ctx_str,
-                int(rows_read),
-                int(rows_written),
-            )
-            return ExecutionResult(rows_read=int(rows_read), rows_written=int(rows_written))
+            except Exception as exc:
+                if is_db_disconnect(exc):
+                    logger.warning(
+                        "DB disconnected during execution."
+                        " Leaving pipeline RUNNING for recovery. %s err=%s",
+                        ctx_str,
+                        short_db_error(exc),
+                    )
+                    raise
 
-        except Exception as exc:
-            if is_db_disconnect(exc):
-                logger.warning(
-                    "DB disconnected during execution."
-                    " Leaving pipeline RUNNING for recovery. %s err=%s",
+                logger.error(
+                    "Execution failed: %s err=%s",
                     ctx_str,
                     short_db_error(exc),
+                    exc_info=LOG_TRACEBACKS,
                 )
+
+                await session.rollback()
+
+                # resolved writer/transform objects may be in a bad state; rebuild on retry
+                if self._plans is not None:
+                    self._plans.discard_plan(pid)
+
+                err_text = _cap(f"{type(exc).__name__}: {short_db_error(exc)}")
+                await self._runs.finish_failed(session, run_id=run_id, error_message=err_text)
+
                 raise
 
-            logger.error(
-                "Execution failed: %s err=%s",
-                ctx_str,
-                short_db_error(exc),
-                exc_info=LOG_TRACEBACKS,
-            )
+            finally:
+                if capture is not None and capture.artifact is not None:
+                    await self._save_profile(session, run_id, pid, capture.artifact)
 
+    async def _save_profile(
+        self, session: AsyncSession, run_id: str, pipeline_id: str, artifact: ProfileArtifact
+    ) -> None:
+        # best effort: a lost profile never changes the outcome of the run
+        try:
+            await self._runs.save_profile(
+                session, run_id=run_id, pipeline_id=pipeline_id, artifact=artifact
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Saving run profile failed run=%s: %r", run_id, exc)
             await session.rollback()
+        else:
+            logger.info(
+                "Run profile saved run=%s mode=%s samples=%d size=%d",
+                run_id,
+                artifact.mode,
+                artifact.samples,
+                len(artifact.data),
+            )
+
+    async def _run_on_data_session(
+        self, session: AsyncSession, run_id: str, pipeline: PipelineLike
+    ) -> ExecutionResult:
+        progress = None
+        if self._progress_interval > 0:
+            progress = ProgressReporter(
+                session,
+                pipeline_id=str(pipeline.id),
+                run_id=run_id,
+                min_interval=self._progress_interval,
+            )
+
+        if self._data_session_factory is None:
+            ctx = self._context(session, run_id, progress=progress)
+            return await self._run_planned(session, ctx, pipeline)
+
+        # closing the session rolls back an unfinished batch on failure
+        async with self._data_session_factory() as data_session:
+            ctx = self._context(data_session, run_id, progress=progress)
+            return await self._run_planned(session, ctx, pipeline)
+
+    async def _run_planned(
+        self, session: AsyncSession, ctx: ExecutionContext, pipeline: PipelineLike
+    ) -> ExecutionResult:
+        plan = self._plan_for(pipeline)
+        if self._seek_preflight and plan.snapshot.mode == "incremental":
+            summary = await seek_preflight(
+                ctx, plan.snapshot, create_index=self._seek_index_autocreate
+            )
+            if summary is not None:
+                await self._runs.set_plan_summary(
+                    session, run_id=ctx.run_id, summary=summary.as_dict()
+                )
+
+        plan, fingerprints = self._with_fingerprints(plan)
+        rows_read, rows_written = await self._run_body(ctx, plan)
+        return ExecutionResult(
+            rows_read=int(rows_read),
+            rows_written=int(rows_written),
+            rows_skipped=fingerprints.skipped if fingerprints is not None else 0,
+        )
+
+    def _with_fingerprints(
+        self, plan: PipelinePlan
+    ) -> tuple[PipelinePlan, FingerprintWriter | None]:
+        """Wrap the (cached) plan writer in a per-run FingerprintWriter if enabled."""
+        snap = plan.snapshot
+        if not snap.skip_unchanged or plan.writer is None:
+            return plan, None
+
+        target = (snap.tasks[-1].target_table if snap.tasks else None) or snap.target_table
+        writer = FingerprintWriter(
+            plan.writer,
+            pipeline_id=snap.id,
+            scope=fingerprint_scope(replace(snap, target_table=target)),
+        )
+        return replace(plan, writer=writer), writer
+
+    def _context(
+        self, session: AsyncSession, run_id: str, *, progress: ProgressReporter | None = None
+    ) -> ExecutionContext:
+        return ExecutionContext(
+            session=session,
+            run_id=run_id,
+            runs=self._runs,
+            pipelines=self._pipelines,
+            state=self._state,
+            pause=self._pause,
+            progress=progress,
+        )
+
+    def _plan_for(self, pipeline: PipelineLike) -> PipelinePlan:
+        snap: PipelineSnapshot = pipeline  # type: ignore[assignment]
+        if self._plans is not None:
+            return self._plans.get_plan(snap)
+        return build_plan(snap)
 
-            err_text = _cap(f"{type(exc).__name__}: {short_db_error(exc)}")
-            await self._runs.finish_failed(session, run_id=run_id, error_message=err_text)
-
-            raise
-
-    async def _run_body(self, ctx: ExecutionContext, pipeline: PipelineLike) -> tuple[int, int]:
-        tasks = getattr(pipeline, "tasks", ())
-        if tasks:
-            snap = validate_tasks_v1(pipeline)  # type: ignore[arg-type]
-            if snap.mode == "full":
-                return await run_tasks_full(ctx, snap)
-            if snap.mode == "incremental":
-                return await run_tasks_incremental(ctx, snap)
-            raise ValueError(f"Unsupported pipeline.mode: {snap.mode!r}")
-
-        runner = self._strategies.get(pipeline.mode)
-        if runner is None:
-            raise ValueError(f"Unsupported pipeline.mode: {pipeline.mode!r}")
-        return await runner(ctx, pipeline)
+    async def _run_body(self, ctx: ExecutionContext, plan: PipelinePlan) -> tuple[int, int]:
+        snap = plan.snapshot
+        if plan.dag is not None:
+            adapter = load_adapter(snap.mode, kind="dag")
+            return await adapter(ctx, snap, dag=plan.dag, concurrency=self._branch_concurrency)
+        adapter = load_adapter(snap.mode, kind="tasks" if snap.tasks else "sql")
+        if snap.tasks:
+            return await adapter(ctx, snap, writer=plan.writer, py_fns=plan.task_fns)
+        return await adapter(ctx, snap, transformer=plan.transformer, writer=plan.writer)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+# candidates are EtlPipeline rows (anything with id, name and priority)
+C = TypeVar("C")
+
+
+@dataclass(slots=True)
+class _Usage:
+    seconds: float
+    at: float
+
+
+class FairShare:
+    """Weighted fair-share ordering by recently consumed runtime.
+
+    Every finished dispatch adds its wall time to the pipeline's usage, which
+    decays exponentially with `half_life` seconds. Candidates are ordered by
+    usage divided by `priority` (the weight), so a pipeline that just ran for
+    an hour yields to ones that have not, and a pipeline with twice the
+    priority may consume twice the runtime before it does.
+
+    Pipelines whose decayed usage exceeds `heavy_seconds` are "heavy"; they
+    may occupy at most `max_slots - reserved_slots` of the concurrency slots,
+    so small frequent pipelines always find a free slot next to backfills.
+    State is per runner process and in memory only.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_slots: int = 4,
+        reserved_slots: int = 1,
+        half_life: float = 900.0,
+        heavy_seconds: float = 300.0,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_slots < 1:
+            raise ValueError("max_slots must be >= 1")
+        self.max_slots = max_slots
+        self.reserved_slots = min(max(reserved_slots, 0), max_slots - 1)
+        self._half_life = half_life
+        self._heavy_seconds = heavy_seconds
+        self._monotonic = monotonic
+        self._usage: dict[str, _Usage] = {}
+
+    def usage(self, pipeline_id: str) -> float:
+        u = self._usage.get(pipeline_id)
+        if u is None:
+            return 0.0
+        elapsed = self._monotonic() - u.at
+        return u.seconds * math.pow(0.5, elapsed / self._half_life)
+
+    def record(self, pipeline_id: str, seconds: float) -> None:
+        now = self._monotonic()
+        decayed = self.usage(pipeline_id)
+        self._usage[pipeline_id] = _Usage(seconds=decayed + max(seconds, 0.0), at=now)
+
+        # forget pipelines whose usage has decayed to nothing
+        if len(self._usage) > 1024:
+            for pid in [p for p in self._usage if self.usage(p) < 1e-3]:
+                del self._usage[pid]
+
+    def is_heavy(self, pipeline_id: str) -> bool:
+        return self.usage(pipeline_id) > self._heavy_seconds
+
+    def order(self, candidates: Sequence[C]) -> list[C]:
+        """Least normalized usage first; priority, then name break ties."""
+
+        def key(p: Any) -> tuple[float, int, str]:
+            weight = max(int(p.priority or 1), 1)
+            return (self.usage(str(p.id)) / weight, -weight, str(p.name))
+
+        return sorted(candidates, key=key)
+
+    def admit(self, pipeline_id: str, running: Sequence[str]) -> bool:
+        """Whether `pipeline_id` may take a slot while `running` are in flight."""
+        if len(running) >= self.max_slots:
+            return False
+        if not self.is_heavy(pipeline_id):
+            return True
+        heavy = sum(1 for pid in running if self.is_heavy(pid))
+        return heavy < self.max_slots - self.reserved_slots
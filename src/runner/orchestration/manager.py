@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass
 
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.app.core.enums import PipelineStatus
 from src.runner.orchestration.dispatcher import PipelineDispatcher
 from src.runner.orchestration.executor import PipelineExecutor
+from src.runner.orchestration.fair_share import FairShare
 from src.runner.repos.pipelines import PipelinesRepo
 from src.runner.repos.runs import RunsRepo
 from src.runner.repos.state import StateRepo
 from src.runner.services.db_errors import is_db_disconnect
+from src.runner.services.pause_signals import PauseWatcher
+from src.runner.services.plan_cache import PlanCache
+from src.runner.services.warmup import WarmupReport, warm_up
 
 logger = logging.getLogger("etl_runner")
 
@@ -23,26 +32,61 @@ class PipelineManager:
     """Orchestrates a single runner "tick".
 
     - Fetch candidate pipelines.
+    - Apply pause requests; start runs in fair-share order while slots are free.
     - Process each pipeline in its own fresh DB session."""
 
-    def __init__(self, session_factory) -> None:
+    def __init__(
+        self,
+        session_factory,
+        *,
+        data_session_factory=None,
+        pause_watcher: PauseWatcher | None = None,
+        seek_preflight: bool = False,
+        seek_index_autocreate: bool = False,
+        progress_interval: float = 0.0,
+        branch_concurrency: int = 4,
+        fair_share: FairShare | None = None,
+    ) -> None:
         self._session_factory = session_factory
 
+        # dispatch order and concurrency slots; one task per running pipeline
+        self._fair = fair_share or FairShare(max_slots=1, reserved_slots=0)
+        self._inflight: dict[str, asyncio.Task[None]] = {}
+
         # repos (same instances for the entire process)
         self._pipelines = PipelinesRepo()
         self._runs = RunsRepo()
         self._state = StateRepo()
 
+        # snapshot/plan cache shared by dispatcher and executor
+        self._plans = PlanCache()
+
         # executor + dispatcher
         self._executor = PipelineExecutor(
-            runs=self._runs, pipelines=self._pipelines, state=self._state
+            runs=self._runs,
+            pipelines=self._pipelines,
+            state=self._state,
+            pause=pause_watcher,
+            plans=self._plans,
+            data_session_factory=data_session_factory,
+            seek_preflight=seek_preflight,
+            seek_index_autocreate=seek_index_autocreate,
+            progress_interval=progress_interval,
+            branch_concurrency=branch_concurrency,
         )
         self._dispatcher = PipelineDispatcher(
             executor=self._executor,
             pipelines=self._pipelines,
+            plans=self._plans,
         )
 
+    @property
+    def inflight(self) -> list[str]:
+        return list(self._inflight)
+
     async def tick(self) -> TickResult:
+        self._reap()
+
         # 1) Fetch candidate pipelines using a single session
         async with self._session_factory() as session:
             pipelines = await self._pipelines.get_active(session)
@@ -51,23 +95,82 @@ class PipelineManager:
             logger.info("No active pipelines " "(enabled & RUN_REQUESTED/PAUSE_REQUESTED) found")
             return TickResult(pipelines_found=0, pipelines_processed=0)
 
-        logger.info("Found %d active pipeline(s)", len(pipelines))
+        logger.info(
+            "Found %d active pipeline(s), %d in flight", len(pipelines), len(self._inflight)
+        )
 
         processed = 0
 
-        # 2) Process each pipeline in its own fresh session
-        for pipeline in pipelines:
-            async with self._session_factory() as session:
-                try:
-                    await self._dispatcher.dispatch(session, pipeline)
+        # 2) Pauses are applied inline; runs start in fair-share order while slots are free,
+        #    each in its own task and fresh session. The rest waits for the next tick.
+        for pipeline in self._fair.order(pipelines):
+            pid = str(pipeline.id)
+            if pid in self._inflight:
+                continue
+
+            if pipeline.status == PipelineStatus.PAUSE_REQUESTED.value:
+                if await self._dispatch_one(pipeline):
                     processed += 1
-                except Exception as exc:
-                    if is_db_disconnect(exc):
-                        raise
-                    logger.exception(
-                        "Error while running pipeline id=%s name=%s",
-                        getattr(pipeline, "id", "?"),
-                        getattr(pipeline, "name", "?"),
-                    )
+                continue
+
+            if not self._fair.admit(pid, self.inflight):
+                logger.debug("No slot for pipeline id=%s (in flight: %d)", pid, len(self._inflight))
+                continue
+
+            self._inflight[pid] = asyncio.create_task(
+                self._run_one(pipeline), name=f"pipeline-{pid}"
+            )
+            processed += 1
 
         return TickResult(pipelines_found=len(pipelines), pipelines_processed=processed)
+
+    async def _dispatch_one(self, pipeline) -> bool:
+        async with self._session_factory() as session:
+            try:
+                await self._dispatcher.dispatch(session, pipeline)
+                return True
+            except Exception as exc:
+                if is_db_disconnect(exc):
+                    raise
+                logger.exception(
+                    "Error while running pipeline id=%s name=%s",
+                    getattr(pipeline, "id", "?"),
+                    getattr(pipeline, "name", "?"),
+                )
+                return False
+
+    async def _run_one(self, pipeline) -> None:
+        pid = str(pipeline.id)
+        started = time.monotonic()
+        try:
+            await self._dispatch_one(pipeline)
+        except Exception as exc:
+            # the main loop never sees this task's errors; recovery handles stuck RUNNING
+            logger.warning("DB disconnected while running pipeline id=%s: %r", pid, exc)
+        finally:
+            self._fair.record(pid, time.monotonic() - started)
+
+    def _reap(self) -> None:
+        for pid, task in list(self._inflight.items()):
+            if task.done():
+                del self._inflight[pid]
+
+    async def warm_up(
+        self, *, engines: list[tuple[AsyncEngine, int]], max_plans: int
+    ) -> WarmupReport:
+        """Pre-open pool connections and resolve the plans of enabled pipelines."""
+        return await warm_up(
+            self._session_factory,
+            engines=engines,
+            pipelines=self._pipelines,
+            plans=self._plans,
+            max_plans=max_plans,
+        )
+
+    async def aclose(self) -> None:
+        """Cancel in-flight runs (shutdown). They stay RUNNING and are recovered on start."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from src.runner.repos.run_history import (
+    RunHistoryRepo,
+    add_months,
+    expired_partitions,
+    month_floor,
+    partition_name,
+)
+from src.runner.services.db_errors import is_db_disconnect
+from src.runner.services.time_utils import utcnow_naive
+
+logger = logging.getLogger("etl_runner")
+
+
+class RunHistoryMaintenance:
+    """Keeps the partitioned run history in shape; runs every `interval` seconds.
+
+    Each pass (in this order, one transaction each):
+      1. creates the monthly etl_runs partitions up to `months_ahead` months out,
+         so new runs never land in the default partition (runs that did are
+         moved into their month's partition; one transaction per month);
+      2. rolls run totals up into etl.etl_run_daily from the first day that may
+         still change;
+      3. drops partitions whose whole month is older than `retention_days`
+         (0 keeps everything). Their days were rolled up in step 2. Run
+         profiles older than the retention go with them.
+
+    A failing step is logged and the pass goes on with the next one (a month
+    whose partition could not be created is retried on the next pass);
+    database disconnects propagate.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        *,
+        history: RunHistoryRepo | None = None,
+        retention_days: int = 90,
+        months_ahead: int = 2,
+        interval: float = 3600.0,
+        clock: Callable[[], datetime] = utcnow_naive,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._session_factory = session_factory
+        self._history = history or RunHistoryRepo()
+        self._retention_days = retention_days
+        self._months_ahead = max(months_ahead, 1)
+        self._interval = interval
+        self._clock = clock
+        self._monotonic = monotonic
+        self._ran_at: float | None = None
+
+    async def tick(self) -> bool:
+        """Run a maintenance pass if one is due; returns whether it ran."""
+        mono = self._monotonic()
+        if self._ran_at is not None and mono - self._ran_at < self._interval:
+            return False
+        self._ran_at = mono
+        await self.run_once()
+        return True
+
+    async def run_once(self) -> list[str]:
+        """One maintenance pass; returns the names of dropped partitions."""
+        now = self._clock()
+        async with self._session_factory() as session:
+            existing = set(await self._history.list_partitions(session))
+            await self._create_partitions(session, existing, month_floor(now))
+
+            try:
+                start = await self._history.rollup_start(session)
+                if start is not None:
+                    await self._history.rollup_since(session, start)
+                await session.commit()
+            except Exception as exc:
+                await self._step_failed(session, exc, "rollup")
+
+            if self._retention_days <= 0:
+                return []
+            cutoff = now - timedelta(days=self._retention_days)
+            expired = expired_partitions(sorted(existing), cutoff)
+            try:
+                for name in expired:
+                    await self._history.drop_partition(session, name)
+                await self._history.delete_profiles_before(session, cutoff)
+                await session.commit()
+            except Exception as exc:
+                await self._step_failed(session, exc, "retention")
+                return []
+            if expired:
+                logger.info(
+                    "Run history: dropped partitions %s (retention %d days)",
+                    expired,
+                    self._retention_days,
+                )
+            return expired
+
+    async def _create_partitions(self, session, existing: set[str], this_month: datetime) -> None:
+        created = []
+        for i in range(self._months_ahead + 1):
+            month = add_months(this_month, i)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            try:
+                moved = await self._history.create_partition(session, month)
+                await session.commit()
+            except Exception as exc:
+                await self._step_failed(session, exc, f"create partition {name}")
+                continue
+            created.append(name)
+            if moved:
+                logger.warning(
+                    "Run history: moved %d run(s) of %s out of the default partition into %s",
+                    moved,
+                    f"{month:%Y-%m}",
+                    name,
+                )
+        if created:
+            logger.info("Run history: created partitions %s", created)
+
+    async def _step_failed(self, session, exc: Exception, step: str) -> None:
+        if is_db_disconnect(exc):
+            raise exc
+        await session.rollback()
+        logger.error("Run history: %s failed, skipped until the next pass: %r", step, exc)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from src.app.core.cron import CronSchedule, parse_cron
+from src.runner.repos.pipelines import PipelinesRepo
+from src.runner.services.time_utils import utcnow_naive
+
+logger = logging.getLogger("etl_runner")
+
+
+@dataclass(slots=True)
+class _Entry:
+    pipeline_id: str
+    version: int
+    cron: CronSchedule
+    misfire: str
+    token: int  # heap items with another token are stale
+
+
+class CronScheduler:
+    """Moves scheduled pipelines to RUN_REQUESTED when their cron fires.
+
+    Next fire times live in a min-heap, so a tick only looks at pipelines that
+    are due. Definitions are re-read every `refresh_interval` seconds; entries
+    whose version changed are rebuilt and their old heap items ignored.
+
+    A fire time is handled exactly once across runners: `last_scheduled_at`
+    is advanced with a guarded UPDATE. Fires that find the pipeline queued,
+    running or paused are absorbed. Fires late by more than `misfire_grace`
+    seconds follow the pipeline's `schedule_misfire` policy: "coalesce" runs
+    once for all of them, "skip" drops them and waits for the next fire time.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        *,
+        pipelines: PipelinesRepo | None = None,
+        refresh_interval: float = 30.0,
+        misfire_grace: float = 60.0,
+        clock: Callable[[], datetime] = utcnow_naive,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._session_factory = session_factory
+        self._pipelines = pipelines or PipelinesRepo()
+        self._refresh_interval = refresh_interval
+        self._misfire_grace = misfire_grace
+        self._clock = clock
+        self._monotonic = monotonic
+
+        self._entries: dict[str, _Entry] = {}
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._tokens = 0
+        self._refreshed_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def next_due(self) -> datetime | None:
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def tick(self) -> int:
+        """Fire everything that is due; returns the number of runs requested."""
+        now = self._clock()
+        async with self._session_factory() as session:
+            mono = self._monotonic()
+            if self._refreshed_at is None or mono - self._refreshed_at >= self._refresh_interval:
+                await self._refresh(session, now)
+                self._refreshed_at = mono
+
+            requested = 0
+            while self._heap and self._heap[0][0] <= now:
+                item = heapq.heappop(self._heap)
+                if not self._is_live(item):
+                    continue
+                due, _, pid = item
+                entry = self._entries[pid]
+                try:
+                    fired = await self._fire(session, entry, due, now)
+                except BaseException:
+                    # keep the fire time: the next tick retries it (the guarded
+                    # UPDATE makes a fire that did commit a no-op)
+                    self._push(entry, due)
+                    raise
+                if fired:
+                    requested += 1
+                self._push(entry, entry.cron.next_after(now))
+            return requested
+
+    async def _refresh(self, session, now: datetime) -> None:
+        rows = await self._pipelines.list_scheduled(session)
+        await session.rollback()
+
+        seen: set[str] = set()
+        for pid, version, expr, misfire, last_scheduled_at in rows:
+            pid = str(pid)
+            seen.add(pid)
+            current = self._entries.get(pid)
+            if current is not None and current.version == int(version or 0):
+                current.misfire = misfire or "coalesce"
+                continue
+
+            try:
+                cron = parse_cron(expr)
+            except ValueError as exc:
+                logger.error("Ignoring schedule of pipeline id=%s: %s", pid, exc)
+                self._entries.pop(pid, None)
+                continue
+
+            entry = _Entry(
+                pipeline_id=pid,
+                version=int(version or 0),
+                cron=cron,
+                misfire=misfire or "coalesce",
+                token=0,
+            )
+            self._entries[pid] = entry
+            anchor = last_scheduled_at or now
+            if anchor.tzinfo is not None:  # timestamptz comes back aware
+                anchor = anchor.astimezone(timezone.utc).replace(tzinfo=None)
+            # a new schedule starts counting from now, not from the beginning of time
+            self._push(entry, cron.next_after(anchor))
+
+        for pid in set(self._entries) - seen:
+            del self._entries[pid]  # unscheduled or disabled; heap items go stale
+
+    async def _fire(self, session, entry: _Entry, due: datetime, now: datetime) -> bool:
+        late = (now - due).total_seconds()
+        misfired = late > self._misfire_grace
+        run = not (misfired and entry.misfire == "skip")
+
+        outcome = await self._pipelines.fire_schedule(
+            session, entry.pipeline_id, due=due, now=now, request_run=run
+        )
+
+        if misfired:
+            logger.warning(
+                "Schedule misfire pipeline id=%s due=%s late=%.0fs policy=%s -> %s",
+                entry.pipeline_id,
+                due.isoformat(),
+                late,
+                entry.misfire,
+                outcome or "handled elsewhere",
+            )
+        elif outcome == "requested":
+            logger.info("Schedule fired pipeline id=%s due=%s", entry.pipeline_id, due.isoformat())
+        elif outcome == "absorbed":
+            logger.info(
+                "Schedule fire absorbed (pipeline busy) id=%s due=%s",
+                entry.pipeline_id,
+                due.isoformat(),
+            )
+        return outcome == "requested"
+
+    def _push(self, entry: _Entry, due: datetime) -> None:
+        self._tokens += 1
+        entry.token = self._tokens
+        heapq.heappush(self._heap, (due, entry.token, entry.pipeline_id))
+
+    def _is_live(self, item: tuple[datetime, int, str]) -> bool:
+        entry = self._entries.get(item[2])
+        return entry is not None and entry.token == item[1]
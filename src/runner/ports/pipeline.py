@@ -29,3 +29,13 @@ class PipelineLike(Protocol):
     def source_query(self) -> str | None: ...
     @property
     def tasks(self) -> Sequence[object]: ...
+    @property
+    def cdc_slot(self) -> str | None: ...
+    @property
+    def cdc_source_table(self) -> str | None: ...
+    @property
+    def cdc_key_column(self) -> str | None: ...
+    @property
+    def extra_targets(self) -> Sequence[str]: ...
+    @property
+    def skip_unchanged(self) -> bool: ...
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
 
 from sqlalchemy import or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,7 +22,18 @@ class PipelinesRepo:
                     EtlPipeline.status == PipelineStatus.PAUSE_REQUESTED.value,
                 )
             )
-            .order_by(EtlPipeline.name)
+            .order_by(EtlPipeline.priority.desc(), EtlPipeline.name)
+        )
+        res = await session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def list_enabled(self, session: AsyncSession, *, limit: int) -> list[EtlPipeline]:
+        """Enabled pipelines, highest priority first (runner warm-up)."""
+        stmt = (
+            select(EtlPipeline)
+            .where(EtlPipeline.enabled.is_(True))
+            .order_by(EtlPipeline.priority.desc(), EtlPipeline.name)
+            .limit(limit)
         )
         res = await session.execute(stmt)
         return list(res.scalars().all())
@@ -53,6 +66,20 @@ class PipelinesRepo:
             await session.commit()
         return claimed
 
+    async def take_profile_request(self, session: AsyncSession, pipeline_id: str) -> str | None:
+        """Consume one requested profiled run; returns its mode, None if none is left."""
+        stmt = (
+            update(EtlPipeline)
+            .where(EtlPipeline.id == pipeline_id)
+            .where(EtlPipeline.profile_runs > 0)
+            .values(profile_runs=EtlPipeline.profile_runs - 1)
+            .returning(EtlPipeline.profile_mode)
+        )
+        res = await session.execute(stmt)
+        mode = res.scalar_one_or_none()
+        await session.commit()
+        return mode
+
     async def apply_pause_requested(self, session: AsyncSession, pipeline_id: str) -> bool:
         stmt = (
             update(EtlPipeline)
@@ -73,6 +100,12 @@ class PipelinesRepo:
         )
         return [row[0] for row in res.all()]
 
+    async def list_pause_requested_ids(self, session: AsyncSession) -> list[str]:
+        res = await session.execute(
+            select(EtlPipeline.id).where(EtlPipeline.status == PipelineStatus.PAUSE_REQUESTED.value)
+        )
+        return [row[0] for row in res.all()]
+
     async def mark_failed_bulk(self, session: AsyncSession, pipeline_ids: Sequence[str]) -> int:
         ids = list(pipeline_ids)
         if not ids:
@@ -133,3 +166,61 @@ class PipelinesRepo:
             await session.commit()
             return True
         return False
+
+    async def list_scheduled(self, session: AsyncSession) -> list[Any]:
+        """(id, version, schedule, schedule_misfire, last_scheduled_at) of scheduled pipelines."""
+        res = await session.execute(
+            select(
+                EtlPipeline.id,
+                EtlPipeline.version,
+                EtlPipeline.schedule,
+                EtlPipeline.schedule_misfire,
+                EtlPipeline.last_scheduled_at,
+            )
+            .where(EtlPipeline.enabled.is_(True))
+            .where(EtlPipeline.schedule.is_not(None))
+        )
+        return list(res.all())
+
+    async def fire_schedule(
+        self,
+        session: AsyncSession,
+        pipeline_id: str,
+        *,
+        due: datetime,
+        now: datetime,
+        request_run: bool = True,
+    ) -> str | None:
+        """Handle the fire time `due` of a scheduled pipeline.
+
+        Returns "requested" when the pipeline moved IDLE/FAILED -> RUN_REQUESTED,
+        "absorbed" when it was busy (or `request_run` is False) and only
+        `last_scheduled_at` advanced, or None when another runner already
+        handled this fire time.
+        """
+        not_handled = or_(
+            EtlPipeline.last_scheduled_at.is_(None), EtlPipeline.last_scheduled_at < due
+        )
+        base = (
+            update(EtlPipeline)
+            .where(EtlPipeline.id == pipeline_id)
+            .where(EtlPipeline.enabled.is_(True))
+            .where(not_handled)
+        )
+
+        outcome: str | None = None
+        if request_run:
+            res = await session.execute(
+                base.where(
+                    EtlPipeline.status.in_([PipelineStatus.IDLE.value, PipelineStatus.FAILED.value])
+                ).values(status=PipelineStatus.RUN_REQUESTED.value, last_scheduled_at=now)
+            )
+            if res.rowcount:
+                outcome = "requested"
+
+        if outcome is None:
+            res = await session.execute(base.values(last_scheduled_at=now))
+            outcome = "absorbed" if res.rowcount else None
+
+        await session.commit()
+        return outcome
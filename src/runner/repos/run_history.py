@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# etl.etl_runs is range-partitioned by started_at, one partition per UTC month
+PARTITION_PREFIX = "etl_runs_p"
+_PARTITION_RE = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+
+# runs land in the default partition only when their month has no partition
+# yet (e.g. the runner was down over a month change)
+DEFAULT_PARTITION = "etl_runs_default"
+
+_LIST_PARTITIONS_SQL = text(
+    """
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'etl.etl_runs'::regclass
+    """
+)
+
+# Recomputes whole days, so re-running it is harmless; a day is final once no
+# run started on it is still RUNNING.
+_ROLLUP_SQL = text(
+    """
+    INSERT INTO etl.etl_run_daily (
+        pipeline_id, day, runs, succeeded, failed,
+        rows_read, rows_written, rows_skipped,
+        duration_total_s, duration_max_s, updated_at
+    )
+    SELECT
+        pipeline_id,
+        (started_at AT TIME ZONE 'UTC')::date,
+        count(*),
+        count(*) FILTER (WHERE status = 'SUCCESS'),
+        count(*) FILTER (WHERE status = 'FAILED'),
+        sum(rows_read),
+        sum(rows_written),
+        sum(rows_skipped),
+        coalesce(sum(extract(epoch FROM finished_at - started_at)), 0),
+        coalesce(max(extract(epoch FROM finished_at - started_at)), 0),
+        now()
+    FROM etl.etl_runs
+    WHERE started_at >= CAST(:since AS timestamp) AT TIME ZONE 'UTC'
+    GROUP BY 1, 2
+    ON CONFLICT (pipeline_id, day) DO UPDATE SET
+        runs = EXCLUDED.runs,
+        succeeded = EXCLUDED.succeeded,
+        failed = EXCLUDED.failed,
+        rows_read = EXCLUDED.rows_read,
+        rows_written = EXCLUDED.rows_written,
+        rows_skipped = EXCLUDED.rows_skipped,
+        duration_total_s = EXCLUDED.duration_total_s,
+        duration_max_s = EXCLUDED.duration_max_s,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+
+_DEFAULT_HAS_ROWS_SQL = text(
+    f"""
+    SELECT EXISTS (
+        SELECT 1 FROM etl.{DEFAULT_PARTITION}
+        WHERE started_at >= CAST(:lo AS timestamp) AT TIME ZONE 'UTC'
+          AND started_at < CAST(:hi AS timestamp) AT TIME ZONE 'UTC'
+    )
+    """
+)
+
+_DETACH_DEFAULT_SQL = text(f"ALTER TABLE etl.etl_runs DETACH PARTITION etl.{DEFAULT_PARTITION}")
+_ATTACH_DEFAULT_SQL = text(
+    f"ALTER TABLE etl.etl_runs ATTACH PARTITION etl.{DEFAULT_PARTITION} DEFAULT"
+)
+
+# The detached default partition has the parent's columns in the parent's
+# order, so its rows can be re-inserted as they are (routed to the new month).
+_MOVE_FROM_DEFAULT_SQL = text(
+    f"""
+    WITH moved AS (
+        DELETE FROM etl.{DEFAULT_PARTITION}
+        WHERE started_at >= CAST(:lo AS timestamp) AT TIME ZONE 'UTC'
+          AND started_at < CAST(:hi AS timestamp) AT TIME ZONE 'UTC'
+        RETURNING *
+    )
+    INSERT INTO etl.etl_runs SELECT * FROM moved
+    """
+)
+
+# The last column is the start day of the oldest run finished since the
+# previous rollup: it was RUNNING then and its day may lie before max(day).
+# finished_at comes from the runner clock and is written before the commit,
+# so the window reaches back a little before the previous rollup.
+_ROLLUP_FROM_SQL = text(
+    """
+    SELECT
+        (SELECT max(day) FROM etl.etl_run_daily),
+        (SELECT min((started_at AT TIME ZONE 'UTC')::date)
+           FROM etl.etl_runs WHERE status = 'RUNNING'),
+        (SELECT min((started_at AT TIME ZONE 'UTC')::date) FROM etl.etl_runs),
+        (SELECT min((r.started_at AT TIME ZONE 'UTC')::date)
+           FROM etl.etl_runs r
+           WHERE r.finished_at >= (SELECT max(updated_at) FROM etl.etl_run_daily)
+                                  - interval '10 minutes')
+    """
+)
+
+
+def month_floor(dt: datetime) -> datetime:
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(month: datetime, n: int) -> datetime:
+    y, m = divmod(month.year * 12 + month.month - 1 + n, 12)
+    return month.replace(year=y, month=m + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    """Month start of a monthly partition, None for other tables (e.g. the default one)."""
+    m = _PARTITION_RE.match(name)
+    return datetime(int(m.group(1)), int(m.group(2)), 1) if m else None
+
+
+def expired_partitions(names: list[str], cutoff: datetime) -> list[str]:
+    """Partitions whose whole month lies before `cutoff`, oldest first."""
+    out = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            out.append((month, name))
+    return [name for _, name in sorted(out)]
+
+
+class RunHistoryRepo:
+    """Partition maintenance and daily rollup of etl.etl_runs (runner only).
+
+    DDL runs with the runner's role, which must own etl.etl_runs.
+    """
+
+    async def list_partitions(self, session: AsyncSession) -> list[str]:
+        res = await session.execute(_LIST_PARTITIONS_SQL)
+        return [str(r[0]) for r in res.all()]
+
+    async def create_partition(self, session: AsyncSession, month: datetime) -> int:
+        """Create the partition of `month`; returns the number of runs moved into it.
+
+        Runs of that month already in the default partition would make
+        CREATE ... PARTITION OF fail, so the default partition is detached,
+        the month created, those rows moved over and the default re-attached,
+        all in the caller's transaction. DETACH locks etl.etl_runs until the
+        commit, so new runs wait for the move.
+        """
+        # identifiers and bounds are generated here, never user input
+        lo, hi = month, add_months(month, 1)
+        create = text(
+            f"CREATE TABLE IF NOT EXISTS etl.{partition_name(month)}"
+            f" PARTITION OF etl.etl_runs"
+            f" FOR VALUES FROM ('{lo.isoformat()}+00') TO ('{hi.isoformat()}+00')"
+        )
+        bounds = {"lo": lo, "hi": hi}
+
+        res = await session.execute(_DEFAULT_HAS_ROWS_SQL, bounds)
+        if not res.scalar_one():
+            await session.execute(create)
+            return 0
+
+        await session.execute(_DETACH_DEFAULT_SQL)
+        await session.execute(create)
+        moved = await session.execute(_MOVE_FROM_DEFAULT_SQL, bounds)
+        await session.execute(_ATTACH_DEFAULT_SQL)
+        return int(getattr(moved, "rowcount", 0) or 0)
+
+    async def drop_partition(self, session: AsyncSession, name: str) -> None:
+        if partition_month(name) is None:
+            raise ValueError(f"not a run history partition: {name!r}")
+        await session.execute(text(f"DROP TABLE IF EXISTS etl.{name}"))
+
+    async def delete_profiles_before(self, session: AsyncSession, cutoff: datetime) -> int:
+        res = await session.execute(
+            text(
+                "DELETE FROM etl.etl_run_profiles"
+                " WHERE created_at < CAST(:cutoff AS timestamp) AT TIME ZONE 'UTC'"
+            ),
+            {"cutoff": cutoff},
+        )
+        return int(getattr(res, "rowcount", 0) or 0)
+
+    async def rollup_since(self, session: AsyncSession, day: date) -> None:
+        since = datetime(day.year, day.month, day.day)
+        await session.execute(_ROLLUP_SQL, {"since": since})
+
+    async def rollup_start(self, session: AsyncSession) -> date | None:
+        """First day whose totals may still change (None: no runs at all).
+
+        That is the last rolled-up day, or if earlier the day of the oldest
+        RUNNING run or of the oldest run finished since the previous rollup
+        (e.g. one that was RUNNING then and crossed midnight); the whole
+        history when nothing was rolled up yet.
+        """
+        res = await session.execute(_ROLLUP_FROM_SQL)
+        last_rolled, oldest_running, oldest, oldest_finished = res.one()
+        if last_rolled is None:
+            return oldest
+        return min(d for d in (last_rolled, oldest_running, oldest_finished) if d is not None)
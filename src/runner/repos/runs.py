@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
+from typing import Any
 from uuid import uuid4
 
 from sqlalchemy import insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.core.enums import RunStatus
-from src.app.models import EtlRun
+from src.app.models import EtlRun, EtlRunProfile
+from src.runner.services.profiling import ProfileArtifact
 from src.runner.services.time_utils import utcnow_naive
 
 logger = logging.getLogger("etl_runner")
@@ -16,21 +19,56 @@ MAX_ERR_LEN = 1000
 
 
 class RunsRepo:
+    def __init__(self) -> None:
+        # partition key of the runs started by this process: etl_runs is
+        # partitioned by started_at, so updates that name it touch one partition
+        self._started_at: dict[str, datetime] = {}
+
+    def _run(self, run_id: str, *, forget: bool = False) -> Any:
+        runs = self._started_at
+        started_at = runs.pop(run_id, None) if forget else runs.get(run_id)
+        stmt = update(EtlRun).where(EtlRun.id == run_id)
+        if started_at is not None:
+            stmt = stmt.where(EtlRun.started_at == started_at)
+        return stmt
+
     async def start_run(self, session: AsyncSession, *, pipeline_id: str) -> str:
         run_id = str(uuid4())
+        started_at = utcnow_naive()
         stmt = insert(EtlRun).values(
             id=run_id,
             pipeline_id=pipeline_id,
             status=RunStatus.RUNNING.value,
-            started_at=utcnow_naive(),
+            started_at=started_at,
             rows_read=0,
             rows_written=0,
         )
         await session.execute(stmt)
         await session.commit()
+        self._started_at[run_id] = started_at
         logger.info("Started ETL run id=%s pipeline_id=%s", run_id, pipeline_id)
         return run_id
 
+    async def save_profile(
+        self, session: AsyncSession, *, run_id: str, pipeline_id: str, artifact: ProfileArtifact
+    ) -> None:
+        stmt = insert(EtlRunProfile).values(
+            run_id=run_id,
+            pipeline_id=pipeline_id,
+            mode=artifact.mode,
+            format=artifact.format,
+            samples=artifact.samples,
+            duration_s=artifact.duration_s,
+            data=artifact.data,
+        )
+        await session.execute(stmt)
+        await session.commit()
+
+    async def set_plan_summary(self, session: AsyncSession, *, run_id: str, summary: dict) -> None:
+        stmt = self._run(run_id).values(plan_summary=summary)
+        await session.execute(stmt)
+        await session.commit()
+
     async def finish_success(
         self,
         session: AsyncSession,
@@ -38,21 +76,23 @@ class RunsRepo:
         run_id: str,
         rows_read: int,
         rows_written: int,
+        rows_skipped: int = 0,
     ) -> None:
-        stmt = (
-            update(EtlRun)
-            .where(EtlRun.id == run_id)
-            .values(
-                status=RunStatus.SUCCESS.value,
-                finished_at=utcnow_naive(),
-                rows_read=rows_read,
-                rows_written=rows_written,
-            )
+        stmt = self._run(run_id, forget=True).values(
+            status=RunStatus.SUCCESS.value,
+            finished_at=utcnow_naive(),
+            rows_read=rows_read,
+            rows_written=rows_written,
+            rows_skipped=rows_skipped,
         )
         await session.execute(stmt)
         await session.commit()
         logger.info(
-            "Finished ETL run id=%s SUCCESS (read=%d written=%d)", run_id, rows_read, rows_written
+            "Finished ETL run id=%s SUCCESS (read=%d written=%d skipped=%d)",
+            run_id,
+            rows_read,
+            rows_written,
+            rows_skipped,
         )
 
     async def finish_failed(
@@ -62,14 +102,10 @@ class RunsRepo:
         run_id: str,
         error_message: str,
     ) -> None:
-        stmt = (
-            update(EtlRun)
-            .where(EtlRun.id == run_id)
-            .values(
-                status=RunStatus.FAILED.value,
-                finished_at=utcnow_naive(),
-                error_message=error_message[:MAX_ERR_LEN],
-            )
+        stmt = self._run(run_id, forget=True).values(
+            status=RunStatus.FAILED.value,
+            finished_at=utcnow_naive(),
+            error_message=error_message[:MAX_ERR_LEN],
         )
         await session.execute(stmt)
         await session.commit()
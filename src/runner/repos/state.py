@@ -1,20 +1,99 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.models import EtlState
 
 
+@dataclass(frozen=True, slots=True)
+class StateRecord:
+    """Checkpoint of a pipeline as stored in etl.etl_state."""
+
+    pipeline_id: str
+    last_processed_value: str | None
+    last_processed_id: str | None
+
+
 class StateRepo:
-    async def get(self, session: AsyncSession, pipeline_id: str) -> EtlState | None:
-        return await session.get(EtlState, pipeline_id)
+    async def get(self, session: AsyncSession, pipeline_id: str) -> StateRecord | None:
+        res = await session.execute(
+            select(EtlState.last_processed_value, EtlState.last_processed_id).where(
+                EtlState.pipeline_id == pipeline_id
+            )
+        )
+        row = res.one_or_none()
+        if row is None:
+            return None
+        return StateRecord(
+            pipeline_id=str(pipeline_id),
+            last_processed_value=row.last_processed_value,
+            last_processed_id=row.last_processed_id,
+        )
 
     async def upsert(
-        self, session: AsyncSession, pipeline_id: str, *, last_value: str, last_id: str
+        self, session: AsyncSession, pipeline_id: str, *, last_value: str, last_id: str | None
+    ) -> None:
+        """Write the checkpoint with a single INSERT ... ON CONFLICT statement.
+
+        No ORM identity-map lookup or flush: the statement is executed inside the
+        current batch transaction and becomes durable with the batch commit.
+        """
+        stmt = insert(EtlState).values(
+            pipeline_id=pipeline_id,
+            last_processed_value=last_value,
+            last_processed_id=last_id,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EtlState.pipeline_id],
+            set_={
+                "last_processed_value": stmt.excluded.last_processed_value,
+                "last_processed_id": stmt.excluded.last_processed_id,
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(stmt)
+
+    async def get_reader(
+        self, session: AsyncSession, pipeline_id: str, reader: int
+    ) -> StateRecord | None:
+        """Checkpoint of a secondary reader (by order_index) of a DAG task pipeline."""
+        res = await session.execute(
+            select(EtlState.reader_checkpoints[str(reader)]).where(
+                EtlState.pipeline_id == pipeline_id
+            )
+        )
+        cp = res.scalar_one_or_none()
+        if not cp:
+            return None
+        return StateRecord(
+            pipeline_id=str(pipeline_id),
+            last_processed_value=cp.get("value"),
+            last_processed_id=cp.get("id"),
+        )
+
+    async def upsert_reader(
+        self,
+        session: AsyncSession,
+        pipeline_id: str,
+        reader: int,
+        *,
+        last_value: str,
+        last_id: str | None,
     ) -> None:
-        state = await session.get(EtlState, pipeline_id)
-        if state is None:
-            state = EtlState(pipeline_id=pipeline_id)
-            session.add(state)
-        state.last_processed_value = last_value
-        state.last_processed_id = last_id
+        """Merge one reader's checkpoint into `reader_checkpoints` (batch transaction)."""
+        entry = {str(reader): {"value": last_value, "id": last_id}}
+        stmt = insert(EtlState).values(pipeline_id=pipeline_id, reader_checkpoints=entry)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EtlState.pipeline_id],
+            set_={
+                "reader_checkpoints": func.coalesce(
+                    EtlState.reader_checkpoints, literal({}, JSONB)
+                ).op("||")(stmt.excluded.reader_checkpoints),
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(stmt)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+# Parser for the text output of the built-in `test_decoding` logical decoding
+# plugin, e.g.
+#
+#   BEGIN
+#   table content.film_work: UPDATE: id[uuid]:'3f..' title[text]:'It''s' rating[numeric]:7.5
+#   table content.film_work: UPDATE: old-key: id[uuid]:'3f..' new-tuple: id[uuid]:'40..' ...
+#   table content.film_work: DELETE: id[uuid]:'3f..'
+#   COMMIT
+
+UNCHANGED_TOAST = "unchanged-toast-datum"
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    table: str  # schema-qualified, as printed by test_decoding
+    op: str  # INSERT / UPDATE / DELETE / TRUNCATE
+    new: dict[str, str | None] = field(default_factory=dict)
+    old: dict[str, str | None] = field(default_factory=dict)  # old-key / deleted key
+    types: dict[str, str] = field(default_factory=dict)
+
+
+def parse_change(data: str) -> Change | None:
+    """Parse one test_decoding line; BEGIN/COMMIT lines return None."""
+    if not data.startswith("table "):
+        return None
+
+    rest = data[len("table ") :]
+    table, sep, rest = rest.partition(": ")
+    op, sep2, rest = rest.partition(":")
+    if not sep or not sep2:
+        raise ValueError(f"Unparseable change: {data[:200]!r}")
+    table = table.replace('"', "")
+    op = op.strip()
+    rest = rest.strip()
+
+    if op == "TRUNCATE":
+        return Change(table=table, op=op)
+
+    if rest == "(no-tuple-data)":
+        raise ValueError(
+            f"{op} on {table} carries no key columns;"
+            " the source table needs a primary key or REPLICA IDENTITY"
+        )
+
+    types: dict[str, str] = {}
+    if op == "UPDATE" and rest.startswith("old-key:"):
+        old_part, _, new_part = rest[len("old-key:") :].partition(" new-tuple:")
+        old = _parse_tuple(old_part, types)
+        new = _parse_tuple(new_part, types)
+        return Change(table=table, op=op, new=new, old=old, types=types)
+
+    values = _parse_tuple(rest, types)
+    if op == "DELETE":
+        return Change(table=table, op=op, old=values, types=types)
+    return Change(table=table, op=op, new=values, types=types)
+
+
+def _parse_tuple(s: str, types: dict[str, str]) -> dict[str, str | None]:
+    out: dict[str, str | None] = {}
+    i, n = 0, len(s)
+    while i < n:
+        while i < n and s[i] == " ":
+            i += 1
+        if i >= n:
+            break
+
+        # column name, possibly quoted
+        if s[i] == '"':
+            j = s.index('"', i + 1)
+            name = s[i + 1 : j]
+            i = j + 1
+        else:
+            j = s.index("[", i)
+            name = s[i:j]
+            i = j
+
+        # column type, up to the "]:" that closes it (array types contain "[]")
+        j = s.index("]:", i)
+        types.setdefault(name, s[i + 1 : j])
+        i = j + 2
+
+        # value: quoted literal with '' escapes, or a bare token
+        if i < n and s[i] == "'":
+            buf: list[str] = []
+            i += 1
+            while i < n:
+                if s[i] == "'":
+                    if i + 1 < n and s[i + 1] == "'":
+                        buf.append("'")
+                        i += 2
+                        continue
+                    i += 1
+                    break
+                buf.append(s[i])
+                i += 1
+            out[name] = "".join(buf)
+        else:
+            j = s.find(" ", i)
+            j = n if j == -1 else j
+            token = s[i:j]
+            out[name] = None if token == "null" else token
+            i = j
+    return out
+
+
+def touched_keys(changes: Iterable[Change], *, table: str, key: str) -> tuple[list[str], str]:
+    """Keys of `table` touched by `changes`, in first-seen order, plus the key type.
+
+    Inserts, updates and deletes are not distinguished: the caller re-reads
+    every key from the source and treats keys that no longer produce a row as
+    deleted. This also covers sources that aggregate over the table.
+    """
+    seen: dict[str, None] = {}
+    key_type = ""
+    for ch in changes:
+        if ch.table != table:
+            continue
+        if ch.op == "TRUNCATE":
+            raise ValueError(f"TRUNCATE on {table} cannot be replayed; run a full reload")
+        for values in (ch.old, ch.new):
+            if key not in values:
+                continue
+            value = values[key]
+            if value is None or value == UNCHANGED_TOAST:
+                continue
+            seen.setdefault(value, None)
+            key_type = key_type or ch.types.get(key, "")
+        if key not in ch.new and key not in ch.old:
+            raise ValueError(
+                f"{ch.op} on {table} has no {key!r} column"
+                " (use REPLICA IDENTITY FULL when it is not part of the primary key)"
+            )
+    return list(seen), key_type
@@ -27,3 +27,16 @@ def is_db_disconnect(exc: BaseException) -> bool:
 
     msg = str(exc).lower()
     return "no address associated with hostname" in msg
+
+
+# lock_not_available (lock_timeout), deadlock_detected, serialization_failure
+_LOCK_CONTENTION_SQLSTATES = frozenset({"55P03", "40P01", "40001"})
+
+
+def is_lock_contention(exc: BaseException) -> bool:
+    """The statement lost a lock wait; retrying it later can succeed."""
+    orig = getattr(exc, "orig", exc)
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(
+        getattr(orig, "__cause__", None), "sqlstate", None
+    )
+    return sqlstate in _LOCK_CONTENTION_SQLSTATES
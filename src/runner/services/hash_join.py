@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger("etl_runner")
+
+JOIN_HOWS = ("left", "inner")
+_SPEC_KEYS = {"on", "dim_on", "how", "columns", "prefix"}
+
+# rough cost of a dict slot plus the tuple header of one entry, on top of the
+# key and the values themselves
+_ENTRY_OVERHEAD = 120
+# host parameters per SQLite lookup (older builds allow at most 999)
+_LOOKUP_CHUNK = 500
+
+
+@dataclass(frozen=True, slots=True)
+class JoinSpec:
+    """Body of a JOIN task, e.g. `{"on": "film_id", "columns": ["rating"], "prefix": "dim_"}`.
+
+    `on` names the key columns of the incoming rows, `dim_on` the matching
+    columns of the dimension reader (default: the same names). `columns` are
+    the dimension columns added to every row as `prefix + column` (default:
+    all but the keys). "left" keeps unmatched rows with None in those
+    columns, "inner" drops them.
+    """
+
+    on: tuple[str, ...]
+    dim_on: tuple[str, ...]
+    how: str = "left"
+    columns: tuple[str, ...] | None = None
+    prefix: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class JoinLimits:
+    # estimated in-memory size of one dimension index (0: no limit)
+    memory_bytes: int = 64 * 1024 * 1024
+    # directory of spill files (None: the system temp dir)
+    spill_dir: str | None = None
+
+
+_limits = JoinLimits()
+
+
+def configure_join_limits(limits: JoinLimits) -> None:
+    """Install the dimension index limits (at runner start)."""
+    global _limits
+    _limits = limits
+
+
+def join_limits() -> JoinLimits:
+    return _limits
+
+
+def _names(value: Any, what: str) -> tuple[str, ...]:
+    names = (value,) if isinstance(value, str) else tuple(value or ())
+    if not names or not all(isinstance(n, str) and n for n in names):
+        raise ValueError(f"JOIN {what} must be a column name or a list of column names")
+    return names
+
+
+def parse_join_spec(body: str) -> JoinSpec:
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"JOIN body must be a JSON object: {exc}") from None
+    if not isinstance(data, dict):
+        raise ValueError("JOIN body must be a JSON object")
+
+    unknown = set(data) - _SPEC_KEYS
+    if unknown:
+        raise ValueError(f"Unknown JOIN keys: {sorted(unknown)}")
+
+    on = _names(data.get("on"), "on")
+    dim_on = _names(data["dim_on"], "dim_on") if "dim_on" in data else on
+    if len(dim_on) != len(on):
+        raise ValueError("JOIN on and dim_on must name the same number of columns")
+
+    how = data.get("how", "left")
+    if how not in JOIN_HOWS:
+        raise ValueError(f"JOIN how must be one of {JOIN_HOWS}, got {how!r}")
+
+    prefix = data.get("prefix", "")
+    if not isinstance(prefix, str):
+        raise ValueError("JOIN prefix must be a string")
+
+    columns = _names(data["columns"], "columns") if "columns" in data else None
+    return JoinSpec(on=on, dim_on=dim_on, how=how, columns=columns, prefix=prefix)
+
+
+def join_key(row: Mapping[Any, Any], columns: tuple[str, ...]) -> Any:
+    """Scalar key (one column) or tuple; None when any part is NULL (never matches)."""
+    if len(columns) == 1:
+        return row[columns[0]]
+    key = tuple(row[c] for c in columns)
+    return None if None in key else key
+
+
+def _require(row: Mapping[Any, Any], columns: Iterable[str], what: str) -> None:
+    missing = [c for c in columns if c not in row]
+    if missing:
+        raise ValueError(f"{what} rows have no column(s) {missing}")
+
+
+def _entry_size(key: Any, values: tuple[Any, ...]) -> int:
+    size = _ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(values)
+    return size + sum(sys.getsizeof(v) for v in values)
+
+
+class DimensionIndex:
+    """Rows of a dimension reader by join key, built once per run.
+
+    Entries are `key -> tuple of columns`, no per-row dict. When the
+    estimated size passes `memory_limit` bytes, the index moves to a
+    temporary SQLite file for the rest of the run and lookups go through a
+    worker thread. Keys must be unique; rows with a NULL key are skipped.
+    Spilled keys compare by repr(), so both sides need the same key types.
+    """
+
+    def __init__(
+        self,
+        key_columns: Sequence[str],
+        columns: Sequence[str] | None = None,
+        *,
+        memory_limit: int = 0,
+        spill_dir: str | None = None,
+    ) -> None:
+        self.key_columns = tuple(key_columns)
+        # unknown until the first row when not given (an empty dimension adds none)
+        self.columns: tuple[str, ...] | None = tuple(columns) if columns is not None else None
+        self.size = 0
+        self.approx_bytes = 0
+        self._memory_limit = memory_limit
+        self._spill_dir = spill_dir
+        self._rows: dict[Any, tuple[Any, ...]] = {}
+        self._db: sqlite3.Connection | None = None
+        self._path: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def spilled(self) -> bool:
+        return self._db is not None
+
+    async def add(self, rows: Sequence[Mapping[Any, Any]]) -> None:
+        if not rows:
+            return
+        if self.columns is None:
+            self.columns = tuple(c for c in rows[0] if c not in self.key_columns)
+        columns = self.columns
+        _require(rows[0], (*self.key_columns, *columns), "Join dimension")
+
+        entries = [
+            (key, tuple(r[c] for c in columns))
+            for r in rows
+            if (key := join_key(r, self.key_columns)) is not None
+        ]
+        if self._db is not None:
+            await asyncio.to_thread(self._insert, entries)
+            self.size += len(entries)
+            return
+
+        for key, values in entries:
+            if key in self._rows:
+                raise ValueError(f"Join dimension key {key!r} is not unique")
+            self._rows[key] = values
+            self.approx_bytes += _entry_size(key, values)
+        self.size += len(entries)
+
+        if self._memory_limit and self.approx_bytes > self._memory_limit:
+            await asyncio.to_thread(self._spill)
+
+    async def get_many(self, keys: Iterable[Any]) -> dict[Any, tuple[Any, ...]]:
+        """Entries of the given keys that exist (None keys are ignored)."""
+        if self._db is None:
+            rows = self._rows
+            return {k: rows[k] for k in keys if k is not None and k in rows}
+        return await asyncio.to_thread(self._select, {k for k in keys if k is not None})
+
+    def close(self) -> None:
+        """Drop the entries and the spill file (if any)."""
+        self._rows = {}
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.close()
+            self._db = None
+        if self._path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._path)
+
+    # --- SQLite spill (worker thread) ---
+
+    def _spill(self) -> None:
+        fd, path = tempfile.mkstemp(prefix="etl-join-", suffix=".sqlite3", dir=self._spill_dir)
+        os.close(fd)
+        logger.info(
+            "Join dimension over %.1f MiB (%d rows): spilling to %s",
+            self.approx_bytes / (1024 * 1024),
+            self.size,
+            path,
+        )
+        db = sqlite3.connect(path, check_same_thread=False)
+        # scratch data of one run: no journal, no fsync
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.execute("CREATE TABLE dim (k TEXT PRIMARY KEY, v BLOB NOT NULL) WITHOUT ROWID")
+        with self._lock:
+            self._db, self._path = db, path
+        self._insert(list(self._rows.items()))
+        self._rows = {}
+        self.approx_bytes = 0
+
+    def _insert(self, entries: list[tuple[Any, tuple[Any, ...]]]) -> None:
+        with self._lock:
+            assert self._db is not None
+            try:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT INTO dim (k, v) VALUES (?, ?)",
+                        ((repr(k), pickle.dumps(v)) for k, v in entries),
+                    )
+            except sqlite3.IntegrityError:
+                raise ValueError("Join dimension key is not unique") from None
+
+    def _select(self, keys: set[Any]) -> dict[Any, tuple[Any, ...]]:
+        by_repr = {repr(k): k for k in keys}
+        wanted = list(by_repr)
+        found: dict[Any, tuple[Any, ...]] = {}
+        with self._lock:
+            assert self._db is not None
+            for i in range(0, len(wanted), _LOOKUP_CHUNK):
+                chunk = wanted[i : i + _LOOKUP_CHUNK]
+                marks = ", ".join("?" * len(chunk))
+                for k, v in self._db.execute(f"SELECT k, v FROM dim WHERE k IN ({marks})", chunk):
+                    found[by_repr[k]] = pickle.loads(v)
+        return found
+
+
+async def hash_join(
+    rows: Sequence[Mapping[str, Any]], *, index: DimensionIndex, spec: JoinSpec
+) -> list[dict[str, Any]]:
+    """Join one batch against the dimension index (probe side: `rows`)."""
+    if not rows:
+        return []
+    _require(rows[0], spec.on, "JOIN input")
+    names = tuple(spec.prefix + c for c in index.columns or ())
+    clash = set(names) & rows[0].keys()
+    if clash:
+        raise ValueError(f"JOIN columns {sorted(clash)} already exist; set a prefix")
+
+    keys = [join_key(r, spec.on) for r in rows]
+    found = await index.get_many(keys)
+    missing = (None,) * len(names)
+    inner = spec.how == "inner"
+
+    out: list[dict[str, Any]] = []
+    for row, key in zip(rows, keys, strict=False):
+        values = found.get(key)
+        if values is None:
+            if inner:
+                continue
+            values = missing
+        joined = dict(row)
+        joined.update(zip(names, values, strict=False))
+        out.append(joined)
+    return out
@@ -1,3 +1,40 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Any
+
+# fields of the run being executed by the current task, attached to every
+# log record (see structured_log.LogContextFilter)
+_log_context: ContextVar[Mapping[str, Any]] = ContextVar(
+    "etl_log_context", default=MappingProxyType({})
+)
+
+
 def ctx_prefix(*, pid: str, pname: str, rid: str, attempt: int | None = None) -> str:
     base = f"pid={pid} name={pname} run={rid}"
     return f"{base} att={attempt}" if attempt is not None else base
+
+
+def ctx_fields(*, pid: str, pname: str, rid: str, attempt: int | None = None) -> dict[str, Any]:
+    """The ctx_prefix fields as structured log attributes."""
+    fields: dict[str, Any] = {"pipeline_id": pid, "pipeline": pname, "run_id": rid}
+    if attempt is not None:
+        fields["attempt"] = attempt
+    return fields
+
+
+def current_log_context() -> Mapping[str, Any]:
+    return _log_context.get()
+
+
+@contextmanager
+def bind_log_context(**fields: Any) -> Iterator[None]:
+    """Adds `fields` to the records logged by this task (and tasks it starts)."""
+    token = _log_context.set(MappingProxyType({**_log_context.get(), **fields}))
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
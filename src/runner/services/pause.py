@@ -2,6 +2,7 @@ import logging
 
 from src.app.core import PipelineStatus
 from src.runner.orchestration.context import ExecutionContext
+from src.runner.services.tracing import span
 
 logger = logging.getLogger("etl_runner")
 
@@ -10,9 +11,24 @@ async def _pause_if_requested(
     ctx: ExecutionContext,
     pipeline_id: str,
 ) -> bool:
-    status = await ctx.pipelines.get_status(ctx.session, pipeline_id)
-    if status == PipelineStatus.PAUSE_REQUESTED.value:
-        await ctx.pipelines.apply_pause_requested(ctx.session, pipeline_id)  # commit inside
+    with span("pause_check") as s:
+        applied = await _check_pause(ctx, pipeline_id)
+        s.set(paused=applied)
+    return applied
+
+
+async def _check_pause(ctx: ExecutionContext, pipeline_id: str) -> bool:
+    if ctx.pause is not None:
+        # Hot path: in-memory signal, no round trip unless a pause is pending.
+        if not ctx.pause.is_requested(pipeline_id):
+            return False
+    else:
+        status = await ctx.pipelines.get_status(ctx.session, pipeline_id)
+        if status != PipelineStatus.PAUSE_REQUESTED.value:
+            return False
+
+    # Conditional PAUSE_REQUESTED -> PAUSED; a stale signal simply does not apply.
+    applied = await ctx.pipelines.apply_pause_requested(ctx.session, pipeline_id)  # commit inside
+    if applied:
         logger.info("Pause requested:" " pipeline id=%s -> PAUSED (after batch)", pipeline_id)
-        return True
-    return False
+    return applied
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+from src.runner.repos.pipelines import PipelinesRepo
+from src.runner.services.db_errors import is_db_disconnect
+
+logger = logging.getLogger("etl_runner")
+
+
+class PauseWatcher:
+    """Runner-wide, in-memory view of pipelines with a pending pause request.
+
+    A single background task refreshes the set of PAUSE_REQUESTED pipeline ids
+    every `interval` seconds. Running batch loops consult `is_requested()`
+    without any I/O, instead of querying the pipeline status after every batch.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        *,
+        pipelines: PipelinesRepo | None = None,
+        interval: float = 0.5,
+    ) -> None:
+        self._session_factory = session_factory
+        self._pipelines = pipelines or PipelinesRepo()
+        self._interval = interval
+        self._requested: frozenset[str] = frozenset()
+        self._task: asyncio.Task[None] | None = None
+
+    def is_requested(self, pipeline_id: str) -> bool:
+        return str(pipeline_id) in self._requested
+
+    async def refresh(self) -> None:
+        async with self._session_factory() as session:
+            ids = await self._pipelines.list_pause_requested_ids(session)
+        self._requested = frozenset(str(i) for i in ids)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await self.refresh()
+        self._task = asyncio.create_task(self._loop(), name="pause-watcher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.refresh()
+            except Exception as exc:
+                # Keep the last known view; the next refresh will catch up.
+                if is_db_disconnect(exc):
+                    logger.warning("Pause watcher: DB disconnected, will retry. err=%r", exc)
+                else:
+                    logger.exception("Pause watcher refresh failed")
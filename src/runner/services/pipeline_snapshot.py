@@ -15,6 +15,7 @@ class TaskSnapshot:
     task_type: str
     body: str
     target_table: str | None
+    depends_on: tuple[int, ...] | None = None  # None: v1 linear chain
 
 
 @dataclass(frozen=True, slots=True)
@@ -32,6 +33,12 @@ class PipelineSnapshot:
     incremental_id_key: str | None
     description: str | None = None  # legacy fallback in transformer
     tasks: tuple[TaskSnapshot, ...] = ()
+    version: int = 0  # 0 = unknown (never cached)
+    cdc_slot: str | None = None
+    cdc_source_table: str | None = None
+    cdc_key_column: str | None = None
+    extra_targets: tuple[str, ...] = ()
+    skip_unchanged: bool = False
 
 
 def snapshot_pipeline(p: EtlPipeline) -> PipelineSnapshot:
@@ -48,6 +55,12 @@ def snapshot_pipeline(p: EtlPipeline) -> PipelineSnapshot:
         incremental_key=p.incremental_key,
         incremental_id_key=p.incremental_id_key,
         description=p.description,
+        version=int(getattr(p, "version", 0) or 0),
+        cdc_slot=p.cdc_slot,
+        cdc_source_table=p.cdc_source_table,
+        cdc_key_column=p.cdc_key_column,
+        extra_targets=tuple(p.extra_targets or ()),
+        skip_unchanged=bool(p.skip_unchanged),
     )
 
 
@@ -65,6 +78,7 @@ async def snapshot_pipeline_with_tasks(session: AsyncSession, p: EtlPipeline) ->
             task_type=str(t.task_type),
             body=str(t.body),
             target_table=t.target_table,
+            depends_on=tuple(t.depends_on) if t.depends_on is not None else None,
         )
         for t in res.scalars().all()
     )
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+
+from src.runner.adapters.tasks_python import TransformFn, load_python_transform
+from src.runner.adapters.transformers import NoOpTransformer, Transformer, resolve_transformer
+from src.runner.adapters.writers import BranchWriter, Writer, resolve_branch_writer, resolve_writer
+from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from src.runner.services.task_plan import (
+    TaskGraph,
+    is_task_dag,
+    validate_tasks_v1,
+    validate_tasks_v2,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DagPlan:
+    """Task DAG with its PYTHON transforms (by order_index) and per-branch sinks."""
+
+    graph: TaskGraph
+    fns: Mapping[int, TransformFn]
+    sinks: BranchWriter
+
+
+@dataclass(frozen=True, slots=True)
+class PipelinePlan:
+    """Validated snapshot plus the sink/transform objects resolved for it.
+
+    Task DAG plans carry their sinks in `dag` and have no single `writer`.
+    """
+
+    snapshot: PipelineSnapshot
+    writer: Writer | None
+    transformer: Transformer
+    task_fns: tuple[TransformFn, ...] = ()
+    dag: DagPlan | None = None
+
+
+def build_plan(snap: PipelineSnapshot) -> PipelinePlan:
+    if snap.tasks and is_task_dag(snap):
+        validated, graph = validate_tasks_v2(snap)
+        return PipelinePlan(
+            snapshot=validated,
+            writer=None,
+            transformer=NoOpTransformer(),
+            dag=DagPlan(
+                graph=graph,
+                fns={
+                    t.order_index: load_python_transform(t.body)
+                    for t in validated.tasks
+                    if t.task_type == "PYTHON"
+                },
+                sinks=resolve_branch_writer(validated, graph.sinks),
+            ),
+        )
+
+    if snap.tasks:
+        validated = validate_tasks_v1(snap)
+        final_target = validated.tasks[-1].target_table or validated.target_table
+        view = replace(validated, target_table=final_target)
+        return PipelinePlan(
+            snapshot=validated,
+            writer=resolve_writer(view),
+            transformer=NoOpTransformer(),
+            task_fns=tuple(load_python_transform(t.body) for t in validated.tasks[1:]),
+        )
+
+    return PipelinePlan(
+        snapshot=snap,
+        writer=resolve_writer(snap),
+        transformer=resolve_transformer(snap),
+    )
+
+
+@dataclass(slots=True)
+class _Entry:
+    version: int
+    snapshot: PipelineSnapshot
+    plan: PipelinePlan | None = None
+
+
+class PlanCache:
+    """Runner-side cache of pipeline snapshots and plans keyed by (id, version).
+
+    Any definition change bumps `etl_pipelines.version`, so a stale entry is
+    simply replaced on the next claim. Snapshots with version 0 (unknown) are
+    never cached.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_snapshot(self, pipeline_id: str, version: int) -> PipelineSnapshot | None:
+        entry = self._lookup(pipeline_id, version)
+        return entry.snapshot if entry is not None else None
+
+    def put_snapshot(self, snap: PipelineSnapshot) -> None:
+        if not snap.version:
+            return
+        entry = self._lookup(snap.id, snap.version)
+        if entry is None:
+            self._store(_Entry(version=snap.version, snapshot=snap))
+
+    def get_plan(self, snap: PipelineSnapshot) -> PipelinePlan:
+        if not snap.version:
+            return build_plan(snap)
+
+        entry = self._lookup(snap.id, snap.version)
+        if entry is None:
+            entry = _Entry(version=snap.version, snapshot=snap)
+            self._store(entry)
+        if entry.plan is None:
+            entry.plan = build_plan(entry.snapshot)
+        return entry.plan
+
+    def discard_plan(self, pipeline_id: str) -> None:
+        entry = self._entries.get(str(pipeline_id))
+        if entry is not None:
+            entry.plan = None
+
+    def _lookup(self, pipeline_id: str, version: int) -> _Entry | None:
+        key = str(pipeline_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.version != version:
+            return None  # replaced by _store() when the new version is loaded
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, entry: _Entry) -> None:
+        key = str(entry.snapshot.id)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
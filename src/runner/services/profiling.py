@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import gzip
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from types import FrameType
+
+logger = logging.getLogger("etl_runner")
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# synthetic roots of the collapsed stacks: the loop was waiting (I/O, sleep),
+# or running another task (other pipelines, fan-out sink tasks)
+IDLE_STACK = "[idle]"
+OTHER_STACK = "[other tasks]"
+
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileArtifact:
+    mode: str
+    # "collapsed" (text, one `a;b;c weight` line per stack, weights in µs of
+    # wall time) or "pstats"
+    format: str
+    data: bytes  # gzip-compressed
+    samples: int
+    duration_s: float
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+def collapse_stack(frame: FrameType | None, *, max_depth: int = 128) -> str:
+    """Root-first `file:function;...` of a thread stack, without the event loop
+    frames below the running task."""
+    labels: list[str] = []
+    while frame is not None and len(labels) < max_depth:
+        if frame.f_code.co_filename.startswith(_ASYNCIO_DIR):
+            break  # task step / loop machinery: everything below is the same
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Samples the event loop thread every `interval` seconds from a helper thread.
+
+    Only samples taken while the profiled task is running are attributed to
+    stacks; the others go to IDLE_STACK / OTHER_STACK. Each sample weighs the
+    time since the previous one (the sampler waits for the GIL while the loop
+    is busy), so the weights add up to the run's wall time.
+    """
+
+    def __init__(self, *, interval: float = 0.005, max_depth: int = 128) -> None:
+        self._interval = interval
+        self._max_depth = max_depth
+        self._stacks: Counter[str] = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+        self._duration = 0.0
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, args=(loop, task, thread_id), name="run-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> ProfileArtifact:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._duration = time.perf_counter() - self._started
+        text = "".join(f"{stack} {n}\n" for stack, n in self._stacks.most_common())
+        return ProfileArtifact(
+            mode="sample",
+            format="collapsed",
+            data=gzip.compress(text.encode()),
+            samples=self._samples,
+            duration_s=self._duration,
+        )
+
+    def _run(
+        self, loop: asyncio.AbstractEventLoop, task: asyncio.Task | None, thread_id: int
+    ) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self._interval):
+            now = time.perf_counter()
+            weight = int((now - last) * 1_000_000)
+            last = now
+            running = asyncio.current_task(loop)
+            if self._stop.is_set():
+                break  # the task is in stop(), not in the profiled code
+            self._samples += 1
+            if running is None:
+                self._stacks[IDLE_STACK] += weight
+            elif running is not task:
+                self._stacks[OTHER_STACK] += weight
+            else:
+                frame = sys._current_frames().get(thread_id)
+                stack = collapse_stack(frame, max_depth=self._max_depth)
+                self._stacks[stack or IDLE_STACK] += weight
+                del frame
+
+
+# cProfile hooks the whole thread: one profile at a time per process
+_cprofile_busy = threading.Lock()
+
+
+class CProfileProfiler:
+    """Deterministic profile (pstats) of everything the loop thread runs meanwhile.
+
+    Exact call counts and timings, but with noticeable overhead and no task
+    separation: meant for short runs with few pipelines running concurrently.
+    """
+
+    def __init__(self) -> None:
+        self._profile = cProfile.Profile()
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._profile.enable()
+
+    def stop(self) -> ProfileArtifact:
+        self._profile.disable()
+        duration = time.perf_counter() - self._started
+        self._profile.create_stats()
+        stats = self._profile.stats
+        return ProfileArtifact(
+            mode="cprofile",
+            format="pstats",
+            # same content as Profile.dump_stats(): pstats.Stats(path) loads it
+            data=gzip.compress(marshal.dumps(stats)),
+            samples=sum(cc for cc, *_ in stats.values()),
+            duration_s=duration,
+        )
+
+
+class ProfileCapture:
+    """Holds the artifact of a finished `profile_run` block (None until then)."""
+
+    artifact: ProfileArtifact | None = None
+
+
+@asynccontextmanager
+async def profile_run(mode: str | None) -> AsyncIterator[ProfileCapture]:
+    """Profiles the enclosed block of the current task (mode None: does nothing).
+
+    A "cprofile" request falls back to sampling while another cProfile is
+    active (concurrent profiled runs).
+    """
+    capture = ProfileCapture()
+    if mode is None:
+        yield capture
+        return
+    profiler: SamplingProfiler | CProfileProfiler
+    locked = mode == "cprofile" and _cprofile_busy.acquire(blocking=False)
+    if mode == "cprofile" and not locked:
+        logger.warning("cProfile already active in this runner; sampling this run instead")
+    profiler = CProfileProfiler() if locked else SamplingProfiler()
+    try:
+        profiler.start()
+        try:
+            yield capture
+        finally:
+            capture.artifact = profiler.stop()
+    finally:
+        if locked:
+            _cprofile_busy.release()
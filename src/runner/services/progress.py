@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.constants import PIPELINE_EVENTS_CHANNEL
+from src.runner.services.time_utils import utcnow_naive
+
+logger = logging.getLogger("etl_runner")
+
+_NOTIFY_SQL = text("SELECT pg_notify(:channel, :payload)")
+
+
+class ProgressReporter:
+    """Publishes per-batch run progress as NOTIFY events (SSE watchers).
+
+    Reports are throttled to one per `min_interval` seconds per run and go
+    out on the run's control-plane session, which is idle while batches run
+    on the data plane. Progress is best effort: a failed NOTIFY is logged
+    and never fails the run.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        pipeline_id: str,
+        run_id: str,
+        min_interval: float = 1.0,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._session = session
+        self._pipeline_id = pipeline_id
+        self._run_id = run_id
+        self._min_interval = min_interval
+        self._monotonic = monotonic
+        self._sent_at: float | None = None
+
+    async def report(self, *, batch: int, rows_read: int, rows_written: int) -> bool:
+        """Called after each committed batch; returns whether an event was sent."""
+        now = self._monotonic()
+        if self._sent_at is not None and now - self._sent_at < self._min_interval:
+            return False
+        self._sent_at = now
+
+        payload = json.dumps(
+            {
+                "type": "progress",
+                "pipeline_id": self._pipeline_id,
+                "run_id": self._run_id,
+                "batch": batch,
+                "rows_read": rows_read,
+                "rows_written": rows_written,
+                "at": utcnow_naive().isoformat(),
+            }
+        )
+        try:
+            await self._session.execute(
+                _NOTIFY_SQL, {"channel": PIPELINE_EVENTS_CHANNEL, "payload": payload}
+            )
+            await self._session.commit()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Progress NOTIFY failed run=%s: %r", self._run_id, exc)
+            await self._session.rollback()
+            return False
+        return True
+
+
+async def report_progress(
+    progress: ProgressReporter | None, *, batch: int, rows_read: int, rows_written: int
+) -> None:
+    if progress is not None:
+        await progress.report(batch=batch, rows_read=rows_read, rows_written=rows_written)
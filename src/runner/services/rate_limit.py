@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger("etl_runner")
+
+
+class TokenBucket:
+    """Token bucket that lets a caller go into debt and then waits it off.
+
+    `acquire(n)` never rejects, even when n exceeds `burst`: the tokens are
+    taken at once and the caller sleeps until the balance is non-negative
+    again, so a large batch simply pays for itself afterwards.
+    """
+
+    def __init__(
+        self, rate: float, burst: float | None = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.burst = burst if burst is not None else rate  # one second worth by default
+        self._clock = clock
+        self._tokens = self.burst
+        self._at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._at) * self.rate)
+        self._at = now
+
+    def delay_for(self, n: float, *, scale: float = 1.0) -> float:
+        """Take `n` tokens; return how long to wait (refill slowed down by `scale`)."""
+        self._refill()
+        self._tokens -= n
+        return 0.0 if self._tokens >= 0 else -self._tokens / (self.rate * scale)
+
+    async def acquire(self, n: float, *, scale: float = 1.0) -> None:
+        delay = self.delay_for(n, scale=scale)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass(frozen=True, slots=True)
+class SinkLimits:
+    rows_per_sec: float | None = None
+    bytes_per_sec: float | None = None
+    max_in_flight: int | None = None
+
+
+class SinkLimiter:
+    """Throughput limits of one sink, shared by every pipeline of the runner.
+
+    On top of the static limits, an AIMD factor (0 < factor <= 1) scales the
+    token refill rate: each pushback from the sink (ES 429, PG lock timeout)
+    halves it, each accepted request adds `increase` back. Without a rate
+    limit, pushback still waits `backoff()` before the caller retries.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limits: SinkLimits,
+        *,
+        min_factor: float = 1 / 32,
+        increase: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.limits = limits
+        self.factor = 1.0
+        self._min_factor = min_factor
+        self._increase = increase
+        self._rows = TokenBucket(limits.rows_per_sec, clock=clock) if limits.rows_per_sec else None
+        self._bytes = (
+            TokenBucket(limits.bytes_per_sec, clock=clock) if limits.bytes_per_sec else None
+        )
+        self._slots = asyncio.Semaphore(limits.max_in_flight) if limits.max_in_flight else None
+
+    @property
+    def counts_bytes(self) -> bool:
+        return self._bytes is not None
+
+    @asynccontextmanager
+    async def slot(self, *, rows: int, nbytes: int = 0) -> AsyncIterator[None]:
+        """Wait for tokens and an in-flight slot for one request to the sink."""
+        if self._rows is not None:
+            await self._rows.acquire(rows, scale=self.factor)
+        if self._bytes is not None and nbytes:
+            await self._bytes.acquire(nbytes, scale=self.factor)
+
+        if self._slots is None:
+            yield
+            return
+        async with self._slots:
+            yield
+
+    def on_success(self) -> None:
+        self.factor = min(1.0, self.factor + self._increase)
+
+    def on_pushback(self) -> None:
+        self.factor = max(self._min_factor, self.factor / 2)
+        logger.warning("Sink %s pushed back; throttling to %.0f%%", self.name, self.factor * 100)
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry `attempt` (1-based) after a pushback."""
+        return min(0.25 * 2 ** (attempt - 1), 10.0)
+
+
+# ----------------------------
+# Runner-wide registry
+# ----------------------------
+
+_limits: dict[str, SinkLimits] = {}
+_limiters: dict[str, SinkLimiter] = {}
+
+
+def parse_sink_limits(raw: str | Mapping[str, Any] | None) -> dict[str, SinkLimits]:
+    """`{"es:*": {"rows_per_sec": 5000, "max_in_flight": 2}, ...}` -> SinkLimits per pattern."""
+    if not raw:
+        return {}
+    data = json.loads(raw) if isinstance(raw, str) else dict(raw)
+    out: dict[str, SinkLimits] = {}
+    for pattern, cfg in data.items():
+        unknown = set(cfg) - {"rows_per_sec", "bytes_per_sec", "max_in_flight"}
+        if unknown:
+            raise ValueError(f"Unknown sink limit keys for {pattern!r}: {sorted(unknown)}")
+        out[str(pattern)] = SinkLimits(**cfg)
+    return out
+
+
+def configure_sink_limits(limits: Mapping[str, SinkLimits]) -> None:
+    """Install limits (at runner start). Keys are fnmatch patterns over targets."""
+    _limits.clear()
+    _limits.update(limits)
+    _limiters.clear()
+
+
+def sink_limiter(target: str) -> SinkLimiter:
+    """Limiter for `target`; targets matching the same pattern share one limiter."""
+    key = next((p for p in _limits if fnmatch.fnmatchcase(target, p)), target)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = SinkLimiter(key, _limits.get(key, SinkLimits()))
+        _limiters[key] = limiter
+    return limiter
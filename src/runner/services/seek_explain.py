@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import replace
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.query_plan import (
+    BatchSource,
+    Checkpoint,
+    SeekPlanSummary,
+    create_suggested_index,
+    explain_next_page,
+    parse_checkpoint,
+)
+from src.runner.orchestration.context import ExecutionContext
+from src.runner.repos.state import StateRepo
+from src.runner.services.db_errors import is_db_disconnect
+from src.runner.services.pipeline_snapshot import PipelineSnapshot
+
+logger = logging.getLogger("etl_runner")
+
+
+def batch_source(snap: PipelineSnapshot) -> BatchSource:
+    return BatchSource(
+        id=snap.id,
+        mode=snap.mode,
+        reader_sql=snap.tasks[0].body if snap.tasks else snap.source_query,
+        batch_size=int(snap.batch_size or 1000),
+        incremental_key=snap.incremental_key,
+        incremental_id_key=snap.incremental_id_key,
+    )
+
+
+async def seek_checkpoint(
+    session: AsyncSession, snap: PipelineSnapshot, state_repo: StateRepo
+) -> Checkpoint:
+    """(last_ts, last_id) the next incremental run of `snap` resumes from."""
+    state = await state_repo.get(session, snap.id)
+    if state is None:
+        return None, None
+    return parse_checkpoint(state.last_processed_value, state.last_processed_id)
+
+
+async def seek_preflight(
+    ctx: ExecutionContext, snap: PipelineSnapshot, *, create_index: bool = False
+) -> SeekPlanSummary | None:
+    """EXPLAIN the next seek page before an incremental run starts.
+
+    Never fails the run: planner errors are logged and reported as None, and
+    the read transaction is rolled back so the adapter starts clean.
+    """
+    session = ctx.session
+    try:
+        checkpoint = await seek_checkpoint(session, snap, ctx.state)
+        summary = await explain_next_page(session, batch_source(snap), checkpoint)
+        await session.rollback()
+
+        if summary.needs_sort:
+            logger.warning(
+                "Seek query of pipeline id=%s sorts every batch on %s (seq scans: %s)."
+                " Suggested: %s",
+                snap.id,
+                ", ".join(summary.sort_keys),
+                ", ".join(summary.seq_scans) or "-",
+                summary.suggested_index or "no single-relation index applies",
+            )
+            if create_index and await create_suggested_index(session, summary):
+                logger.warning("Created seek index: %s", summary.suggested_index)
+                summary = replace(summary, index_created=True)
+        return summary
+    except Exception as exc:
+        if is_db_disconnect(exc):
+            raise
+        await session.rollback()
+        logger.warning("Seek pre-flight failed for pipeline id=%s: %r", snap.id, exc)
+        return None
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from src.runner.services.logctx import current_log_context
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] [runner] %(message)s"
+
+# pass as `extra=` on lines logged once per batch; they are rate limited per
+# run and message (BatchLogLimiter), everything else always goes through
+PER_BATCH: dict[str, Any] = {"per_batch": True}
+
+
+class LogContextFilter(logging.Filter):
+    """Copies the bound run context (logctx.bind_log_context) onto each record.
+
+    Runs before the queue, on the caller's task, where the context is set.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = current_log_context()
+        record.log_ctx = dict(fields)
+        for key, value in fields.items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class BatchLogLimiter(logging.Filter):
+    """At most one per-batch line per (run, message) every `interval` seconds.
+
+    Suppressed lines are counted and reported on the next line let through
+    (`suppressed` attribute). Warnings and errors are never dropped.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        *,
+        max_keys: int = 4096,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self._interval = interval
+        self._max_keys = max_keys
+        self._monotonic = monotonic
+        # (run, message template) -> (last emitted at, suppressed since)
+        self._seen: dict[tuple[str, str], tuple[float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (
+            self._interval <= 0
+            or not getattr(record, "per_batch", False)
+            or record.levelno >= logging.WARNING
+        ):
+            return True
+
+        key = (str(current_log_context().get("run_id", "")), str(record.msg))
+        now = self._monotonic()
+        last = self._seen.get(key)
+        if last is not None and now - last[0] < self._interval:
+            self._seen[key] = (last[0], last[1] + 1)
+            return False
+
+        if last is not None and last[1]:
+            record.suppressed = last[1]
+        if last is None and len(self._seen) >= self._max_keys:
+            self._prune(now)
+        self._seen[key] = (now, 0)
+        return True
+
+    def _prune(self, now: float) -> None:
+        # finished runs leave their keys behind; drop the ones gone quiet
+        stale = [k for k, (at, _) in self._seen.items() if now - at >= self._interval]
+        for k in stale:
+            del self._seen[k]
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{line} (+{suppressed} similar suppressed)" if suppressed else line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, run context."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        out.update(getattr(record, "log_ctx", {}))
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            out["suppressed"] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        if record.stack_info:
+            out["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread with only the cheap work done here.
+
+    The stdlib prepare() runs the full formatter on the caller's thread; this
+    one merges the args and renders a traceback, so the final formatting (JSON
+    or text) and the blocking write happen on the listener thread.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = self._exc_formatter.formatException(record.exc_info)
+        prepared = logging.makeLogRecord(record.__dict__)
+        prepared.msg = message
+        prepared.args = None
+        prepared.exc_info = None
+        prepared.exc_text = exc_text
+        return prepared
+
+
+def configure_logging(
+    *,
+    fmt: str = "text",
+    batch_interval: float = 5.0,
+    level: int = logging.INFO,
+    stream: Any = None,
+) -> logging.handlers.QueueListener:
+    """Routes root logging through a queue to a writer thread; returns the
+    started listener (stop() it on shutdown to flush)."""
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _RecordQueueHandler(records)
+    # filters need the caller's context, so they run before the queue
+    queue_handler.addFilter(BatchLogLimiter(batch_interval))
+    queue_handler.addFilter(LogContextFilter())
+
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    return listener
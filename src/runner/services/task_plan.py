@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from src.app.core.constants import is_allowed_target
-from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
 
+from src.app.core.constants import is_allowed_target
+from src.app.core.source_query import placeholders, validate_source_placeholders
+from src.runner.services.hash_join import JoinSpec, parse_join_spec
+from src.runner.services.pipeline_snapshot import PipelineSnapshot, TaskSnapshot
 
-def validate_tasks_v1(p: PipelineSnapshot) -> PipelineSnapshot:
-    if not p.tasks:
-        return p
 
+def _sorted_tasks(p: PipelineSnapshot) -> tuple[TaskSnapshot, ...]:
     tasks_sorted = tuple(sorted(p.tasks, key=lambda t: t.order_index))
 
     # uniqueness + basic fields
@@ -26,11 +28,22 @@ def validate_tasks_v1(p: PipelineSnapshot) -> PipelineSnapshot:
             raise ValueError(
                 f"Task body is empty" f" (pipeline={p.id} order_index={t.order_index})"
             )
+    return tasks_sorted
+
+
+def validate_tasks_v1(p: PipelineSnapshot) -> PipelineSnapshot:
+    if not p.tasks:
+        return p
+
+    tasks_sorted = _sorted_tasks(p)
 
     # v1: first must be SQL
     if tasks_sorted[0].task_type != "SQL":
         raise ValueError("Tasks v1 require first" " task_type='SQL' (single reader)")
 
+    # the reader is bound like source_query (seek placeholders, incremental only)
+    validate_source_placeholders(tasks_sorted[0].body, mode=p.mode)
+
     # v1: rest must be PYTHON
     for t in tasks_sorted[1:]:
         if t.task_type != "PYTHON":
@@ -50,6 +63,126 @@ def validate_tasks_v1(p: PipelineSnapshot) -> PipelineSnapshot:
         raise ValueError(f"Target not allowed: {final_target!r}" f" (pipeline={p.id})")
 
     # return normalized (sorted) snapshot
-    from dataclasses import replace
-
     return replace(p, tasks=tasks_sorted)
+
+
+# ---------- Tasks v2 (DAG) ----------
+
+
+@dataclass(frozen=True, slots=True)
+class TaskNode:
+    task: TaskSnapshot
+    children: tuple[int, ...]
+    # sink written with this task's output (None: not written)
+    target: str | None
+    # JOIN tasks: order_index of the dimension reader
+    dimension: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TaskGraph:
+    """Validated task DAG, nodes keyed by order_index.
+
+    Readers are the SQL tasks (roots); every PYTHON task transforms the
+    output of one earlier task, so a batch fans out into independent
+    branches. A JOIN task joins the output of one earlier task with a
+    dimension: an SQL task read whole once per run instead of in batches.
+    A task writes its output to its `target_table`; leaves without one
+    write to the pipeline's target (and `extra_targets`).
+    """
+
+    nodes: Mapping[int, TaskNode]
+    readers: tuple[int, ...]
+    dimensions: tuple[int, ...] = ()
+    joins: Mapping[int, JoinSpec] = field(default_factory=dict)
+
+    @property
+    def sinks(self) -> list[tuple[int, str]]:
+        return [(i, n.target) for i, n in self.nodes.items() if n.target is not None]
+
+    def subtree(self, root: int) -> list[int]:
+        out = [root]
+        for child in self.nodes[root].children:
+            out.extend(self.subtree(child))
+        return out
+
+
+def is_task_dag(p: PipelineSnapshot) -> bool:
+    """Any task with `depends_on` set switches the pipeline to the v2 DAG model."""
+    return any(t.depends_on is not None for t in p.tasks)
+
+
+def validate_tasks_v2(p: PipelineSnapshot) -> tuple[PipelineSnapshot, TaskGraph]:
+    tasks_sorted = _sorted_tasks(p)
+
+    if p.mode not in ("full", "incremental"):
+        raise ValueError(f"Task DAGs support full and incremental mode, got {p.mode!r}")
+    if p.skip_unchanged:
+        raise ValueError("skip_unchanged is not supported for task DAGs")
+
+    children: dict[int, list[int]] = {t.order_index: [] for t in tasks_sorted}
+    types = {t.order_index: t.task_type for t in tasks_sorted}
+    readers: list[int] = []
+    joins: dict[int, JoinSpec] = {}
+    dimension_of: dict[int, int] = {}
+    for t in tasks_sorted:
+        deps = t.depends_on or ()
+        where = f"(pipeline={p.id} order_index={t.order_index})"
+        # upstream tasks come first, so the graph cannot have cycles
+        for dep in deps:
+            if dep not in children or dep >= t.order_index:
+                raise ValueError(f"Task DAG: depends_on={dep} must be an earlier task {where}")
+
+        if t.task_type == "SQL":
+            if deps:
+                raise ValueError(f"Task DAG: SQL readers cannot depend on other tasks {where}")
+            readers.append(t.order_index)
+        elif t.task_type == "PYTHON":
+            if len(deps) != 1:
+                raise ValueError(f"Task DAG: a PYTHON task depends on exactly one task {where}")
+            children[deps[0]].append(t.order_index)
+        elif t.task_type == "JOIN":
+            if len(deps) != 2 or types[deps[1]] != "SQL":
+                raise ValueError(
+                    f"Task DAG: a JOIN task depends on [upstream task, SQL dimension] {where}"
+                )
+            joins[t.order_index] = parse_join_spec(t.body)
+            children[deps[0]].append(t.order_index)
+            dimension_of[t.order_index] = deps[1]
+        else:
+            raise ValueError(f"Task DAG: unsupported task_type {t.task_type!r} {where}")
+
+    # a dimension is read whole, once per run: it is not a batch reader
+    dimensions = sorted(set(dimension_of.values()))
+    by_index = {t.order_index: t for t in tasks_sorted}
+    for d in dimensions:
+        if children[d] or by_index[d].target_table:
+            raise ValueError(
+                f"Task DAG: SQL task {d} is a JOIN dimension and cannot have"
+                f" tasks or a target_table of its own (pipeline={p.id})"
+            )
+        if placeholders(by_index[d].body):
+            raise ValueError(
+                f"Task DAG: JOIN dimension {d} is read whole; it cannot use seek"
+                f" placeholders (pipeline={p.id})"
+            )
+    readers = [r for r in readers if r not in dimensions]
+    for r in readers:
+        # readers are bound like source_query (seek placeholders, incremental only)
+        validate_source_placeholders(by_index[r].body, mode=p.mode)
+
+    nodes: dict[int, TaskNode] = {}
+    for t in tasks_sorted:
+        kids = tuple(children[t.order_index])
+        leaf = not kids and t.order_index not in dimensions
+        target = t.target_table or (p.target_table if leaf else None)
+        if target is not None and not is_allowed_target(target):
+            raise ValueError(f"Target not allowed: {target!r} (pipeline={p.id})")
+        nodes[t.order_index] = TaskNode(
+            task=t, children=kids, target=target, dimension=dimension_of.get(t.order_index)
+        )
+
+    graph = TaskGraph(
+        nodes=nodes, readers=tuple(readers), dimensions=tuple(dimensions), joins=joins
+    )
+    return replace(p, tasks=tasks_sorted), graph
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import IO, Any, Protocol
+
+logger = logging.getLogger("etl_runner")
+
+TRACE_EXPORTERS = ("none", "console", "file", "otlp")
+
+
+class Span(Protocol):
+    recording: bool
+
+    def set(self, **attributes: Any) -> None: ...
+
+
+class _NoopSpan:
+    __slots__ = ()
+    recording = False
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class LocalSpan:
+    """A finished-or-running span of the built-in tracer."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "duration",
+        "attributes",
+        "error",
+        "_t0",
+    )
+    recording = True
+    trace_id: str
+    span_id: str
+
+    def __init__(self, name: str, parent: LocalSpan | None, attributes: dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.time()
+        self.duration: float | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+        self._t0 = time.perf_counter()
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self) -> None:
+        self.duration = time.perf_counter() - self._t0
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": datetime.fromtimestamp(self.start, timezone.utc).isoformat(),
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "attributes": self.attributes,
+        }
+        if self.error is not None:
+            out["error"] = self.error
+        return out
+
+
+# ---------- exporters (run on the export thread) ----------
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[dict[str, Any]]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class ConsoleSpanExporter:
+    """One JSON object per span on stderr (or `stream`)."""
+
+    def __init__(self, stream: IO[str] | None = None) -> None:
+        self._stream = stream or sys.stderr
+
+    def export(self, spans: Sequence[dict[str, Any]]) -> None:
+        self._stream.write("".join(json.dumps(s, default=str) + "\n" for s in spans))
+        self._stream.flush()
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FileSpanExporter:
+    """Appends spans as JSON lines to `path`, for offline analysis."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._file: IO[str] | None = None
+
+    def export(self, spans: Sequence[dict[str, Any]]) -> None:
+        if self._file is None:
+            self._file = open(self._path, "a", encoding="utf-8")  # noqa: SIM115
+        self._file.write("".join(json.dumps(s, default=str) + "\n" for s in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _ExportThread:
+    """Hands finished spans to the exporter off the event loop, in batches."""
+
+    _STOP = object()
+
+    def __init__(self, exporter: SpanExporter, *, max_batch: int = 512) -> None:
+        self._exporter = exporter
+        self._max_batch = max_batch
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-export", daemon=True)
+        self._thread.start()
+
+    def put(self, span: dict[str, Any]) -> None:
+        self._queue.put(span)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if batch[-1] is self._STOP:
+                batch.pop()
+                stop = True
+            try:
+                if batch:
+                    self._exporter.export(batch)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Span export failed (%d spans dropped): %r", len(batch), exc)
+        self._exporter.shutdown()
+
+
+# ---------- tracers ----------
+
+_current: ContextVar[LocalSpan | None] = ContextVar("etl_current_span", default=None)
+
+
+class Tracer:
+    """Does nothing: the default, so instrumented code costs ~a function call."""
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        yield NOOP_SPAN
+
+    def current(self) -> Span:
+        return NOOP_SPAN
+
+    def shutdown(self) -> None:
+        pass
+
+
+class LocalTracer(Tracer):
+    """Built-in tracer: spans nest per task (contextvars) and are exported as dicts."""
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        self._export = _ExportThread(exporter)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        s = LocalSpan(name, _current.get(), attributes)
+        token = _current.set(s)
+        try:
+            yield s
+        except BaseException as exc:
+            s.error = f"{type(exc).__name__}: {exc}"[:500]
+            raise
+        finally:
+            _current.reset(token)
+            s.end()
+            self._export.put(s.as_dict())
+
+    def current(self) -> Span:
+        return _current.get() or NOOP_SPAN
+
+    def shutdown(self) -> None:
+        self._export.shutdown()
+
+
+class OtelTracer(Tracer):
+    """OpenTelemetry SDK with the OTLP exporter (configured by the standard
+    OTEL_EXPORTER_OTLP_* / OTEL_SERVICE_NAME variables)."""
+
+    def __init__(self) -> None:
+        try:
+            from opentelemetry import trace
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError as exc:
+            raise RuntimeError(
+                "RUNNER_TRACE_EXPORTER=otlp needs opentelemetry-sdk and"
+                " opentelemetry-exporter-otlp installed"
+            ) from exc
+        self._trace = trace
+        self._provider = TracerProvider()
+        self._provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        self._tracer = self._provider.get_tracer("etl_runner")
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        with self._tracer.start_as_current_span(name, attributes=_otel_attrs(attributes)) as s:
+            yield _OtelSpan(s)
+
+    def current(self) -> Span:
+        s = self._trace.get_current_span()
+        return _OtelSpan(s) if s.is_recording() else NOOP_SPAN
+
+    def shutdown(self) -> None:
+        self._provider.shutdown()
+
+
+class _OtelSpan:
+    __slots__ = ("_span",)
+    recording = True
+
+    def __init__(self, span: Any) -> None:
+        self._span = span
+
+    def set(self, **attributes: Any) -> None:
+        self._span.set_attributes(_otel_attrs(attributes))
+
+
+def _otel_attrs(attributes: dict[str, Any]) -> dict[str, Any]:
+    # OTel attribute values must be primitives
+    return {
+        k: v if isinstance(v, str | bool | int | float) else str(v)
+        for k, v in attributes.items()
+        if v is not None
+    }
+
+
+def build_tracer(exporter: str, *, path: str = "runner-traces.jsonl") -> Tracer:
+    if exporter == "none":
+        return Tracer()
+    if exporter == "console":
+        return LocalTracer(ConsoleSpanExporter())
+    if exporter == "file":
+        return LocalTracer(FileSpanExporter(path))
+    if exporter == "otlp":
+        return OtelTracer()
+    raise ValueError(f"unknown trace exporter {exporter!r}, expected one of {TRACE_EXPORTERS}")
+
+
+# ---------- process-wide tracer ----------
+
+_tracer: Tracer = Tracer()
+
+
+def configure_tracing(tracer: Tracer) -> None:
+    global _tracer
+    _tracer.shutdown()
+    _tracer = tracer
+
+
+def shutdown_tracing() -> None:
+    """Flushes pending spans; instrumentation becomes a no-op again."""
+    configure_tracing(Tracer())
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[Span]:
+    """`with span("fetch", batch_no=n) as s: ...; s.set(rows=len(rows))`"""
+    return _tracer.span(name, **attributes)
+
+
+def current_span() -> Span:
+    return _tracer.current()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.app.core.constants import ES_TARGET_PREFIX
+from src.runner.adapters.registry import load_adapter
+from src.runner.repos.pipelines import PipelinesRepo
+from src.runner.services.pipeline_snapshot import PipelineSnapshot, snapshot_pipeline_with_tasks
+from src.runner.services.plan_cache import PlanCache
+
+logger = logging.getLogger("etl_runner")
+
+
+class StartupTimer:
+    """Wall time of consecutive startup phases, logged once the runner is ready."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._started = self._last = clock()
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        """Close `phase` (time since the previous mark) and return its duration."""
+        now = self._clock()
+        self.phases[phase] = now - self._last
+        self._last = now
+        return self.phases[phase]
+
+    @property
+    def total(self) -> float:
+        return self._last - self._started
+
+    def summary(self) -> str:
+        return " ".join(f"{name}={secs:.3f}s" for name, secs in self.phases.items())
+
+
+@dataclass(frozen=True, slots=True)
+class WarmupReport:
+    connections: int
+    plans: int
+    failed: int
+
+
+async def open_pool_connections(engine: AsyncEngine, n: int) -> int:
+    """Open `n` pooled connections at once; they stay in the pool when released."""
+    if n <= 0:
+        return 0
+
+    async def checkout(stack: AsyncExitStack) -> None:
+        conn = await stack.enter_async_context(engine.connect())
+        await conn.execute(text("SELECT 1"))
+
+    # all held together, so the pool has to open n distinct connections; every
+    # checkout finishes before the stack releases them
+    async with AsyncExitStack() as stack:
+        results = await asyncio.gather(*(checkout(stack) for _ in range(n)), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise errors[0]
+    return n
+
+
+def _targets(snap: PipelineSnapshot) -> list[str]:
+    targets = [snap.target_table or "", *snap.extra_targets]
+    return targets + [t.target_table for t in snap.tasks if t.target_table]
+
+
+async def warm_plans(
+    session_factory, *, pipelines: PipelinesRepo, plans: PlanCache, limit: int
+) -> tuple[int, int]:
+    """Resolve the plans (transforms, sinks) of enabled pipelines into `plans`.
+
+    Also imports the adapter (and sink client) modules those pipelines need.
+    A pipeline whose plan cannot be built is only counted: its run reports
+    the error as before. Returns (resolved, failed).
+    """
+    async with session_factory() as session:
+        enabled = await pipelines.list_enabled(session, limit=limit)
+        snaps = [await snapshot_pipeline_with_tasks(session, p) for p in enabled]
+
+    resolved = failed = 0
+    for snap in snaps:
+        try:
+            plans.put_snapshot(snap)
+            plan = plans.get_plan(snap)
+            kind = "dag" if plan.dag is not None else "tasks" if snap.tasks else "sql"
+            load_adapter(snap.mode, kind=kind)
+            if any(t.startswith(ES_TARGET_PREFIX) for t in _targets(snap)):
+                importlib.import_module("elasticsearch")
+        except Exception as exc:
+            failed += 1
+            logger.warning("Warm-up: cannot prepare pipeline id=%s: %r", snap.id, exc)
+        else:
+            resolved += 1
+    return resolved, failed
+
+
+async def warm_up(
+    session_factory,
+    *,
+    engines: list[tuple[AsyncEngine, int]],
+    pipelines: PipelinesRepo,
+    plans: PlanCache,
+    max_plans: int,
+) -> WarmupReport:
+    """Pre-open pool connections and pre-resolve pipeline plans before the first tick.
+
+    Best effort: a failure is logged and the runner starts cold instead.
+    """
+    connections = resolved = failed = 0
+    try:
+        counts = await asyncio.gather(*(open_pool_connections(e, n) for e, n in engines))
+        connections = sum(counts)
+        resolved, failed = await warm_plans(
+            session_factory, pipelines=pipelines, plans=plans, limit=max_plans
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Warm-up failed, starting cold: %r", exc)
+    return WarmupReport(connections=connections, plans=resolved, failed=failed)
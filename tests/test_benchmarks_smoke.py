@@ -0,0 +1,14 @@
+import pytest
+
+from benchmarks.scenarios import SCENARIOS, BenchParams
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+async def test_scenario_processes_all_rows(name):
+    res = await SCENARIOS[name](BenchParams(rows=57, batch_size=10))
+
+    assert res.rows == 57
+    assert res.batches == 6
+    assert res.rows_per_sec > 0
+    assert res.batch_latency_ms["p99"] >= res.batch_latency_ms["p50"]
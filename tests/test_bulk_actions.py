@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from src.app.repositories.pipelines import SQLPipelinesRepository
+from src.app.schemas.pipelines import MAX_BULK_IDS, BulkActionRequest, PipelineListFilter
+from src.app.services.pipelines import PipelinesService
+
+
+def test_request_needs_exactly_one_non_empty_selection():
+    a = uuid4()
+    assert BulkActionRequest(ids=[a, a]).ids == [a]
+    assert BulkActionRequest(filter={"status": ["paused"]}).filter.status == ("PAUSED",)
+
+    for bad in (
+        {},
+        {"ids": []},
+        {"ids": [a], "filter": {"enabled": True}},
+        {"filter": {}},
+        {"ids": [uuid4() for _ in range(MAX_BULK_IDS + 1)]},
+    ):
+        with pytest.raises(ValidationError):
+            BulkActionRequest(**bad)
+
+
+def _service(rows):
+    repo = SimpleNamespace(bulk_set_status=AsyncMock(return_value=rows))
+    return PipelinesService(AsyncMock(), repo=repo), repo
+
+
+async def test_run_reports_an_outcome_per_requested_id_in_order():
+    applied, running, failed, missing = (uuid4() for _ in range(4))
+    service, repo = _service(
+        [
+            (str(running), "RUNNING", False),
+            (str(failed), "FAILED", False),
+            (str(applied), "PAUSED", True),
+        ]
+    )
+
+    out = await service.bulk_transition(
+        "run", BulkActionRequest(ids=[applied, running, failed, missing])
+    )
+
+    kw = repo.bulk_set_status.await_args.kwargs
+    assert kw["new_status"] == "RUN_REQUESTED"
+    assert "FAILED" not in kw["allowed_from"]
+    assert out.applied == 1
+    assert [(r.id, r.outcome) for r in out.results] == [
+        (applied, "applied"),
+        (running, "unchanged"),
+        (failed, "rejected"),
+        (missing, "not_found"),
+    ]
+    assert out.results[0].previous_status == "PAUSED"
+    assert out.results[0].status == "RUN_REQUESTED"
+
+
+async def test_pause_by_filter_reports_selected_rows():
+    a, b = uuid4(), uuid4()
+    service, repo = _service([(str(a), "PAUSED", False), (str(b), "RUNNING", True)])
+
+    out = await service.bulk_transition("pause", BulkActionRequest(filter={"enabled": True}))
+
+    assert repo.bulk_set_status.await_args.kwargs["ids"] is None
+    assert [r.outcome for r in out.results] == ["unchanged", "applied"]
+    assert out.applied == 1
+
+
+async def test_bulk_update_is_one_locking_statement():
+    session = AsyncMock()
+    session.execute.return_value = SimpleNamespace(all=lambda: [])
+
+    await SQLPipelinesRepository().bulk_set_status(
+        session,
+        new_status="RUN_REQUESTED",
+        allowed_from=["IDLE", "PAUSED"],
+        filters=PipelineListFilter(status=("PAUSED",)),
+    )
+
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE" in sql
+    assert "RETURNING" in sql
+    assert "updated_at=now()" in sql
+    session.commit.assert_awaited_once()
@@ -0,0 +1,344 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import src.runner.adapters.cdc as cdc_mod
+from src.app.core import cdc_slots
+from src.app.core.cdc_slots import drop_replication_slot, released_slot
+from src.app.repositories.pipelines import SQLPipelinesRepository
+from src.app.services.pipelines import PipelinesService
+from src.runner.adapters.cdc import run_cdc_pipeline
+from src.runner.repos.state import StateRecord
+from src.runner.services.cdc_decoding import parse_change, touched_keys
+
+U1 = "3f0c6a52-7f5e-4d8e-9d5a-0d5c2b1c9a01"
+U2 = "3f0c6a52-7f5e-4d8e-9d5a-0d5c2b1c9a02"
+
+
+def test_parse_insert_with_quoting_and_null():
+    ch = parse_change(
+        f"table content.film_work: INSERT: id[uuid]:'{U1}' title[text]:'It''s here'"
+        " rating[numeric]:7.5 description[text]:null"
+        " created_at[timestamp without time zone]:'2024-01-01 10:00:00'"
+    )
+
+    assert ch.table == "content.film_work"
+    assert ch.op == "INSERT"
+    assert ch.new == {
+        "id": U1,
+        "title": "It's here",
+        "rating": "7.5",
+        "description": None,
+        "created_at": "2024-01-01 10:00:00",
+    }
+    assert ch.types["created_at"] == "timestamp without time zone"
+
+
+def test_parse_update_with_old_key_and_delete():
+    upd = parse_change(
+        f"table content.film_work: UPDATE: old-key: id[uuid]:'{U1}' new-tuple: id[uuid]:'{U2}'"
+        " tags[text[]]:'{a,b}' title[text]:unchanged-toast-datum"
+    )
+    assert upd.old == {"id": U1}
+    assert upd.new["id"] == U2
+    assert upd.new["tags"] == "{a,b}"
+
+    dele = parse_change(f"table content.film_work: DELETE: id[uuid]:'{U1}'")
+    assert dele.op == "DELETE"
+    assert dele.old == {"id": U1}
+
+    assert parse_change("BEGIN") is None
+    assert parse_change("COMMIT") is None
+
+
+def test_delete_without_replica_identity_is_rejected():
+    with pytest.raises(ValueError, match="REPLICA IDENTITY"):
+        parse_change("table content.film_work: DELETE: (no-tuple-data)")
+
+
+def test_touched_keys_dedupes_and_filters_table():
+    changes = [
+        parse_change(f"table content.film_work: INSERT: id[uuid]:'{U1}' title[text]:'a'"),
+        parse_change(f"table ugc.ratings: INSERT: id[integer]:1 film_id[uuid]:'{U2}'"),
+        parse_change(f"table content.film_work: UPDATE: id[uuid]:'{U1}' title[text]:'b'"),
+        parse_change(f"table content.film_work: DELETE: id[uuid]:'{U2}'"),
+    ]
+
+    keys, key_type = touched_keys(changes, table="content.film_work", key="id")
+
+    assert keys == [U1, U2]
+    assert key_type == "uuid"
+
+
+def test_truncate_requires_full_reload():
+    with pytest.raises(ValueError, match="full reload"):
+        touched_keys(
+            [parse_change("table content.film_work: TRUNCATE: (no-flags)")],
+            table="content.film_work",
+            key="id",
+        )
+
+
+class _Result:
+    def __init__(self, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar_one(self):
+        return self._scalar
+
+    def all(self):
+        return self._rows
+
+    def mappings(self):
+        return self._rows
+
+
+class _CdcSession:
+    """Scripted session: one peeked batch, then an empty slot."""
+
+    def __init__(self, peeks, source_rows):
+        self.peeks = list(peeks)
+        self.source_rows = source_rows
+        self.advanced = []
+        self.reread_keys = []
+        self.commit = AsyncMock()
+
+    async def execute(self, stmt, params=None):
+        if stmt is cdc_mod._SLOT_EXISTS_SQL:
+            return _Result([("0/100",)])
+        if stmt is cdc_mod._CURRENT_LSN_SQL:
+            return _Result(scalar="0/900")
+        if stmt is cdc_mod._PEEK_SQL:
+            return _Result(self.peeks.pop(0) if self.peeks else [])
+        if stmt is cdc_mod._ADVANCE_SQL:
+            self.advanced.append(params["lsn"])
+            return _Result()
+        self.reread_keys.append(params["keys"])
+        return _Result([r for r in self.source_rows if r["film_id"] in params["keys"]])
+
+
+@pytest.mark.asyncio
+async def test_cdc_batch_upserts_deletes_and_checkpoints():
+    session = _CdcSession(
+        peeks=[
+            [
+                ("0/200", "BEGIN"),
+                ("0/210", f"table content.film_work: UPDATE: id[uuid]:'{U1}' title[text]:'x'"),
+                ("0/220", f"table content.film_work: DELETE: id[uuid]:'{U2}'"),
+                ("0/230", "COMMIT"),
+            ]
+        ],
+        source_rows=[{"film_id": U1, "title": "x", "rating": None, "updated_at": None}],
+    )
+    state = AsyncMock()
+    state.get.return_value = None
+    writer = AsyncMock()
+    writer.write.return_value = 1
+    writer.delete.return_value = 1
+
+    ctx = SimpleNamespace(
+        session=session,
+        run_id="r",
+        state=state,
+        pause=None,
+        progress=None,
+        pipelines=AsyncMock(),
+    )
+    ctx.pipelines.get_status.return_value = "RUNNING"
+
+    pipeline = SimpleNamespace(
+        id="p",
+        name="p",
+        type="SQL",
+        mode="cdc",
+        batch_size=100,
+        source_query="SELECT id AS film_id, title, rating, updated_at FROM content.film_work",
+        target_table="analytics.film_dim",
+        incremental_id_key="film_id",
+        cdc_slot="etl_film_dim",
+        cdc_source_table="content.film_work",
+        cdc_key_column="id",
+    )
+
+    read, written = await run_cdc_pipeline(ctx, pipeline, writer=writer)
+
+    assert (read, written) == (1, 2)
+    assert session.reread_keys == [[U1, U2]]
+    writer.delete.assert_awaited_once_with(session, pipeline, [U2])
+    state.upsert.assert_awaited_once_with(session, "p", last_value="0/230", last_id=None)
+    assert session.advanced == ["0/230"]
+
+
+@pytest.mark.asyncio
+async def test_cdc_catches_slot_up_to_committed_checkpoint(monkeypatch):
+    session = _CdcSession(peeks=[], source_rows=[])
+    state = AsyncMock()
+    state.get.return_value = StateRecord("p", "0/500", None)
+
+    behind = AsyncMock(return_value=True)
+    ctx = SimpleNamespace(
+        session=session,
+        run_id="r",
+        state=state,
+        pause=None,
+        progress=None,
+        pipelines=AsyncMock(),
+    )
+    pipeline = SimpleNamespace(
+        id="p",
+        name="p",
+        type="SQL",
+        mode="cdc",
+        batch_size=100,
+        source_query="SELECT id AS film_id FROM content.film_work",
+        target_table="analytics.film_dim",
+        incremental_id_key="film_id",
+        cdc_slot="etl_film_dim",
+        cdc_source_table="content.film_work",
+        cdc_key_column=None,
+    )
+
+    monkeypatch.setattr(cdc_mod, "_slot_behind", behind)
+
+    assert await run_cdc_pipeline(ctx, pipeline, writer=AsyncMock()) == (0, 0)
+
+    assert session.advanced == ["0/500"]
+
+
+def test_slot_advances_to_the_checkpoint_itself():
+    # the checkpoint is already the end of the last COMMIT record; one byte
+    # further could skip an interleaved transaction committed right there
+    assert str(cdc_mod._ADVANCE_SQL) == (
+        "SELECT pg_replication_slot_advance(CAST(:slot AS name), CAST(:lsn AS pg_lsn))"
+    )
+    assert str(cdc_mod._BEHIND_SQL) == (
+        "SELECT CAST(:checkpoint AS pg_lsn) > CAST(:confirmed AS pg_lsn)"
+    )
+
+
+def test_slot_is_released_on_mode_change_and_rename_only():
+    assert released_slot("cdc", "s1", "full", None) == "s1"
+    assert released_slot("cdc", "s1", "cdc", "s2") == "s1"
+    assert released_slot("cdc", "s1", "cdc", "s1") is None
+    assert released_slot("incremental", None, "cdc", "s1") is None
+
+
+class _SlotSession:
+    def __init__(self, row):
+        self.row = row
+        self.dropped = []
+
+    async def execute(self, stmt, params):
+        if stmt is cdc_slots._DROP_SLOT_SQL:
+            self.dropped.append(params["slot"])
+        return _Result([self.row] if self.row is not None else [])
+
+
+@pytest.mark.parametrize(
+    "row, outcome",
+    [
+        ((False, False), "dropped"),
+        (None, "missing"),
+        ((True, False), "active"),
+        ((False, True), "in_use"),
+    ],
+)
+async def test_only_unused_slots_are_dropped(row, outcome):
+    session = _SlotSession(row)
+
+    assert await drop_replication_slot(session, "s1") == outcome
+    assert session.dropped == (["s1"] if outcome == "dropped" else [])
+
+
+async def test_update_away_from_cdc_drops_the_old_slot(monkeypatch):
+    pipeline = SimpleNamespace(
+        status="IDLE",
+        type="SQL",
+        mode="cdc",
+        incremental_key=None,
+        incremental_id_key="film_id",
+        python_module=None,
+        cdc_slot="etl_film_dim",
+        cdc_source_table="content.film_work",
+        source_query="SELECT 1",
+        target_table="analytics.film_dim",
+        extra_targets=[],
+    )
+    repo = SimpleNamespace(
+        get_pipeline=AsyncMock(return_value=pipeline),
+        update_pipeline=AsyncMock(return_value=pipeline),
+    )
+    drop = AsyncMock(return_value="dropped")
+    monkeypatch.setattr("src.app.services.pipelines.drop_replication_slot", drop)
+    session = AsyncMock()
+    service = PipelinesService(session, repo=repo)
+
+    await service.update_pipeline("p", {"cdc_slot": "etl_film_dim_v2"})
+    drop.assert_awaited_once_with(session, "etl_film_dim")
+
+    drop.reset_mock()
+    await service.update_pipeline("p", {"priority": 5})
+    drop.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "old_mode, new_mode, reset",
+    [("cdc", "incremental", True), ("incremental", "cdc", True), ("full", "incremental", False)],
+)
+async def test_mode_change_to_or_from_cdc_resets_the_checkpoint(
+    monkeypatch, old_mode, new_mode, reset
+):
+    pipeline = SimpleNamespace(
+        status="IDLE",
+        type="SQL",
+        mode=old_mode,
+        incremental_key="updated_at",
+        incremental_id_key="film_id",
+        python_module=None,
+        cdc_slot="etl_film_dim",
+        cdc_source_table="content.film_work",
+        source_query="SELECT 1",
+        target_table="analytics.film_dim",
+        extra_targets=[],
+    )
+    repo = SimpleNamespace(
+        get_pipeline=AsyncMock(return_value=pipeline),
+        update_pipeline=AsyncMock(return_value=pipeline),
+    )
+    monkeypatch.setattr(
+        "src.app.services.pipelines.drop_replication_slot", AsyncMock(return_value="dropped")
+    )
+    session = AsyncMock()
+
+    await PipelinesService(session, repo=repo).update_pipeline("p", {"mode": new_mode})
+
+    assert repo.update_pipeline.await_args.kwargs["reset_checkpoint"] is reset
+
+
+async def test_checkpoint_reset_deletes_the_state_row_before_the_commit():
+    pipeline = SimpleNamespace(version=1)
+    events = []
+
+    async def execute(stmt, params=None):
+        events.append(str(stmt.compile(dialect=postgresql.dialect())))
+        res = MagicMock()
+        res.scalar_one_or_none.return_value = pipeline
+        return res
+
+    async def commit():
+        events.append("COMMIT")
+
+    session = SimpleNamespace(execute=execute, commit=commit, refresh=AsyncMock())
+
+    await SQLPipelinesRepository().update_pipeline(
+        session, "p", {"mode": "cdc"}, reset_checkpoint=True
+    )
+
+    assert events[1].startswith("DELETE FROM etl.etl_state WHERE etl.etl_state.pipeline_id")
+    assert events[2] == "COMMIT"
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pytest
+
+from src.app.core.cron import parse_cron
+
+
+@pytest.mark.parametrize(
+    ("expr", "after", "expected"),
+    [
+        ("*/15 * * * *", datetime(2024, 1, 1, 10, 7, 30), datetime(2024, 1, 1, 10, 15)),
+        ("0 3 * * *", datetime(2024, 1, 1, 3, 0), datetime(2024, 1, 2, 3, 0)),
+        ("@hourly", datetime(2024, 1, 1, 23, 59), datetime(2024, 1, 2, 0, 0)),
+        ("30 8 * * MON-FRI", datetime(2024, 1, 5, 9, 0), datetime(2024, 1, 8, 8, 30)),
+        ("0 0 1 JAN,JUL *", datetime(2024, 2, 1), datetime(2024, 7, 1)),
+        ("0 0 29 2 *", datetime(2024, 3, 1), datetime(2028, 2, 29)),
+        ("0 12 * * 7", datetime(2024, 1, 1), datetime(2024, 1, 7, 12, 0)),  # Sunday
+        # both day fields restricted: either matches (1st of month or a Monday)
+        ("0 0 1 * 1", datetime(2024, 1, 2), datetime(2024, 1, 8)),
+    ],
+)
+def test_next_after(expr, after, expected):
+    assert parse_cron(expr).next_after(after) == expected
+
+
+@pytest.mark.parametrize("expr", ["", "* * * *", "60 * * * *", "*/0 * * * *", "0 0 * * FOO"])
+def test_invalid_expressions(expr):
+    with pytest.raises(ValueError):
+        parse_cron(expr)
+
+
+def test_expression_that_never_fires():
+    with pytest.raises(ValueError, match="never fires"):
+        parse_cron("0 0 30 2 *").next_after(datetime(2024, 1, 1))
@@ -117,6 +117,36 @@ async def test_retry_on_non_disconnect_error(monkeypatch):
     pipelines.fail_if_active.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_profile_request_covers_the_first_attempt_only(monkeypatch):
+    session = AsyncMock()
+    executor = AsyncMock()
+    pipelines = AsyncMock()
+
+    claimed = DummyPipeline(
+        id="pid-1", name="p1", status=PipelineStatus.RUN_REQUESTED.value, profile_runs=1
+    )
+    pipelines.claim_run_requested.return_value = claimed
+    pipelines.take_profile_request.return_value = "sample"
+
+    snap = DummyPipeline(id="pid-1", name="p1", tasks=(), mode="full")
+    import src.runner.orchestration.dispatcher as disp_mod
+
+    monkeypatch.setattr(disp_mod, "snapshot_pipeline_with_tasks", AsyncMock(return_value=snap))
+    monkeypatch.setattr(disp_mod, "is_db_disconnect", lambda exc: False)
+
+    executor.execute.side_effect = [RuntimeError("1"), SimpleNamespace(rows_read=1)]
+    pipelines.get_status.return_value = PipelineStatus.RUNNING.value
+
+    d = PipelineDispatcher(
+        executor=executor, pipelines=pipelines, max_attempts=3, backoff_seconds=(0, 0, 0)
+    )
+    await d.dispatch(session, claimed)
+
+    pipelines.take_profile_request.assert_awaited_once_with(session, "pid-1")
+    assert [c.kwargs["profile"] for c in executor.execute.await_args_list] == ["sample", None]
+
+
 @pytest.mark.asyncio
 async def test_db_disconnect_exits_without_failing_pipeline(monkeypatch):
     session = AsyncMock()
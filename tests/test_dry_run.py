@@ -0,0 +1,137 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.app.core.query_plan import BatchSource, explain_pipeline_run
+from src.app.services.pipelines import PipelinesService
+
+NO_CHECKPOINT = (None, None)
+
+
+def _source(mode="full", reader_sql="SELECT * FROM content.film_work", **kw):
+    return BatchSource(id="p", mode=mode, reader_sql=reader_sql, batch_size=1000, **kw)
+
+
+def _session(plan_for):
+    """Session whose EXPLAIN returns `plan_for(sql, params)` as the plan root."""
+    statements: list[tuple[str, dict]] = []
+
+    async def execute(stmt, params=None):
+        sql = stmt.text.removeprefix("EXPLAIN (VERBOSE, FORMAT JSON) ")
+        statements.append((sql, params or {}))
+        res = MagicMock()
+        res.scalar_one.return_value = json.dumps([{"Plan": plan_for(sql, params or {})}])
+        return res
+
+    return SimpleNamespace(execute=execute), statements
+
+
+def _scan(node_type="Seq Scan", **kw):
+    return {"Node Type": node_type, "Relation Name": "film_work", "Schema": "content", **kw}
+
+
+async def test_full_run_plans_first_and_last_offset_batch():
+    def plan(sql, _params):
+        if "OFFSET 0" in sql:
+            return {"Node Type": "Limit", "Total Cost": 20.0, "Plan Rows": 1000}
+        if "OFFSET" in sql:
+            return {"Node Type": "Limit", "Total Cost": 5000.0, "Plan Rows": 500}
+        return {**_scan(), "Total Cost": 5000.0, "Plan Rows": 4500}
+
+    session, statements = _session(plan)
+
+    est = await explain_pipeline_run(session, _source(), NO_CHECKPOINT)
+
+    assert est.form == "offset"
+    assert est.estimated_rows == 4500
+    assert est.projected_batches == 5
+    assert statements[1][0] == (
+        "SELECT * FROM (SELECT * FROM content.film_work) AS src LIMIT 1000 OFFSET 0"
+    )
+    assert statements[2][0].endswith("LIMIT 1000 OFFSET 4000")
+    assert est.last_batch is not None and est.last_batch.total_cost == 5000.0
+    assert est.estimated_total_cost == pytest.approx(5 * 2510.0)
+    assert [i.code for i in est.issues] == ["offset_rescan"]
+    assert est.as_dict()["ok"] is False
+
+
+async def test_single_batch_full_run_is_ok():
+    session, statements = _session(
+        lambda sql, _p: {"Node Type": "Limit", "Total Cost": 3.0, "Plan Rows": 10}
+    )
+
+    est = await explain_pipeline_run(session, _source(), NO_CHECKPOINT)
+
+    assert est.ok
+    assert est.projected_batches == 1
+    assert est.last_batch is None
+    assert len(statements) == 2
+
+
+async def test_incremental_run_flags_sort_and_scan_per_batch():
+    sorted_scan = {
+        "Node Type": "Limit",
+        "Total Cost": 800.0,
+        "Plan Rows": 1000,
+        "Plans": [
+            {
+                "Node Type": "Sort",
+                "Sort Key": ["src.updated_at", "src.id"],
+                "Plans": [_scan(Alias="src")],
+            }
+        ],
+    }
+
+    def plan(_sql, params):
+        return sorted_scan if params["limit"] else {**sorted_scan, "Plan Rows": 12500}
+
+    session, statements = _session(plan)
+    source = _source(mode="incremental", incremental_key="updated_at", incremental_id_key="id")
+
+    est = await explain_pipeline_run(session, source, (datetime(2024, 1, 1), "42"))
+
+    assert est.form == "seek"
+    assert [p["limit"] for _, p in statements] == [1000, None]
+    assert statements[0][1]["last_id"] == "42"
+    assert est.estimated_rows == 12500
+    assert est.projected_batches == 13
+    assert est.estimated_total_cost == 13 * 800.0
+    assert [i.code for i in est.issues] == ["sort_per_batch", "seq_scan_per_batch"]
+    assert "CREATE INDEX CONCURRENTLY" in est.issues[0].message
+
+
+async def test_cdc_pipelines_are_rejected():
+    session, _ = _session(lambda sql, _p: {})
+
+    with pytest.raises(ValueError, match="full and incremental"):
+        await explain_pipeline_run(session, _source(mode="cdc"), NO_CHECKPOINT)
+
+
+async def test_api_estimate_reads_the_checkpoint_through_its_repo():
+    pipeline = SimpleNamespace(
+        id="p",
+        mode="incremental",
+        source_query="SELECT * FROM content.film_work",
+        batch_size=1000,
+        incremental_key="updated_at",
+        incremental_id_key="id",
+    )
+    repo = SimpleNamespace(
+        get_pipeline=AsyncMock(return_value=pipeline),
+        get_reader_sql=AsyncMock(return_value=None),
+        get_checkpoint=AsyncMock(return_value=("2024-01-01T00:00:00", "42")),
+    )
+    session, statements = _session(
+        lambda sql, _p: {"Node Type": "Limit", "Total Cost": 3.0, "Plan Rows": 10}
+    )
+    session.rollback = AsyncMock()
+
+    est = await PipelinesService(session, repo=repo).explain_pipeline("p")
+
+    assert est.form == "seek"
+    assert statements[0][1]["last_id"] == "42"
+    repo.get_checkpoint.assert_awaited_once_with(session, "p")
+    session.rollback.assert_awaited()
@@ -0,0 +1,124 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.runner.orchestration.executor import PipelineExecutor
+from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from src.runner.services.plan_cache import PipelinePlan
+
+_PLAN = SimpleNamespace(snapshot=SimpleNamespace(mode="full", skip_unchanged=False))
+
+
+def _executor(data_session=None):
+    runs = AsyncMock()
+    runs.start_run.return_value = "rid-1"
+
+    factory = None
+    if data_session is not None:
+
+        @asynccontextmanager
+        async def factory():
+            yield data_session
+
+    executor = PipelineExecutor(
+        runs=runs,
+        pipelines=AsyncMock(),
+        state=AsyncMock(),
+        data_session_factory=factory,
+    )
+    return executor, runs
+
+
+@pytest.mark.asyncio
+async def test_batches_use_data_session_and_bookkeeping_control_session(monkeypatch):
+    control, data = AsyncMock(), AsyncMock()
+    executor, runs = _executor(data)
+
+    seen = {}
+
+    async def fake_body(ctx, plan):
+        seen["session"] = ctx.session
+        return 3, 2
+
+    monkeypatch.setattr(executor, "_plan_for", lambda p: _PLAN)
+    monkeypatch.setattr(executor, "_run_body", fake_body)
+
+    res = await executor.execute(control, SimpleNamespace(id="pid-1", name="p1"))
+
+    assert (res.rows_read, res.rows_written) == (3, 2)
+    assert seen["session"] is data
+    runs.start_run.assert_awaited_once_with(control, pipeline_id="pid-1")
+    runs.finish_success.assert_awaited_once_with(
+        control, run_id="rid-1", rows_read=3, rows_written=2, rows_skipped=0
+    )
+
+
+@pytest.mark.asyncio
+async def test_failure_is_recorded_on_control_session(monkeypatch):
+    control, data = AsyncMock(), AsyncMock()
+    executor, runs = _executor(data)
+
+    monkeypatch.setattr(executor, "_plan_for", lambda p: _PLAN)
+    monkeypatch.setattr(executor, "_run_body", AsyncMock(side_effect=ValueError("boom")))
+
+    with pytest.raises(ValueError):
+        await executor.execute(control, SimpleNamespace(id="pid-1", name="p1"))
+
+    runs.finish_failed.assert_awaited_once()
+    assert runs.finish_failed.await_args.args == (control,)
+
+
+@pytest.mark.asyncio
+async def test_without_data_factory_uses_given_session(monkeypatch):
+    control = AsyncMock()
+    executor, _ = _executor()
+
+    seen = {}
+
+    async def fake_body(ctx, plan):
+        seen["session"] = ctx.session
+        return 0, 0
+
+    monkeypatch.setattr(executor, "_plan_for", lambda p: _PLAN)
+    monkeypatch.setattr(executor, "_run_body", fake_body)
+
+    await executor.execute(control, SimpleNamespace(id="pid-1", name="p1"))
+
+    assert seen["session"] is control
+
+
+@pytest.mark.asyncio
+async def test_skip_unchanged_wraps_writer_per_run_and_records_skipped(monkeypatch):
+    control = AsyncMock()
+    executor, runs = _executor()
+    cached_writer = AsyncMock()
+    snap = PipelineSnapshot(
+        id="pid-1",
+        name="p1",
+        type="SQL",
+        mode="full",
+        enabled=True,
+        batch_size=10,
+        source_query="select 1",
+        python_module=None,
+        target_table="analytics.film_dim",
+        incremental_key=None,
+        incremental_id_key=None,
+        skip_unchanged=True,
+    )
+    plan = PipelinePlan(snapshot=snap, writer=cached_writer, transformer=AsyncMock())
+    monkeypatch.setattr(executor, "_plan_for", lambda p: plan)
+
+    async def fake_body(ctx, plan):
+        assert plan.writer is not cached_writer
+        plan.writer.skipped = 4
+        return 5, 1
+
+    monkeypatch.setattr(executor, "_run_body", fake_body)
+
+    res = await executor.execute(control, SimpleNamespace(id="pid-1", name="p1"))
+
+    assert res.rows_skipped == 4
+    assert runs.finish_success.await_args.kwargs["rows_skipped"] == 4
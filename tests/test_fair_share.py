@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.app.core.enums import PipelineStatus
+from src.runner.orchestration.fair_share import FairShare
+from src.runner.orchestration.manager import PipelineManager
+
+
+class _Clock:
+    t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _p(pid, *, priority=10, status=PipelineStatus.RUN_REQUESTED.value):
+    return SimpleNamespace(id=pid, name=pid, priority=priority, status=status)
+
+
+def test_usage_decays_with_half_life():
+    clock = _Clock()
+    fair = FairShare(half_life=100.0, monotonic=clock)
+
+    fair.record("a", 40.0)
+    clock.t = 100.0
+    assert fair.usage("a") == pytest.approx(20.0)
+
+    fair.record("a", 5.0)
+    assert fair.usage("a") == pytest.approx(25.0)
+
+
+def test_order_by_usage_per_weight_then_priority():
+    fair = FairShare(monotonic=_Clock())
+    fair.record("backfill", 600.0)
+    fair.record("small", 30.0)
+    fair.record("vip", 60.0)
+
+    ordered = fair.order([_p("backfill"), _p("small"), _p("vip", priority=40), _p("new")])
+
+    # new: 0; vip: 60/40; small: 30/10; backfill: 600/10
+    assert [p.id for p in ordered] == ["new", "vip", "small", "backfill"]
+
+
+def test_heavy_pipelines_leave_reserved_slots_free():
+    fair = FairShare(max_slots=3, reserved_slots=1, heavy_seconds=100.0, monotonic=_Clock())
+    for pid in ("h1", "h2", "h3"):
+        fair.record(pid, 500.0)
+
+    assert fair.admit("h2", ["h1"])
+    assert not fair.admit("h3", ["h1", "h2"])
+    assert fair.admit("light", ["h1", "h2"])
+    assert not fair.admit("light", ["h1", "h2", "x"])
+
+
+async def test_manager_starts_runs_concurrently_up_to_the_slots():
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def dispatch(session, pipeline):
+        if pipeline.status == PipelineStatus.RUN_REQUESTED.value:
+            started.append(pipeline.id)
+            await release.wait()
+
+    @asynccontextmanager
+    async def factory():
+        yield AsyncMock()
+
+    manager = PipelineManager(factory, fair_share=FairShare(max_slots=2, reserved_slots=0))
+    manager._pipelines = SimpleNamespace(
+        get_active=AsyncMock(
+            return_value=[
+                _p("a"),
+                _p("b"),
+                _p("c"),
+                _p("paused", status=PipelineStatus.PAUSE_REQUESTED.value),
+            ]
+        )
+    )
+    manager._dispatcher = SimpleNamespace(dispatch=dispatch)
+
+    result = await manager.tick()
+    await asyncio.sleep(0)
+
+    assert result.pipelines_processed == 3  # a, b started; pause applied inline
+    assert sorted(started) == ["a", "b"]
+    assert sorted(manager.inflight) == ["a", "b"]
+
+    release.set()
+    await asyncio.sleep(0)
+    await manager.tick()
+    await asyncio.sleep(0)
+    assert "c" in started
+
+    await manager.aclose()
@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.runner.adapters.writers import (
+    ElasticsearchWriter,
+    FanOutWriter,
+    PostgresWriter,
+    resolve_writer,
+)
+
+
+class _Sink:
+    def __init__(self, log: list, *, delay: float = 0.0, result: int | None = None, fail=None):
+        self.log = log
+        self.delay = delay
+        self.result = result
+        self.fail = fail
+        self.closed = False
+        self.cancelled = False
+
+    async def write(self, session, pipeline, rows):
+        self.log.append(("start", pipeline.target_table))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise self.fail
+        self.log.append(("end", pipeline.target_table))
+        return len(rows) if self.result is None else self.result
+
+    async def delete(self, session, pipeline, keys):
+        return self.result if self.result is not None else len(keys)
+
+    async def close(self):
+        self.closed = True
+
+
+def _pipeline(**kw):
+    return SimpleNamespace(id="p1", name="p", target_table="analytics.film_dim", **kw)
+
+
+async def test_pg_sinks_are_sequential_es_sinks_concurrent():
+    log: list = []
+    writer = FanOutWriter(
+        [
+            ("analytics.film_dim", _Sink(log, delay=0.01)),
+            ("analytics.film_rating_agg", _Sink(log)),
+            ("es:film_dim", _Sink(log, delay=0.01)),
+        ]
+    )
+
+    n = await writer.write(object(), _pipeline(), [{"film_id": 1}, {"film_id": 2}])
+
+    assert n == 2
+    # ES started while the first PG sink was still writing; PG sinks never overlap
+    assert log[:2] == [("start", "analytics.film_dim"), ("start", "es:film_dim")]
+    pg = [e for e in log if e[1].startswith("analytics.")]
+    assert pg == [
+        ("start", "analytics.film_dim"),
+        ("end", "analytics.film_dim"),
+        ("start", "analytics.film_rating_agg"),
+        ("end", "analytics.film_rating_agg"),
+    ]
+
+
+async def test_written_is_what_every_sink_acknowledged():
+    writer = FanOutWriter([("analytics.film_dim", _Sink([])), ("es:film_dim", _Sink([], result=1))])
+
+    assert await writer.write(object(), _pipeline(), [{}, {}, {}]) == 1
+
+
+async def test_one_failing_sink_fails_the_batch_and_cancels_the_rest():
+    slow = _Sink([], delay=1.0)
+    writer = FanOutWriter(
+        [
+            ("analytics.film_dim", _Sink([], fail=RuntimeError("pg down"))),
+            ("es:film_dim", slow),
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match="pg down"):
+        await writer.write(object(), _pipeline(), [{}])
+    assert slow.cancelled
+
+    await writer.close()
+    assert slow.closed
+
+
+async def test_delete_reports_most_removed():
+    writer = FanOutWriter(
+        [("analytics.film_dim", _Sink([], result=2)), ("es:film_dim", _Sink([], result=0))]
+    )
+
+    assert await writer.delete(object(), _pipeline(), ["a", "b"]) == 2
+
+
+def test_resolve_writer_fans_out_only_with_extra_targets():
+    assert isinstance(resolve_writer(_pipeline(extra_targets=())), PostgresWriter)
+
+    writer = resolve_writer(_pipeline(extra_targets=("es:film_dim", "analytics.film_dim")))
+
+    assert isinstance(writer, FanOutWriter)
+    assert writer.targets == ["analytics.film_dim", "es:film_dim"]
+    assert isinstance(writer._sinks[1][1], ElasticsearchWriter)
+
+
+def test_resolve_writer_rejects_unknown_extra_target():
+    with pytest.raises(ValueError, match="not allowed"):
+        resolve_writer(_pipeline(extra_targets=("es:secret",)))
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.runner.adapters.fingerprints import (
+    FingerprintWriter,
+    fingerprint_scope,
+    row_fingerprint,
+)
+
+
+class _Session:
+    """Keeps etl_row_fingerprints in a dict; understands the writer's three statements."""
+
+    def __init__(self):
+        self.rows: dict[str, bytes] = {}
+
+    async def execute(self, stmt, params):
+        sql = stmt.text
+        if sql.startswith("SELECT"):
+            hits = [(k, self.rows[k]) for k in params["keys"] if k in self.rows]
+            return SimpleNamespace(all=lambda: hits)
+        if sql.startswith("INSERT"):
+            self.rows.update(zip(params["keys"], params["fps"], strict=True))
+        elif sql.startswith("DELETE"):
+            for k in params["keys"]:
+                self.rows.pop(k, None)
+        return SimpleNamespace()
+
+
+def _writer():
+    inner = AsyncMock()
+    inner.write.side_effect = lambda session, pipeline, rows: len(rows)
+    return FingerprintWriter(inner, pipeline_id="p1", scope="analytics.film_dim"), inner
+
+
+def test_fingerprint_ignores_key_order_but_not_values():
+    a = row_fingerprint({"film_id": "1", "title": "A", "rating": 7.5})
+    assert a == row_fingerprint({"rating": 7.5, "title": "A", "film_id": "1"})
+    assert a != row_fingerprint({"film_id": "1", "title": "A", "rating": 7.6})
+    assert len(a) == 16
+
+
+async def test_unchanged_rows_are_skipped_on_the_next_run():
+    session = _Session()
+    rows = [{"film_id": "1", "title": "A"}, {"film_id": "2", "title": "B"}]
+
+    first, inner = _writer()
+    assert await first.write(session, None, rows) == 2
+    assert first.skipped == 0
+
+    second, inner = _writer()
+    changed = [{"film_id": "1", "title": "A"}, {"film_id": "2", "title": "B2"}]
+    assert await second.write(session, None, changed) == 1
+
+    assert second.skipped == 1
+    inner.write.assert_awaited_once_with(session, None, [{"film_id": "2", "title": "B2"}])
+
+
+async def test_fingerprints_are_stored_only_after_the_sink_accepted_the_batch():
+    session = _Session()
+    writer, inner = _writer()
+    inner.write.side_effect = RuntimeError("sink down")
+
+    with pytest.raises(RuntimeError):
+        await writer.write(session, None, [{"film_id": "1"}])
+
+    assert session.rows == {}
+
+
+async def test_delete_forgets_fingerprints():
+    session = _Session()
+    writer, inner = _writer()
+    inner.delete.return_value = 1
+    await writer.write(session, None, [{"film_id": "1"}, {"film_id": "2"}])
+
+    assert await writer.delete(session, None, ["1"]) == 1
+    assert set(session.rows) == {"2"}
+
+
+def test_fanout_pipelines_share_one_scope():
+    p = SimpleNamespace(target_table="analytics.film_dim", extra_targets=("es:film_dim",))
+    assert fingerprint_scope(p) == "analytics.film_dim,es:film_dim"
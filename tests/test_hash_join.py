@@ -0,0 +1,256 @@
+import os
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.runner.adapters.tasks_dag import run_tasks_dag
+from src.runner.services.hash_join import (
+    DimensionIndex,
+    JoinLimits,
+    configure_join_limits,
+    hash_join,
+    parse_join_spec,
+)
+from src.runner.services.pipeline_snapshot import PipelineSnapshot, TaskSnapshot
+from src.runner.services.plan_cache import DagPlan
+from src.runner.services.task_plan import validate_tasks_v2
+
+FILMS = "SELECT id AS film_id, title FROM content.film_work"
+RATINGS = "SELECT film_id, rating, votes FROM ratings.film_rating"
+
+
+def test_join_spec_defaults_and_errors():
+    spec = parse_join_spec('{"on": "film_id"}')
+    assert (spec.on, spec.dim_on, spec.how, spec.columns) == (
+        ("film_id",),
+        ("film_id",),
+        "left",
+        None,
+    )
+
+    spec = parse_join_spec('{"on": ["a", "b"], "dim_on": ["x", "y"], "how": "inner"}')
+    assert spec.dim_on == ("x", "y") and spec.how == "inner"
+
+    for body, match in [
+        ("film_id", "JSON object"),
+        ('{"on": "a", "using": "a"}', "Unknown JOIN keys"),
+        ('{"on": ["a", "b"], "dim_on": "x"}', "same number"),
+        ('{"on": "a", "how": "full"}', "how must be"),
+        ('{"on": []}', "column name"),
+    ]:
+        with pytest.raises(ValueError, match=match):
+            parse_join_spec(body)
+
+
+async def test_in_memory_index_skips_null_keys_and_rejects_duplicates():
+    index = DimensionIndex(["film_id"])
+    await index.add(
+        [
+            {"film_id": 1, "rating": 8.1, "votes": 10},
+            {"film_id": None, "rating": 1.0, "votes": 1},
+        ]
+    )
+
+    assert index.columns == ("rating", "votes")
+    assert index.size == 1 and not index.spilled
+    assert await index.get_many([1, 2, None]) == {1: (8.1, 10)}
+
+    with pytest.raises(ValueError, match="not unique"):
+        await index.add([{"film_id": 1, "rating": 2.0, "votes": 2}])
+
+
+async def test_index_spills_to_sqlite_past_the_memory_limit(tmp_path):
+    t = datetime(2024, 1, 1)
+    index = DimensionIndex(
+        ["film_id", "lang"], ["rating", "at"], memory_limit=1000, spill_dir=str(tmp_path)
+    )
+    await index.add([{"film_id": 1, "lang": "en", "rating": 8.1, "at": t}])
+    assert not index.spilled
+
+    await index.add(
+        [{"film_id": i, "lang": "en", "rating": float(i), "at": t} for i in range(2, 20)]
+    )
+    assert index.spilled and index.size == 19 and index.approx_bytes == 0
+    [spill_file] = os.listdir(tmp_path)
+
+    # rows added after the spill go straight to the file
+    await index.add([{"film_id": 50, "lang": "de", "rating": 5.0, "at": t}])
+    found = await index.get_many([(1, "en"), (50, "de"), (1, "de"), None])
+    assert found == {(1, "en"): (8.1, t), (50, "de"): (5.0, t)}
+
+    with pytest.raises(ValueError, match="not unique"):
+        await index.add([{"film_id": 50, "lang": "de", "rating": 0.0, "at": t}])
+
+    index.close()
+    assert not os.path.exists(tmp_path / spill_file)
+
+
+async def test_hash_join_left_inner_and_column_clash():
+    index = DimensionIndex(["id"], ["rating"])
+    await index.add([{"id": 1, "rating": 8.1, "votes": 10}])
+    rows = [{"film_id": 1, "title": "a"}, {"film_id": 2, "title": "b"}]
+
+    left = parse_join_spec('{"on": "film_id", "dim_on": "id", "prefix": "dim_"}')
+    assert await hash_join(rows, index=index, spec=left) == [
+        {"film_id": 1, "title": "a", "dim_rating": 8.1},
+        {"film_id": 2, "title": "b", "dim_rating": None},
+    ]
+    assert rows[0] == {"film_id": 1, "title": "a"}  # input left as is
+
+    inner = parse_join_spec('{"on": "film_id", "dim_on": "id", "how": "inner"}')
+    assert await hash_join(rows, index=index, spec=inner) == [
+        {"film_id": 1, "title": "a", "rating": 8.1}
+    ]
+
+    with pytest.raises(ValueError, match="set a prefix"):
+        await hash_join([{"film_id": 1, "rating": 0}], index=index, spec=inner)
+
+
+def _snap(*tasks, mode="full"):
+    return PipelineSnapshot(
+        id="p",
+        name="p",
+        type="SQL",
+        mode=mode,
+        enabled=True,
+        batch_size=2,
+        source_query=None,
+        python_module=None,
+        target_table="analytics.film_dim",
+        incremental_key=None,
+        incremental_id_key=None,
+        tasks=tasks,
+    )
+
+
+def _task(idx, task_type, body, *, deps=(), target=None):
+    return TaskSnapshot(f"t{idx}", idx, task_type, body, target, depends_on=tuple(deps))
+
+
+JOIN_DAG = (
+    _task(1, "SQL", FILMS),
+    _task(2, "SQL", RATINGS),
+    _task(3, "JOIN", '{"on": "film_id", "columns": ["rating"]}', deps=[1, 2]),
+)
+
+
+def test_dimension_is_not_a_batch_reader():
+    _, graph = validate_tasks_v2(_snap(*JOIN_DAG))
+
+    assert graph.readers == (1,)
+    assert graph.dimensions == (2,)
+    assert graph.nodes[3].dimension == 2
+    assert graph.nodes[1].children == (3,)
+    assert graph.sinks == [(3, "analytics.film_dim")]
+
+
+@pytest.mark.parametrize(
+    "tasks, match",
+    [
+        (
+            (
+                _task(1, "SQL", FILMS),
+                _task(2, "PYTHON", "src.pipelines.python_tasks.normalize_title", deps=[1]),
+                _task(3, "JOIN", '{"on": "film_id"}', deps=[1, 2]),
+            ),
+            "SQL dimension",
+        ),
+        (
+            (
+                _task(1, "SQL", FILMS),
+                _task(2, "SQL", RATINGS, target="analytics.film_rating_agg"),
+                _task(3, "JOIN", '{"on": "film_id"}', deps=[1, 2]),
+            ),
+            "JOIN dimension",
+        ),
+        (
+            (
+                _task(1, "SQL", FILMS),
+                _task(2, "SQL", RATINGS + " WHERE film_id > :last_id"),
+                _task(3, "JOIN", '{"on": "film_id"}', deps=[1, 2]),
+            ),
+            "read whole",
+        ),
+        (
+            (
+                _task(1, "SQL", FILMS),
+                _task(2, "SQL", RATINGS),
+                _task(3, "JOIN", '{"on": "film_id", "how": "right"}', deps=[1, 2]),
+            ),
+            "how must be",
+        ),
+    ],
+)
+def test_invalid_joins_are_rejected(tasks, match):
+    with pytest.raises(ValueError, match=match):
+        validate_tasks_v2(_snap(*tasks))
+
+
+class _Session:
+    def __init__(self, dimension, pages):
+        self.dimension = dimension
+        self.pages = list(pages)
+        self.streamed = []
+
+    async def stream(self, stmt):
+        self.streamed.append(str(stmt))
+        dimension = self.dimension
+
+        async def partitions(size):
+            for i in range(0, len(dimension), size):
+                yield dimension[i : i + size]
+
+        result = MagicMock()
+        result.mappings.return_value.partitions = partitions
+        return result
+
+    async def execute(self, stmt, params=None):
+        res = MagicMock()
+        res.mappings.return_value.all.return_value = self.pages.pop(0)
+        return res
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.parametrize("memory_bytes", [0, 1])
+async def test_dag_run_reads_the_dimension_once_and_joins_every_batch(
+    tmp_path, monkeypatch, memory_bytes
+):
+    configure_join_limits(JoinLimits(memory_bytes=memory_bytes, spill_dir=str(tmp_path)))
+    monkeypatch.setattr("src.runner.adapters.tasks_dag.DIMENSION_FETCH_ROWS", 2)
+    dimension = [{"film_id": i, "rating": i / 10, "votes": i} for i in range(1, 6)]
+    session = _Session(
+        dimension,
+        [
+            [{"film_id": 1, "title": "a"}, {"film_id": 9, "title": "b"}],
+            [{"film_id": 5, "title": "c"}],
+            [],
+        ],
+    )
+    ctx = SimpleNamespace(
+        session=session, state=AsyncMock(), pause=None, progress=None, pipelines=AsyncMock()
+    )
+    ctx.pipelines.get_status.return_value = "RUNNING"
+    sinks = AsyncMock()
+    sinks.targets = ["analytics.film_dim"]
+    sinks.write.side_effect = lambda s, p, outputs: len(outputs[3])
+    _, graph = validate_tasks_v2(_snap(*JOIN_DAG))
+
+    try:
+        read, written = await run_tasks_dag(
+            ctx, _snap(*JOIN_DAG), dag=DagPlan(graph=graph, fns={}, sinks=sinks)
+        )
+    finally:
+        configure_join_limits(JoinLimits())
+
+    assert (read, written) == (3, 3)
+    assert session.streamed == [RATINGS]
+    batches = [c.args[2][3] for c in sinks.write.await_args_list]
+    assert batches == [
+        [{"film_id": 1, "title": "a", "rating": 0.1}, {"film_id": 9, "title": "b", "rating": None}],
+        [{"film_id": 5, "title": "c", "rating": 0.5}],
+    ]
+    assert os.listdir(tmp_path) == []  # spill file removed with the run
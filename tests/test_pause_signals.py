@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.runner.services.pause import _pause_if_requested
+from src.runner.services.pause_signals import PauseWatcher
+
+
+class _SessionCtx:
+    async def __aenter__(self):
+        return AsyncMock()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _watcher(ids):
+    pipelines = AsyncMock()
+    pipelines.list_pause_requested_ids.return_value = ids
+    return PauseWatcher(lambda: _SessionCtx(), pipelines=pipelines, interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_no_io_when_pause_not_requested():
+    watcher = _watcher([])
+    await watcher.refresh()
+
+    pipelines = AsyncMock()
+    ctx = SimpleNamespace(session=AsyncMock(), pipelines=pipelines, pause=watcher)
+
+    assert await _pause_if_requested(ctx, "pid-1") is False
+    pipelines.get_status.assert_not_awaited()
+    pipelines.apply_pause_requested.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_pause_applied_when_signal_set():
+    watcher = _watcher(["pid-1"])
+    await watcher.refresh()
+
+    pipelines = AsyncMock()
+    pipelines.apply_pause_requested.return_value = True
+    ctx = SimpleNamespace(session=AsyncMock(), pipelines=pipelines, pause=watcher)
+
+    assert await _pause_if_requested(ctx, "pid-1") is True
+    pipelines.apply_pause_requested.assert_awaited_once_with(ctx.session, "pid-1")
+    pipelines.get_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stale_signal_does_not_pause():
+    watcher = _watcher(["pid-1"])
+    await watcher.refresh()
+
+    pipelines = AsyncMock()
+    pipelines.apply_pause_requested.return_value = False
+    ctx = SimpleNamespace(session=AsyncMock(), pipelines=pipelines, pause=watcher)
+
+    assert await _pause_if_requested(ctx, "pid-1") is False
+
+
+@pytest.mark.asyncio
+async def test_fallback_to_status_query_without_watcher():
+    pipelines = AsyncMock()
+    pipelines.get_status.return_value = "RUNNING"
+    ctx = SimpleNamespace(session=AsyncMock(), pipelines=pipelines, pause=None)
+
+    assert await _pause_if_requested(ctx, "pid-1") is False
+    pipelines.get_status.assert_awaited_once()
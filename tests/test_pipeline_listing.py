@@ -0,0 +1,131 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from starlette.requests import Request
+
+from src.app.api.helpers.pipelines import (
+    decode_cursor,
+    encode_cursor,
+    etag_matches,
+    listing_etag,
+)
+from src.app.api.v1.pipelines import list_pipelines_endpoint
+from src.app.models import EtlPipeline
+from src.app.repositories.pipelines import _filtered
+from src.app.schemas.pipelines import (
+    PIPELINE_OUT_FIELDS,
+    PipelineListFilter,
+    parse_fields,
+)
+
+PID = "8db9cb6a-7507-4b57-bda4-30e925605ffa"
+
+
+def test_cursor_round_trip_and_garbage():
+    cursor = encode_cursor(("film-dim", PID))
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("film-dim", PID)
+
+    for bad in ("???", encode_cursor(("film-dim", "not-a-uuid")), "eyJhIjoxfQ"):
+        with pytest.raises(ValueError, match="invalid cursor"):
+            decode_cursor(bad)
+
+
+def test_fields_projection_always_keeps_id():
+    assert parse_fields(None) is None
+    assert parse_fields("status, name,status") == ("id", "status", "name")
+    with pytest.raises(ValueError, match="password"):
+        parse_fields("name,password")
+
+
+def test_every_output_field_is_a_column():
+    # the listing selects PipelineOut fields as columns
+    assert set(PIPELINE_OUT_FIELDS) <= set(EtlPipeline.__table__.c.keys())
+
+
+def test_status_filter_is_normalized_and_checked():
+    assert PipelineListFilter(status=("running", "IDLE", "RUNNING")).status == ("RUNNING", "IDLE")
+    with pytest.raises(ValueError, match="BOGUS"):
+        PipelineListFilter(status=("bogus",))
+
+
+def test_etag_changes_with_the_watermark_and_the_query():
+    at = datetime(2025, 1, 1)
+    etag = listing_etag(3, at, "limit=10")
+    assert etag.startswith('W/"')
+    assert etag == listing_etag(3, at, "limit=10")
+    assert etag != listing_etag(2, at, "limit=10")
+    assert etag != listing_etag(3, datetime(2025, 1, 2), "limit=10")
+    assert etag != listing_etag(3, at, "limit=20")
+
+    assert etag_matches(f'"x", {etag}', etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+
+
+def _request(query: str = "") -> Request:
+    return Request({"type": "http", "query_string": query.encode(), "headers": []})
+
+
+def _service(rows, next_after=None):
+    return SimpleNamespace(
+        pipelines_watermark=AsyncMock(return_value=(len(rows), datetime(2025, 1, 1))),
+        list_pipelines_page=AsyncMock(return_value=(rows, next_after)),
+    )
+
+
+async def _list(service, query="", **kw):
+    params = dict(
+        limit=100,
+        cursor=None,
+        status_=[],
+        mode=None,
+        type_=None,
+        enabled=None,
+        fields=None,
+        if_none_match=None,
+    )
+    params.update(kw)
+    return await list_pipelines_endpoint(_request(query), service=service, **params)
+
+
+async def test_projection_and_next_cursor_header():
+    service = _service([{"id": PID, "name": "film-dim", "status": "IDLE"}], ("film-dim", PID))
+
+    resp = await _list(service, "fields=status", fields="status", limit=1)
+
+    assert resp.status_code == 200
+    assert resp.body == f'[{{"id":"{PID}","status":"IDLE"}}]'.encode()
+    assert decode_cursor(resp.headers["x-next-cursor"]) == ("film-dim", PID)
+    call = service.list_pipelines_page.await_args
+    assert call.kwargs == {"fields": ("id", "status"), "after": None, "limit": 1}
+
+
+async def test_unchanged_listing_returns_304_without_reading_the_page():
+    service = _service([])
+    first = await _list(service)
+
+    again = await _list(service, if_none_match=first.headers["etag"])
+
+    assert again.status_code == 304
+    assert service.list_pipelines_page.await_count == 1
+
+
+async def test_bad_cursor_is_a_400():
+    with pytest.raises(HTTPException) as exc_info:
+        await _list(_service([]), cursor="???")
+    assert exc_info.value.status_code == 400
+
+
+def test_filters_become_where_clauses():
+    stmt = _filtered(
+        EtlPipeline.__table__.select(), PipelineListFilter(status=("IDLE",), enabled=True)
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "etl_pipelines.status IN" in sql
+    assert "etl_pipelines.enabled IS true" in sql
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.app.core.enums import PipelineStatus
+from src.runner.orchestration.dispatcher import PipelineDispatcher
+from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from src.runner.services.plan_cache import PlanCache
+
+
+def _snap(version: int, **kw) -> PipelineSnapshot:
+    base = dict(
+        id="pid-1",
+        name="p1",
+        type="SQL",
+        mode="full",
+        enabled=True,
+        batch_size=100,
+        source_query="SELECT 1",
+        python_module=None,
+        target_table="analytics.film_dim",
+        incremental_key=None,
+        incremental_id_key=None,
+        version=version,
+    )
+    base.update(kw)
+    return PipelineSnapshot(**base)
+
+
+def test_plan_is_reused_for_same_version():
+    cache = PlanCache()
+    snap = _snap(3)
+
+    assert cache.get_plan(snap) is cache.get_plan(snap)
+
+
+def test_version_bump_replaces_entry():
+    cache = PlanCache()
+    old = cache.get_plan(_snap(3))
+    new = cache.get_plan(_snap(4, batch_size=500))
+
+    assert new is not old
+    assert new.snapshot.batch_size == 500
+    assert cache.get_snapshot("pid-1", 3) is None
+    assert len(cache) == 1
+
+
+def test_unknown_version_is_never_cached():
+    cache = PlanCache()
+    snap = _snap(0)
+
+    assert cache.get_plan(snap) is not cache.get_plan(snap)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_skips_tasks_query_on_cache_hit(monkeypatch):
+    import src.runner.orchestration.dispatcher as disp_mod
+
+    cache = PlanCache()
+    snap = _snap(7)
+    cache.put_snapshot(snap)
+
+    loader = AsyncMock(return_value=snap)
+    monkeypatch.setattr(disp_mod, "snapshot_pipeline_with_tasks", loader)
+
+    session = AsyncMock()
+    executor = AsyncMock()
+    pipelines = AsyncMock()
+    claimed = SimpleNamespace(
+        id="pid-1", name="p1", version=7, status=PipelineStatus.RUN_REQUESTED.value
+    )
+    pipelines.claim_run_requested.return_value = claimed
+    pipelines.get_status.return_value = PipelineStatus.RUNNING.value
+
+    d = PipelineDispatcher(executor=executor, pipelines=pipelines, plans=cache)
+    await d.dispatch(session, claimed)
+
+    loader.assert_not_awaited()
+    assert executor.execute.await_args.args[1] is snap
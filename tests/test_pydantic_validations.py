@@ -78,3 +78,92 @@ def test_batch_size_bounds(size):
             target_table="analytics.film_dim",
             batch_size=size,
         )
+
+
+def _pushdown(mode: str, source_query: str) -> PipelineCreate:
+    return PipelineCreate(
+        name="pushdown",
+        mode=mode,
+        source_query=source_query,
+        target_table="analytics.film_dim",
+        incremental_key="updated_at",
+        incremental_id_key="film_id",
+    )
+
+
+def test_seek_placeholders_accepted_in_incremental_mode():
+    p = _pushdown(
+        "incremental",
+        "SELECT id AS film_id, updated_at::timestamptz FROM content.film_work"
+        " WHERE :last_ts IS NULL OR (updated_at, id) > (:last_ts, :last_id)"
+        " ORDER BY updated_at, id LIMIT :limit",
+    )
+    assert p.mode == "incremental"
+
+
+@pytest.mark.parametrize(
+    ("mode", "query", "needle"),
+    [
+        ("full", "SELECT film_id, updated_at FROM t LIMIT :limit", "incremental mode"),
+        (
+            "incremental",
+            "SELECT film_id, updated_at FROM t WHERE updated_at > :last_ts ORDER BY 1",
+            ":last_id, :limit",
+        ),
+        (
+            "incremental",
+            "SELECT film_id, updated_at FROM t WHERE x = :tenant"
+            " AND updated_at > :last_ts AND film_id > :last_id ORDER BY 1 LIMIT :limit",
+            ":tenant",
+        ),
+        (
+            "incremental",
+            "SELECT film_id, updated_at FROM t"
+            " WHERE updated_at > :last_ts AND film_id > :last_id LIMIT :limit",
+            "ORDER BY",
+        ),
+    ],
+)
+def test_seek_placeholders_rejected(mode, query, needle):
+    with pytest.raises(ValidationError) as e:
+        _pushdown(mode, query)
+    assert needle in str(e.value)
+
+
+def test_extra_targets_are_deduplicated_and_must_not_repeat_target():
+    p = PipelineCreate(
+        name="fanout",
+        source_query="select 1",
+        target_table="analytics.film_dim",
+        extra_targets=[" es:film_dim", "es:film_dim"],
+    )
+    assert p.extra_targets == ["es:film_dim"]
+
+    with pytest.raises(ValidationError) as e:
+        PipelineCreate(
+            name="fanout",
+            source_query="select 1",
+            target_table="analytics.film_dim",
+            extra_targets=["analytics.film_dim"],
+        )
+    assert "extra_targets" in str(e.value)
+
+
+def test_schedule_is_validated_and_normalized():
+    p = PipelineCreate(
+        name="nightly",
+        source_query="select 1",
+        target_table="analytics.film_dim",
+        schedule="  0   3 * * *",
+    )
+    assert p.schedule == "0 3 * * *"
+    assert p.schedule_misfire == "coalesce"
+
+    for bad in ("0 3 * *", "0 0 30 2 *"):
+        with pytest.raises(ValidationError):
+            PipelineCreate(
+                name="nightly",
+                source_query="select 1",
+                target_table="analytics.film_dim",
+                schedule=bad,
+            )
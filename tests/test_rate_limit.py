@@ -0,0 +1,146 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from src.runner.adapters import writers
+from src.runner.adapters.writers import ElasticsearchWriter, ESConfig, _pg_execute
+from src.runner.services.rate_limit import (
+    SinkLimiter,
+    SinkLimits,
+    TokenBucket,
+    configure_sink_limits,
+    parse_sink_limits,
+    sink_limiter,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _reset_limits(monkeypatch):
+    configure_sink_limits({})
+    # no real sleeping in backoff
+    monkeypatch.setattr(SinkLimiter, "backoff", lambda self, attempt: 0.0)
+    yield
+    configure_sink_limits({})
+
+
+def test_bucket_goes_into_debt_and_waits_it_off():
+    clock = _Clock()
+    bucket = TokenBucket(100, clock=clock)
+
+    assert bucket.delay_for(100) == 0.0  # the initial burst
+    assert bucket.delay_for(50) == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.delay_for(0) == 0.0
+    # a throttled sink refills at half the rate
+    assert bucket.delay_for(50, scale=0.5) == pytest.approx(1.0)
+
+
+def test_pushback_halves_the_rate_and_success_recovers_it():
+    limiter = SinkLimiter("es:*", SinkLimits(rows_per_sec=100), increase=0.25)
+    limiter.on_pushback()
+    limiter.on_pushback()
+    assert limiter.factor == 0.25
+
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.factor == 1.0
+
+
+def test_targets_matching_one_pattern_share_a_limiter():
+    configure_sink_limits(parse_sink_limits('{"es:*": {"rows_per_sec": 10, "max_in_flight": 2}}'))
+
+    a, b = sink_limiter("es:film_dim"), sink_limiter("es:film_rating_agg")
+    assert a is b
+    assert a.limits == SinkLimits(rows_per_sec=10, max_in_flight=2)
+    assert sink_limiter("analytics.film_dim").limits == SinkLimits()
+
+    with pytest.raises(ValueError, match="rows_per_second"):
+        parse_sink_limits({"es:*": {"rows_per_second": 1}})
+
+
+def _lock_timeout() -> DBAPIError:
+    return DBAPIError("INSERT ...", {}, SimpleNamespace(sqlstate="55P03"))
+
+
+class _Session:
+    def __init__(self, failures: list[Exception]):
+        self.failures = failures
+        self.executed = 0
+        self.savepoints = 0
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        self.savepoints += 1
+        yield
+
+    async def execute(self, stmt, params):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.executed += 1
+        return SimpleNamespace(rowcount=len(params))
+
+
+async def test_pg_statement_is_retried_after_a_lock_timeout():
+    session = _Session([_lock_timeout(), _lock_timeout()])
+
+    res = await _pg_execute(session, "stmt", [{}, {}], target="analytics.film_dim", rows=[{}, {}])
+
+    assert res.rowcount == 2
+    assert session.savepoints == 3
+    assert sink_limiter("analytics.film_dim").factor < 1.0
+
+
+async def test_pg_gives_up_after_max_retries_and_other_errors_fail_at_once(monkeypatch):
+    monkeypatch.setattr(writers, "MAX_PUSHBACK_RETRIES", 2)
+    session = _Session([_lock_timeout(), _lock_timeout()])
+    with pytest.raises(DBAPIError):
+        await _pg_execute(session, "stmt", [], target="analytics.film_dim")
+
+    session = _Session([DBAPIError("INSERT ...", {}, SimpleNamespace(sqlstate="23505"))])
+    with pytest.raises(DBAPIError):
+        await _pg_execute(session, "stmt", [], target="analytics.film_dim")
+    assert session.savepoints == 1
+
+
+class _EsClient:
+    """Rejects the first bulk item with 429 once, accepts everything else."""
+
+    def __init__(self):
+        self.calls: list[list[dict]] = []
+
+    async def bulk(self, operations, refresh):
+        self.calls.append(operations)
+        items = []
+        for op in operations:
+            if "update" not in op:
+                continue
+            status = 429 if len(self.calls) == 1 and not items else 200
+            items.append({"update": {"_id": op["update"]["_id"], "status": status}})
+        return {"errors": any(i["update"]["status"] == 429 for i in items), "items": items}
+
+
+async def test_es_retries_only_the_items_rejected_with_429():
+    writer = ElasticsearchWriter(ESConfig(url="http://es", user=None, password=None))
+    client = _EsClient()
+    writer._client = client  # type: ignore[assignment]
+    writer._ensured.add("film_dim")
+    pipeline = SimpleNamespace(target_table="es:film_dim")
+
+    n = await writer.write(None, pipeline, [{"film_id": 1}, {"film_id": 2}])
+
+    assert n == 2
+    assert len(client.calls) == 2
+    assert client.calls[1] == [
+        {"update": {"_index": "film_dim", "_id": "1"}},
+        {"doc": {"film_id": 1}, "doc_as_upsert": True},
+    ]
@@ -0,0 +1,188 @@
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.runner.orchestration.retention import RunHistoryMaintenance
+from src.runner.repos.run_history import (
+    RunHistoryRepo,
+    add_months,
+    expired_partitions,
+    partition_month,
+    partition_name,
+)
+from src.runner.repos.runs import RunsRepo
+
+
+def test_partition_names_and_month_math():
+    assert partition_name(datetime(2025, 12, 1)) == "etl_runs_p202512"
+    assert add_months(datetime(2025, 12, 1), 1) == datetime(2026, 1, 1)
+    assert add_months(datetime(2025, 1, 1), -1) == datetime(2024, 12, 1)
+    assert partition_month("etl_runs_p202512") == datetime(2025, 12, 1)
+    assert partition_month("etl_runs_default") is None
+
+
+def test_only_whole_months_before_the_cutoff_expire():
+    names = ["etl_runs_p202403", "etl_runs_default", "etl_runs_p202401", "etl_runs_p202402"]
+    assert expired_partitions(names, datetime(2024, 3, 1)) == [
+        "etl_runs_p202401",
+        "etl_runs_p202402",
+    ]
+    assert expired_partitions(names, datetime(2024, 2, 29)) == ["etl_runs_p202401"]
+
+
+def _maintenance(partitions, *, retention_days=90, rollup_start=None):
+    history = SimpleNamespace(
+        list_partitions=AsyncMock(return_value=partitions),
+        create_partition=AsyncMock(return_value=0),
+        drop_partition=AsyncMock(),
+        rollup_start=AsyncMock(return_value=rollup_start),
+        rollup_since=AsyncMock(),
+        delete_profiles_before=AsyncMock(return_value=0),
+    )
+    calls: list[str] = []
+    history.rollup_since.side_effect = lambda s, day: calls.append("rollup")
+    history.drop_partition.side_effect = lambda s, name: calls.append(f"drop {name}")
+
+    session = AsyncMock()
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    job = RunHistoryMaintenance(
+        factory,
+        history=history,
+        retention_days=retention_days,
+        months_ahead=2,
+        clock=lambda: datetime(2024, 6, 15, 12, 0),
+    )
+    job.session = session
+    return job, history, calls
+
+
+async def test_creates_upcoming_partitions_rolls_up_then_drops_expired():
+    job, history, calls = _maintenance(
+        ["etl_runs_default", "etl_runs_p202402", "etl_runs_p202403", "etl_runs_p202406"],
+        rollup_start=date(2024, 6, 14),
+    )
+
+    dropped = await job.run_once()
+
+    created = [c.args[1] for c in history.create_partition.await_args_list]
+    assert created == [datetime(2024, 7, 1), datetime(2024, 8, 1)]
+    # 90 days before 2024-06-15 is 2024-03-17: March is not over yet
+    assert dropped == ["etl_runs_p202402"]
+    assert calls == ["rollup", "drop etl_runs_p202402"]
+    history.rollup_since.assert_awaited_once()
+    assert history.rollup_since.await_args.args[1] == date(2024, 6, 14)
+
+
+async def test_zero_retention_keeps_everything():
+    job, history, _ = _maintenance(["etl_runs_p200001"], retention_days=0)
+
+    assert await job.run_once() == []
+    history.drop_partition.assert_not_awaited()
+    history.rollup_since.assert_not_awaited()  # no runs yet
+
+
+async def test_failed_month_does_not_abort_rollup_and_retention():
+    job, history, calls = _maintenance(
+        ["etl_runs_p202402", "etl_runs_p202406"], rollup_start=date(2024, 6, 14)
+    )
+    history.create_partition.side_effect = [RuntimeError("default partition conflict"), 3]
+
+    dropped = await job.run_once()
+
+    assert [c.args[1] for c in history.create_partition.await_args_list] == [
+        datetime(2024, 7, 1),
+        datetime(2024, 8, 1),
+    ]
+    job.session.rollback.assert_awaited_once()
+    assert dropped == ["etl_runs_p202402"]
+    assert calls == ["rollup", "drop etl_runs_p202402"]
+
+
+async def test_disconnect_during_maintenance_propagates(monkeypatch):
+    monkeypatch.setattr("src.runner.orchestration.retention.is_db_disconnect", lambda exc: True)
+    job, history, _ = _maintenance(["etl_runs_p202406"])
+    history.create_partition.side_effect = ConnectionError("gone")
+
+    with pytest.raises(ConnectionError):
+        await job.run_once()
+
+
+def _ddl_session(default_has_rows):
+    statements: list[str] = []
+
+    async def execute(stmt, params=None):
+        statements.append(" ".join(str(stmt).split()))
+        res = MagicMock()
+        res.scalar_one.return_value = default_has_rows
+        res.rowcount = 2
+        return res
+
+    return SimpleNamespace(execute=execute), statements
+
+
+async def test_create_partition_moves_runs_out_of_the_default_partition():
+    session, statements = _ddl_session(default_has_rows=True)
+
+    moved = await RunHistoryRepo().create_partition(session, datetime(2024, 7, 1))
+
+    assert moved == 2
+    detach, create, move, attach = statements[1:]
+    assert detach == "ALTER TABLE etl.etl_runs DETACH PARTITION etl.etl_runs_default"
+    assert create.startswith("CREATE TABLE IF NOT EXISTS etl.etl_runs_p202407 PARTITION OF")
+    assert "DELETE FROM etl.etl_runs_default" in move
+    assert "INSERT INTO etl.etl_runs SELECT * FROM moved" in move
+    assert attach == "ALTER TABLE etl.etl_runs ATTACH PARTITION etl.etl_runs_default DEFAULT"
+
+
+async def test_create_partition_without_stray_runs_only_creates():
+    session, statements = _ddl_session(default_has_rows=False)
+
+    assert await RunHistoryRepo().create_partition(session, datetime(2024, 7, 1)) == 0
+    assert len(statements) == 2
+    assert statements[1].startswith("CREATE TABLE IF NOT EXISTS etl.etl_runs_p202407")
+
+
+async def test_run_finished_since_the_last_pass_re_rolls_its_start_day():
+    # a run started on 06-13 crosses midnight: RUNNING at the first pass,
+    # SUCCESS before the second, when 06-14 is already the last rolled-up day
+    passes = [
+        (date(2024, 6, 14), date(2024, 6, 13), date(2024, 1, 1), None),
+        (date(2024, 6, 14), None, date(2024, 1, 1), date(2024, 6, 13)),
+        (date(2024, 6, 14), None, date(2024, 1, 1), None),
+    ]
+    statements = []
+
+    async def execute(stmt, params=None):
+        statements.append(str(stmt))
+        res = MagicMock()
+        res.one.return_value = passes[len(statements) - 1]
+        return res
+
+    session = SimpleNamespace(execute=execute)
+    repo = RunHistoryRepo()
+
+    assert await repo.rollup_start(session) == date(2024, 6, 13)
+    assert await repo.rollup_start(session) == date(2024, 6, 13)
+    assert await repo.rollup_start(session) == date(2024, 6, 14)
+    assert "finished_at >= (SELECT max(updated_at) FROM etl.etl_run_daily)" in statements[0]
+
+
+def test_run_updates_name_the_partition_key():
+    repo = RunsRepo()
+    started = datetime(2024, 6, 15, 12, 0)
+    repo._started_at["r1"] = started
+
+    sql = str(repo._run("r1").values(status="SUCCESS").compile(dialect=postgresql.dialect()))
+    assert "etl_runs.started_at =" in sql
+
+    repo._run("r1", forget=True)
+    sql = str(repo._run("r1").values(status="FAILED").compile(dialect=postgresql.dialect()))
+    assert "started_at" not in sql.split("WHERE", 1)[1]
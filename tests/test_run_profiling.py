@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import pstats
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from src.app.api.helpers.pipelines import profile_response
+from src.runner.orchestration.executor import PipelineExecutor
+from src.runner.services import profiling
+from src.runner.services.profiling import IDLE_STACK, profile_run
+
+
+def _busy(seconds: float) -> None:
+    end = asyncio.get_running_loop().time() + seconds
+    while asyncio.get_running_loop().time() < end:
+        pass
+
+
+async def _work():
+    for _ in range(5):
+        _busy(0.02)
+        await asyncio.sleep(0.01)
+
+
+async def test_sampling_attributes_the_profiled_task_only():
+    async def other():
+        for _ in range(5):
+            _busy(0.01)
+            await asyncio.sleep(0.005)
+
+    neighbour = asyncio.create_task(other())
+    async with profile_run("sample") as capture:
+        await _work()
+    await neighbour
+
+    art = capture.artifact
+    assert (art.mode, art.format) == ("sample", "collapsed")
+    stacks = dict(line.rsplit(" ", 1) for line in gzip.decompress(art.data).decode().splitlines())
+    assert any(s.endswith("test_run_profiling.py:_busy") and "_work" in s for s in stacks)
+    assert IDLE_STACK in stacks
+    # the neighbour's samples (if any) are only counted, never attributed
+    assert not any("<locals>.other" in s for s in stacks)
+    assert not any("SamplingProfiler.stop" in s for s in stacks)
+    # weights are microseconds of wall time
+    assert sum(int(w) for w in stacks.values()) <= art.duration_s * 1_000_000 * 1.05
+
+
+async def test_cprofile_artifact_loads_with_pstats(tmp_path):
+    async with profile_run("cprofile") as capture:
+        await _work()
+
+    art = capture.artifact
+    assert (art.mode, art.format) == ("cprofile", "pstats")
+    path = tmp_path / "run.pstats"
+    path.write_bytes(gzip.decompress(art.data))
+    names = {func[2] for func in pstats.Stats(str(path)).stats}
+    assert "_busy" in names
+
+
+async def test_concurrent_cprofile_request_falls_back_to_sampling():
+    with profiling._cprofile_busy:
+        async with profile_run("cprofile") as capture:
+            await asyncio.sleep(0.01)
+    assert capture.artifact.mode == "sample"
+
+    async with profile_run(None) as capture:
+        pass
+    assert capture.artifact is None
+
+
+def _executor(monkeypatch, body):
+    runs = AsyncMock()
+    runs.start_run.return_value = "rid-1"
+    executor = PipelineExecutor(runs=runs, pipelines=AsyncMock(), state=AsyncMock())
+    plan = SimpleNamespace(snapshot=SimpleNamespace(mode="full", skip_unchanged=False))
+    monkeypatch.setattr(executor, "_plan_for", lambda p: plan)
+    monkeypatch.setattr(executor, "_run_body", body)
+    return executor, runs
+
+
+async def test_profiled_run_stores_its_artifact(monkeypatch):
+    async def body(ctx, plan):
+        await _work()
+        return 1, 1
+
+    executor, runs = _executor(monkeypatch, body)
+    await executor.execute(AsyncMock(), SimpleNamespace(id="pid-1", name="p1"), profile="sample")
+
+    kw = runs.save_profile.await_args.kwargs
+    assert (kw["run_id"], kw["pipeline_id"]) == ("rid-1", "pid-1")
+    assert kw["artifact"].samples > 0
+    runs.finish_success.assert_awaited_once()
+
+
+async def test_profile_save_failure_does_not_fail_the_run(monkeypatch):
+    executor, runs = _executor(monkeypatch, AsyncMock(return_value=(1, 1)))
+    runs.save_profile.side_effect = RuntimeError("db gone")
+    session = AsyncMock()
+
+    res = await executor.execute(session, SimpleNamespace(id="pid-1", name="p1"), profile="sample")
+
+    assert res.rows_read == 1
+    session.rollback.assert_awaited()
+
+
+async def test_unprofiled_run_stores_nothing(monkeypatch):
+    executor, runs = _executor(monkeypatch, AsyncMock(return_value=(1, 1)))
+    await executor.execute(AsyncMock(), SimpleNamespace(id="pid-1", name="p1"))
+    runs.save_profile.assert_not_awaited()
+
+
+def test_profile_download_is_decompressed():
+    profile = SimpleNamespace(
+        run_id="r1",
+        format="collapsed",
+        mode="sample",
+        samples=3,
+        duration_s=0.5,
+        data=gzip.compress(b"a;b 10\n"),
+    )
+    resp = profile_response(profile)
+    assert resp.body == b"a;b 10\n"
+    assert resp.media_type.startswith("text/plain")
+    assert 'filename="run-r1.collapsed.txt"' in resp.headers["content-disposition"]
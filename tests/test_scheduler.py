@@ -0,0 +1,123 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.runner.orchestration.scheduler import CronScheduler
+
+
+class _Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+        self.mono = 0.0
+
+    def advance(self, **kw):
+        delta = timedelta(**kw)
+        self.now += delta
+        self.mono += delta.total_seconds()
+
+
+def _scheduler(rows, clock, *, busy=False):
+    repo = SimpleNamespace(
+        list_scheduled=AsyncMock(return_value=rows),
+        fire_schedule=AsyncMock(
+            side_effect=lambda s, pid, *, due, now, request_run: (
+                "requested" if request_run and not busy else "absorbed"
+            )
+        ),
+    )
+
+    @asynccontextmanager
+    async def factory():
+        yield AsyncMock()
+
+    sched = CronScheduler(
+        factory,
+        pipelines=repo,
+        refresh_interval=30.0,
+        misfire_grace=60.0,
+        clock=lambda: clock.now,
+        monotonic=lambda: clock.mono,
+    )
+    return sched, repo
+
+
+async def test_fires_when_due_and_reschedules():
+    clock = _Clock(datetime(2024, 1, 1, 10, 0, 30))
+    sched, repo = _scheduler([("p1", 1, "*/5 * * * *", "coalesce", None)], clock)
+
+    assert await sched.tick() == 0
+    assert sched.next_due() == datetime(2024, 1, 1, 10, 5)
+
+    clock.advance(minutes=5)
+    assert await sched.tick() == 1
+    call = repo.fire_schedule.await_args
+    assert call.kwargs["due"] == datetime(2024, 1, 1, 10, 5)
+    assert call.kwargs["request_run"] is True
+    assert sched.next_due() == datetime(2024, 1, 1, 10, 10)
+
+
+async def test_missed_fires_coalesce_into_one_run():
+    clock = _Clock(datetime(2024, 1, 1, 12, 0, 10))
+    last = datetime(2024, 1, 1, 9, 0)  # runner was down for three hours
+    sched, repo = _scheduler([("p1", 1, "*/5 * * * *", "coalesce", last)], clock)
+
+    assert await sched.tick() == 1
+    assert repo.fire_schedule.await_count == 1
+    assert sched.next_due() == datetime(2024, 1, 1, 12, 5)
+
+
+async def test_skip_policy_drops_missed_fires():
+    clock = _Clock(datetime(2024, 1, 1, 12, 0, 10))
+    last = datetime(2024, 1, 1, 9, 0)
+    sched, repo = _scheduler([("p1", 1, "*/5 * * * *", "skip", last)], clock)
+
+    assert await sched.tick() == 0
+    assert repo.fire_schedule.await_args.kwargs["request_run"] is False
+    assert sched.next_due() == datetime(2024, 1, 1, 12, 5)
+
+
+async def test_busy_pipeline_absorbs_the_fire():
+    clock = _Clock(datetime(2024, 1, 1, 10, 5, 0))
+    last = datetime(2024, 1, 1, 10, 0)
+    sched, _ = _scheduler([("p1", 1, "*/5 * * * *", "coalesce", last)], clock, busy=True)
+
+    assert await sched.tick() == 0
+    assert sched.next_due() == datetime(2024, 1, 1, 10, 10)
+
+
+async def test_refresh_rebuilds_changed_and_drops_removed_schedules():
+    clock = _Clock(datetime(2024, 1, 1, 10, 0, 30))
+    sched, repo = _scheduler(
+        [("p1", 1, "0 * * * *", "coalesce", None), ("p2", 1, "*/5 * * * *", "coalesce", None)],
+        clock,
+    )
+    await sched.tick()
+    assert len(sched) == 2
+    assert sched.next_due() == datetime(2024, 1, 1, 10, 5)
+
+    repo.list_scheduled.return_value = [("p1", 2, "*/2 * * * *", "coalesce", None)]
+    clock.advance(seconds=30)
+    await sched.tick()
+
+    assert len(sched) == 1
+    assert sched.next_due() == datetime(2024, 1, 1, 10, 2)
+
+
+async def test_failed_fire_is_retried_on_the_next_tick():
+    clock = _Clock(datetime(2024, 1, 1, 10, 0, 30))
+    sched, repo = _scheduler([("p1", 1, "*/5 * * * *", "coalesce", None)], clock)
+    await sched.tick()
+
+    clock.advance(minutes=5)
+    repo.fire_schedule.side_effect = [ConnectionError("db down"), "requested"]
+    with pytest.raises(ConnectionError):
+        await sched.tick()
+    assert sched.next_due() == datetime(2024, 1, 1, 10, 5)
+
+    clock.advance(seconds=5)
+    assert await sched.tick() == 1
+    assert repo.fire_schedule.await_args.kwargs["due"] == datetime(2024, 1, 1, 10, 5)
+    assert sched.next_due() == datetime(2024, 1, 1, 10, 10)
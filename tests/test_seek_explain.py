@@ -0,0 +1,135 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.app.core.query_plan import BatchSource, seek_query_for, summarize_plan
+from src.app.services.pipelines import PipelinesService
+from src.runner.services.pipeline_snapshot import PipelineSnapshot, TaskSnapshot
+from src.runner.services.seek_explain import batch_source
+
+
+def _plan(root):
+    return json.dumps([{"Plan": root}])
+
+
+SORTED_SEQ_SCAN = {
+    "Node Type": "Limit",
+    "Total Cost": 1234.5,
+    "Plan Rows": 1000,
+    "Plans": [
+        {
+            "Node Type": "Sort",
+            "Sort Key": ["fw.updated_at", "fw.id"],
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "film_work",
+                    "Schema": "content",
+                    "Alias": "fw",
+                }
+            ],
+        }
+    ],
+}
+
+
+def test_sort_over_seq_scan_suggests_composite_index():
+    s = summarize_plan(_plan(SORTED_SEQ_SCAN), inc_key="updated_at", id_key="id")
+
+    assert s.needs_sort and not s.ok
+    assert s.seq_scans == ("content.film_work",)
+    assert s.sort_keys == ("fw.updated_at", "fw.id")
+    assert s.suggested_index == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_film_work_updated_at_id"
+        " ON content.film_work (updated_at, id)"
+    )
+    assert s.as_dict()["ok"] is False
+
+
+def test_index_scan_is_ok():
+    root = {
+        "Node Type": "Limit",
+        "Total Cost": 4.2,
+        "Plan Rows": 1000,
+        "Plans": [
+            {"Node Type": "Index Scan", "Relation Name": "film_work", "Alias": "fw"},
+        ],
+    }
+    s = summarize_plan(_plan(root), inc_key="updated_at", id_key="id")
+
+    assert s.ok
+    assert s.suggested_index is None
+    assert s.node_types == ("Limit", "Index Scan")
+
+
+def test_expression_sort_key_has_no_suggestion():
+    root = {
+        "Node Type": "Limit",
+        "Plans": [
+            {
+                "Node Type": "Sort",
+                "Sort Key": ["(max(r.updated_at))", "r.film_id"],
+                "Plans": [{"Node Type": "Seq Scan", "Relation Name": "ratings", "Alias": "r"}],
+            }
+        ],
+    }
+    s = summarize_plan(_plan(root), inc_key="updated_at", id_key="film_id")
+
+    assert s.needs_sort
+    assert s.suggested_index is None
+
+
+def test_seek_query_for_tasks_uses_reader_sql():
+    snap = PipelineSnapshot(
+        id="p",
+        name="p",
+        type="SQL",
+        mode="incremental",
+        enabled=True,
+        batch_size=10,
+        source_query=None,
+        python_module=None,
+        target_table="analytics.film_dim",
+        incremental_key="updated_at",
+        incremental_id_key="id",
+        tasks=(TaskSnapshot("t", 1, "SQL", "SELECT * FROM content.film_work", None),),
+    )
+
+    q = seek_query_for(batch_source(snap))
+
+    assert "FROM (SELECT * FROM content.film_work) AS src" in q.seek_page.text
+
+
+def test_seek_query_for_full_mode_is_rejected():
+    source = BatchSource(id="p", mode="full", reader_sql="SELECT 1", batch_size=10)
+
+    with pytest.raises(ValueError):
+        seek_query_for(source)
+
+
+async def test_api_explain_reads_task_sql_and_checkpoint_through_its_repo(monkeypatch):
+    pipeline = SimpleNamespace(
+        id="p",
+        mode="incremental",
+        source_query=None,
+        batch_size=50,
+        incremental_key="updated_at",
+        incremental_id_key="id",
+    )
+    repo = SimpleNamespace(
+        get_pipeline=AsyncMock(return_value=pipeline),
+        get_reader_sql=AsyncMock(return_value="SELECT * FROM content.film_work"),
+        get_checkpoint=AsyncMock(return_value=("2024-01-01T10:00:00", "42")),
+    )
+    explain = AsyncMock(return_value=summarize_plan(_plan(SORTED_SEQ_SCAN)))
+    monkeypatch.setattr("src.app.services.pipelines.explain_next_page", explain)
+
+    await PipelinesService(AsyncMock(), repo=repo).explain_seek("p")
+
+    _, source, checkpoint = explain.await_args.args
+    assert source.reader_sql == "SELECT * FROM content.film_work"
+    assert source.batch_size == 50
+    assert checkpoint == (datetime(2024, 1, 1, 10, 0), "42")
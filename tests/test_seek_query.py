@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+
+from benchmarks.plan_time import planning_ms, summarize
+from src.app.core.seek_query import build_seek_query
+
+
+def test_first_page_until_checkpoint_exists():
+    q = build_seek_query("SELECT * FROM t;", inc_key="updated_at", id_key="id")
+
+    stmt, params = q.bind(None, None, 100)
+
+    assert stmt is q.first_page
+    assert params == {"limit": 100}
+    assert "WHERE" not in stmt.text
+    assert stmt.text.endswith("ORDER BY src.updated_at, src.id LIMIT :limit")
+
+
+def test_seek_page_is_the_same_statement_every_batch():
+    q = build_seek_query("SELECT * FROM t", inc_key="updated_at", id_key="id")
+    ts = datetime(2024, 1, 1)
+
+    s1, p1 = q.bind(ts, "a", 10)
+    s2, p2 = q.bind(ts, "b", 10)
+
+    assert s1 is s2 is q.seek_page
+    assert p1 == {"last_ts": ts, "last_id": "a", "limit": 10}
+    assert p2["last_id"] == "b"
+
+
+PUSHDOWN_SQL = """
+    SELECT fw.id AS film_id, max(fw.updated_at) AS updated_at, avg(r.score) AS rating
+    FROM content.film_work fw JOIN content.rating r ON r.film_id = fw.id
+    WHERE CAST(:last_ts AS timestamptz) IS NULL
+       OR (fw.updated_at, fw.id) > (CAST(:last_ts AS timestamptz), CAST(:last_id AS uuid))
+    GROUP BY fw.id ORDER BY 2, 1 LIMIT :limit;
+"""
+
+
+def test_placeholders_are_bound_directly_without_wrap():
+    q = build_seek_query(PUSHDOWN_SQL, inc_key="updated_at", id_key="film_id")
+    ts = datetime(2024, 1, 1)
+
+    first, p0 = q.bind(None, None, 50)
+    seek, p1 = q.bind(ts, "a", 50)
+
+    assert q.pushdown
+    assert first is seek
+    assert "AS src" not in seek.text
+    assert not seek.text.endswith(";")
+    assert p0 == {"last_ts": None, "last_id": None, "limit": 50}
+    assert p1 == {"last_ts": ts, "last_id": "a", "limit": 50}
+
+
+def test_partial_placeholders_are_rejected():
+    with pytest.raises(ValueError, match=":limit"):
+        build_seek_query(
+            "SELECT * FROM t WHERE updated_at > :last_ts ORDER BY 1",
+            inc_key="updated_at",
+            id_key="id",
+        )
+
+
+def test_rejects_non_identifiers():
+    with pytest.raises(ValueError):
+        build_seek_query("SELECT 1", inc_key="updated_at; drop", id_key="id")
+
+
+def test_plan_time_summary():
+    assert planning_ms('[{"Plan": {}, "Planning Time": 0.25}]') == 0.25
+
+    report = summarize([0.3, 0.5], [0.02, 0.02], batches_per_day=200_000)
+
+    assert report.saved_per_batch_ms == pytest.approx(0.38)
+    assert report.saved_per_day_s == pytest.approx(76.0)
@@ -0,0 +1,38 @@
+from sqlalchemy.dialects import postgresql
+
+from src.runner.repos.state import StateRepo
+
+
+class _CompilingSession:
+    """Records the PostgreSQL SQL of every executed statement."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+
+async def test_checkpoint_upsert_is_a_single_on_conflict_statement():
+    session = _CompilingSession()
+
+    await StateRepo().upsert(session, "p", last_value="2024-01-01T00:00:00", last_id="7")
+
+    [sql] = session.statements
+    assert sql.startswith("INSERT INTO etl.etl_state")
+    assert "ON CONFLICT (pipeline_id) DO UPDATE SET" in sql
+    set_clause = sql.split("DO UPDATE SET", 1)[1]
+    assert "last_processed_value = excluded.last_processed_value" in set_clause
+    assert "last_processed_id = excluded.last_processed_id" in set_clause
+    assert "updated_at = now()" in set_clause
+    assert "reader_checkpoints" not in set_clause
+
+
+async def test_reader_checkpoint_merges_into_the_state_row():
+    session = _CompilingSession()
+
+    await StateRepo().upsert_reader(session, "p", 4, last_value="x", last_id="1")
+
+    [sql] = session.statements
+    assert "reader_checkpoints = (coalesce(etl.etl_state.reader_checkpoints" in sql
+    assert "|| excluded.reader_checkpoints" in sql
@@ -0,0 +1,156 @@
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.app.api.helpers.pipelines import sse_event, sse_stream
+from src.app.core.constants import PIPELINE_EVENTS_CHANNEL
+from src.app.services.status_events import RESYNC_EVENT, StatusEventHub
+from src.runner.services.progress import ProgressReporter
+
+
+class _Conn:
+    """asyncpg connection stand-in: records listeners, can be 'dropped'."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.on_terminate.append(callback)
+
+    def notify(self, event: dict):
+        self.listeners[PIPELINE_EVENTS_CHANNEL](self, 1, PIPELINE_EVENTS_CHANNEL, json.dumps(event))
+
+    def drop(self):
+        self.closed = True
+        for cb in self.on_terminate:
+            cb(self)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+
+def _hub(**kw):
+    conns: list[_Conn] = []
+
+    async def connect():
+        conns.append(_Conn())
+        return conns[-1]
+
+    return StatusEventHub(connect, reconnect_delays=(0,), **kw), conns
+
+
+async def test_one_connection_fans_out_to_subscribers_of_that_pipeline():
+    hub, conns = _hub()
+    async with hub.subscribe("p1") as a, hub.subscribe("p1") as b, hub.subscribe("p2") as c:
+        assert len(conns) == 1
+        assert hub.subscriber_count == 3
+
+        conns[0].notify({"type": "status", "pipeline_id": "p1", "status": "RUNNING"})
+
+        assert a.get_nowait()["status"] == "RUNNING"
+        assert b.get_nowait()["status"] == "RUNNING"
+        assert c.empty()
+
+    assert hub.subscriber_count == 0
+    await hub.aclose()
+    assert conns[0].closed
+
+
+async def test_slow_subscriber_loses_backlog_and_gets_resync():
+    hub, conns = _hub(queue_size=2)
+    async with hub.subscribe("p1") as q:
+        for i in range(3):
+            conns[0].notify({"type": "progress", "pipeline_id": "p1", "batch": i})
+
+        assert q.get_nowait() == RESYNC_EVENT
+        assert q.get_nowait()["batch"] == 2
+    await hub.aclose()
+
+
+async def test_lost_connection_is_reestablished_and_subscribers_resync():
+    hub, conns = _hub()
+    async with hub.subscribe("p1") as q:
+        conns[0].drop()
+        event = await asyncio.wait_for(q.get(), timeout=1)
+        assert event == RESYNC_EVENT
+
+        for _ in range(20):
+            if len(conns) == 2 and conns[1].listeners:
+                break
+            await asyncio.sleep(0)
+        conns[1].notify({"type": "status", "pipeline_id": "p1", "status": "IDLE"})
+        assert (await asyncio.wait_for(q.get(), timeout=1))["status"] == "IDLE"
+    await hub.aclose()
+
+
+async def test_subscribe_fails_when_listen_cannot_connect():
+    async def connect():
+        raise OSError("db down")
+
+    hub = StatusEventHub(connect, reconnect_delays=(10,))
+    with pytest.raises(OSError):
+        async with hub.subscribe("p1"):
+            pass
+    assert hub.subscriber_count == 0
+    await hub.aclose()
+
+
+def test_sse_frame_format():
+    frame = sse_event({"type": "run", "pipeline_id": "p1", "status": "SUCCESS"})
+    assert frame == 'event: run\ndata: {"type":"run","pipeline_id":"p1","status":"SUCCESS"}\n\n'
+
+
+async def test_stream_sends_current_state_events_and_heartbeats():
+    queue: asyncio.Queue = asyncio.Queue()
+    closed = []
+    subscription = AsyncExitStack()
+    subscription.callback(lambda: closed.append(True))
+    request = AsyncMock()
+    request.is_disconnected.side_effect = [False, True]
+
+    await queue.put({"type": "status", "pipeline_id": "p1", "status": "RUNNING"})
+    first = {"type": "status", "pipeline_id": "p1", "status": "RUN_REQUESTED"}
+    frames = [f async for f in sse_stream(request, queue, first, subscription, heartbeat=0.01)]
+
+    assert frames[0].startswith("retry:")
+    assert '"RUN_REQUESTED"' in frames[1]
+    assert '"RUNNING"' in frames[2]
+    assert frames[3] == ": ping\n\n"
+    assert len(frames) == 4
+    assert closed == [True]
+
+
+async def test_progress_is_throttled_per_run():
+    session = AsyncMock()
+    clock = iter([0.0, 0.5, 1.2])
+    reporter = ProgressReporter(
+        session, pipeline_id="p1", run_id="r1", min_interval=1.0, monotonic=lambda: next(clock)
+    )
+
+    sent = [await reporter.report(batch=i, rows_read=i, rows_written=i) for i in (1, 2, 3)]
+
+    assert sent == [True, False, True]
+    params = session.execute.await_args.args[1]
+    assert params["channel"] == PIPELINE_EVENTS_CHANNEL
+    assert json.loads(params["payload"])["batch"] == 3
+    assert session.commit.await_count == 2
+
+
+async def test_failed_progress_notify_does_not_fail_the_run():
+    session = AsyncMock()
+    session.execute.side_effect = RuntimeError("connection reset")
+    reporter = ProgressReporter(session, pipeline_id="p1", run_id="r1")
+
+    assert await reporter.report(batch=1, rows_read=1, rows_written=1) is False
+    session.rollback.assert_awaited_once()
@@ -0,0 +1,92 @@
+import asyncio
+import io
+import json
+import logging
+
+from src.runner.services.logctx import bind_log_context, ctx_fields, current_log_context
+from src.runner.services.structured_log import (
+    PER_BATCH,
+    BatchLogLimiter,
+    JsonFormatter,
+    LogContextFilter,
+    TextFormatter,
+    configure_logging,
+)
+
+
+def _record(msg="%s FULL batch=%d", args=("ctx", 1), level=logging.INFO, **extra):
+    record = logging.LogRecord("etl_runner", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+async def test_context_is_per_task_and_restored():
+    async def run(rid):
+        with bind_log_context(**ctx_fields(pid="p", pname="n", rid=rid)):
+            await asyncio.sleep(0)
+            return current_log_context()["run_id"]
+
+    assert await asyncio.gather(run("r1"), run("r2")) == ["r1", "r2"]
+    assert dict(current_log_context()) == {}
+
+
+def test_json_record_carries_context_fields():
+    with bind_log_context(**ctx_fields(pid="p1", pname="orders", rid="r1", attempt=2)):
+        record = _record()
+        LogContextFilter().filter(record)
+
+    out = json.loads(JsonFormatter().format(record))
+    assert out["msg"] == "ctx FULL batch=1"
+    assert out["level"] == "INFO"
+    assert (out["pipeline_id"], out["pipeline"], out["run_id"], out["attempt"]) == (
+        "p1",
+        "orders",
+        "r1",
+        2,
+    )
+
+
+def test_batch_lines_are_limited_per_run_and_message():
+    now = [0.0]
+    limiter = BatchLogLimiter(5.0, monotonic=lambda: now[0])
+
+    with bind_log_context(run_id="r1"):
+        seen = []
+        for t in (0.0, 1.0, 2.0, 6.0):
+            now[0] = t
+            record = _record(**PER_BATCH)
+            seen.append(limiter.filter(record))
+        assert seen == [True, False, False, True]
+        assert record.suppressed == 2
+
+        # other messages, warnings and non-batch lines are not limited
+        assert limiter.filter(_record("%s INC batch=%d", **PER_BATCH))
+        assert limiter.filter(_record(level=logging.WARNING, **PER_BATCH))
+        assert limiter.filter(_record())
+
+    with bind_log_context(run_id="r2"):
+        assert limiter.filter(_record(**PER_BATCH))
+
+    assert "(+3 similar suppressed)" in TextFormatter().format(_record(suppressed=3))
+
+
+def test_queue_listener_writes_off_the_caller_thread():
+    stream = io.StringIO()
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    listener = configure_logging(fmt="json", batch_interval=0, stream=stream)
+    try:
+        with bind_log_context(run_id="r9"):
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logging.getLogger("etl_runner").exception("failed %s", "x")
+    finally:
+        listener.stop()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    out = json.loads(stream.getvalue())
+    assert out["msg"] == "failed x"
+    assert out["run_id"] == "r9"
+    assert "ValueError: boom" in out["exc"]
@@ -0,0 +1,261 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.runner.adapters.tasks_dag import run_branches, run_tasks_dag
+from src.runner.adapters.writers import BranchWriter
+from src.runner.repos.state import StateRecord
+from src.runner.services.pipeline_snapshot import PipelineSnapshot, TaskSnapshot
+from src.runner.services.plan_cache import DagPlan, build_plan
+from src.runner.services.task_plan import validate_tasks_v2
+
+READER = "SELECT id AS film_id, title, updated_at FROM content.film_work"
+NORMALIZE = "src.pipelines.python_tasks.normalize_title"
+
+
+def _task(idx, task_type="PYTHON", body=NORMALIZE, *, deps=(), target=None):
+    return TaskSnapshot(f"t{idx}", idx, task_type, body, target, depends_on=tuple(deps))
+
+
+def _snap(*tasks, mode="full", **kw):
+    base = dict(
+        id="p",
+        name="p",
+        type="SQL",
+        mode=mode,
+        enabled=True,
+        batch_size=2,
+        source_query=None,
+        python_module=None,
+        target_table="analytics.film_dim",
+        incremental_key="updated_at" if mode == "incremental" else None,
+        incremental_id_key="film_id",
+        tasks=tasks,
+    )
+    base.update(kw)
+    return PipelineSnapshot(**base)
+
+
+# reader 1 fans out to two branches; reader 4 has its own chain
+DAG = (
+    _task(1, "SQL", READER),
+    _task(2, deps=[1], target="analytics.film_rating_agg"),
+    _task(3, deps=[1]),
+    _task(4, "SQL", READER, target="es:film_dim"),
+    _task(5, deps=[4]),
+)
+
+
+def test_dag_readers_branches_and_sinks():
+    snap, graph = validate_tasks_v2(_snap(*reversed(DAG)))
+
+    assert [t.order_index for t in snap.tasks] == [1, 2, 3, 4, 5]
+    assert graph.readers == (1, 4)
+    assert graph.nodes[1].children == (2, 3)
+    # explicit targets are written, leaves default to the pipeline target
+    assert graph.sinks == [
+        (2, "analytics.film_rating_agg"),
+        (3, "analytics.film_dim"),
+        (4, "es:film_dim"),
+        (5, "analytics.film_dim"),
+    ]
+    assert graph.subtree(1) == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "tasks, kw, match",
+    [
+        ((_task(1, "SQL", READER), _task(2, deps=[1, 1])), {}, "exactly one"),
+        ((_task(1, "SQL", READER), _task(2, deps=[3]), _task(3, deps=[1])), {}, "earlier"),
+        ((_task(1, "SQL", READER), _task(2, "SQL", READER, deps=[1])), {}, "cannot depend"),
+        ((_task(1, "SQL", READER), _task(2, deps=[1])), {"skip_unchanged": True}, "skip_"),
+        ((_task(1, "SQL", READER), _task(2, deps=[1], target="public.x")), {}, "not allowed"),
+    ],
+)
+def test_invalid_dags_are_rejected(tasks, kw, match):
+    with pytest.raises(ValueError, match=match):
+        validate_tasks_v2(_snap(*tasks, **kw))
+
+
+def test_tasks_without_depends_on_keep_the_v1_chain():
+    linear = _snap(
+        TaskSnapshot("a", 1, "SQL", READER, None), TaskSnapshot("b", 2, "PYTHON", NORMALIZE, None)
+    )
+    assert build_plan(linear).dag is None
+
+    plan = build_plan(_snap(*DAG))
+    assert plan.dag is not None and plan.writer is None
+    assert sorted(plan.dag.fns) == [2, 3, 5]
+    assert plan.dag.sinks.targets == [
+        "analytics.film_rating_agg",
+        "analytics.film_dim",
+        "es:film_dim",
+    ]
+
+
+def _dag_plan(fns, sinks):
+    _, graph = validate_tasks_v2(_snap(*DAG))
+    return DagPlan(graph=graph, fns=fns, sinks=sinks)
+
+
+async def test_branches_run_concurrently_within_the_limit_on_private_rows():
+    running = peak = 0
+
+    async def slow(rows):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        for r in rows:
+            r["title"] = r["title"].upper()  # in place
+        return rows
+
+    graph_tasks = (
+        _task(1, "SQL", READER, target="analytics.film_rating_agg"),
+        *(_task(i, deps=[1]) for i in (2, 3, 4)),
+    )
+    _, graph = validate_tasks_v2(_snap(*graph_tasks))
+    dag = DagPlan(graph=graph, fns={2: slow, 3: slow, 4: slow}, sinks=BranchWriter([]))
+
+    outputs = await run_branches(dag, 1, [{"title": "a"}], asyncio.Semaphore(2))
+
+    assert peak == 2
+    assert outputs[1] == [{"title": "a"}]
+    assert outputs[2] == outputs[3] == outputs[4] == [{"title": "A"}]
+
+
+async def test_sync_branches_run_in_threads_within_the_limit():
+    lock = threading.Lock()
+    running = peak = 0
+    loop_thread = threading.get_ident()
+    threads = set()
+
+    def blocking(rows):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        threads.add(threading.get_ident())
+        time.sleep(0.05)  # CPU-bound stand-in: would block the event loop inline
+        with lock:
+            running -= 1
+        return ({**r, "title": r["title"].upper()} for r in rows)
+
+    graph_tasks = (
+        _task(1, "SQL", READER, target="analytics.film_rating_agg"),
+        *(_task(i, deps=[1]) for i in (2, 3, 4)),
+    )
+    _, graph = validate_tasks_v2(_snap(*graph_tasks))
+    dag = DagPlan(graph=graph, fns={2: blocking, 3: blocking, 4: blocking}, sinks=BranchWriter([]))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    tick_task = asyncio.create_task(ticker())
+    try:
+        outputs = await run_branches(dag, 1, [{"title": "a"}], asyncio.Semaphore(2))
+    finally:
+        tick_task.cancel()
+
+    assert peak == 2
+    assert loop_thread not in threads
+    assert ticks > 5  # the loop kept running while the transforms slept
+    assert outputs[2] == outputs[3] == outputs[4] == [{"title": "A"}]
+
+
+async def test_branch_writer_serializes_session_sinks_and_sums_rows():
+    calls = []
+
+    def sink(name, n):
+        w = AsyncMock()
+
+        async def write(session, view, rows):
+            calls.append((name, view.target_table, len(rows)))
+            await asyncio.sleep(0)
+            return n
+
+        w.write.side_effect = write
+        return w
+
+    writer = BranchWriter(
+        [
+            (2, "analytics.a", sink("pg-a", 1), True),
+            (3, "analytics.b", sink("pg-b", 2), True),
+            (4, "es:c", sink("es-c", 3), False),
+            (5, "es:d", sink("es-d", 4), False),
+        ]
+    )
+
+    n = await writer.write(None, SimpleNamespace(target_table="x"), {2: [{}], 3: [{}], 4: [{}]})
+
+    assert n == 6  # task 5 had no rows
+    pg = [c for c in calls if c[0].startswith("pg")]
+    assert pg == [("pg-a", "analytics.a", 1), ("pg-b", "analytics.b", 1)]
+    assert ("es-c", "es:c", 1) in calls
+
+
+class _Session:
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.params = []
+        self.commits = 0
+
+    async def execute(self, stmt, params=None):
+        self.params.append(params)
+        res = MagicMock()
+        res.mappings.return_value.all.return_value = self.pages.pop(0)
+        return res
+
+    async def commit(self):
+        self.commits += 1
+
+
+async def test_incremental_dag_checkpoints_each_reader_with_its_batch():
+    t = datetime(2024, 1, 1)
+    session = _Session(
+        [
+            [{"film_id": 1, "title": "a", "updated_at": t}],
+            [],
+            [{"film_id": 7, "title": "b", "updated_at": t}],
+            [],
+        ]
+    )
+    state = AsyncMock()
+    state.get.return_value = None
+    state.get_reader.return_value = StateRecord("p", "2023-12-31T00:00:00", "5")
+    ctx = SimpleNamespace(
+        session=session, state=state, pause=None, progress=None, pipelines=AsyncMock()
+    )
+    ctx.pipelines.get_status.return_value = "RUNNING"
+    sinks = AsyncMock()
+    sinks.targets = ["analytics.film_dim"]
+    sinks.write.return_value = 2
+    identity = {i: (lambda rows: rows) for i in (2, 3, 5)}
+
+    read, written = await run_tasks_dag(
+        ctx, _snap(*DAG, mode="incremental"), dag=_dag_plan(identity, sinks)
+    )
+
+    assert (read, written) == (2, 4)
+    state.upsert.assert_awaited_once_with(
+        session, "p", last_value="2024-01-01T00:00:00", last_id="1"
+    )
+    state.upsert_reader.assert_awaited_once_with(
+        session, "p", 4, last_value="2024-01-01T00:00:00", last_id="7"
+    )
+    # reader 4 resumed from its own checkpoint
+    assert session.params[2]["last_id"] == "5"
+    assert sorted(sinks.write.await_args_list[0].args[2]) == [1, 2, 3]
+    assert sorted(sinks.write.await_args_list[1].args[2]) == [4, 5]
+    assert session.commits == 2
+    sinks.close.assert_awaited_once()
@@ -0,0 +1,107 @@
+import importlib.util
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.runner.orchestration.executor import PipelineExecutor
+from src.runner.services import tracing
+from src.runner.services.tracing import (
+    NOOP_SPAN,
+    LocalTracer,
+    build_tracer,
+    configure_tracing,
+    current_span,
+    shutdown_tracing,
+    span,
+)
+
+
+class _Memory:
+    def __init__(self):
+        self.spans = []
+        self.closed = False
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def shutdown(self):
+        self.closed = True
+
+
+@pytest.fixture
+def exported():
+    memory = _Memory()
+    configure_tracing(LocalTracer(memory))
+    yield memory
+    shutdown_tracing()
+
+
+def test_default_tracer_records_nothing():
+    with span("fetch", batch_no=1) as s:
+        s.set(rows=10)
+        assert s is NOOP_SPAN
+        assert current_span() is NOOP_SPAN
+
+
+def test_spans_nest_and_record_errors(exported):
+    with span("execute", attempt=1) as outer:
+        with span("fetch", batch_no=1) as inner:
+            inner.set(rows=5)
+        with pytest.raises(ValueError), span("write", batch_no=1):
+            raise ValueError("sink down")
+        assert current_span() is outer
+    shutdown_tracing()
+
+    fetch, write, execute = exported.spans
+    assert exported.closed
+    assert fetch["attributes"] == {"batch_no": 1, "rows": 5}
+    assert fetch["parent_id"] == execute["span_id"] == write["parent_id"]
+    assert fetch["trace_id"] == execute["trace_id"]
+    assert execute["parent_id"] is None
+    assert write["error"] == "ValueError: sink down"
+
+
+async def test_executor_span_wraps_adapter_stages(exported, monkeypatch):
+    runs = AsyncMock()
+    runs.start_run.return_value = "rid-1"
+    executor = PipelineExecutor(runs=runs, pipelines=AsyncMock(), state=AsyncMock())
+
+    async def body(ctx, plan):
+        with span("fetch", batch_no=1) as s:
+            s.set(rows=3)
+        return 3, 2
+
+    plan = SimpleNamespace(snapshot=SimpleNamespace(mode="full", skip_unchanged=False))
+    monkeypatch.setattr(executor, "_plan_for", lambda p: plan)
+    monkeypatch.setattr(executor, "_run_body", body)
+
+    await executor.execute(AsyncMock(), SimpleNamespace(id="pid-1", name="p1"), attempt=2)
+    shutdown_tracing()
+
+    fetch, execute = exported.spans
+    assert execute["name"] == "execute"
+    assert execute["attributes"]["attempt"] == 2
+    assert execute["attributes"]["rows_written"] == 2
+    assert fetch["parent_id"] == execute["span_id"]
+
+
+def test_file_exporter_appends_json_lines(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracer = build_tracer("file", path=str(path))
+    with tracer.span("commit", batch_no=3):
+        pass
+    tracer.shutdown()
+
+    (line,) = path.read_text().splitlines()
+    assert json.loads(line)["name"] == "commit"
+
+
+def test_unknown_or_unavailable_exporter_fails_fast():
+    with pytest.raises(ValueError):
+        build_tracer("jaeger")
+    if importlib.util.find_spec("opentelemetry") is None:
+        with pytest.raises(RuntimeError, match="opentelemetry"):
+            build_tracer("otlp")
+    assert isinstance(tracing.build_tracer("none"), tracing.Tracer)
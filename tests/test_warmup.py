@@ -0,0 +1,125 @@
+import asyncio
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.runner.adapters.registry import load_adapter
+from src.runner.services import warmup
+from src.runner.services.pipeline_snapshot import PipelineSnapshot
+from src.runner.services.plan_cache import PlanCache
+from src.runner.services.warmup import StartupTimer, open_pool_connections, warm_plans, warm_up
+
+
+def _snap(pid, mode="full", target="analytics.film_dim"):
+    return PipelineSnapshot(
+        id=pid,
+        name=pid,
+        type="SQL",
+        mode=mode,
+        enabled=True,
+        batch_size=100,
+        source_query="SELECT 1",
+        python_module=None,
+        target_table=target,
+        incremental_key=None,
+        incremental_id_key=None,
+        version=3,
+    )
+
+
+def test_runner_main_does_not_import_adapters_or_elasticsearch():
+    code = (
+        "import sys, src.runner.main\n"
+        "loaded = [m for m in sys.modules if m.startswith('elasticsearch')"
+        " or m.startswith('src.runner.adapters.sql_') or m.startswith('src.runner.adapters.tasks_f')]\n"
+        "print(','.join(loaded))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_adapters_load_on_first_use():
+    from src.runner.adapters.tasks_full import run_tasks_full
+
+    assert load_adapter("full", kind="tasks") is run_tasks_full
+    with pytest.raises(ValueError, match="Unsupported pipeline.mode"):
+        load_adapter("cdc", kind="tasks")
+
+
+def test_startup_timer_reports_phases():
+    clock = iter([10.0, 10.5, 12.0])
+    timer = StartupTimer(clock=lambda: next(clock))
+
+    timer.mark("db")
+    timer.mark("warmup")
+
+    assert timer.phases == {"db": 0.5, "warmup": 1.5}
+    assert timer.total == 2.0
+    assert timer.summary() == "db=0.500s warmup=1.500s"
+
+
+class _Engine:
+    def __init__(self):
+        self.held = self.max_held = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        self.held += 1
+        self.max_held = max(self.max_held, self.held)
+        try:
+            yield AsyncMock()
+        finally:
+            self.held -= 1
+
+
+async def test_pool_connections_are_held_together():
+    engine = _Engine()
+
+    assert await open_pool_connections(engine, 3) == 3
+    assert engine.max_held == 3
+    assert engine.held == 0
+
+
+@asynccontextmanager
+async def _factory():
+    yield AsyncMock()
+
+
+async def test_plans_of_enabled_pipelines_are_resolved_into_the_cache(monkeypatch):
+    snaps = {"p1": _snap("p1"), "p2": _snap("p2", mode="bogus")}
+    repo = SimpleNamespace(
+        list_enabled=AsyncMock(return_value=[SimpleNamespace(id="p1"), SimpleNamespace(id="p2")])
+    )
+    monkeypatch.setattr(
+        warmup, "snapshot_pipeline_with_tasks", AsyncMock(side_effect=lambda s, p: snaps[p.id])
+    )
+    plans = PlanCache()
+
+    resolved, failed = await warm_plans(_factory, pipelines=repo, plans=plans, limit=10)
+
+    assert (resolved, failed) == (1, 1)
+    assert repo.list_enabled.await_args.kwargs == {"limit": 10}
+    assert plans.get_snapshot("p1", 3) is snaps["p1"]
+    assert plans.get_plan(snaps["p1"]) is plans.get_plan(snaps["p1"])
+
+
+async def test_failed_warm_up_starts_cold():
+    class _Down(_Engine):
+        @asynccontextmanager
+        async def connect(self):
+            await asyncio.sleep(0)
+            raise OSError("db down")
+            yield
+
+    repo = SimpleNamespace(list_enabled=AsyncMock())
+
+    report = await warm_up(
+        _factory, engines=[(_Down(), 2)], pipelines=repo, plans=PlanCache(), max_plans=5
+    )
+
+    assert report == warmup.WarmupReport(connections=0, plans=0, failed=0)
+    repo.list_enabled.assert_not_awaited()